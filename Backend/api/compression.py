@@ -0,0 +1,162 @@
+import zlib
+from typing import Dict, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is used without it
+    brotli = None
+
+# Media types worth compressing (images, archives and fonts are compressed already)
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+# Bodies at least this large are compressed in a worker thread instead of on the event loop
+THREAD_MINIMUM_SIZE = 256 * 1024
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Content codings the middleware can produce, preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Pick a content coding from an Accept-Encoding header
+
+    The highest q-value wins; ties go to the earliest coding in
+    ``available``. Codings with q=0 are refused, and ``*`` stands for every
+    coding not listed.
+
+    Returns:
+        The chosen coding, or None to send the body as-is
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    """Streaming compressor for one response body"""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        self.coding = coding
+        if coding == 'br':
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, more_body: bool) -> bytes:
+        """Compress a chunk; the stream is finished when ``more_body`` is False"""
+        if self.coding == 'br':
+            out = self._brotli.process(data)
+            return out + (self._brotli.flush() if more_body else self._brotli.finish())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, as negotiated with Accept-Encoding
+
+    Only JSON, text and other compressible media types are compressed, and
+    only when the body reaches ``minimum_size`` bytes: small responses cost
+    more to compress than they save. Responses that already carry a
+    Content-Encoding (or are partial) are left alone. Streaming responses are
+    compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        """Wrap an ASGI app
+
+        Args:
+            app: Application to wrap
+            minimum_size: Smallest body compressed, in bytes
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: Brotli quality (0-11); 4-5 compresses JSON better
+                than gzip -6 at a similar speed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = supported_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''), self.encodings)
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body':
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if start is not None:
+                headers = MutableHeaders(raw=start['headers'])
+                compressible = self._compressible(start['status'], headers)
+                if compressible:
+                    headers.add_vary_header('Accept-Encoding')
+                if compressible and coding and (more_body or len(body) >= self.minimum_size):
+                    compressor = _Compressor(coding, self.gzip_level, self.brotli_quality)
+                    headers['Content-Encoding'] = coding
+                    if more_body:
+                        del headers['Content-Length']
+                if compressor is not None:
+                    body = await self._compress(compressor, body, more_body)
+                    if not more_body:
+                        headers['Content-Length'] = str(len(body))
+                await send(start)
+                start = None
+            elif compressor is not None:
+                body = await self._compress(compressor, body, more_body)
+            await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(status: int, headers: MutableHeaders) -> bool:
+        if status in (204, 206, 304) or 'content-encoding' in headers:
+            return False
+        media_type = headers.get('content-type', '').partition(';')[0].strip().lower()
+        if media_type == 'text/event-stream':  # events must reach the client as they are sent
+            return False
+        return media_type.startswith('text/') or media_type in COMPRESSIBLE_TYPES or media_type.endswith('+json')
+
+    @staticmethod
+    async def _compress(compressor: _Compressor, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(compressor.compress, body, more_body)
+        return compressor.compress(body, more_body)
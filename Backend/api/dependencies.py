@@ -1,13 +1,15 @@
 import os
 from functools import lru_cache
-from fastapi import Depends, HTTPException, status, Query
+from fastapi import Depends, HTTPException, status, Query, Request
 from fastapi.security import APIKeyHeader
 from dotenv import load_dotenv
 from typing import Optional
 from pydantic import BaseModel
 
-from woo_client import WooClient
+from woo_client import WooClient, ProductSearchIndex, SkuIndex, TaxonomyIndex, RequestMetrics, ValidationCache
+from woo_client.metrics import LatencyMetrics
 from api.models import Settings
+from api.webhooks import WebhookDispatcher, order_product_ids, split_product_events
 
 # Load environment variables
 load_dotenv()
@@ -24,9 +26,111 @@ def get_settings() -> Settings:
         wp_username=os.getenv("WP_USERNAME"),
         wp_secret=os.getenv("WP_SECRET"),
         api_key=os.getenv("API_KEY"),
-        verify_ssl=os.getenv("VERIFY_SSL", "true").lower() == "true"
+        verify_ssl=os.getenv("VERIFY_SSL", "true").lower() == "true",
+        webhook_secret=os.getenv("WC_WEBHOOK_SECRET"),
+        max_retries=int(os.getenv("WC_MAX_RETRIES", "0")),
+        tracing_exporter=os.getenv("TRACING_EXPORTER") or None,
+        compress_requests=os.getenv("WC_COMPRESS_REQUESTS", "false").lower() == "true"
     )
 
+@lru_cache()
+def get_upstream_metrics() -> RequestMetrics:
+    """Get the process-wide latency histograms of WooCommerce requests"""
+    return RequestMetrics()
+
+@lru_cache()
+def get_inbound_metrics() -> LatencyMetrics:
+    """Get the process-wide latency histograms of requests served by this API"""
+    return LatencyMetrics(('method', 'route', 'status'))
+
+@lru_cache()
+def get_validation_cache() -> Optional[ValidationCache]:
+    """Get the process-wide ETag/Last-Modified cache of WooCommerce responses (None when disabled)"""
+    max_entries = int(os.getenv("WC_VALIDATION_CACHE_ENTRIES", "1000"))
+    if max_entries <= 0:
+        return None
+    return ValidationCache(
+        max_entries=max_entries,
+        max_bytes=int(os.getenv("WC_VALIDATION_CACHE_MB", "64")) * 1024 * 1024
+    )
+
+@lru_cache()
+def get_search_index() -> ProductSearchIndex:
+    """Get the process-wide local product search index"""
+    return ProductSearchIndex(path=os.getenv("SEARCH_INDEX_PATH", os.path.join("data", "search_index.db")))
+
+def create_sku_index() -> SkuIndex:
+    """Open the SKU → ID index configured for this host"""
+    return SkuIndex(path=os.getenv("SKU_INDEX_PATH", os.path.join("data", "sku_index.db")))
+
+def create_taxonomy_index() -> TaxonomyIndex:
+    """Open the category/attribute index configured for this host
+
+    The index snapshot is stored in SQLite, so API workers on the same host
+    load it once and share it.
+    """
+    return TaxonomyIndex(
+        max_age_seconds=float(os.getenv("TAXONOMY_INDEX_MAX_AGE_SECONDS", "3600")),
+        path=os.getenv("TAXONOMY_INDEX_PATH", os.path.join("data", "taxonomy_index.db"))
+    )
+
+@lru_cache()
+def get_sku_index() -> SkuIndex:
+    """Get the process-wide SKU → ID index"""
+    return create_sku_index()
+
+@lru_cache()
+def get_taxonomy_index() -> TaxonomyIndex:
+    """Get the process-wide category/attribute index used to plan imports"""
+    return create_taxonomy_index()
+
+@lru_cache()
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """Get the process-wide dispatcher that applies webhook events to local indexes"""
+    dispatcher = WebhookDispatcher(
+        debounce_seconds=float(os.getenv("WEBHOOK_DEBOUNCE_SECONDS", "2")),
+        max_delay_seconds=float(os.getenv("WEBHOOK_MAX_DELAY_SECONDS", "10")),
+    )
+    
+    search_index = get_search_index()
+    sku_index = get_sku_index()
+    taxonomy_index = get_taxonomy_index()
+    
+    def apply_to_search_index(events):
+        upserts, deleted = split_product_events(events)
+        search_index.delete_products(deleted)
+        search_index.upsert_products(upserts)
+    
+    def apply_to_sku_index(events):
+        upserts, deleted = split_product_events(events)
+        sku_index.delete_ids(deleted)
+        sku_index.upsert(upserts)
+    
+    def refresh_ordered_products(events):
+        # Orders change the stock of their products; SKUs and IDs stay the same
+        product_ids = order_product_ids(events)
+        if product_ids:
+            search_index.reindex(create_woo_client(get_settings()), product_ids)
+    
+    dispatcher.subscribe("product", apply_to_search_index)
+    dispatcher.subscribe("product", apply_to_sku_index)
+    dispatcher.subscribe("order", refresh_ordered_products)
+    for resource in ("category", "attribute", "term"):
+        dispatcher.subscribe(resource, taxonomy_index.apply_events)
+    return dispatcher
+
+def invalidate_taxonomy_on_write(section: str):
+    """Router dependency invalidating a taxonomy index section after successful writes
+
+    Args:
+        section: 'categories' or 'attributes'
+    """
+    def dependency(request: Request):
+        yield
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            get_taxonomy_index().invalidate(section)
+    return dependency
+
 def verify_api_key(
     api_key_header: Optional[str] = Depends(API_KEY_HEADER),
     settings: Settings = Depends(get_settings)
@@ -46,6 +150,21 @@ def verify_api_key(
         headers={"WWW-Authenticate": "APIKey"},
     )
 
+def create_woo_client(settings: Settings, verify_ssl: Optional[bool] = None) -> WooClient:
+    """Create a WooClient from the settings (outside of a request, e.g. for warmup)"""
+    return WooClient(
+        api_key=settings.wc_key,
+        api_secret=settings.wc_secret,
+        store_url=settings.wc_url,
+        wp_username=settings.wp_username,
+        wp_password=settings.wp_secret,
+        verify_ssl=settings.verify_ssl if verify_ssl is None else verify_ssl,
+        max_retries=settings.max_retries,
+        request_hooks=[get_upstream_metrics()],
+        compress_requests=settings.compress_requests,
+        validation_cache=get_validation_cache()
+    )
+
 def get_woo_client(
     auth_valid: bool = Depends(verify_api_key),
     settings: Settings = Depends(get_settings),
@@ -61,16 +180,11 @@ def get_woo_client(
     try:
         # Use the verify_ssl from query param if provided, otherwise use from settings
         ssl_verify = verify_ssl if verify_ssl is not None else settings.verify_ssl
+        client = create_woo_client(settings, verify_ssl=ssl_verify)
         
-        # Create and return the WooClient
-        return WooClient(
-            api_key=settings.wc_key,
-            api_secret=settings.wc_secret,
-            store_url=settings.wc_url,
-            wp_username=settings.wp_username,
-            wp_password=settings.wp_secret,
-            verify_ssl=ssl_verify
-        )
+        # Share the process-wide SKU index between requests
+        client.products.sku_index = get_sku_index()
+        return client
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -0,0 +1,87 @@
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def make_etag(body: bytes) -> str:
+    """Weak entity tag of a response body
+
+    Weak, because the same tag is sent whatever Content-Encoding the
+    compression middleware applies to the body.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    """Entity tag without its weak indicator"""
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an entity tag against an If-None-Match header"""
+    if if_none_match.strip() == '*':
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == opaque for tag in if_none_match.split(','))
+
+
+class ETagMiddleware:
+    """Send ETags with GET responses and answer 304 Not Modified to unchanged ones
+
+    The tag is a hash of the body, so it costs one pass over a response
+    already rendered; a browser revalidating a page it has seen gets an
+    empty 304 instead of the JSON again. Streaming responses (sent in
+    several chunks) and responses that set their own ETag are passed
+    through. Add it before CompressionMiddleware so that the tag is computed
+    on the uncompressed body.
+    """
+
+    def __init__(self, app: ASGIApp, cache_control: str = 'private, no-cache'):
+        """Wrap an ASGI app
+
+        Args:
+            app: Application to wrap
+            cache_control: Cache-Control of tagged responses that have none
+                (the default lets browsers keep them but revalidate each time)
+        """
+        self.app = app
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get('if-none-match')
+        start: Optional[Message] = None
+
+        async def send_tagged(message: Message) -> None:
+            nonlocal start
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start['headers'])
+            body = message.get('body', b'')
+            if (message['type'] == 'http.response.body' and not message.get('more_body', False)
+                    and start['status'] == 200 and 'etag' not in headers):
+                etag = make_etag(body)
+                headers['ETag'] = etag
+                if 'cache-control' not in headers:
+                    headers['Cache-Control'] = self.cache_control
+                if if_none_match and etag_matches(if_none_match, etag):
+                    for name in ('content-length', 'content-type'):
+                        if name in headers:
+                            del headers[name]
+                    start['status'] = 304
+                    message = {'type': 'http.response.body', 'body': b'', 'more_body': False}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_tagged)
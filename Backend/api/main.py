@@ -1,16 +1,25 @@
 import os
-from fastapi import FastAPI, Depends, HTTPException, status
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional
 import logging
 from pydantic import BaseModel
 
 # Import API routers
-from api.routers import products, categories, attributes, media, store
-from api.dependencies import get_woo_client, get_settings
+from api.routers import products, categories, attributes, media, store, webhooks
+from api.dependencies import (
+    get_woo_client, get_settings, get_upstream_metrics, get_inbound_metrics, invalidate_taxonomy_on_write
+)
+from api.warmup import get_index_warmup
+from api.compression import CompressionMiddleware
+from api.etags import ETagMiddleware
 from api.models import ErrorResponse, Settings
+from woo_client.metrics import render_prometheus
+from woo_client.tracing import configure_tracing, extract_context, start_span
 
 # Load environment variables
 load_dotenv()
@@ -23,11 +32,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger("api")
 
+# Optional tracing: console/memory exporters, or "otel" for the process's TracerProvider
+tracing_exporter = get_settings().tracing_exporter
+if tracing_exporter:
+    configure_tracing(None if tracing_exporter == "otel" else tracing_exporter)
+    logger.info(f"Tracing enabled ({tracing_exporter})")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the category, attribute and SKU indexes in the background and keep them fresh
+
+    The server accepts requests right away; /api/health/ready reports 503
+    until the warmup has finished.
+    """
+    warmup = get_index_warmup()
+    warmup.start()
+    yield
+    warmup.stop()
+
 # Create FastAPI app
 app = FastAPI(
     title="Woo-Flow API",
     description="API for managing WooCommerce products and store data (Woo-Flow)",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -42,18 +70,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETags on GET responses, so that unchanged pages are revalidated with a 304
+# (added first: it must see the body before compression)
+if os.getenv("API_ETAGS", "true").lower() == "true":
+    app.add_middleware(ETagMiddleware)
+
+# Compress JSON responses (brotli when installed, gzip otherwise) above a size threshold
+if os.getenv("API_COMPRESSION", "true").lower() == "true":
+    app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024")))
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route, e.g. /api/products/{product_id}
+
+    Routes of included routers may only know the path below their prefix, so
+    the prefix is taken from the leading segments of the request path.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = getattr(route, "path_format", route.path)
+    segments = request.url.path.split("/")
+    depth = template.count("/")
+    return "/".join(segments[:len(segments) - depth]) + template if depth else request.url.path
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record the latency of every request by route template (not by raw path)
+
+    When tracing is on, the request is also a server span, continuing the
+    trace of an incoming `traceparent` header.
+    """
+    started = time.perf_counter()
+    status_code = 500
+    with start_span(f"{request.method} {request.url.path}", {"http.request.method": request.method},
+                    kind="server", context=extract_context(request.headers)) as span:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = route_template(request)
+            span.update_name(f"{request.method} {route}")
+            span.set_attributes({"http.route": route, "http.response.status_code": status_code})
+            get_inbound_metrics().observe((request.method, route, str(status_code)), time.perf_counter() - started)
+
 # Include routers
 app.include_router(store.router, prefix="/api/store", tags=["Store"])
 app.include_router(products.router, prefix="/api/products", tags=["Products"])
-app.include_router(categories.router, prefix="/api/categories", tags=["Categories"])
-app.include_router(attributes.router, prefix="/api/attributes", tags=["Attributes"])
+app.include_router(categories.router, prefix="/api/categories", tags=["Categories"],
+                   dependencies=[Depends(invalidate_taxonomy_on_write("categories"))])
+app.include_router(attributes.router, prefix="/api/attributes", tags=["Attributes"],
+                   dependencies=[Depends(invalidate_taxonomy_on_write("attributes"))])
 app.include_router(media.router, prefix="/api/media", tags=["Media"])
+app.include_router(webhooks.router, prefix="/api/webhooks", tags=["Webhooks"])
 
 @app.get("/api/health", tags=["Health"])
 async def health_check():
     """Check if the API is running"""
     return {"status": "ok", "version": app.version}
 
+@app.get("/api/health/ready", tags=["Health"])
+async def readiness_check():
+    """Check if the startup warmup of the local indexes has finished
+
+    Returns 503 while the category tree, the attribute/term registry or the
+    SKU index is still loading (or failed to load), with the state of each.
+    """
+    warmup = get_index_warmup().status()
+    return JSONResponse(warmup, status_code=status.HTTP_200_OK if warmup["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+@app.get("/api/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def get_metrics():
+    """Request latency histograms in the Prometheus text format
+
+    `wooflow_upstream_request_*` covers requests to WooCommerce by endpoint
+    template (IDs replaced by `{id}`), with sent/received bytes and retries;
+    `wooflow_http_request_*` covers requests served by this API by route.
+    """
+    body = render_prometheus([
+        (get_upstream_metrics(), "wooflow_upstream_request", "Latency of requests to the WooCommerce and WordPress APIs"),
+        (get_inbound_metrics(), "wooflow_http_request", "Latency of requests served by the Woo-Flow API"),
+    ])
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/api/settings", response_model=Settings)
 async def get_api_settings(settings: Settings = Depends(get_settings)):
     """Get current API settings"""
@@ -63,6 +162,8 @@ async def get_api_settings(settings: Settings = Depends(get_settings)):
         masked_settings.wc_secret = "********"
     if masked_settings.wp_secret:
         masked_settings.wp_secret = "********"
+    if masked_settings.webhook_secret:
+        masked_settings.webhook_secret = "********"
     return masked_settings
 
 class SSLSettings(BaseModel):
@@ -83,6 +184,8 @@ async def update_ssl_settings(
         updated_settings.wc_secret = "********"
     if updated_settings.wp_secret:
         updated_settings.wp_secret = "********"
+    if updated_settings.webhook_secret:
+        updated_settings.webhook_secret = "********"
     
     return updated_settings
 
@@ -12,6 +12,10 @@ class Settings(BaseModel):
     wp_secret: Optional[str] = None
     api_key: Optional[str] = None
     verify_ssl: bool = False
+    webhook_secret: Optional[str] = None
+    max_retries: int = 0
+    tracing_exporter: Optional[str] = None
+    compress_requests: bool = False
 
 # Error response model
 class ErrorResponse(BaseModel):
@@ -132,6 +136,26 @@ class ProductResponse(BaseModel):
         extra='allow',  # Allow additional fields
     )
 
+class SkuResolveRequest(BaseModel):
+    skus: List[str]
+
+class SkuResolveResponse(BaseModel):
+    resolved: Dict[str, Dict[str, Any]]
+    missing: List[str]
+
+class InventoryRecord(BaseModel):
+    id: Optional[int] = None
+    sku: Optional[str] = None
+    parent_id: Optional[int] = None
+    regular_price: Optional[str] = None
+    sale_price: Optional[str] = None
+    stock_quantity: Optional[int] = None
+    stock_status: Optional[StockStatus] = None
+
+class InventoryUpdateRequest(BaseModel):
+    records: List[InventoryRecord]
+    dry_run: bool = False
+
 # Category related schemas
 class CategoryCreate(BaseModel):
     name: str
@@ -217,3 +241,13 @@ class VariationResponse(BaseModel):
     model_config = ConfigDict(
         extra='allow',  # Allow additional fields
     )
+
+# Webhook related schemas
+class WebhookEvent(BaseModel):
+    topic: str
+    resource: str
+    event: str
+    resource_id: Optional[int] = None
+    webhook_id: Optional[int] = None
+    payload: Dict[str, Any] = {}
+    received_at: datetime
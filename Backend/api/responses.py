@@ -0,0 +1,44 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from woo_client.json_codec import JsonCodec, default_codec
+
+# Upstream headers forwarded with passthrough responses
+PASSTHROUGH_HEADERS = ('X-WP-Total', 'X-WP-TotalPages')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the fast codec (orjson when installed)
+
+    Return it directly from an endpoint to skip response_model validation and
+    jsonable_encoder for payloads that are already JSON-compatible, such as
+    WooCommerce API data.
+    """
+
+    codec: JsonCodec = default_codec()
+
+    def render(self, content: Any) -> bytes:
+        return self.codec.dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Response for JSON bytes that are passed through without decoding"""
+
+    media_type = "application/json"
+
+
+def passthrough(upstream_response) -> RawJSONResponse:
+    """Return an upstream WooCommerce response body as-is
+
+    The body is not decoded or validated; the pagination headers are kept.
+
+    Args:
+        upstream_response: requests.Response returned by a ``*_raw`` client method
+    """
+    headers = {
+        name: upstream_response.headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in upstream_response.headers
+    }
+    return RawJSONResponse(content=upstream_response.content, headers=headers)
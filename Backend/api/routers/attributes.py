@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
 from typing import List, Dict, Any, Optional
 
-from woo_client import WooClient
-from api.dependencies import get_woo_client
+from woo_client import WooClient, TaxonomyIndex
+from api.dependencies import get_woo_client, get_taxonomy_index
 
 router = APIRouter()
 
 @router.get("", response_model=List[Dict[str, Any]])
 async def get_attributes(
-    woo_client: WooClient = Depends(get_woo_client)
+    cached: bool = Query(True, description="Serve from the local attribute index when it is loaded"),
+    woo_client: WooClient = Depends(get_woo_client),
+    taxonomy_index: TaxonomyIndex = Depends(get_taxonomy_index)
 ):
-    """Get a list of product attributes"""
+    """Get a list of product attributes
+
+    Served from the local attribute index (warmed up at startup and kept
+    fresh in the background) unless `cached=false` is given.
+    """
+    if cached and taxonomy_index.is_loaded("attributes"):
+        return taxonomy_index.list_attributes()
     try:
         attributes = woo_client.attributes.get_attributes()
         return attributes
@@ -85,9 +93,19 @@ async def delete_attribute(
 @router.get("/{attribute_id}/terms", response_model=List[Dict[str, Any]])
 async def get_attribute_terms(
     attribute_id: int = Path(..., ge=1),
-    woo_client: WooClient = Depends(get_woo_client)
+    cached: bool = Query(True, description="Serve from the local attribute index when it is loaded"),
+    woo_client: WooClient = Depends(get_woo_client),
+    taxonomy_index: TaxonomyIndex = Depends(get_taxonomy_index)
 ):
-    """Get terms for a specific attribute"""
+    """Get terms for a specific attribute
+
+    Served from the local attribute index, with every term of the
+    attribute, unless `cached=false` is given.
+    """
+    if cached and taxonomy_index.is_loaded("attributes"):
+        terms = taxonomy_index.list_terms(attribute_id)
+        if terms is not None:
+            return terms
     try:
         terms = woo_client.attributes.get_attribute_terms(attribute_id)
         return terms
@@ -3,16 +3,22 @@ from typing import List, Dict, Any, Optional
 import logging
 
 from woo_client import WooClient
-from api.dependencies import get_woo_client
+from woo_client import TaxonomyIndex
+from api.dependencies import get_woo_client, get_taxonomy_index
+from api.responses import passthrough
 from api.models import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryTreeRequest
 
 router = APIRouter()
 
 @router.get("/count", summary="Get total category count", response_model=dict)
 async def get_category_count(
-    woo_client: WooClient = Depends(get_woo_client)
+    cached: bool = Query(True, description="Serve from the local category index when it is loaded"),
+    woo_client: WooClient = Depends(get_woo_client),
+    taxonomy_index: TaxonomyIndex = Depends(get_taxonomy_index)
 ):
     """Get the total number of categories"""
+    if cached and taxonomy_index.is_loaded("categories"):
+        return {"count": len(taxonomy_index.list_categories())}
     try:
         categories = woo_client.categories.get_categories(per_page=100)
         total = 0
@@ -40,14 +46,25 @@ async def get_categories(
     per_page: int = Query(100, ge=1, le=100),
     page: int = Query(1, ge=1),
     parent: Optional[int] = None,
-    woo_client: WooClient = Depends(get_woo_client)
+    raw: bool = Query(False, description="Return the WooCommerce payload as-is"),
+    cached: bool = Query(True, description="Serve from the local category index when it is loaded"),
+    woo_client: WooClient = Depends(get_woo_client),
+    taxonomy_index: TaxonomyIndex = Depends(get_taxonomy_index)
 ):
-    """Get a list of product categories"""
+    """Get a list of product categories
+
+    Served from the local category index (warmed up at startup and kept
+    fresh in the background) unless `raw` or `cached=false` is given.
+    """
+    if cached and not raw and taxonomy_index.is_loaded("categories"):
+        return taxonomy_index.list_categories(parent=parent)[(page - 1) * per_page:page * per_page]
     # CategoryClient.get_categories only supports per_page and parent
     params = {"per_page": per_page}
     if parent is not None:
         params["parent"] = parent
     try:
+        if raw:
+            return passthrough(woo_client.categories.get_categories_raw(page=page, **params))
         categories = woo_client.categories.get_categories(**params)
         return categories
     except Exception as e:
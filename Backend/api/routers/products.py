@@ -1,24 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Path, File, UploadFile, Response
 from typing import List, Dict, Any, Optional
 import shutil
+import tempfile
+import csv
+import io
 import os
 import logging
 
-from woo_client import WooClient
-from api.dependencies import get_woo_client
+from woo_client import WooClient, ProductSearchIndex, SkuIndex, TaxonomyIndex
+from api.dependencies import get_woo_client, get_search_index, get_sku_index, get_taxonomy_index, verify_api_key
+from api.responses import FastJSONResponse, passthrough
 from api.models import (
     ProductCreate, ProductUpdate, ProductResponse,
     VariationCreate, VariationUpdate, VariationResponse,
-    ErrorResponse, ProductStatus
+    ErrorResponse, ProductStatus, SkuResolveRequest, SkuResolveResponse,
+    InventoryUpdateRequest
 )
 from models import Product
-from models.csv_product_importer import CSVProductImporter
 
 router = APIRouter()
 
 # Get a logger instance
 logger = logging.getLogger(__name__)
 
+def csv_importer(woo_client: WooClient):
+    """Create a CSVProductImporter
+
+    Imported on first use: the importer needs pandas, which would otherwise
+    add its import time to every API start.
+    """
+    from models.csv_product_importer import CSVProductImporter
+    return CSVProductImporter(client=woo_client, logger=logger)
+
+def save_upload(file: UploadFile, temp_dir: str = "temp_uploads") -> str:
+    """Save an uploaded CSV file under a generated name in ``temp_dir``
+
+    The client's filename is never part of the path, so it cannot point
+    outside the directory. The caller deletes the file.
+    """
+    os.makedirs(temp_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=temp_dir, suffix=".csv")
+    with os.fdopen(fd, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+    return path
+
+def add_edit_links(products: List[Dict[str, Any]], template: str) -> None:
+    """Add permalink (if missing) and the wp-admin edit_link to products in place"""
+    prefix, suffix = template.split("{id}")
+    for p in products:
+        p.setdefault('permalink', None)
+        p['edit_link'] = f"{prefix}{p.get('id')}{suffix}"
+
 @router.get("/count", summary="Get total product count", response_model=dict)
 async def get_product_count(
     woo_client: WooClient = Depends(get_woo_client)
@@ -44,16 +76,176 @@ async def get_product_count(
             detail=f"Failed to get product count: {str(e)}"
         )
 
+@router.get("/search/autocomplete", summary="Autocomplete product names and SKUs", response_model=List[Dict[str, Any]])
+async def autocomplete_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    auth_valid: bool = Depends(verify_api_key),
+    search_index: ProductSearchIndex = Depends(get_search_index)
+):
+    """Suggest products whose name or SKU starts with the typed words (served from the local index)"""
+    return search_index.autocomplete(q, limit=limit)
+
+@router.get("/search/facets", summary="Get faceted product counts", response_model=Dict[str, Any])
+async def get_product_facets(
+    q: Optional[str] = None,
+    category: Optional[int] = None,
+    stock_status: Optional[str] = None,
+    auth_valid: bool = Depends(verify_api_key),
+    search_index: ProductSearchIndex = Depends(get_search_index)
+):
+    """Count products by category, stock status and price band (served from the local index)"""
+    return search_index.facets(q, category=category, stock_status=stock_status)
+
+@router.get("/search/status", summary="Get local search index status", response_model=Dict[str, Any])
+async def get_search_index_status(
+    auth_valid: bool = Depends(verify_api_key),
+    search_index: ProductSearchIndex = Depends(get_search_index)
+):
+    """Get the state of the local search index"""
+    return search_index.status()
+
+@router.post("/search/rebuild", summary="Rebuild the local search index", 
+             response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_search_index(
+    background_tasks: BackgroundTasks,
+    incremental: bool = Query(False, description="Only re-index products modified since the last sync"),
+    woo_client: WooClient = Depends(get_woo_client),
+    search_index: ProductSearchIndex = Depends(get_search_index)
+):
+    """Populate the local search index from the store in the background"""
+    if incremental:
+        background_tasks.add_task(search_index.refresh, woo_client.products)
+    else:
+        background_tasks.add_task(search_index.build, woo_client.products)
+    return {"status": "scheduled", "incremental": incremental}
+
+# Plain def: index misses are looked up with blocking requests, so FastAPI runs this in its thread pool
+@router.post("/resolve-skus", summary="Resolve SKUs to product and variation IDs", response_model=SkuResolveResponse)
+def resolve_skus(
+    request: SkuResolveRequest,
+    woo_client: WooClient = Depends(get_woo_client)
+):
+    """Resolve a list of SKUs to IDs and parent IDs using the SKU index"""
+    try:
+        results = woo_client.products.resolve_skus(request.skus)
+        return {
+            "resolved": {sku: entry for sku, entry in results.items() if entry},
+            "missing": [sku for sku, entry in results.items() if not entry]
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to resolve SKUs: {str(e)}"
+        )
+
+# Plain def: the batched requests block, so FastAPI runs these in its thread pool, not on the event loop
+@router.post("/bulk/inventory", summary="Bulk update prices and stock", response_model=Dict[str, Any])
+def bulk_update_inventory(
+    request: InventoryUpdateRequest,
+    batch_size: int = Query(100, ge=1, le=100),
+    max_workers: int = Query(4, ge=1, le=16),
+    woo_client: WooClient = Depends(get_woo_client)
+):
+    """
+    Update prices and stock for many products and variations at once.
+
+    Each record needs an `sku` or `id` and any of `regular_price`, `sale_price`,
+    `stock_quantity` and `stock_status`. Empty values leave a field unchanged and
+    a `sale_price` of `clear` ends the sale. Records that would not change anything
+    are skipped; the rest is sent through the WooCommerce batch endpoints.
+    """
+    try:
+        records = [record.dict(exclude_none=True) for record in request.records]
+        return woo_client.products.bulk_update_inventory(
+            records,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            dry_run=request.dry_run
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update inventory: {str(e)}"
+        )
+
+@router.post("/bulk/inventory/csv", summary="Bulk update prices and stock from a CSV file", response_model=Dict[str, Any])
+def bulk_update_inventory_csv(
+    file: UploadFile = File(..., description="CSV file with sku|id, regular_price, sale_price, stock_quantity, stock_status columns."),
+    dry_run: bool = Query(False),
+    batch_size: int = Query(100, ge=1, le=100),
+    max_workers: int = Query(4, ge=1, le=16),
+    woo_client: WooClient = Depends(get_woo_client)
+):
+    """Update prices and stock from an uploaded CSV file (see `/bulk/inventory`)"""
+    try:
+        content = file.file.read().decode("utf-8-sig")
+        records = list(csv.DictReader(io.StringIO(content)))
+        return woo_client.products.bulk_update_inventory(
+            records,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            dry_run=dry_run
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update inventory: {str(e)}"
+        )
+    finally:
+        file.file.close()
+
+@router.get("/sku-index/status", summary="Get SKU index status", response_model=Dict[str, Any])
+async def get_sku_index_status(
+    auth_valid: bool = Depends(verify_api_key),
+    sku_index: SkuIndex = Depends(get_sku_index)
+):
+    """Get the state of the SKU index"""
+    return sku_index.status()
+
+@router.post("/sku-index/rebuild", summary="Rebuild the SKU index",
+             response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_sku_index(
+    background_tasks: BackgroundTasks,
+    incremental: bool = Query(False, description="Only re-index products modified since the last sync"),
+    woo_client: WooClient = Depends(get_woo_client),
+    sku_index: SkuIndex = Depends(get_sku_index)
+):
+    """Populate the SKU index from the store in the background"""
+    if incremental:
+        background_tasks.add_task(sku_index.refresh, woo_client.products)
+    else:
+        background_tasks.add_task(sku_index.build, woo_client.products)
+    return {"status": "scheduled", "incremental": incremental}
+
 @router.get("", response_model=List[ProductResponse])
 async def get_products(
+    http_response: Response,
     per_page: int = Query(10, ge=1, le=100),
     page: int = Query(1, ge=1),
     search: Optional[str] = None,
     status: Optional[ProductStatus] = None,
     category: Optional[int] = None,
-    woo_client: WooClient = Depends(get_woo_client)
+    use_index: bool = Query(True, description="Serve search from the local index when it is ready"),
+    raw: bool = Query(False, description="Return the WooCommerce payload as-is (no validation, no edit_link)"),
+    validate: bool = Query(False, description="Validate every product against the response model"),
+    woo_client: WooClient = Depends(get_woo_client),
+    search_index: ProductSearchIndex = Depends(get_search_index)
 ):
-    """Get a list of products with filters"""
+    """Get a list of products with filters
+
+    WooCommerce data is trusted by default: products are returned without
+    re-validating them against `ProductResponse`, with `edit_link` added in a
+    single pass. Use `validate=true` to run the full response model validation.
+
+    With `raw=true` the upstream JSON body is streamed back without being
+    decoded, validated or re-encoded, together with the `X-WP-Total` and
+    `X-WP-TotalPages` headers. Clients can build edit links from the
+    `X-Edit-Link-Template` header by replacing `{id}`.
+
+    Searches served from the local index set `X-WP-Total` and
+    `X-WP-TotalPages` from the number of matches, raw or not.
+    """
     params = {"per_page": per_page, "page": page}
     
     if search:
@@ -64,15 +256,48 @@ async def get_products(
         params["category"] = category
         
     try:
+        totals = {}
+        if search and use_index and search_index.is_ready():
+            # Rank locally, then fetch the page of hits by ID instead of running
+            # WooCommerce's LIKE-based search
+            result = search_index.search(
+                search,
+                limit=per_page,
+                offset=(page - 1) * per_page,
+                status=status.value if status else None,
+                category=category
+            )
+            # The page is fetched by ID, so the upstream totals would only count this page
+            totals = {
+                "X-WP-Total": str(result["total"]),
+                "X-WP-TotalPages": str(-(-result["total"] // per_page)),
+            }
+            ids = [hit["id"] for hit in result["hits"]]
+            if not ids:
+                return FastJSONResponse([], headers=totals)
+            params = {
+                "per_page": len(ids),
+                "include": ",".join(str(i) for i in ids),
+                "orderby": "include"
+            }
+
+        edit_link_template = f"{woo_client.store_url}/wp-admin/post.php?post={{id}}&action=edit"
+        if raw:
+            response = passthrough(woo_client.products.get_products_raw(**params))
+            response.headers["X-Edit-Link-Template"] = edit_link_template
+            response.headers.update(totals)
+            return response
+
         products = woo_client.products.get_products(**params)
-        store_url = woo_client.store_url
-        for p in products:
-            p['permalink'] = p.get('permalink')
-            p['edit_link'] = f"{store_url}/wp-admin/post.php?post={p.get('id')}&action=edit"
-        return products
+        add_edit_links(products, edit_link_template)
+        if validate:
+            http_response.headers.update(totals)
+            return products
+        # Returning a response directly skips response_model validation
+        return FastJSONResponse(products, headers=totals)
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=500,
             detail=f"Failed to get products: {str(e)}"
         )
 
@@ -155,10 +380,17 @@ async def get_variations(
     product_id: int = Path(..., ge=1),
     per_page: int = Query(10, ge=1, le=100),
     page: int = Query(1, ge=1),
+    raw: bool = Query(False, description="Return the WooCommerce payload as-is"),
     woo_client: WooClient = Depends(get_woo_client)
 ):
     """Get variations for a product"""
     try:
+        if raw:
+            return passthrough(woo_client.products.get_variations_raw(
+                parent_id=product_id,
+                per_page=per_page,
+                page=page
+            ))
         variations = woo_client.products.get_variations(
             parent_id=product_id,
             per_page=per_page,
@@ -250,6 +482,7 @@ async def delete_variation(
 @router.post("/upload/csv", summary="Upload and import products from a CSV file", response_model=Dict[str, Any])
 async def upload_and_import_csv(
     file: UploadFile = File(..., description="CSV file containing product data."),
+    dialect: Optional[str] = Query(None, description="Header dialect: canonical, labelled or legacy (detected when omitted)"),
     woo_client: WooClient = Depends(get_woo_client)
 ):
     """
@@ -261,7 +494,12 @@ async def upload_and_import_csv(
 
     ### CSV Format:
 
-    The CSV file must have a header row. The following are key columns:
+    The CSV file must have a header row. Three header dialects are accepted and
+    detected automatically: `canonical` (`attr_name_1`, `category_1`, `image_1`, see
+    docs/csv_import.md), `labelled` (described below) and `legacy` (`title`,
+    `reg_price`, `attr_1_name`, as in examples/products.csv).
+
+    The following are key columns of the `labelled` dialect:
 
     - **`type`**: `simple`, `variable`, or `variation`. This is crucial.
     - **`name`**: Product name. Required for `simple` and `variable` types.
@@ -295,32 +533,38 @@ async def upload_and_import_csv(
 
     ### Processing:
     1. The uploaded file is saved temporarily on the server.
-    2. The `CSVProductImporter` is used to parse the file and interact with the WooCommerce API.
-    3. After processing, the temporary file is deleted.
+    2. The whole file is validated first. If any row is invalid, nothing is
+       created and a 422 response with the validation report is returned.
+    3. The `CSVProductImporter` is used to parse the file and interact with the WooCommerce API.
+    4. After processing, the temporary file is deleted.
 
     ### Response:
     - Returns a JSON object with a summary of the import, including `created` and `failed` lists.
     - The `failed` list will contain details on which rows failed and why.
+    - The `report` object times the import: seconds per phase (parse, validate,
+      categorize, taxonomy, media, create, variations), requests and bytes per
+      endpoint, lookup cache hit rates and the slowest rows with their breakdown.
     """
-    # Create a temporary file to store the upload
-    temp_dir = "temp_uploads"
-    os.makedirs(temp_dir, exist_ok=True)
-    temp_file_path = os.path.join(temp_dir, file.filename)
+    temp_file_path = None
 
     try:
         # Save the uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_file_path = save_upload(file)
 
         logger.info(f"CSV file '{file.filename}' uploaded and saved to '{temp_file_path}'.")
 
         # Initialize the importer
-        importer = CSVProductImporter(client=woo_client, logger=logger)
+        importer = csv_importer(woo_client)
 
         # Start the import process
-        results = importer.import_from_file(temp_file_path)
+        results = importer.import_from_file(temp_file_path, dialect=dialect)
         
         # Check for errors in the results and return appropriate status
+        if "validation" in results:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=results["validation"]
+            )
         if "error" in results:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -342,9 +586,84 @@ async def upload_and_import_csv(
         )
     finally:
         # Ensure the temporary file is deleted
-        if os.path.exists(temp_file_path):
+        if temp_file_path and os.path.exists(temp_file_path):
             os.remove(temp_file_path)
             logger.info(f"Temporary file '{temp_file_path}' deleted.")
         
         # Close the uploaded file
         file.file.close()
+
+@router.post("/upload/csv/validate", summary="Validate a product CSV file without importing it", response_model=Dict[str, Any])
+async def validate_csv(
+    file: UploadFile = File(..., description="CSV file containing product data."),
+    dialect: Optional[str] = Query(None, description="Header dialect: canonical, labelled or legacy (detected when omitted)"),
+    woo_client: WooClient = Depends(get_woo_client)
+):
+    """
+    Validate a product CSV file without sending anything to WooCommerce.
+
+    Returns the validation report: the detected dialect, file-level errors,
+    per-row errors (`row`, `column`, `error`; the header is row 1) and the
+    columns that were not recognized.
+    """
+    temp_file_path = None
+
+    try:
+        temp_file_path = save_upload(file)
+
+        importer = csv_importer(woo_client)
+        return importer.validate_file(temp_file_path, dialect=dialect)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to validate CSV file: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to validate CSV file: {str(e)}"
+        )
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        file.file.close()
+
+# Plain def: loading the taxonomy index blocks on WooCommerce requests, so FastAPI runs this in its thread pool
+@router.post("/upload/csv/plan", summary="Plan a product CSV import without writing anything", response_model=Dict[str, Any])
+def plan_csv_import(
+    file: UploadFile = File(..., description="CSV file containing product data."),
+    dialect: Optional[str] = Query(None, description="Header dialect: canonical, labelled or legacy (detected when omitted)"),
+    woo_client: WooClient = Depends(get_woo_client),
+    taxonomy_index: TaxonomyIndex = Depends(get_taxonomy_index)
+):
+    """
+    Dry-run a CSV import.
+
+    The file is validated and its categories and global attributes are
+    resolved against a cached index of the store's taxonomy; nothing is
+    created. The plan lists how many products, variations, new categories,
+    new attribute terms and image uploads the import would create, how many
+    HTTP requests it would make, and its estimated duration based on the
+    latency measured while loading the index.
+    """
+    temp_file_path = None
+
+    try:
+        temp_file_path = save_upload(file)
+
+        importer = csv_importer(woo_client)
+        return importer.plan(temp_file_path, dialect=dialect, taxonomy=taxonomy_index)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to plan CSV import: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to plan CSV import: {str(e)}"
+        )
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        file.file.close()
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Dict, Any
+from datetime import datetime
+import json
+import logging
+
+from api.dependencies import get_settings, get_webhook_dispatcher, verify_api_key
+from api.models import Settings, WebhookEvent
+from api.webhooks import WebhookDispatcher, verify_signature, parse_topic
+
+router = APIRouter()
+
+# Get a logger instance
+logger = logging.getLogger(__name__)
+
+@router.post("/woocommerce", status_code=status.HTTP_202_ACCEPTED, response_model=Dict[str, Any])
+async def receive_woocommerce_webhook(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    dispatcher: WebhookDispatcher = Depends(get_webhook_dispatcher)
+):
+    """
+    Receive a WooCommerce webhook delivery.
+
+    Supports the `product.*` and `order.*` topics and `action.*` topics for
+    taxonomy hooks (`created_product_cat`, `edited_product_cat`,
+    `delete_product_cat`, `woocommerce_attribute_*` and `*_pa_*` terms).
+    Order events re-index the ordered products, whose stock has changed.
+    Signed deliveries for other resources (e.g. `coupon.*`) are acknowledged
+    as ignored, since no local index uses them.
+
+    The body is authenticated with the HMAC-SHA256 signature WooCommerce sends
+    in `X-WC-Webhook-Signature`, using the `WC_WEBHOOK_SECRET` setting. Valid
+    events are queued and applied to the local indexes in the background, so
+    the response is returned immediately.
+    """
+    if not settings.webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook secret not configured"
+        )
+
+    body = await request.body()
+    topic = request.headers.get("X-WC-Webhook-Topic")
+
+    # WooCommerce pings a new webhook with an unsigned "webhook_id=<id>" form body
+    if not topic and body.startswith(b"webhook_id="):
+        return {"status": "ok", "ping": True}
+
+    if not verify_signature(body, request.headers.get("X-WC-Webhook-Signature"), settings.webhook_secret):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature"
+        )
+
+    if not topic:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing X-WC-Webhook-Topic header"
+        )
+
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid webhook payload: {str(e)}"
+        )
+    if not isinstance(payload, dict):
+        payload = {"arg": payload}
+
+    resource, event_name, resource_id = parse_topic(topic, payload)
+    webhook_id = request.headers.get("X-WC-Webhook-ID")
+
+    event = WebhookEvent(
+        topic=topic,
+        resource=resource,
+        event=event_name,
+        resource_id=resource_id,
+        webhook_id=int(webhook_id) if webhook_id and webhook_id.isdigit() else None,
+        payload=payload,
+        received_at=datetime.utcnow()
+    )
+    if not dispatcher.submit(event):
+        logger.debug(f"Ignored webhook {topic}: nothing subscribes to {resource}")
+        return {"status": "ignored", "topic": topic, "resource": resource, "id": resource_id}
+    logger.debug(f"Queued webhook {topic} for {resource} {resource_id}")
+
+    return {"status": "queued", "topic": topic, "resource": resource, "id": resource_id}
+
+@router.get("/woocommerce/stats", response_model=Dict[str, Any])
+async def get_webhook_stats(
+    auth_valid: bool = Depends(verify_api_key),
+    dispatcher: WebhookDispatcher = Depends(get_webhook_dispatcher)
+):
+    """Get counters for received, coalesced, applied and ignored webhook events"""
+    return dispatcher.stats()
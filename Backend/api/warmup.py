@@ -0,0 +1,209 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional
+
+from api.dependencies import (
+    create_sku_index, create_taxonomy_index, create_woo_client, get_settings, get_sku_index, get_taxonomy_index
+)
+from api.models import Settings
+from woo_client import WooClient, SkuIndex, TaxonomyIndex
+
+logger = logging.getLogger(__name__)
+
+# Indexes loaded at startup, in parallel
+WARMUP_TASKS = ('categories', 'attributes', 'sku')
+
+
+def warm_shared_indexes(settings: Optional[Settings] = None) -> Dict[str, Any]:
+    """Fill the host-wide index databases before the API workers start
+
+    Loads the category/attribute snapshot and builds the SKU index if it has
+    never been built, so that workers start from warm shared indexes instead
+    of each fetching them on its first request. Runs with its own index
+    handles, which are closed afterwards: SQLite connections must not be
+    inherited by forked workers.
+
+    Args:
+        settings: API settings (read from the environment when omitted)
+
+    Returns:
+        Seconds spent per index, or the error that prevented warming it
+    """
+    settings = settings or get_settings()
+    if not all([settings.wc_key, settings.wc_secret, settings.wc_url]):
+        return {'skipped': 'WooCommerce API credentials not configured'}
+
+    client = create_woo_client(settings)
+    # Forked workers would inherit the warmup requests in their metrics
+    client.request_hooks.clear()
+    results = {}
+    for name, open_index, warm in (
+        ('taxonomy', create_taxonomy_index, lambda index: index.ensure_fresh(client)),
+        ('sku', create_sku_index, lambda index: index.ensure_built(client)),
+    ):
+        index = open_index()
+        started = time.perf_counter()
+        try:
+            warm(index)
+            results[name] = {'seconds': round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            # The workers load the index on first use instead
+            logger.warning(f"Could not warm the {name} index: {str(e)}")
+            results[name] = {'error': str(e)}
+        finally:
+            index.close()
+    return results
+
+
+class IndexWarmup:
+    """Startup warmup and background refresh of the indexes served by this process
+
+    start() loads the category tree, the attribute/term registry and the SKU
+    index in parallel on a background thread, then keeps refreshing them
+    ahead of expiry (and after webhook invalidations) so that requests never
+    wait for a cold load. status() backs the readiness endpoint.
+    """
+
+    def __init__(self, client_factory: Optional[Callable[[], WooClient]], taxonomy_index: TaxonomyIndex,
+                 sku_index: SkuIndex, poll_seconds: float = 30.0, sku_refresh_seconds: float = 300.0,
+                 enabled: bool = True):
+        """Create the warmup (nothing runs until start())
+
+        Args:
+            client_factory: Creates the WooClient used for the fetches (None
+                when WooCommerce is not configured: warmup is skipped)
+            taxonomy_index: Category/attribute index to load
+            sku_index: SKU index to build
+            poll_seconds: Interval of the background refresh checks
+            sku_refresh_seconds: Age after which the SKU index is refreshed
+            enabled: False to skip warmup and background refreshes
+        """
+        self.client_factory = client_factory
+        self.taxonomy_index = taxonomy_index
+        self.sku_index = sku_index
+        self.poll_seconds = poll_seconds
+        self.sku_refresh_seconds = sku_refresh_seconds
+        self.enabled = enabled and client_factory is not None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._tasks: Dict[str, Dict[str, Any]] = {
+            name: {'state': 'pending', 'seconds': None, 'error': None, 'refreshed_at': None}
+            for name in WARMUP_TASKS
+        }
+
+    def start(self) -> None:
+        """Start the warmup and the background refreshes"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='index-warmup', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background refreshes (a fetch in progress is not interrupted)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def warm_up(self) -> bool:
+        """Load every index in parallel
+
+        Returns:
+            True if every index loaded
+        """
+        client = self.client_factory()
+        self._started_at = time.time()
+        with ThreadPoolExecutor(max_workers=len(WARMUP_TASKS), thread_name_prefix='index-warmup') as executor:
+            results = list(executor.map(lambda name: self._run_task(name, client), WARMUP_TASKS))
+        self._finished_at = time.time()
+        return all(results)
+
+    def refresh(self) -> None:
+        """Reload what has expired, been invalidated or failed to load
+
+        The taxonomy sections are reloaded once they are past 3/4 of their
+        maximum age, before requests would find them expired.
+        """
+        client = self.client_factory()
+        for name in WARMUP_TASKS:
+            self._run_task(name, client)
+
+    def _run(self) -> None:
+        self.warm_up()
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Index refresh failed: {str(e)}", exc_info=True)
+
+    def _run_task(self, name: str, client: WooClient) -> bool:
+        """Load or refresh one index, recording its state"""
+        task = self._tasks[name]
+        warming = task['state'] != 'ready'
+        if warming:
+            with self._lock:
+                task['state'] = 'running'
+        started = time.perf_counter()
+        try:
+            if name == 'sku':
+                self.sku_index.ensure_fresh(client, max_age_seconds=self.sku_refresh_seconds)
+            else:
+                refresh_after = self.taxonomy_index.max_age_seconds * 0.75
+                self.taxonomy_index.ensure_fresh(client, sections=(name,), max_age_seconds=refresh_after)
+        except Exception as e:
+            logger.warning(f"Could not load the {name} index: {str(e)}")
+            with self._lock:
+                task['error'] = str(e)
+                if warming:
+                    task['state'] = 'failed'
+            return False
+
+        with self._lock:
+            if warming:
+                task['seconds'] = round(time.perf_counter() - started, 3)
+            task['state'] = 'ready'
+            task['error'] = None
+            task['refreshed_at'] = time.time()
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Warmup state, for the readiness endpoint
+
+        Returns:
+            ready (every index loaded, or warmup disabled), started_at and
+            finished_at of the warmup, and the state ('pending', 'running',
+            'ready' or 'failed'), load time, last error and last refresh of
+            each index
+        """
+        with self._lock:
+            tasks = {name: dict(task) for name, task in self._tasks.items()}
+        return {
+            'ready': not self.enabled or all(task['state'] == 'ready' for task in tasks.values()),
+            'enabled': self.enabled,
+            'started_at': self._started_at,
+            'finished_at': self._finished_at,
+            'indexes': tasks,
+        }
+
+
+@lru_cache()
+def get_index_warmup() -> IndexWarmup:
+    """Get the process-wide index warmup, started by the API lifespan"""
+    settings = get_settings()
+    configured = all([settings.wc_key, settings.wc_secret, settings.wc_url])
+    return IndexWarmup(
+        client_factory=(lambda: create_woo_client(settings)) if configured else None,
+        taxonomy_index=get_taxonomy_index(),
+        sku_index=get_sku_index(),
+        poll_seconds=float(os.getenv("INDEX_REFRESH_SECONDS", "30")),
+        sku_refresh_seconds=float(os.getenv("SKU_INDEX_REFRESH_SECONDS", "300")),
+        enabled=os.getenv("API_WARMUP", "true").lower() == "true",
+    )
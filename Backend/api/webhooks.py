@@ -0,0 +1,292 @@
+import base64
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.models import WebhookEvent
+
+
+# Action hooks that can be registered as WooCommerce "action.*" webhooks to
+# receive taxonomy changes (WooCommerce has no native category/attribute topics)
+CATEGORY_ACTIONS = {
+    'created_product_cat': 'created',
+    'edited_product_cat': 'updated',
+    'delete_product_cat': 'deleted',
+}
+ATTRIBUTE_ACTIONS = {
+    'woocommerce_attribute_added': 'created',
+    'woocommerce_attribute_updated': 'updated',
+    'woocommerce_attribute_deleted': 'deleted',
+}
+TERM_ACTION_PREFIXES = {
+    'created_pa_': 'created',
+    'edited_pa_': 'updated',
+    'delete_pa_': 'deleted',
+}
+
+WebhookHandler = Callable[[List[WebhookEvent]], None]
+
+
+def compute_signature(body: bytes, secret: str) -> str:
+    """Compute the WooCommerce webhook signature for a request body
+
+    WooCommerce signs the raw body with HMAC-SHA256 and sends the base64
+    encoded digest in the X-WC-Webhook-Signature header.
+    """
+    digest = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """Check a webhook signature in constant time"""
+    if not signature:
+        return False
+    return hmac.compare_digest(compute_signature(body, secret), signature.strip())
+
+
+def parse_topic(topic: str, payload: Dict[str, Any]) -> Tuple[str, str, Optional[int]]:
+    """Split a webhook topic into (resource, event, resource_id)
+
+    Handles the native topics (``product.updated``, ``order.created``, ...) as
+    well as the ``action.*`` topics used for taxonomy changes.
+
+    Args:
+        topic: Value of the X-WC-Webhook-Topic header
+        payload: Decoded webhook body
+
+    Returns:
+        Tuple of resource name, event name and the affected ID (if known)
+    """
+    resource, _, event = topic.partition('.')
+
+    if resource != 'action':
+        return resource, event, _extract_id(payload.get('id'))
+
+    # Action webhooks send {"action": "<hook>", "arg": <first hook argument>}
+    action = payload.get('action') or event
+    arg = _extract_id(payload.get('arg'))
+
+    if action in CATEGORY_ACTIONS:
+        return 'category', CATEGORY_ACTIONS[action], arg
+    if action in ATTRIBUTE_ACTIONS:
+        return 'attribute', ATTRIBUTE_ACTIONS[action], arg
+    for prefix, term_event in TERM_ACTION_PREFIXES.items():
+        if action.startswith(prefix):
+            return 'term', term_event, arg
+
+    return 'action', action, arg
+
+
+def split_product_events(events: List[WebhookEvent]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Split product events into payloads to upsert and IDs to remove
+
+    Returns:
+        Tuple of (product payloads, deleted product IDs)
+    """
+    upserts = []
+    deleted = []
+    for event in events:
+        if event.event == 'deleted':
+            if event.resource_id is not None:
+                deleted.append(event.resource_id)
+        elif event.payload.get('id'):
+            upserts.append(event.payload)
+    return upserts, deleted
+
+
+def order_product_ids(events: List[WebhookEvent]) -> List[int]:
+    """Get the IDs of the products ordered in order events
+
+    Variations are reported by their parent product, which is what the
+    search index holds. Orders without line items (e.g. deletions) give none.
+    """
+    product_ids = []
+    for event in events:
+        for item in event.payload.get('line_items') or []:
+            product_id = _extract_id(item.get('product_id'))
+            if product_id:
+                product_ids.append(product_id)
+    return list(dict.fromkeys(product_ids))
+
+
+def _extract_id(value: Any) -> Optional[int]:
+    """Best-effort conversion of a webhook ID field to an int"""
+    if isinstance(value, dict):
+        value = value.get('id') or value.get('term_id')
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class WebhookDispatcher:
+    """Queue incoming webhook events and apply them to local indexes in the background
+
+    Events are coalesced per (resource, ID): a burst of updates to the same
+    product only reaches the subscribers once, with the latest payload. A
+    resource is flushed once it has been quiet for ``debounce_seconds``, or at
+    the latest ``max_delay_seconds`` after its first pending event so that a
+    continuous flood cannot starve the indexes.
+
+    Subscribers receive a list of events for the resource they registered
+    for, which lets them apply changes in bulk.
+    """
+
+    def __init__(self, debounce_seconds: float = 2.0, max_delay_seconds: float = 10.0,
+                 logger: Optional[logging.Logger] = None):
+        """Initialize the dispatcher
+
+        Args:
+            debounce_seconds: Quiet period before pending events are applied
+            max_delay_seconds: Upper bound on how long an event may stay queued
+            logger: Optional logger instance
+        """
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._handlers: Dict[str, List[WebhookHandler]] = {}
+        # (resource, id) -> [event, first_seen, last_seen]
+        self._pending: Dict[Tuple[str, Any], List[Any]] = {}
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._stats = {
+            'received': 0,
+            'coalesced': 0,
+            'applied': 0,
+            'handler_errors': 0,
+            'ignored': 0,
+        }
+
+    def subscribe(self, resource: str, handler: WebhookHandler) -> None:
+        """Register a handler for a resource ('product', 'order', 'category', ...)
+
+        Use '*' to receive events for every resource.
+        """
+        with self._condition:
+            self._handlers.setdefault(resource, []).append(handler)
+
+    def handles(self, resource: str) -> bool:
+        """Whether any handler is subscribed to a resource (directly or with '*')"""
+        with self._condition:
+            return bool(self._handlers.get(resource) or self._handlers.get('*'))
+
+    def submit(self, event: WebhookEvent) -> bool:
+        """Queue an event without blocking the caller
+
+        Returns:
+            False if no handler is subscribed to the event's resource (the
+            event is dropped and counted as ignored)
+        """
+        if not self.handles(event.resource):
+            with self._condition:
+                self._stats['ignored'] += 1
+            return False
+
+        now = time.monotonic()
+        # Events without an ID (e.g. unknown actions) are never coalesced
+        key = (event.resource, event.resource_id if event.resource_id is not None else id(event))
+
+        with self._condition:
+            self._stats['received'] += 1
+            if key in self._pending:
+                self._stats['coalesced'] += 1
+                self._pending[key][0] = event
+                self._pending[key][2] = now
+            else:
+                self._pending[key] = [event, now, now]
+            self._ensure_worker()
+            self._condition.notify()
+        return True
+
+    def flush(self) -> int:
+        """Apply every pending event immediately
+
+        Returns:
+            Number of events applied
+        """
+        with self._condition:
+            events = [entry[0] for entry in self._pending.values()]
+            self._pending.clear()
+        self._apply(events)
+        return len(events)
+
+    def stop(self) -> None:
+        """Stop the background worker after applying pending events"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._worker:
+            self._worker.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Get counters describing the dispatcher activity"""
+        with self._condition:
+            return {**self._stats, 'pending': len(self._pending)}
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker on first use (caller holds the lock)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop: wait for events to become due and apply them"""
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+
+                due, wait = self._collect_due(time.monotonic())
+                if not due:
+                    self._condition.wait(timeout=wait)
+                    continue
+
+            self._apply(due)
+
+    def _collect_due(self, now: float) -> Tuple[List[WebhookEvent], Optional[float]]:
+        """Pop events that are ready to apply (caller holds the lock)
+
+        Returns:
+            The due events and how long to wait for the next one
+        """
+        due = []
+        next_deadline = None
+
+        for key, (event, first_seen, last_seen) in list(self._pending.items()):
+            deadline = min(last_seen + self.debounce_seconds, first_seen + self.max_delay_seconds)
+            if deadline <= now:
+                due.append(event)
+                del self._pending[key]
+            elif next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+
+        wait = None if next_deadline is None else max(next_deadline - now, 0)
+        return due, wait
+
+    def _apply(self, events: List[WebhookEvent]) -> None:
+        """Hand events to the subscribers, grouped by resource"""
+        by_resource: Dict[str, List[WebhookEvent]] = {}
+        for event in events:
+            by_resource.setdefault(event.resource, []).append(event)
+
+        with self._condition:
+            handlers = {resource: list(hs) for resource, hs in self._handlers.items()}
+
+        for resource, resource_events in by_resource.items():
+            for handler in handlers.get(resource, []) + handlers.get('*', []):
+                try:
+                    handler(resource_events)
+                except Exception as e:
+                    with self._condition:
+                        self._stats['handler_errors'] += 1
+                    self.logger.error(f"Webhook handler failed for {resource} events: {str(e)}", exc_info=True)
+            with self._condition:
+                self._stats['applied'] += len(resource_events)
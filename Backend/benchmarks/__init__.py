@@ -0,0 +1,11 @@
+"""Performance benchmarks for Woo-Flow
+
+Run from the Backend directory, e.g. ``python -m benchmarks.bench_json``.
+``python -m benchmarks.suite`` runs the whole suite against the local stub
+store (benchmarks.stub_store) and writes the results as JSON.
+``python -m benchmarks.bench_import_time`` fails when an entry point starts
+importing pandas, NumPy or OpenTelemetry eagerly again.
+``python -m benchmarks.bench_compression`` compares wire bytes with and
+without compression. ``python -m benchmarks.bench_replay --profile``
+profiles an import replayed from a recorded cassette.
+"""
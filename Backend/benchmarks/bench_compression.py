@@ -0,0 +1,140 @@
+"""Bandwidth and latency effect of HTTP compression
+
+Measures, against the stub store:
+
+- upstream reads: product pages fetched by WooClient with the store sending
+  plain or gzipped JSON
+- batch writes: /products/batch bodies sent plain or gzipped
+  (``compress_requests``)
+- API responses: GET /api/products as sent to the frontend without
+  compression, with gzip and with brotli (when installed)
+
+Bytes are body bytes on the wire. Loopback transfers are nearly free, so the
+transfer time on a slower link is also estimated from the byte counts
+(``--mbps``).
+
+Usage:
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --pages 20 --mbps 50
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Dict, Any
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_store import StubStore
+from benchmarks.synthetic import make_products
+
+
+def _client(store: StubStore, **kwargs):
+    from woo_client import WooClient
+    return WooClient("ck_bench", "cs_bench", store.url, **kwargs)
+
+
+def _transfer_ms(nbytes: int, mbps: float) -> float:
+    return round(nbytes * 8 / (mbps * 1e6) * 1000, 1)
+
+
+def measure_upstream(pages: int = 10, per_page: int = 100) -> Dict[str, Dict[str, Any]]:
+    """Fetch ``pages`` product pages from a store sending plain, then gzipped, responses"""
+    results = {}
+    for name, compress in (('plain', False), ('gzip', True)):
+        with StubStore(products=pages * per_page, compress_responses=compress) as store:
+            client = _client(store)
+            client.products.get_products(per_page=per_page, page=1)  # warm-up
+            store.reset_stats()
+            started = time.perf_counter()
+            for page in range(1, pages + 1):
+                client.products.get_products(per_page=per_page, page=page)
+            elapsed = time.perf_counter() - started
+            results[name] = {'bytes': store.traffic()['bytes_out'], 'seconds': round(elapsed, 4)}
+    return results
+
+
+def measure_batch(batches: int = 5, batch_size: int = 100) -> Dict[str, Dict[str, Any]]:
+    """Send ``batches`` product batch-create requests with plain, then gzipped, bodies"""
+    results = {}
+    products = [{key: value for key, value in product.items() if key not in ('id', 'variations')}
+                for product in make_products(batch_size)]
+    for name, compress in (('plain', False), ('gzip', True)):
+        with StubStore(products=10, accept_compressed_requests=True) as store:
+            client = _client(store, compress_requests=compress)
+            started = time.perf_counter()
+            for _ in range(batches):
+                client.products._make_request('POST', '/products/batch', data={'create': products})
+            elapsed = time.perf_counter() - started
+            results[name] = {'bytes': store.traffic()['bytes_in'], 'seconds': round(elapsed, 4)}
+    return results
+
+
+def measure_api(requests_count: int = 100, per_page: int = 100) -> Dict[str, Dict[str, Any]]:
+    """GET /api/products responses without compression, with gzip and with brotli"""
+    from fastapi.testclient import TestClient
+    from api.compression import supported_encodings
+    from api.dependencies import get_woo_client
+    from api.main import app
+
+    results = {}
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with StubStore(products=per_page) as store:
+        client = _client(store)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            http = TestClient(app)
+            url = f'/api/products?per_page={per_page}'
+            for coding in ('identity',) + tuple(reversed(supported_encodings())):
+                headers = {'Accept-Encoding': coding}
+                response = http.get(url, headers=headers)  # warm-up
+                response.raise_for_status()
+                started = time.perf_counter()
+                for _ in range(requests_count):
+                    http.get(url, headers=headers)
+                elapsed = time.perf_counter() - started
+                results[coding] = {
+                    'bytes': int(response.headers.get('content-length') or len(response.content)),
+                    'ms_per_request': round(elapsed / requests_count * 1000, 2),
+                }
+        finally:
+            app.dependency_overrides.clear()
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Every measurement, with quick sizes for the benchmark suite"""
+    return {
+        'upstream': measure_upstream(pages=3 if quick else 10),
+        'batch': measure_batch(batches=2 if quick else 5),
+        'api': measure_api(requests_count=30 if quick else 100),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the effect of HTTP compression")
+    parser.add_argument("--pages", type=int, default=10, help="Product pages fetched upstream")
+    parser.add_argument("--batches", type=int, default=5, help="Batch requests of 100 products sent")
+    parser.add_argument("--requests", type=int, default=100, help="API requests per encoding")
+    parser.add_argument("--mbps", type=float, default=20.0, help="Link speed for the transfer time estimate")
+    args = parser.parse_args()
+
+    sections = {
+        'Upstream product pages (store -> client)': measure_upstream(pages=args.pages),
+        'Batch request bodies (client -> store)': measure_batch(batches=args.batches),
+        'API /api/products responses (API -> frontend)': measure_api(requests_count=args.requests),
+    }
+    for title, results in sections.items():
+        print(f"\n{title}")
+        baseline = next(iter(results.values()))['bytes']
+        for name, result in results.items():
+            timing = (f"{result['seconds']:.3f} s" if 'seconds' in result
+                      else f"{result['ms_per_request']:.2f} ms/req")
+            print(f"  {name:<10} {result['bytes']:>12,} bytes  x{baseline / result['bytes']:5.1f}  {timing:>14}"
+                  f"  ~{_transfer_ms(result['bytes'], args.mbps):,.1f} ms at {args.mbps:g} Mbit/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cost of preparing an import CSV before any product is sent to the API
+
+Compares the old per-row cleaning (csv.DictReader, pd.notna() on every cell,
+probing attr_name_{i}/category_{i}/image_{i} on every row) with the
+vectorized pre-pass of models.csv_layout. Only the CSV handling is timed,
+no requests are made.
+
+Usage:
+    python -m benchmarks.bench_csv_prepass
+    python -m benchmarks.bench_csv_prepass --rows 100000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.csv_layout import prepare_frame, read_csv_frame
+
+HEADER = ['type', 'sku', 'name', 'description', 'short_description', 'regular_price', 'sale_price',
+          'manage_stock', 'stock_quantity', 'stock_status', 'status',
+          'category_1', 'include_hierarchy_1', 'category_2', 'image_1', 'image_2',
+          'attr_name_1', 'attr_value_1', 'attr_var_1', 'attr_name_2', 'attr_value_2', 'attr_var_2',
+          'weight', 'length', 'width', 'height']
+
+
+def write_csv(path: str, rows: int, seed: int = 42) -> None:
+    """Write a synthetic import file: simple products and variable products with 4 variations"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        written = 0
+        while written < rows:
+            n = written + 1
+            price = f"{rng.uniform(5, 200):.2f}"
+            if rng.random() < 0.5:
+                writer.writerow(['simple', f'SKU-{n}', f'Product {n}', 'Description ' * 10, 'Short', price, '',
+                                 'true', rng.randint(0, 500), 'instock', 'publish', 'Clothing', 'yes', 'Shirts',
+                                 f'https://example.com/{n}.jpg', '', 'Material', 'Cotton, Polyester', 'false',
+                                 '', '', '', '0.5', '10', '20', '5'])
+                written += 1
+                continue
+            writer.writerow(['variable', f'VAR-{n}', f'Product {n}', 'Description ' * 10, 'Short', price, '',
+                             'true', 100, 'instock', 'publish', 'Clothing', '', '', f'https://example.com/{n}.jpg',
+                             '', 'Color', 'Red,Blue', 'true', 'Size', 'S,M', 'true', '', '', '', ''])
+            written += 1
+            for color in ('Red', 'Blue'):
+                for size in ('S', 'M'):
+                    writer.writerow(['variation', f'VAR-{n}-{color}-{size}', '', '', '', price, '', 'true',
+                                     rng.randint(0, 50), 'instock', 'publish', '', '', '', '', '', '', color, '',
+                                     '', size, '', '', '', '', ''])
+                    written += 1
+
+
+def legacy(path: str) -> int:
+    """Per-row cleaning and column probing, as the importer did before the pre-pass"""
+    touched = 0
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row = {k: v if pd.notna(v) and v != '' else None for k, v in row.items()}
+        row.get('type', '').lower()
+        for i in range(1, 10):
+            if f'attr_name_{i}' in row and row[f'attr_name_{i}']:
+                touched += 1
+            if f'attr_value_{i}' in row and row[f'attr_value_{i}']:
+                touched += 1
+        for i in range(1, 6):
+            if f'category_{i}' in row and row[f'category_{i}']:
+                touched += 1
+            if f'image_{i}' in row and row[f'image_{i}']:
+                touched += 1
+    return touched
+
+
+def prepass(path: str) -> int:
+    """Vectorized pre-pass followed by layout-driven column access"""
+    touched = 0
+    records, layout = prepare_frame(read_csv_frame(path))
+    for row in records:
+        for _, name_key, value_key, _ in layout.attributes:
+            if name_key in row:
+                touched += 1
+            if value_key in row:
+                touched += 1
+        for _, category_key, _ in layout.categories:
+            if category_key in row:
+                touched += 1
+        for _, image_key in layout.images:
+            if image_key in row:
+                touched += 1
+    return touched
+
+
+def timed(func, *args) -> float:
+    """Wall time of one call, in seconds"""
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV preprocessing of the product importer")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of CSV rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per path (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'products.csv')
+        write_csv(path, args.rows)
+
+        # Both paths must see the same non-empty cells
+        assert legacy(path) == prepass(path)
+
+        old = min(timed(legacy, path) for _ in range(args.repeat))
+        new = min(timed(prepass, path) for _ in range(args.repeat))
+
+    print(f"{args.rows} rows\n")
+    print(f"per-row cleaning     {old * 1000:9.1f} ms  {args.rows / old:10.0f} rows/s")
+    print(f"vectorized pre-pass  {new * 1000:9.1f} ms  {args.rows / new:10.0f} rows/s")
+    print(f"\nspeed-up: x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
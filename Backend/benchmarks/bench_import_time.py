@@ -0,0 +1,110 @@
+"""Import time of the library and the API
+
+Runs ``python -X importtime`` in fresh interpreters for the usual entry
+points and reports the total import time, the number of modules loaded and
+the slowest top-level imports. Heavy optional dependencies must only load
+on first use: the run fails when an entry point imports one of the modules
+it is not allowed to (pandas and NumPy are needed by CSV imports and
+ProductFrame only, OpenTelemetry by tracing only).
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --repeat 10 --budget-ms 1500
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Dict, Any, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> (statement, modules it must not import)
+TARGETS = {
+    'woo_client': ('from woo_client import WooClient', ('pandas', 'numpy', 'opentelemetry')),
+    'models': ('from models import Product', ('pandas', 'numpy', 'opentelemetry')),
+    'api': ('import api.main', ('pandas', 'numpy')),
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth) records"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        records.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+        })
+    return records
+
+
+def measure(statement: str, repeat: int = 5) -> Dict[str, Any]:
+    """Import time of ``statement`` in a fresh interpreter, best of ``repeat`` runs
+
+    Returns:
+        Total milliseconds, module count, module names and the slowest
+        top-level imports of the fastest run
+    """
+    env = {**os.environ, 'PYTHONPATH': BACKEND_DIR}
+    best: Optional[List[Dict[str, Any]]] = None
+    for _ in range(repeat + 1):  # the first run also writes the bytecode caches
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=BACKEND_DIR,
+                                   env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{statement!r} failed:\n{completed.stderr[-2000:]}")
+        records = parse_importtime(completed.stderr)
+        if best is None or sum(r['self_us'] for r in records) < sum(r['self_us'] for r in best):
+            best = records
+
+    top_level = sorted((r for r in best if r['depth'] == 1), key=lambda r: -r['cumulative_us'])
+    return {
+        'total_ms': round(sum(r['self_us'] for r in best) / 1000, 1),
+        'modules': len(best),
+        'loaded': {r['module'] for r in best},
+        'slowest': [(r['module'], round(r['cumulative_us'] / 1000, 1)) for r in top_level[:5]],
+    }
+
+
+def check(repeat: int = 5, budget_ms: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """Measure every target and list the problems found
+
+    Returns:
+        Per target: total_ms, modules, slowest imports and 'problems'
+        (forbidden modules loaded, budget exceeded)
+    """
+    results = {}
+    for name, (statement, forbidden) in TARGETS.items():
+        measured = measure(statement, repeat)
+        loaded = measured.pop('loaded')
+        problems = [f"imports {module}" for module in forbidden if module in loaded]
+        if budget_ms is not None and measured['total_ms'] > budget_ms:
+            problems.append(f"takes {measured['total_ms']} ms (budget {budget_ms} ms)")
+        results[name] = {**measured, 'statement': statement, 'problems': problems}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and guard the import time of Woo-Flow entry points")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point (the fastest is kept)")
+    parser.add_argument("--budget-ms", type=float, help="Fail when an entry point takes longer than this")
+    args = parser.parse_args()
+
+    results = check(args.repeat, args.budget_ms)
+    failed = False
+    for name, result in results.items():
+        print(f"\n{result['statement']}: {result['total_ms']} ms, {result['modules']} modules")
+        for module, ms in result['slowest']:
+            print(f"  {module:<40} {ms:>8.1f} ms")
+        for problem in result['problems']:
+            failed = True
+            print(f"  FAIL: {problem}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
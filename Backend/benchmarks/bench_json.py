@@ -0,0 +1,114 @@
+"""JSON parse/serialize cost on 100-product pages
+
+Compares the stdlib json module with orjson for the client transport, and
+the three ways the API can return a page of products:
+
+- ``response_model``: FastAPI validates the list against List[ProductResponse]
+  and serializes it (the default list endpoint behaviour)
+- ``FastJSONResponse``: the decoded list is returned directly and encoded once
+- ``raw passthrough``: the upstream bytes are returned without decoding
+
+Usage:
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --page-size 100 --repeat 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+import requests
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_products
+from woo_client.json_codec import STDLIB, ORJSON
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Best-of-``repeat`` wall time of one call, in milliseconds"""
+    func()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def transport_benchmarks(page: List[Dict], repeat: int) -> Dict[str, float]:
+    """Decode and encode costs for the client transport"""
+    body = json.dumps(page).encode('utf-8')
+
+    response = requests.Response()
+    response._content = body
+    response.headers['Content-Type'] = 'application/json'
+    response.encoding = None
+
+    results = {
+        'decode: requests response.json()': measure(response.json, repeat),
+        'decode: json.loads': measure(lambda: STDLIB.loads(body), repeat),
+        'encode: json.dumps': measure(lambda: STDLIB.dumps(page), repeat),
+    }
+    if ORJSON is not None:
+        results['decode: orjson.loads'] = measure(lambda: ORJSON.loads(body), repeat)
+        results['encode: orjson.dumps'] = measure(lambda: ORJSON.dumps(page), repeat)
+    return results
+
+
+def api_benchmarks(page: List[Dict], repeat: int) -> Dict[str, float]:
+    """End-to-end cost of returning one page through FastAPI"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from api.models import ProductResponse
+    from api.responses import FastJSONResponse, RawJSONResponse
+
+    body = json.dumps(page).encode('utf-8')
+    app = FastAPI()
+
+    @app.get("/model", response_model=List[ProductResponse])
+    def with_response_model():
+        return STDLIB.loads(body)
+
+    @app.get("/fast")
+    def with_fast_response():
+        return FastJSONResponse(ORJSON.loads(body) if ORJSON else STDLIB.loads(body))
+
+    @app.get("/raw")
+    def with_passthrough():
+        return RawJSONResponse(content=body)
+
+    client = TestClient(app)
+    return {
+        'api: response_model validation': measure(lambda: client.get("/model"), repeat),
+        'api: FastJSONResponse': measure(lambda: client.get("/fast"), repeat),
+        'api: raw passthrough': measure(lambda: client.get("/raw"), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON handling on product pages")
+    parser.add_argument("--page-size", type=int, default=100, help="Products per page")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per measurement (best is reported)")
+    parser.add_argument("--skip-api", action="store_true", help="Only benchmark the transport codecs")
+    args = parser.parse_args()
+
+    page = make_products(args.page_size)
+    size_kb = len(json.dumps(page)) / 1024
+    print(f"Page: {args.page_size} products, {size_kb:.0f} KB of JSON")
+    print(f"orjson: {'installed' if ORJSON else 'not installed'}\n")
+
+    results = transport_benchmarks(page, args.repeat)
+    if not args.skip_api:
+        results.update(api_benchmarks(page, args.repeat))
+
+    width = max(len(name) for name in results)
+    for name, ms in results.items():
+        print(f"{name:<{width}}  {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
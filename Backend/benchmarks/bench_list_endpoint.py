@@ -0,0 +1,82 @@
+"""Throughput of GET /api/products for the three response paths
+
+Runs the real API app against a stubbed WooCommerce transport that returns
+a synthetic page, so only the API-side cost is measured:
+
+- ``validate=true``: response_model validation of every product (previous default)
+- default: trusted data, edit_link added in bulk, encoded once with the fast codec
+- ``raw=true``: upstream bytes passed through without decoding
+
+Usage:
+    python -m benchmarks.bench_list_endpoint
+    python -m benchmarks.bench_list_endpoint --page-size 100 --requests 300
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import requests
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_products
+
+
+def stub_transport(client, body: bytes) -> None:
+    """Make every request of the client's sub-clients return ``body``"""
+    def send_request(*args, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers['X-WP-Total'] = '1000'
+        response.headers['X-WP-TotalPages'] = '10'
+        return response
+
+    for sub_client in (client, client.products, client.categories, client.attributes, client.media):
+        sub_client._send_request = send_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the product list endpoint")
+    parser.add_argument("--page-size", type=int, default=100, help="Products per page")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from api.main import app
+    from api.dependencies import get_woo_client
+    from woo_client import WooClient
+
+    client = WooClient("ck_bench", "cs_bench", "https://shop.example.com")
+    stub_transport(client, json.dumps(make_products(args.page_size)).encode('utf-8'))
+    app.dependency_overrides[get_woo_client] = lambda: client
+    http = TestClient(app)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    modes = {
+        'validate=true (response_model)': f"/api/products?per_page={args.page_size}&validate=true",
+        'default (trusted fast path)': f"/api/products?per_page={args.page_size}",
+        'raw=true (passthrough)': f"/api/products?per_page={args.page_size}&raw=true",
+    }
+
+    print(f"{args.requests} requests per mode, {args.page_size} products per page\n")
+    baseline = None
+    for name, url in modes.items():
+        http.get(url).raise_for_status()  # warm-up
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            http.get(url)
+        elapsed = time.perf_counter() - started
+        rps = args.requests / elapsed
+        baseline = baseline or rps
+        print(f"{name:<32} {rps:8.1f} req/s  {elapsed / args.requests * 1000:7.2f} ms/req  x{rps / baseline:.1f}")
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
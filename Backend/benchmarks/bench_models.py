@@ -0,0 +1,51 @@
+"""Cost of turning API product data into Product models
+
+Compares the validating Product.from_dict() with the trusted
+Product.from_api_list() path used by ProductClient.get_products_as_models(validate=False).
+
+Usage:
+    python -m benchmarks.bench_models
+    python -m benchmarks.bench_models --products 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_products
+from models import Product
+
+
+def timed(func) -> float:
+    """Wall time of one call, in seconds"""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Product model construction")
+    parser.add_argument("--products", type=int, default=10000, help="Number of products")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per path (best is reported)")
+    args = parser.parse_args()
+
+    items = make_products(args.products)
+
+    # Both paths must produce the same payloads
+    sample = items[:200]
+    assert [p.to_dict() for p in Product.from_api_list(sample)] == [Product.from_dict(i).to_dict() for i in sample]
+
+    validated = min(timed(lambda: [Product.from_dict(i) for i in items]) for _ in range(args.repeat))
+    trusted = min(timed(lambda: Product.from_api_list(items)) for _ in range(args.repeat))
+
+    print(f"{args.products} products\n")
+    print(f"from_dict (validated)    {validated * 1000:9.1f} ms  {args.products / validated:10.0f} products/s")
+    print(f"from_api_list (trusted)  {trusted * 1000:9.1f} ms  {args.products / trusted:10.0f} products/s")
+    print(f"\nspeed-up: x{validated / trusted:.1f}")
+
+
+if __name__ == "__main__":
+    main()
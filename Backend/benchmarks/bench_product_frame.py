@@ -0,0 +1,64 @@
+"""Memory per product: API dicts vs Product models vs ProductFrame
+
+Also times a store-wide repricing (filter + price arithmetic + building
+the batch payloads) on the frame.
+
+Usage:
+    python -m benchmarks.bench_product_frame
+    python -m benchmarks.bench_product_frame --products 50000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_products
+from models import Product
+from models.product_frame import ProductFrame
+
+
+def retained(build):
+    """Build an object and return it with the memory it keeps alive, in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ProductFrame memory and transforms")
+    parser.add_argument("--products", type=int, default=50000, help="Number of products")
+    args = parser.parse_args()
+    count = args.products
+
+    items, dict_bytes = retained(lambda: make_products(count))
+    models, model_bytes = retained(lambda: Product.from_api_list(items))
+    del models
+    frame, frame_bytes = retained(lambda: ProductFrame.from_records(items))
+
+    print(f"{count} products\n")
+    print(f"{'API dicts':<16} {dict_bytes / 2**20:8.1f} MB  {dict_bytes / count:8.0f} B/product")
+    print(f"{'Product models':<16} {model_bytes / 2**20:8.1f} MB  {model_bytes / count:8.0f} B/product"
+          "  (on top of the dicts they reference)")
+    print(f"{'ProductFrame':<16} {frame_bytes / 2**20:8.1f} MB  {frame_bytes / count:8.0f} B/product"
+          f"  (memory_usage(): {frame.memory_usage() / count:.0f} B/product)")
+
+    started = time.perf_counter()
+    repriced = frame.in_category('Shirts').with_status('publish').reprice(1.05, ending=0.99)
+    payloads = repriced.to_batch_updates(original=frame, fields=('regular_price',))
+    elapsed = time.perf_counter() - started
+    updates = sum(len(payload['update']) for _, payload in payloads)
+    print(f"\nReprice 'Shirts' +5% (.99 endings): {updates} updates in {len(payloads)} batches, "
+          f"{elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""CPU cost of an import, replayed from a cassette
+
+Records a CSV import against the stub store once (woo_client.Cassette in
+'record' mode), then replays it without any server: with zero latency the
+time left is the CPU cost of the importer, the models and the client.
+``--latency recorded`` replays with the response times of the recording
+instead, and ``--profile`` prints the functions where replayed imports spend
+their time.
+
+Usage:
+    python -m benchmarks.bench_replay
+    python -m benchmarks.bench_replay --products 500 --profile
+    python -m benchmarks.bench_replay --cassette import.json   # replay an existing recording
+"""
+import argparse
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+from typing import Dict, Any, Optional
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_store import StubStore
+
+logger = logging.getLogger('benchmarks')
+
+# Fixed store URL of recordings, so that replays match whatever port the stub used
+STORE_URL = 'http://127.0.0.1:8081'
+
+
+def _import(cassette, csv_path: str, store_url: str) -> Dict[str, Any]:
+    from models.csv_product_importer import CSVProductImporter
+    from woo_client import WooClient
+
+    client = WooClient("ck_bench", "cs_bench", store_url, wp_username="bench", wp_password="bench",
+                       cassette=cassette)
+    results = CSVProductImporter(client=client, logger=logger).import_from_file(csv_path)
+    if results.get('error') or results['failed']:
+        raise RuntimeError(f"Import failed: {results.get('error') or results['failed'][:3]}")
+    return results
+
+
+def record(cassette_path: str, csv_path: str, products: int) -> int:
+    """Run an import against the stub store, recording it
+
+    Returns:
+        Number of CSV rows imported
+    """
+    from benchmarks.suite import write_import_csv
+    from woo_client import Cassette
+
+    with StubStore(products=0, port=int(STORE_URL.rsplit(':', 1)[1])) as store:
+        rows = write_import_csv(csv_path, products, store.url)
+        with Cassette(cassette_path, mode='record') as cassette:
+            _import(cassette, csv_path, store.url)
+    return rows
+
+
+def replay(cassette_path: str, csv_path: str, latency: str = 'zero',
+           profile: Optional[cProfile.Profile] = None) -> Dict[str, Any]:
+    """Replay a recorded import
+
+    Returns:
+        Elapsed seconds and requests replayed
+    """
+    from woo_client import Cassette
+
+    cassette = Cassette(cassette_path, mode='replay', latency=latency)
+    started = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        _import(cassette, csv_path, STORE_URL)
+    finally:
+        if profile is not None:
+            profile.disable()
+    return {'seconds': round(time.perf_counter() - started, 4), 'requests': cassette.stats()['played']}
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    """Record an import, then measure its replay (the benchmark suite entry)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette_path = os.path.join(tmp, 'import.json')
+        csv_path = os.path.join(tmp, 'import.csv')
+        started = time.perf_counter()
+        rows = record(cassette_path, csv_path, 40 if quick else 200)
+        recorded = time.perf_counter() - started
+        replayed = replay(cassette_path, csv_path)
+    return {
+        'rows': rows,
+        'requests': replayed['requests'],
+        'recorded_seconds': round(recorded, 3),
+        'replay_seconds': replayed['seconds'],
+        'replay_rows_per_second': round(rows / replayed['seconds'], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile an import replayed from a cassette")
+    parser.add_argument("--products", type=int, default=200, help="Products in the recorded import")
+    parser.add_argument("--cassette", help="Replay this cassette (recorded with --csv) instead of recording one")
+    parser.add_argument("--csv", help="Import file of --cassette")
+    parser.add_argument("--latency", choices=("zero", "recorded"), default="zero", help="Replayed response times")
+    parser.add_argument("--profile", action="store_true", help="Print the functions using the most time")
+    parser.add_argument("--top", type=int, default=25, help="Functions printed with --profile")
+    args = parser.parse_args()
+    if bool(args.cassette) != bool(args.csv):
+        parser.error("--cassette and --csv go together")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette_path, csv_path = args.cassette, args.csv
+        if not cassette_path:
+            cassette_path = os.path.join(tmp, 'import.json')
+            csv_path = os.path.join(tmp, 'import.csv')
+            started = time.perf_counter()
+            rows = record(cassette_path, csv_path, args.products)
+            print(f"Recorded an import of {rows} rows in {time.perf_counter() - started:.3f} s "
+                  f"({os.path.getsize(cassette_path):,} bytes)")
+
+        replay(cassette_path, csv_path)  # warm-up: imports and first-use initialization
+        profile = cProfile.Profile() if args.profile else None
+        result = replay(cassette_path, csv_path, latency=args.latency, profile=profile)
+        print(f"Replayed {result['requests']} requests in {result['seconds']:.3f} s ({args.latency} latency)")
+        if profile is not None:
+            pstats.Stats(profile).sort_stats('cumulative').print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
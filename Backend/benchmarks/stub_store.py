@@ -0,0 +1,1052 @@
+"""Local stand-in for a WooCommerce store
+
+Serves the parts of the WooCommerce (wc/v3) and WordPress (wp/v2) REST API
+that woo_client uses: products, variations, categories, attributes and
+terms, media, orders and the batch endpoints, with real pagination headers
+(X-WP-Total, X-WP-TotalPages, Link) and WooCommerce-shaped error bodies.
+Everything is kept in memory and seeded from benchmarks.synthetic, so a
+given seed always produces the same store.
+
+Latency, jitter, 5xx errors and 429 throttling can be injected to see how
+the client, the importer and the API behave against a slow or flaky store.
+Injected faults use their own seeded random generator so runs are
+reproducible. Responses can be gzipped (as most WordPress hosts do) and
+gzip request bodies accepted, to measure the effect of compression on the
+bytes counted by traffic(). With ``etags`` on, GET responses carry an ETag
+and conditional requests for unchanged bodies are answered 304 Not Modified
+(as behind a caching proxy or CDN).
+
+Usage as a CLI (from the Backend directory):
+    python -m benchmarks.stub_store --port 8081 --products 5000
+    python -m benchmarks.stub_store --latency 0.08 --jitter 0.02 --error-rate 0.01 --throttle-rate 0.02
+
+then point WC_URL at http://127.0.0.1:8081 (any key and secret are accepted).
+
+Usage from Python, e.g. as a pytest fixture:
+    with StubStore(products=1000, latency=0.05) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        ...
+        store.stats()  # requests served, by route
+"""
+import argparse
+import gzip
+import hashlib
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit, urlencode
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import CATEGORIES, COLORS, SIZES, make_product
+from woo_client.json_codec import default_codec
+
+WC_PREFIX = '/wp-json/wc/v3'
+WP_PREFIX = '/wp-json/wp/v2'
+
+# WooCommerce rejects batch requests with more than 100 objects
+MAX_BATCH_SIZE = 100
+
+# Smallest valid JPEG, served for image URLs under /wp-content/uploads/
+TINY_JPEG = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f'
+    '141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101'
+    '011100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffda0008010100003f00d2cf20'
+    'ffd9'
+)
+
+_codec = default_codec()
+
+
+class StubError(Exception):
+    """Error answered with a WooCommerce-style JSON body"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _flag(value: Optional[str]) -> bool:
+    """Query string boolean as WordPress parses it ('true', '1', 'True')"""
+    return str(value).lower() in ('true', '1', 'yes')
+
+
+def _ids(value: Optional[str]) -> List[int]:
+    return [int(v) for v in str(value or '').split(',') if v.strip()]
+
+
+class StoreData:
+    """In-memory store contents
+
+    Products, variations, media and orders share one ID sequence, like
+    WordPress posts; categories and attribute terms share another, like
+    WordPress terms.
+    """
+
+    def __init__(self, products: int = 1000, orders: int = 100, seed: int = 42):
+        self._lock = threading.RLock()
+        self._post_ids = iter(range(1, 2 ** 31))
+        self._term_ids = iter(range(max(c[0] for c in CATEGORIES) + 1, 2 ** 31))
+        self._attribute_ids = iter(range(3, 2 ** 31))
+
+        self.products: Dict[int, Dict[str, Any]] = {}
+        self.variations: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.media: Dict[int, Dict[str, Any]] = {}
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.categories: Dict[int, Dict[str, Any]] = {}
+        self.attributes: Dict[int, Dict[str, Any]] = {}
+        self.terms: Dict[int, Dict[int, Dict[str, Any]]] = {}
+
+        self._seed(products, orders, random.Random(seed))
+
+    def next_post_id(self) -> int:
+        with self._lock:
+            return next(self._post_ids)
+
+    def next_term_id(self) -> int:
+        with self._lock:
+            return next(self._term_ids)
+
+    def _seed(self, products: int, orders: int, rng: random.Random) -> None:
+        for category_id, name, slug in CATEGORIES:
+            self.categories[category_id] = self.make_category(category_id, {'name': name, 'slug': slug})
+        for attribute_id, name, options in ((1, 'Color', COLORS), (2, 'Size', SIZES)):
+            self.attributes[attribute_id] = self.make_attribute(attribute_id, {'name': name})
+            self.terms[attribute_id] = {}
+            for option in options:
+                term_id = self.next_term_id()
+                self.terms[attribute_id][term_id] = self.make_term(term_id, {'name': option})
+
+        # Synthetic products come with their own IDs; renumber them so that
+        # products, variations and images get distinct post IDs
+        for _ in range(products):
+            product = make_product(self.next_post_id(), rng)
+            for image in product['images']:
+                image['id'] = self.next_post_id()
+                self.media[image['id']] = self.make_media(image['id'], {
+                    'title': image['name'], 'source_url': image['src'], 'post': product['id'],
+                })
+            variation_count = len(product['variations'])
+            product['variations'] = []
+            self.variations[product['id']] = {}
+            for index in range(variation_count):
+                variation = self.make_variation(self.next_post_id(), product, index)
+                product['variations'].append(variation['id'])
+                self.variations[product['id']][variation['id']] = variation
+            self.products[product['id']] = product
+
+        product_ids = list(self.products)
+        for _ in range(orders):
+            order_id = self.next_post_id()
+            items = rng.sample(product_ids, min(len(product_ids), rng.randint(1, 4))) if product_ids else []
+            self.orders[order_id] = self.make_order(order_id, [self.products[i] for i in items], rng)
+
+    # ------------------------------------------------------------------
+    # Resource shapes
+    # ------------------------------------------------------------------
+
+    def make_category(self, category_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        name = data.get('name') or f'Category {category_id}'
+        return {
+            'id': category_id,
+            'name': name,
+            'slug': data.get('slug') or name.lower().replace(' ', '-'),
+            'parent': int(data.get('parent') or 0),
+            'description': data.get('description', ''),
+            'display': 'default',
+            'image': data.get('image'),
+            'menu_order': 0,
+            'count': 0,
+        }
+
+    def make_attribute(self, attribute_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        name = data.get('name') or f'Attribute {attribute_id}'
+        return {
+            'id': attribute_id,
+            'name': name,
+            'slug': data.get('slug') or f"pa_{name.lower().replace(' ', '_')}",
+            'type': 'select',
+            'order_by': 'menu_order',
+            'has_archives': False,
+        }
+
+    def make_term(self, term_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        name = data.get('name') or f'Term {term_id}'
+        return {
+            'id': term_id,
+            'name': name,
+            'slug': data.get('slug') or name.lower().replace(' ', '-'),
+            'description': data.get('description', ''),
+            'menu_order': 0,
+            'count': 0,
+        }
+
+    def make_media(self, media_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        title = data.get('title') or f'image-{media_id}'
+        return {
+            'id': media_id,
+            'date': _now(),
+            'slug': title.lower().replace(' ', '-'),
+            'status': 'inherit',
+            'type': 'attachment',
+            'title': {'rendered': title},
+            'alt_text': data.get('alt_text', ''),
+            'media_type': 'image',
+            'mime_type': data.get('mime_type', 'image/jpeg'),
+            'post': data.get('post'),
+            'source_url': data.get('source_url') or f'/wp-content/uploads/{title}.jpg',
+        }
+
+    def make_variation(self, variation_id: int, parent: Dict[str, Any], index: int) -> Dict[str, Any]:
+        attributes = [
+            {'id': attribute['id'], 'name': attribute['name'],
+             'option': attribute['options'][index % len(attribute['options'])]}
+            for attribute in parent['attributes'] if attribute['options']
+        ]
+        price = parent['price'] or '10.00'
+        return {
+            'id': variation_id,
+            'parent_id': parent['id'],
+            'type': 'variation',
+            'sku': f"{parent['sku']}-{index + 1}",
+            'status': 'publish',
+            'description': '',
+            'price': price,
+            'regular_price': price,
+            'sale_price': '',
+            'on_sale': False,
+            'manage_stock': True,
+            'stock_quantity': 10 + index,
+            'stock_status': 'instock',
+            'weight': parent['weight'],
+            'dimensions': dict(parent['dimensions']),
+            'image': None,
+            'attributes': attributes,
+            'menu_order': index,
+            'meta_data': [],
+            'date_created': parent['date_created'],
+            'date_modified': parent['date_modified'],
+            'date_modified_gmt': parent['date_modified_gmt'],
+        }
+
+    def make_order(self, order_id: int, items: List[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+        line_items = [
+            {'id': order_id * 10 + i, 'product_id': p['id'], 'name': p['name'], 'sku': p['sku'],
+             'quantity': rng.randint(1, 3), 'price': p['price']}
+            for i, p in enumerate(items)
+        ]
+        total = sum(float(item['price'] or 0) * item['quantity'] for item in line_items)
+        return {
+            'id': order_id,
+            'status': rng.choice(['processing', 'completed', 'completed', 'on-hold']),
+            'currency': 'USD',
+            'date_created': _now(),
+            'total': f'{total:.2f}',
+            'line_items': line_items,
+        }
+
+
+class StubStore:
+    """Threaded HTTP server answering like a WooCommerce store
+
+    Use it as a context manager (or call start()/stop()) to run it in a
+    background thread, or call serve_forever() to run it in the foreground.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, products: int = 1000, orders: int = 100,
+                 seed: int = 42, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1, compress_responses: bool = False,
+                 accept_compressed_requests: bool = False, etags: bool = False):
+        """Create the store (nothing is served until start())
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one, see ``url``)
+            products: Number of seeded products (about 30% are variable)
+            orders: Number of seeded orders
+            seed: Seed for the store contents and the injected faults
+            latency: Seconds added to every API response
+            jitter: Maximum random seconds added on top of ``latency``
+            error_rate: Share of API requests answered with a 500 error
+            throttle_rate: Share of API requests answered with 429 Too Many Requests
+            retry_after: Retry-After header value of 429 responses, in seconds
+            compress_responses: Gzip responses of 1 KB or more when the client accepts gzip
+            accept_compressed_requests: Decode ``Content-Encoding: gzip`` request
+                bodies (otherwise they are rejected with 400 rest_invalid_json,
+                like WordPress behind a server that does not decode them)
+            etags: Send an ETag with GET responses and answer If-None-Match
+                requests for unchanged bodies with 304 Not Modified
+        """
+        self.data = StoreData(products=products, orders=orders, seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.compress_responses = compress_responses
+        self.accept_compressed_requests = accept_compressed_requests
+        self.etags = etags
+        self._traffic: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._routes = self._build_routes()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Store URL to give to WooClient"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StubStore':
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-store', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        """Serve requests in the current thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> 'StubStore':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served so far, keyed by 'METHOD /route' (plus 'errors' and 'throttled')"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+            self._traffic.clear()
+
+    def traffic(self) -> Dict[str, int]:
+        """Body bytes received and sent so far, as on the wire ('bytes_in', 'bytes_out')"""
+        with self._stats_lock:
+            return {'bytes_in': self._traffic['bytes_in'], 'bytes_out': self._traffic['bytes_out']}
+
+    def _count_bytes(self, received: int, sent: int) -> None:
+        with self._stats_lock:
+            self._traffic['bytes_in'] += received
+            self._traffic['bytes_out'] += sent
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Fault injection
+    # ------------------------------------------------------------------
+
+    def _inject(self) -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+        """Sleep for the configured latency and maybe pick a fault to answer with"""
+        with self._rng_lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            self._count('throttled')
+            body = {'code': 'rest_too_many_requests', 'message': 'Too many requests.', 'data': {'status': 429}}
+            return 429, body, {'Retry-After': str(self.retry_after)}
+        if roll < self.throttle_rate + self.error_rate:
+            self._count('errors')
+            body = {'code': 'internal_server_error', 'message': 'Injected server error.', 'data': {'status': 500}}
+            return 500, body, {}
+        return None
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _build_routes(self) -> List[Tuple[str, 're.Pattern', str, Callable]]:
+        """(method, path pattern, route name, handler) for every supported endpoint"""
+        routes = []
+
+        def add(method: str, path: str, handler: Callable) -> None:
+            pattern = re.compile('^' + re.sub(r'{(\w+)}', r'(?P<\1>\\d+)', path) + '/?$')
+            # Routes are reported without the API prefix, e.g. 'GET /products/{id}'
+            name = path[len(WP_PREFIX if path.startswith(WP_PREFIX) else WC_PREFIX):]
+            routes.append((method, pattern, f'{method} {name or "/"}', handler))
+
+        wc = WC_PREFIX
+        add('GET', wc, self.store_index)
+        add('GET', f'{wc}/products', self.list_products)
+        add('POST', f'{wc}/products', self.create_product)
+        add('POST', f'{wc}/products/batch', self.batch_products)
+        add('GET', f'{wc}/products/categories', self.list_categories)
+        add('POST', f'{wc}/products/categories', self.create_category)
+        add('POST', f'{wc}/products/categories/batch', self.batch_categories)
+        add('GET', f'{wc}/products/categories/{{id}}', self.get_category)
+        add('PUT', f'{wc}/products/categories/{{id}}', self.update_category)
+        add('DELETE', f'{wc}/products/categories/{{id}}', self.delete_category)
+        add('GET', f'{wc}/products/attributes', self.list_attributes)
+        add('POST', f'{wc}/products/attributes', self.create_attribute)
+        add('GET', f'{wc}/products/attributes/{{id}}', self.get_attribute)
+        add('PUT', f'{wc}/products/attributes/{{id}}', self.update_attribute)
+        add('DELETE', f'{wc}/products/attributes/{{id}}', self.delete_attribute)
+        add('GET', f'{wc}/products/attributes/{{attribute}}/terms', self.list_terms)
+        add('POST', f'{wc}/products/attributes/{{attribute}}/terms', self.create_term)
+        add('POST', f'{wc}/products/attributes/{{attribute}}/terms/batch', self.batch_terms)
+        add('GET', f'{wc}/products/attributes/{{attribute}}/terms/{{id}}', self.get_term)
+        add('PUT', f'{wc}/products/attributes/{{attribute}}/terms/{{id}}', self.update_term)
+        add('DELETE', f'{wc}/products/attributes/{{attribute}}/terms/{{id}}', self.delete_term)
+        add('GET', f'{wc}/products/{{id}}', self.get_product)
+        add('PUT', f'{wc}/products/{{id}}', self.update_product)
+        add('DELETE', f'{wc}/products/{{id}}', self.delete_product)
+        add('GET', f'{wc}/products/{{parent}}/variations', self.list_variations)
+        add('POST', f'{wc}/products/{{parent}}/variations', self.create_variation)
+        add('POST', f'{wc}/products/{{parent}}/variations/batch', self.batch_variations)
+        add('GET', f'{wc}/products/{{parent}}/variations/{{id}}', self.get_variation)
+        add('PUT', f'{wc}/products/{{parent}}/variations/{{id}}', self.update_variation)
+        add('DELETE', f'{wc}/products/{{parent}}/variations/{{id}}', self.delete_variation)
+        add('GET', f'{wc}/orders', self.list_orders)
+        add('GET', f'{wc}/orders/{{id}}', self.get_order)
+        add('GET', f'{WP_PREFIX}/media', self.list_media)
+        add('POST', f'{WP_PREFIX}/media', self.create_media)
+        add('GET', f'{WP_PREFIX}/media/{{id}}', self.get_media)
+        add('POST', f'{WP_PREFIX}/media/{{id}}', self.update_media)
+        add('DELETE', f'{WP_PREFIX}/media/{{id}}', self.delete_media)
+        return routes
+
+    def dispatch(self, method: str, path: str, query: Dict[str, str], body: bytes,
+                 headers) -> Tuple[int, Any, Dict[str, str]]:
+        """Answer one request
+
+        Returns:
+            (status, body, extra headers); bytes bodies are sent as-is, anything
+            else is encoded as JSON
+        """
+        if method == 'GET' and path.startswith('/wp-content/uploads/'):
+            self._count('GET /wp-content/uploads')
+            return 200, TINY_JPEG, {'Content-Type': 'image/jpeg'}
+
+        allowed = False
+        for route_method, pattern, name, handler in self._routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            self._count(name)
+            if 'Authorization' not in headers:
+                raise StubError(401, 'woocommerce_rest_cannot_view', 'Sorry, you cannot list resources.')
+            fault = self._inject()
+            if fault is not None:
+                return fault
+            args = {key: int(value) for key, value in match.groupdict().items()}
+            return handler(query=query, body=body, headers=headers, **args)
+
+        if allowed:
+            raise StubError(405, 'rest_no_route', 'No route was found matching the URL and request method.')
+        raise StubError(404, 'rest_no_route', 'No route was found matching the URL and request method.')
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _json(self, body: bytes) -> Dict[str, Any]:
+        if not body:
+            return {}
+        try:
+            return _codec.loads(body)
+        except ValueError:
+            raise StubError(400, 'rest_invalid_json', 'Invalid JSON body passed.')
+
+    def _page(self, items: List[Dict[str, Any]], query: Dict[str, str], path: str,
+              default_per_page: int = 10) -> Tuple[int, Any, Dict[str, str]]:
+        """Slice a list by page/per_page and add the WordPress pagination headers"""
+        per_page = int(query.get('per_page', default_per_page))
+        page = int(query.get('page', 1))
+        if not 1 <= per_page <= 100:
+            raise StubError(400, 'rest_invalid_param', 'Invalid parameter(s): per_page')
+        total = len(items)
+        total_pages = max(1, math.ceil(total / per_page)) if total else 0
+        if page > 1 and page > total_pages:
+            raise StubError(400, 'rest_post_invalid_page_number',
+                            'The page number requested is larger than the number of pages available.')
+        start = (page - 1) * per_page
+        page_items = [self._fields(item, query) for item in items[start:start + per_page]]
+
+        links = []
+        base = {k: v for k, v in query.items() if k != 'page'}
+        if page > 1:
+            links.append(f'<{self.url}{path}?{urlencode({**base, "page": page - 1})}>; rel="prev"')
+        if page < total_pages:
+            links.append(f'<{self.url}{path}?{urlencode({**base, "page": page + 1})}>; rel="next"')
+        headers = {'X-WP-Total': str(total), 'X-WP-TotalPages': str(total_pages)}
+        if links:
+            headers['Link'] = ', '.join(links)
+        return 200, page_items, headers
+
+    def _fields(self, item: Dict[str, Any], query: Dict[str, str]) -> Dict[str, Any]:
+        fields = query.get('_fields')
+        if not fields:
+            return item
+        wanted = {f.split('.')[0] for f in fields.split(',')}
+        return {key: value for key, value in item.items() if key in wanted}
+
+    def _one(self, items: Dict[int, Dict[str, Any]], item_id: int, resource: str) -> Dict[str, Any]:
+        item = items.get(item_id)
+        if item is None:
+            raise StubError(404, f'woocommerce_rest_{resource}_invalid_id', 'Invalid ID.')
+        return item
+
+    def _batch(self, data: Dict[str, Any], create: Callable, update: Callable,
+               delete: Callable) -> Tuple[int, Any, Dict[str, str]]:
+        """Apply a {create, update, delete} batch; item errors are reported in place"""
+        operations = {key: data.get(key) or [] for key in ('create', 'update', 'delete')}
+        if sum(len(items) for items in operations.values()) > MAX_BATCH_SIZE:
+            raise StubError(413, 'woocommerce_rest_request_entity_too_large',
+                            f'Unable to accept more than {MAX_BATCH_SIZE} items for this request.')
+
+        def run(func, item):
+            try:
+                return func(item)
+            except StubError as e:
+                item_id = item if isinstance(item, int) else (item.get('id') or 0)
+                return {'id': item_id, 'error': {'code': e.code, 'message': e.message, 'data': {'status': e.status}}}
+
+        result = {}
+        for key, func in (('create', create), ('update', update), ('delete', delete)):
+            if operations[key]:
+                result[key] = [run(func, item) for item in operations[key]]
+        return 200, result, {}
+
+    @staticmethod
+    def _apply(item: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in data.items():
+            if key != 'id':
+                item[key] = value
+        if 'date_modified' in item:
+            item['date_modified'] = item['date_modified_gmt'] = _now()
+        return item
+
+    # ------------------------------------------------------------------
+    # Products
+    # ------------------------------------------------------------------
+
+    def store_index(self, query, body, headers):
+        return 200, {'namespace': 'wc/v3', 'name': 'Woo-Flow stub store', 'url': self.url, 'routes': {}}, {}
+
+    def list_products(self, query, body, headers):
+        with self.data._lock:
+            items = list(self.data.products.values())
+            if query.get('sku'):
+                # Variations are matched too, so a SKU lookup can resolve them
+                skus = set(query['sku'].split(','))
+                items = [p for p in items if p['sku'] in skus]
+                items += [v for variations in self.data.variations.values()
+                          for v in variations.values() if v['sku'] in skus]
+        status = query.get('status', 'any')
+        items = [p for p in items if p.get('status') != 'trash' or status == 'trash']
+        if status != 'any':
+            items = [p for p in items if p.get('status') == status]
+        if query.get('include'):
+            wanted = _ids(query['include'])
+            position = {product_id: i for i, product_id in enumerate(wanted)}
+            items = [p for p in items if p['id'] in position]
+            if query.get('orderby') == 'include':
+                items.sort(key=lambda p: position[p['id']])
+        if query.get('search'):
+            term = query['search'].lower()
+            items = [p for p in items if term in p['name'].lower() or term in (p['sku'] or '').lower()]
+        if query.get('category'):
+            category_id = int(query['category'])
+            items = [p for p in items if any(c['id'] == category_id for c in p.get('categories', []))]
+        if query.get('type'):
+            items = [p for p in items if p.get('type') == query['type']]
+        if query.get('modified_after'):
+            items = [p for p in items if p.get('date_modified_gmt', '') > query['modified_after']]
+        return self._page(items, query, f'{WC_PREFIX}/products')
+
+    def get_product(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._fields(self._one(self.data.products, id, 'product'), query), {}
+
+    def _create_product(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get('name') and data.get('type') != 'variation':
+            raise StubError(400, 'woocommerce_rest_missing_name', 'Missing parameter(s): name')
+        with self.data._lock:
+            sku = data.get('sku')
+            if sku and any(p['sku'] == sku for p in self.data.products.values()):
+                raise StubError(400, 'product_invalid_sku', 'Invalid or duplicated SKU.')
+            product_id = self.data.next_post_id()
+            now = _now()
+            product = {
+                'id': product_id, 'name': '', 'slug': '', 'type': 'simple', 'status': 'publish',
+                'sku': '', 'price': '', 'regular_price': '', 'sale_price': '', 'description': '',
+                'short_description': '', 'manage_stock': False, 'stock_quantity': None,
+                'stock_status': 'instock', 'categories': [], 'images': [], 'attributes': [],
+                'variations': [], 'weight': '', 'dimensions': {'length': '', 'width': '', 'height': ''},
+                'meta_data': [], 'permalink': f'{self.url}/product/{product_id}/',
+                'date_created': now, 'date_modified': now, 'date_modified_gmt': now,
+            }
+            self._apply(product, data)
+            product['slug'] = product['slug'] or product['name'].lower().replace(' ', '-')
+            product['price'] = product.get('sale_price') or product.get('regular_price') or ''
+            product['images'] = [self._product_image(image) for image in product['images']]
+            product['categories'] = [self._product_category(c) for c in product['categories']]
+            self.data.products[product_id] = product
+            self.data.variations[product_id] = {}
+            return product
+
+    def _product_image(self, image: Dict[str, Any]) -> Dict[str, Any]:
+        media = self.data.media.get(image.get('id')) if image.get('id') else None
+        if media is None:
+            return {'id': image.get('id') or self.data.next_post_id(), 'src': image.get('src', ''),
+                    'name': image.get('name', ''), 'alt': image.get('alt', '')}
+        return {'id': media['id'], 'src': media['source_url'], 'name': media['slug'], 'alt': media['alt_text']}
+
+    def _product_category(self, category: Dict[str, Any]) -> Dict[str, Any]:
+        known = self.data.categories.get(category.get('id'))
+        if known is None:
+            return category
+        return {'id': known['id'], 'name': known['name'], 'slug': known['slug']}
+
+    def _update_product(self, data: Dict[str, Any], product_id: Optional[int] = None) -> Dict[str, Any]:
+        product_id = product_id or data.get('id')
+        with self.data._lock:
+            product = self._one(self.data.products, product_id, 'product')
+            return self._apply(product, data)
+
+    def _delete_product(self, product_id: int, force: bool = True) -> Dict[str, Any]:
+        with self.data._lock:
+            product = self._one(self.data.products, int(product_id), 'product')
+            if not force:
+                product['status'] = 'trash'
+                return product
+            del self.data.products[product['id']]
+            self.data.variations.pop(product['id'], None)
+            return product
+
+    def create_product(self, query, body, headers):
+        return 201, self._create_product(self._json(body)), {}
+
+    def update_product(self, query, body, headers, id):
+        return 200, self._update_product(self._json(body), id), {}
+
+    def delete_product(self, query, body, headers, id):
+        return 200, self._delete_product(id, force=_flag(query.get('force'))), {}
+
+    def batch_products(self, query, body, headers):
+        # Batch deletions are always permanent in WooCommerce
+        return self._batch(self._json(body), self._create_product, self._update_product, self._delete_product)
+
+    # ------------------------------------------------------------------
+    # Variations
+    # ------------------------------------------------------------------
+
+    def _variations_of(self, parent: int) -> Dict[int, Dict[str, Any]]:
+        self._one(self.data.products, parent, 'product')
+        return self.data.variations.setdefault(parent, {})
+
+    def list_variations(self, query, body, headers, parent):
+        with self.data._lock:
+            items = list(self._variations_of(parent).values())
+        if query.get('include'):
+            wanted = set(_ids(query['include']))
+            items = [v for v in items if v['id'] in wanted]
+        return self._page(items, query, f'{WC_PREFIX}/products/{parent}/variations')
+
+    def get_variation(self, query, body, headers, parent, id):
+        with self.data._lock:
+            return 200, self._fields(self._one(self._variations_of(parent), id, 'product_variation'), query), {}
+
+    def _create_variation(self, parent: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self.data._lock:
+            variations = self._variations_of(parent)
+            variation_id = self.data.next_post_id()
+            now = _now()
+            variation = {
+                'id': variation_id, 'parent_id': parent, 'type': 'variation', 'sku': '', 'status': 'publish', 'price': '',
+                'regular_price': '', 'sale_price': '', 'manage_stock': False, 'stock_quantity': None,
+                'stock_status': 'instock', 'attributes': [], 'image': None, 'weight': '',
+                'dimensions': {'length': '', 'width': '', 'height': ''}, 'meta_data': [],
+                'date_created': now, 'date_modified': now, 'date_modified_gmt': now,
+            }
+            self._apply(variation, {k: v for k, v in data.items() if k != 'type'})
+            variation['price'] = variation.get('sale_price') or variation.get('regular_price') or ''
+            variations[variation_id] = variation
+            self.data.products[parent]['variations'].append(variation_id)
+            return variation
+
+    def _update_variation(self, parent: int, data: Dict[str, Any], variation_id: Optional[int] = None):
+        with self.data._lock:
+            variation = self._one(self._variations_of(parent), variation_id or data.get('id'), 'product_variation')
+            return self._apply(variation, data)
+
+    def _delete_variation(self, parent: int, variation_id: int) -> Dict[str, Any]:
+        with self.data._lock:
+            variations = self._variations_of(parent)
+            variation = self._one(variations, int(variation_id), 'product_variation')
+            del variations[variation['id']]
+            product = self.data.products[parent]
+            product['variations'] = [v for v in product['variations'] if v != variation['id']]
+            return variation
+
+    def create_variation(self, query, body, headers, parent):
+        return 201, self._create_variation(parent, self._json(body)), {}
+
+    def update_variation(self, query, body, headers, parent, id):
+        return 200, self._update_variation(parent, self._json(body), id), {}
+
+    def delete_variation(self, query, body, headers, parent, id):
+        return 200, self._delete_variation(parent, id), {}
+
+    def batch_variations(self, query, body, headers, parent):
+        with self.data._lock:
+            self._one(self.data.products, parent, 'product')
+        return self._batch(
+            self._json(body),
+            lambda item: self._create_variation(parent, item),
+            lambda item: self._update_variation(parent, item),
+            lambda item: self._delete_variation(parent, item),
+        )
+
+    # ------------------------------------------------------------------
+    # Categories
+    # ------------------------------------------------------------------
+
+    def list_categories(self, query, body, headers):
+        with self.data._lock:
+            items = list(self.data.categories.values())
+        if query.get('slug'):
+            items = [c for c in items if c['slug'] == query['slug']]
+        if query.get('parent') is not None:
+            items = [c for c in items if c['parent'] == int(query['parent'])]
+        if query.get('search'):
+            items = [c for c in items if query['search'].lower() in c['name'].lower()]
+        if query.get('include'):
+            wanted = set(_ids(query['include']))
+            items = [c for c in items if c['id'] in wanted]
+        return self._page(items, query, f'{WC_PREFIX}/products/categories')
+
+    def get_category(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._fields(self._one(self.data.categories, id, 'product_cat'), query), {}
+
+    def _create_category(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get('name'):
+            raise StubError(400, 'rest_missing_callback_param', 'Missing parameter(s): name')
+        with self.data._lock:
+            category = self.data.make_category(self.data.next_term_id(), data)
+            if any(c['slug'] == category['slug'] for c in self.data.categories.values()):
+                raise StubError(400, 'term_exists', 'A term with the name provided already exists with this parent.')
+            self.data.categories[category['id']] = category
+            return category
+
+    def _update_category(self, data: Dict[str, Any], category_id: Optional[int] = None) -> Dict[str, Any]:
+        with self.data._lock:
+            category = self._one(self.data.categories, category_id or data.get('id'), 'product_cat')
+            return self._apply(category, data)
+
+    def _delete_category(self, category_id: int) -> Dict[str, Any]:
+        with self.data._lock:
+            category = self._one(self.data.categories, int(category_id), 'product_cat')
+            del self.data.categories[category['id']]
+            return category
+
+    def create_category(self, query, body, headers):
+        return 201, self._create_category(self._json(body)), {}
+
+    def update_category(self, query, body, headers, id):
+        return 200, self._update_category(self._json(body), id), {}
+
+    def delete_category(self, query, body, headers, id):
+        if not _flag(query.get('force')):
+            raise StubError(501, 'woocommerce_rest_trash_not_supported',
+                            'Resource does not support trashing.')
+        return 200, self._delete_category(id), {}
+
+    def batch_categories(self, query, body, headers):
+        return self._batch(self._json(body), self._create_category, self._update_category, self._delete_category)
+
+    # ------------------------------------------------------------------
+    # Attributes and terms
+    # ------------------------------------------------------------------
+
+    def list_attributes(self, query, body, headers):
+        # Like WooCommerce, the attributes endpoint is not paginated
+        with self.data._lock:
+            return 200, [self._fields(a, query) for a in self.data.attributes.values()], {}
+
+    def get_attribute(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._one(self.data.attributes, id, 'product_attribute'), {}
+
+    def create_attribute(self, query, body, headers):
+        data = self._json(body)
+        if not data.get('name'):
+            raise StubError(400, 'rest_missing_callback_param', 'Missing parameter(s): name')
+        with self.data._lock:
+            attribute = self.data.make_attribute(next(self.data._attribute_ids), data)
+            if any(a['slug'] == attribute['slug'] for a in self.data.attributes.values()):
+                raise StubError(400, 'woocommerce_rest_cannot_create', f"Slug \"{attribute['slug']}\" is already in use.")
+            self.data.attributes[attribute['id']] = attribute
+            self.data.terms[attribute['id']] = {}
+            return 201, attribute, {}
+
+    def update_attribute(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._apply(self._one(self.data.attributes, id, 'product_attribute'), self._json(body)), {}
+
+    def delete_attribute(self, query, body, headers, id):
+        with self.data._lock:
+            attribute = self._one(self.data.attributes, id, 'product_attribute')
+            del self.data.attributes[id]
+            self.data.terms.pop(id, None)
+            return 200, attribute, {}
+
+    def _terms_of(self, attribute: int) -> Dict[int, Dict[str, Any]]:
+        self._one(self.data.attributes, attribute, 'product_attribute')
+        return self.data.terms.setdefault(attribute, {})
+
+    def list_terms(self, query, body, headers, attribute):
+        with self.data._lock:
+            items = list(self._terms_of(attribute).values())
+        if query.get('slug'):
+            items = [t for t in items if t['slug'] == query['slug']]
+        return self._page(items, query, f'{WC_PREFIX}/products/attributes/{attribute}/terms')
+
+    def get_term(self, query, body, headers, attribute, id):
+        with self.data._lock:
+            return 200, self._one(self._terms_of(attribute), id, 'term'), {}
+
+    def _create_term(self, attribute: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get('name'):
+            raise StubError(400, 'rest_missing_callback_param', 'Missing parameter(s): name')
+        with self.data._lock:
+            terms = self._terms_of(attribute)
+            term = self.data.make_term(self.data.next_term_id(), data)
+            if any(t['slug'] == term['slug'] for t in terms.values()):
+                raise StubError(400, 'term_exists', 'A term with the name provided already exists.')
+            terms[term['id']] = term
+            return term
+
+    def _update_term(self, attribute: int, data: Dict[str, Any], term_id: Optional[int] = None):
+        with self.data._lock:
+            return self._apply(self._one(self._terms_of(attribute), term_id or data.get('id'), 'term'), data)
+
+    def _delete_term(self, attribute: int, term_id: int) -> Dict[str, Any]:
+        with self.data._lock:
+            terms = self._terms_of(attribute)
+            term = self._one(terms, int(term_id), 'term')
+            del terms[term['id']]
+            return term
+
+    def create_term(self, query, body, headers, attribute):
+        return 201, self._create_term(attribute, self._json(body)), {}
+
+    def update_term(self, query, body, headers, attribute, id):
+        return 200, self._update_term(attribute, self._json(body), id), {}
+
+    def delete_term(self, query, body, headers, attribute, id):
+        return 200, self._delete_term(attribute, id), {}
+
+    def batch_terms(self, query, body, headers, attribute):
+        with self.data._lock:
+            self._terms_of(attribute)
+        return self._batch(
+            self._json(body),
+            lambda item: self._create_term(attribute, item),
+            lambda item: self._update_term(attribute, item),
+            lambda item: self._delete_term(attribute, item),
+        )
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def list_orders(self, query, body, headers):
+        with self.data._lock:
+            items = sorted(self.data.orders.values(), key=lambda o: o['id'], reverse=True)
+        if query.get('status'):
+            items = [o for o in items if o['status'] == query['status']]
+        return self._page(items, query, f'{WC_PREFIX}/orders')
+
+    def get_order(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._one(self.data.orders, id, 'shop_order'), {}
+
+    # ------------------------------------------------------------------
+    # Media (WordPress API)
+    # ------------------------------------------------------------------
+
+    def list_media(self, query, body, headers):
+        with self.data._lock:
+            items = list(self.data.media.values())
+        return self._page(items, query, f'{WP_PREFIX}/media')
+
+    def get_media(self, query, body, headers, id):
+        with self.data._lock:
+            return 200, self._one(self.data.media, id, 'post'), {}
+
+    def create_media(self, query, body, headers):
+        content_type = headers.get('Content-Type', '')
+        if 'multipart/form-data' in content_type:
+            # Only the file name and the metadata fields are needed
+            filename = re.search(rb'filename="([^"]*)"', body)
+            fields = dict(re.findall(rb'name="(alt_text|title)"\r\n\r\n([^\r]*)\r\n', body))
+            data = {key.decode(): value.decode('utf-8', 'replace') for key, value in fields.items()}
+            name = filename.group(1).decode('utf-8', 'replace') if filename else 'upload.jpg'
+        else:
+            disposition = headers.get('Content-Disposition', '')
+            match = re.search(r'filename="?([^";]+)', disposition)
+            name, data = (match.group(1) if match else 'upload.jpg'), {}
+        if not body:
+            raise StubError(400, 'rest_upload_no_data', 'No data supplied.')
+        with self.data._lock:
+            media_id = self.data.next_post_id()
+            stem = os.path.splitext(name)[0]
+            media = self.data.make_media(media_id, {
+                'title': data.get('title') or stem,
+                'alt_text': data.get('alt_text', ''),
+                'source_url': f'{self.url}/wp-content/uploads/{name}',
+            })
+            self.data.media[media_id] = media
+            return 201, media, {}
+
+    def update_media(self, query, body, headers, id):
+        with self.data._lock:
+            media = self._one(self.data.media, id, 'post')
+            data = self._json(body)
+            if 'title' in data:
+                media['title'] = {'rendered': data.pop('title')}
+            return 200, self._apply(media, data), {}
+
+    def delete_media(self, query, body, headers, id):
+        if not _flag(query.get('force')):
+            raise StubError(501, 'rest_trash_not_supported',
+                            'The post does not support trashing. Set \'force=true\' to delete.')
+        with self.data._lock:
+            media = self._one(self.data.media, id, 'post')
+            del self.data.media[id]
+            return 200, {'deleted': True, 'previous': media}, {}
+
+
+def _make_handler(store: StubStore):
+    """Request handler class bound to a store"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'WooFlowStub/1.0'
+
+        def _handle(self) -> None:
+            parts = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(parts.query, keep_blank_values=True).items()}
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            received = len(body)
+            try:
+                if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+                    if not store.accept_compressed_requests:
+                        raise StubError(400, 'rest_invalid_json', 'Invalid JSON body passed.')
+                    body = gzip.decompress(body)
+                status, payload, extra = store.dispatch(self.command, parts.path.rstrip('/') or '/',
+                                                        query, body, self.headers)
+            except StubError as e:
+                status, payload, extra = e.status, {'code': e.code, 'message': e.message,
+                                                    'data': {'status': e.status}}, {}
+            except (ValueError, KeyError, TypeError) as e:
+                status, payload, extra = 400, {'code': 'rest_invalid_param', 'message': str(e),
+                                               'data': {'status': 400}}, {}
+
+            content = payload if isinstance(payload, bytes) else _codec.dumps(payload)
+            headers = {'Content-Type': 'application/json; charset=UTF-8', **extra}
+            if store.etags and self.command == 'GET' and status == 200:
+                headers['ETag'] = f'"{hashlib.md5(content).hexdigest()}"'
+                if headers['ETag'] in self.headers.get('If-None-Match', ''):
+                    status, content = 304, b''
+                    store._count('not_modified')
+            if (store.compress_responses and len(content) >= 1024
+                    and 'gzip' in self.headers.get('Accept-Encoding', '')):
+                content = gzip.compress(content, compresslevel=6)
+                headers['Content-Encoding'] = 'gzip'
+                headers['Vary'] = 'Accept-Encoding'
+            store._count_bytes(received, len(content) if self.command != 'HEAD' else 0)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+        def log_message(self, format, *args):
+            # Request logging would dominate the timings of a benchmark
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in WooCommerce store")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument("--products", type=int, default=1000, help="Number of seeded products")
+    parser.add_argument("--orders", type=int, default=100, help="Number of seeded orders")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the data and the injected faults")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of 429 responses, in seconds")
+    parser.add_argument("--gzip", action="store_true", help="Gzip responses when the client accepts it")
+    parser.add_argument("--accept-gzip-requests", action="store_true", help="Decode gzip request bodies")
+    parser.add_argument("--etags", action="store_true", help="Send ETags and answer 304 to unchanged GETs")
+    args = parser.parse_args()
+
+    store = StubStore(host=args.host, port=args.port, products=args.products, orders=args.orders,
+                      seed=args.seed, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                      compress_responses=args.gzip, accept_compressed_requests=args.accept_gzip_requests,
+                      etags=args.etags)
+    print(f"Stub WooCommerce store with {len(store.data.products)} products on {store.url}")
+    print("Use any API key and secret. Press Ctrl+C to exit")
+    try:
+        store.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
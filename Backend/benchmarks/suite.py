@@ -0,0 +1,429 @@
+"""Benchmark suite run against the local stub store
+
+Measures, without a live store:
+
+- ``request_overhead``: cost of BaseWooClient._make_request on top of a bare
+  requests call to the same endpoint
+- ``models``: Product.from_dict / from_api_list / to_dict throughput
+- ``csv``: parsing (read, header mapping, normalization) and row
+  categorization of synthetic 10k and 100k-row import files
+- ``import``: end-to-end CSVProductImporter.import_from_file rows per second
+- ``api``: FastAPI product list and detail endpoints, requests per second
+  and p50/p99 latency
+- ``imports``: import time of woo_client, models and api.main in fresh
+  interpreters (see bench_import_time)
+- ``compression``: bytes and time of upstream reads, batch writes and API
+  responses with and without compression (see bench_compression)
+- ``replay``: CPU cost of an import replayed from a recorded cassette, with
+  no server or network involved (see bench_replay)
+
+Results are written as JSON (with the commit they were measured on) so runs
+can be compared between commits.
+
+Usage:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --quick --only models,csv
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --baseline before.json --threshold 0.1
+    python -m benchmarks.suite --compare before.json after.json
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Optional
+
+# Allow running as a script from the Backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_products
+from benchmarks.stub_store import StubStore
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Metric name suffixes where a higher value is better; everything else is a duration
+HIGHER_IS_BETTER = ('_per_second', '_rps')
+
+logger = logging.getLogger('benchmarks')
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of ``repeat`` calls after one warm-up call, in seconds"""
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _client(store: StubStore):
+    from woo_client import WooClient
+    return WooClient("ck_bench", "cs_bench", store.url, wp_username="bench", wp_password="bench")
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+def bench_request_overhead(quick: bool) -> Dict[str, Any]:
+    """Per-call cost of _make_request compared with a bare requests.request"""
+    import requests
+
+    calls = 200 if quick else 1000
+    with StubStore(products=50) as store:
+        client = _client(store)
+        url = f"{client.api_base_url}/products/1"
+        headers = {**client._wc_auth_header, 'Content-Type': 'application/json'}
+
+        def bare():
+            for _ in range(calls):
+                requests.request('GET', url, headers=headers).json()
+
+        def wrapped():
+            for _ in range(calls):
+                client._make_request('GET', '/products/1')
+
+        # Alternate the two so both see the same server state
+        bare(), wrapped()
+        bare_seconds = client_seconds = float('inf')
+        for _ in range(5):
+            started = time.perf_counter()
+            bare()
+            middle = time.perf_counter()
+            wrapped()
+            bare_seconds = min(bare_seconds, middle - started)
+            client_seconds = min(client_seconds, time.perf_counter() - middle)
+
+    return {
+        'calls': calls,
+        'bare_request_us': round(bare_seconds / calls * 1e6, 1),
+        'make_request_us': round(client_seconds / calls * 1e6, 1),
+        'overhead_us': round((client_seconds - bare_seconds) / calls * 1e6, 1),
+    }
+
+
+def bench_models(quick: bool) -> Dict[str, Any]:
+    """Product model construction and serialization throughput"""
+    from models import Product
+
+    count = 2000 if quick else 10000
+    items = make_products(count)
+    products = Product.from_api_list(items)
+
+    from_dict = best_of(lambda: [Product.from_dict(i) for i in items], 3)
+    from_api = best_of(lambda: Product.from_api_list(items), 3)
+    to_dict = best_of(lambda: [p.to_dict() for p in products], 3)
+
+    return {
+        'products': count,
+        'from_dict_per_second': round(count / from_dict),
+        'from_api_list_per_second': round(count / from_api),
+        'to_dict_per_second': round(count / to_dict),
+    }
+
+
+def bench_csv(quick: bool) -> Dict[str, Any]:
+    """Parse and categorize speed of synthetic import files"""
+    from benchmarks.bench_csv_prepass import write_csv
+    from models.csv_layout import normalize_frame, read_csv_frame, to_records
+    from models.csv_product_importer import CSVProductImporter
+    from models.csv_schema import compile_schema
+
+    importer = CSVProductImporter(client=None, logger=logger)
+    result: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in ((10000,) if quick else (10000, 100000)):
+            path = os.path.join(tmp, f'products_{rows}.csv')
+            write_csv(path, rows)
+            parsed: Dict[str, Any] = {}
+
+            def parse():
+                df = read_csv_frame(path)
+                frame, layout = normalize_frame(compile_schema(df.columns).apply(df))
+                importer.layout = layout
+                parsed['records'] = to_records(frame)
+
+            def categorize():
+                importer.failed_products = []
+                importer._group_rows(parsed['records'])
+
+            parse_seconds = best_of(parse, 2)
+            categorize_seconds = best_of(categorize, 3)
+            label = f'{rows // 1000}k'
+            result[f'parse_{label}_rows_per_second'] = round(rows / parse_seconds)
+            result[f'categorize_{label}_rows_per_second'] = round(rows / categorize_seconds)
+    return result
+
+
+def write_import_csv(path: str, products: int, image_base: str) -> int:
+    """Write a canonical import file: half simple products, half variable with 4 variations
+
+    Returns:
+        Number of data rows written
+    """
+    header = ['type', 'sku', 'name', 'description', 'regular_price', 'manage_stock', 'stock_quantity',
+              'category_1', 'include_hierarchy_1', 'image_1', 'attr_name_1', 'attr_value_1', 'attr_var_1',
+              'attr_name_2', 'attr_value_2', 'attr_var_2']
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for n in range(1, products + 1):
+            image = f'{image_base}/wp-content/uploads/import-{n}.jpg'
+            if n % 2:
+                writer.writerow(['simple', f'IMP-{n}', f'Imported {n}', 'Description', '19.99', 'true', 10,
+                                 'Clothing', 'true', image, 'Material', 'Cotton', 'false', '', '', ''])
+                rows += 1
+                continue
+            writer.writerow(['variable', f'IMP-{n}', f'Imported {n}', 'Description', '29.99', 'true', 10,
+                             'Shirts', '', image, 'Color', 'Red,Blue', 'true', 'Size', 'S,M', 'true'])
+            rows += 1
+            for color in ('Red', 'Blue'):
+                for size in ('S', 'M'):
+                    writer.writerow(['variation', f'IMP-{n}-{color}-{size}', '', '', '29.99', 'true', 5,
+                                     '', '', '', '', color, '', '', size, ''])
+                    rows += 1
+    return rows
+
+
+def bench_import(quick: bool) -> Dict[str, Any]:
+    """End-to-end import_from_file against the stub store"""
+    from models.csv_product_importer import CSVProductImporter
+
+    products = 40 if quick else 200
+    with StubStore(products=0) as store, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'import.csv')
+        rows = write_import_csv(path, products, store.url)
+        importer = CSVProductImporter(client=_client(store), logger=logger)
+
+        started = time.perf_counter()
+        results = importer.import_from_file(path)
+        elapsed = time.perf_counter() - started
+        requests_made = sum(count for key, count in store.stats().items() if ' ' in key)
+
+    if results.get('error') or results['failed']:
+        raise RuntimeError(f"Import failed: {results.get('error') or results['failed'][:3]}")
+    return {
+        'rows': rows,
+        'requests': requests_made,
+        'elapsed_seconds': round(elapsed, 3),
+        'import_rows_per_second': round(rows / elapsed, 1),
+        'requests_per_row': round(requests_made / rows, 2),
+    }
+
+
+def bench_api(quick: bool) -> Dict[str, Any]:
+    """Product list and detail endpoints of the Woo-Flow API against the stub store"""
+    from fastapi.testclient import TestClient
+    from api.main import app
+    from api.dependencies import get_woo_client
+
+    count = 100 if quick else 500
+    result: Dict[str, Any] = {}
+    with StubStore(products=500) as store:
+        client = _client(store)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        try:
+            http = TestClient(app)
+            endpoints = {
+                'list': '/api/products?per_page=100',
+                'detail': '/api/products/1',
+            }
+            for name, url in endpoints.items():
+                http.get(url).raise_for_status()  # warm-up
+                latencies = []
+                started = time.perf_counter()
+                for _ in range(count):
+                    request_started = time.perf_counter()
+                    http.get(url)
+                    latencies.append(time.perf_counter() - request_started)
+                elapsed = time.perf_counter() - started
+                result[f'{name}_rps'] = round(count / elapsed, 1)
+                result[f'{name}_p50_ms'] = round(percentile(latencies, 50) * 1000, 2)
+                result[f'{name}_p99_ms'] = round(percentile(latencies, 99) * 1000, 2)
+        finally:
+            app.dependency_overrides.clear()
+    return result
+
+
+def bench_imports(quick: bool) -> Dict[str, Any]:
+    """Import time of the entry points; heavy dependencies loaded eagerly are reported as errors"""
+    from benchmarks.bench_import_time import check
+
+    result: Dict[str, Any] = {}
+    for name, measured in check(repeat=3 if quick else 10).items():
+        result[f'{name}_import_ms'] = measured['total_ms']
+        result[f'{name}_modules'] = measured['modules']
+        if measured['problems']:
+            result[f'{name}_problems'] = measured['problems']
+    return result
+
+
+def bench_compression(quick: bool) -> Dict[str, Any]:
+    """Wire bytes and time with and without compression, upstream and towards the frontend"""
+    from benchmarks.bench_compression import run as measure
+
+    result: Dict[str, Any] = {}
+    for section, measured in measure(quick).items():
+        for coding, values in measured.items():
+            for name, value in values.items():
+                result[f'{section}_{coding}_{name}'] = value
+    return result
+
+
+def bench_replay(quick: bool) -> Dict[str, Any]:
+    """Import replayed from a cassette with zero latency: importer, models and client CPU time"""
+    from benchmarks.bench_replay import run as measure
+
+    return measure(quick)
+
+
+BENCHMARKS: Dict[str, Callable[[bool], Dict[str, Any]]] = {
+    'request_overhead': bench_request_overhead,
+    'models': bench_models,
+    'csv': bench_csv,
+    'import': bench_import,
+    'api': bench_api,
+    'imports': bench_imports,
+    'compression': bench_compression,
+    'replay': bench_replay,
+}
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(quick: bool) -> Dict[str, Any]:
+    """Where and on what the results were measured"""
+    from woo_client.json_codec import default_codec
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_codec': default_codec().name,
+        'quick': quick,
+    }
+
+
+def run(names: List[str], quick: bool) -> Dict[str, Any]:
+    """Run the named benchmarks; a failing benchmark is recorded and the others still run"""
+    results: Dict[str, Any] = {}
+    for name in names:
+        print(f"running {name}...", flush=True)
+        try:
+            results[name] = BENCHMARKS[name](quick)
+        except Exception as e:
+            logger.exception(f"Benchmark {name} failed")
+            results[name] = {'error': str(e)}
+    return {'environment': environment(quick), 'results': results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """Print metric changes between two result files
+
+    Args:
+        baseline: Earlier results
+        current: Newer results
+        threshold: Relative change counted as a regression (0.1 = 10% worse)
+
+    Returns:
+        Names of the regressed metrics, as 'benchmark.metric'
+    """
+    regressions = []
+    print(f"\n{'metric':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metrics in current['results'].items():
+        before = baseline['results'].get(name, {})
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            if metric in ('calls', 'products', 'rows', 'requests'):
+                continue
+            change = (value - old) / old
+            worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+            flag = '  REGRESSION' if worse > threshold else ''
+            if flag:
+                regressions.append(f'{name}.{metric}')
+            print(f"{name + '.' + metric:<48} {old:>12} {value:>12} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Woo-Flow benchmark suite against the stub store")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads (10k-row CSV only)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--baseline", help="Results file to compare the new results with")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two results files without running anything")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.compare:
+        regressions = compare(_load(args.compare[0]), _load(args.compare[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    report = run(names, args.quick)
+    output = args.output
+    if not output:
+        commit = (report['environment']['commit'] or 'unknown')[:10]
+        output = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if report['environment']['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report['results'], indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        regressions = compare(_load(args.baseline), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import random
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+STORE_URL = "https://shop.example.com"
+
+WORDS = (
+    "organic cotton classic slim fit premium soft stretch lightweight breathable vintage "
+    "modern essential everyday relaxed heavyweight recycled merino linen denim canvas "
+    "waterproof insulated packable tailored oversized cropped ribbed brushed washed"
+).split()
+
+CATEGORIES = [
+    (15, "Clothing", "clothing"), (16, "Shirts", "shirts"), (17, "Hoodies", "hoodies"),
+    (18, "Accessories", "accessories"), (19, "Shoes", "shoes"), (20, "Outerwear", "outerwear"),
+    (21, "Bags", "bags"), (22, "Sale", "sale"),
+]
+
+COLORS = ["Black", "White", "Navy", "Olive", "Grey", "Red", "Sand"]
+SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _date(rng: random.Random, base: datetime) -> str:
+    return (base - timedelta(minutes=rng.randint(0, 525600))).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def make_product(product_id: int, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """Build one product shaped like a WooCommerce /wc/v3/products item
+
+    The payload carries the same keys and a similar size (~4 KB) as a real
+    store response, including HTML descriptions, images, attributes,
+    meta_data and _links.
+    """
+    rng = rng or random.Random(product_id)
+    base = datetime(2025, 1, 1)
+    variable = rng.random() < 0.3
+    name = f"{_sentence(rng, 3)} {rng.choice(['Tee', 'Hoodie', 'Jacket', 'Cap', 'Sneaker', 'Tote'])}"
+    slug = name.lower().replace(" ", "-")
+    regular = round(rng.uniform(5, 300), 2)
+    on_sale = rng.random() < 0.2
+    sale = round(regular * 0.8, 2) if on_sale else None
+    stock = rng.randint(0, 200)
+    created = _date(rng, base)
+    modified = _date(rng, base)
+    categories = rng.sample(CATEGORIES, rng.randint(1, 3))
+    images = [
+        {
+            "id": product_id * 10 + i,
+            "date_created": created,
+            "date_created_gmt": created,
+            "date_modified": modified,
+            "date_modified_gmt": modified,
+            "src": f"{STORE_URL}/wp-content/uploads/2025/01/{slug}-{i}.jpg",
+            "name": f"{slug}-{i}",
+            "alt": "",
+        }
+        for i in range(rng.randint(1, 4))
+    ]
+    attributes = [
+        {"id": 1, "name": "Color", "slug": "pa_color", "position": 0, "visible": True,
+         "variation": variable, "options": rng.sample(COLORS, rng.randint(1, 4))},
+        {"id": 2, "name": "Size", "slug": "pa_size", "position": 1, "visible": True,
+         "variation": variable, "options": rng.sample(SIZES, rng.randint(1, 5))},
+    ]
+    description = "".join(f"<p>{_sentence(rng, rng.randint(12, 30))}.</p>\n" for _ in range(rng.randint(2, 6)))
+
+    return {
+        "id": product_id,
+        "name": name,
+        "slug": slug,
+        "permalink": f"{STORE_URL}/product/{slug}/",
+        "date_created": created,
+        "date_created_gmt": created,
+        "date_modified": modified,
+        "date_modified_gmt": modified,
+        "type": "variable" if variable else "simple",
+        "status": rng.choice(["publish"] * 8 + ["draft", "private"]),
+        "featured": rng.random() < 0.05,
+        "catalog_visibility": "visible",
+        "description": description,
+        "short_description": f"<p>{_sentence(rng, 10)}.</p>\n",
+        "sku": f"SKU-{product_id:06d}",
+        "price": str(sale if on_sale else regular),
+        "regular_price": "" if variable else str(regular),
+        "sale_price": "" if variable or not on_sale else str(sale),
+        "date_on_sale_from": None,
+        "date_on_sale_from_gmt": None,
+        "date_on_sale_to": None,
+        "date_on_sale_to_gmt": None,
+        "on_sale": on_sale,
+        "purchasable": True,
+        "total_sales": rng.randint(0, 5000),
+        "virtual": False,
+        "downloadable": False,
+        "downloads": [],
+        "download_limit": -1,
+        "download_expiry": -1,
+        "external_url": "",
+        "button_text": "",
+        "tax_status": "taxable",
+        "tax_class": "",
+        "manage_stock": True,
+        "stock_quantity": stock,
+        "backorders": "no",
+        "backorders_allowed": False,
+        "backordered": False,
+        "low_stock_amount": None,
+        "sold_individually": False,
+        "weight": str(round(rng.uniform(0.1, 3), 2)),
+        "dimensions": {"length": str(rng.randint(5, 60)), "width": str(rng.randint(5, 40)),
+                       "height": str(rng.randint(1, 20))},
+        "shipping_required": True,
+        "shipping_taxable": True,
+        "shipping_class": "",
+        "shipping_class_id": 0,
+        "reviews_allowed": True,
+        "average_rating": f"{rng.uniform(0, 5):.2f}",
+        "rating_count": rng.randint(0, 300),
+        "upsell_ids": [],
+        "cross_sell_ids": [],
+        "parent_id": 0,
+        "purchase_note": "",
+        "categories": [{"id": cid, "name": cname, "slug": cslug} for cid, cname, cslug in categories],
+        "tags": [],
+        "images": images,
+        "attributes": attributes,
+        "default_attributes": [],
+        "variations": [product_id * 100 + i for i in range(rng.randint(2, 8))] if variable else [],
+        "grouped_products": [],
+        "menu_order": 0,
+        "price_html": f"<span class=\"woocommerce-Price-amount amount\"><bdi>{regular}</bdi></span>",
+        "related_ids": rng.sample(range(1, 50000), 5),
+        "meta_data": [
+            {"id": product_id * 7 + i, "key": f"_custom_field_{i}", "value": _sentence(rng, 4)}
+            for i in range(rng.randint(1, 5))
+        ],
+        "stock_status": "instock" if stock else "outofstock",
+        "has_options": variable,
+        "post_password": "",
+        "global_unique_id": "",
+        "_links": {
+            "self": [{"href": f"{STORE_URL}/wp-json/wc/v3/products/{product_id}"}],
+            "collection": [{"href": f"{STORE_URL}/wp-json/wc/v3/products"}],
+        },
+    }
+
+
+def make_products(count: int, start_id: int = 1, seed: int = 42) -> List[Dict[str, Any]]:
+    """Build ``count`` products with consecutive IDs (deterministic for a given seed)"""
+    rng = random.Random(seed)
+    return [make_product(product_id, rng) for product_id in range(start_id, start_id + count)]
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import dotenv
+
+# Preview the changes without updating anything
+#python examples/bulk_inventory_update.py examples/inventory.csv --dry-run
+
+# Apply the changes, 4 batch requests in parallel
+#python examples/bulk_inventory_update.py examples/inventory.csv --workers 4
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the WooClient
+from woo_client import WooClient
+
+# Load environment variables
+dotenv.load_dotenv()
+
+def bulk_update_inventory(csv_path, batch_size=100, workers=4, dry_run=False):
+    """Update prices and stock from a CSV file
+
+    The CSV needs an sku or id column and any of regular_price, sale_price,
+    stock_quantity and stock_status. Empty cells leave the field unchanged;
+    a sale_price of "clear" ends the sale.
+
+    Args:
+        csv_path (str): Path to the inventory CSV file
+        batch_size (int): Number of items per batch request (max 100)
+        workers (int): Number of batch requests sent in parallel
+        dry_run (bool): Print the changes without applying them
+    """
+    # Create a WooClient with credentials from environment variables
+    client = WooClient(
+        api_key=os.getenv("WC_KEY"),
+        api_secret=os.getenv("WC_SECRET"),
+        store_url=os.getenv("WC_URL"),
+        verify_ssl=False  # Set to True in production
+    )
+
+    try:
+        report = client.products.bulk_update_inventory(
+            csv_path,
+            batch_size=batch_size,
+            max_workers=workers,
+            dry_run=dry_run
+        )
+    except Exception as e:
+        print(f"Error: {e}")
+        return
+
+    if dry_run:
+        print(json.dumps(report['changes'], indent=2))
+
+    print(f"\nRecords:    {report['received']}")
+    print(f"Updated:    {report['updated']}")
+    print(f"Unchanged:  {report['unchanged']}")
+    print(f"Unresolved: {len(report['unresolved'])}")
+    print(f"Failed:     {len(report['failed'])}")
+    print(f"Requests:   {report['requests']} in {report['elapsed_seconds']}s "
+          f"({report['records_per_second']} records/s)")
+
+    for sku in report['unresolved']:
+        print(f"  ✗ Unknown SKU: {sku}")
+    for failure in report['failed']:
+        print(f"  ✗ Record {failure['record']}: {failure['error']}")
+
+if __name__ == "__main__":
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Bulk update WooCommerce prices and stock from a CSV file")
+    parser.add_argument("csv_path", help="CSV file with sku|id, regular_price, sale_price, stock_quantity, stock_status")
+    parser.add_argument("--batch-size", type=int, default=100, help="Items per batch request (max 100)")
+    parser.add_argument("--workers", type=int, default=4, help="Batch requests sent in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Show the changes without applying them")
+    args = parser.parse_args()
+
+    bulk_update_inventory(args.csv_path, batch_size=args.batch_size, workers=args.workers, dry_run=args.dry_run)
@@ -11,7 +11,7 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 # Import after path setup
-from woo_client import WooClient
+from woo_client import WooClient, ResponseCache
 from models.csv_product_importer import CSVProductImporter
 
 # Create logs directory if it doesn't exist
@@ -65,6 +65,10 @@ def import_products_from_csv(csv_file_path: str):
     try:
         logger.info(f"Starting import from {csv_file_path}")
         
+        # Reuse categories, attributes and media read by previous runs (within their TTL)
+        cache_path = os.getenv('WC_RESPONSE_CACHE_PATH')
+        response_cache = ResponseCache(cache_path) if cache_path else None
+        
         # Initialize the WooCommerce client
         client = WooClient(
             api_key=api_key,
@@ -72,7 +76,8 @@ def import_products_from_csv(csv_file_path: str):
             store_url=store_url,
             wp_username=wp_username,
             wp_password=wp_password,
-            verify_ssl=False
+            verify_ssl=False,
+            response_cache=response_cache
         )
         
         # Create the CSV importer
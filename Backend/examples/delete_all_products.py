@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import dotenv
 
 # For permanent deletion
@@ -9,6 +8,12 @@ import dotenv
 # To move products to trash instead
 #python examples/delete_all_products.py --trash
 
+# Preview what would be deleted, including media that would become unused
+#python examples/delete_all_products.py --delete-media --dry-run
+
+# Only delete draft products
+#python examples/delete_all_products.py --status draft
+
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -18,62 +23,92 @@ from woo_client import WooClient
 # Load environment variables
 dotenv.load_dotenv()
 
-def delete_all_products(force=True):
+def print_progress(stage, done, total):
+    """Print a single updating progress line"""
+    labels = {'collect': 'Collecting products', 'delete': 'Deleting products', 'media': 'Deleting media'}
+    if stage == 'collect':
+        print(f"\r{labels[stage]}... {done}", end="", flush=True)
+    else:
+        print(f"\r{labels[stage]}... {done}/{total}", end="", flush=True)
+    if done == total and stage != 'collect':
+        print()
+
+def delete_all_products(force=True, delete_media=False, dry_run=False, status=None, workers=4):
     """Delete all products from the WordPress store
     
     Args:
         force (bool): Whether to permanently delete products instead of trashing them
+        delete_media (bool): Whether to also delete media no longer used by any product
+        dry_run (bool): Only show what would be deleted
+        status (str): Only delete products with this status
+        workers (int): Number of requests sent in parallel
     """
     # Create a WooClient with credentials from environment variables
     client = WooClient(
         api_key=os.getenv("WC_KEY"),
         api_secret=os.getenv("WC_SECRET"),
         store_url=os.getenv("WC_URL"),
+        wp_username=os.getenv("WP_USERNAME"),
+        wp_password=os.getenv("WP_SECRET"),
         verify_ssl=False  # Set to True in production
     )
     
     try:
-        # Get a large number of products to ensure we get all of them
-        print("Fetching products...")
-        products = client.products.get_products(per_page=100)
-        
-        if not products:
-            print("No products found in the store.")
-            return
-        
-        print(f"Found {len(products)} products to delete.")
-        
-        
-        
-        # Delete each product
-        print("\nDeleting products...")
-        for product in products:
-            product_id = product['id']
-            product_name = product['name']
-            
-            try:
-                print(f"Deleting product ID {product_id}: {product_name}...", end="")
-                client.products.delete_product(product_id, force=force)
-                print(" ✓ Done")
-                
-                # Small delay to avoid overwhelming the API
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f" ✗ Failed: {e}")
-                
-        print("\nProduct deletion complete.")
-        
+        report = client.products.bulk_delete(
+            filters={'status': status} if status else None,
+            force=force,
+            max_workers=workers,
+            delete_media=delete_media,
+            media_client=client.media,
+            dry_run=dry_run,
+            progress=print_progress
+        )
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"\nError: {e}")
+        return
+    
+    print()
+    if not report['matched']:
+        print("No products found in the store.")
+        return
+    
+    if dry_run:
+        print(f"Would delete {report['matched']} products.")
+        if delete_media:
+            print(f"Would check {len(report['media_ids'])} media items for deletion.")
+        return
+    
+    print(f"Deleted {report['deleted']} of {report['matched']} products "
+          f"in {report['elapsed_seconds']}s ({report['requests']} requests).")
+    for failure in report['failed']:
+        print(f"  ✗ Product {failure['id']}: {failure['error']}")
+    
+    if delete_media:
+        print(f"Deleted {report['media_deleted']} media items.")
+        for failure in report['media_failed']:
+            print(f"  ✗ Media {failure['id']}: {failure['error']}")
+    
+    print("\nProduct deletion complete.")
 
 if __name__ == "__main__":
 
-    # Parse command-line arguments for force flag
+    # Parse command-line arguments
     import argparse
     parser = argparse.ArgumentParser(description="Delete all products from WooCommerce")
     parser.add_argument("--trash", action="store_true", help="Move products to trash instead of permanently deleting")
+    parser.add_argument("--delete-media", action="store_true", help="Also delete media no longer used by any product")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would be deleted")
+    parser.add_argument("--status", help="Only delete products with this status (e.g. draft)")
+    parser.add_argument("--workers", type=int, default=4, help="Requests sent in parallel")
     args = parser.parse_args()
+    if args.trash and args.delete_media:
+        parser.error("--delete-media deletes media permanently and cannot be combined with --trash")
     
     # Run the deletion with force=True for permanent deletion or force=False for trash
-    delete_all_products(force=not args.trash)
+    delete_all_products(
+        force=not args.trash,
+        delete_media=args.delete_media,
+        dry_run=args.dry_run,
+        status=args.status,
+        workers=args.workers
+    )
@@ -1,14 +1,27 @@
+import importlib
+
 from .product import Product, ProductAttribute, ProductCategory, ProductImage, ProductVariation
 
-# Import the CSVProductImporter class 
-try:
-    from .csv_product_importer import CSVProductImporter
-except ImportError:
-    # Handle case where someone is importing from another context
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from models.csv_product_importer import CSVProductImporter
+# Classes that need pandas/NumPy are imported on first access, so that
+# importing the models (or woo_client, which uses Product) stays fast
+_LAZY_IMPORTS = {
+    'ProductFrame': '.product_frame',
+    'CSVProductImporter': '.csv_product_importer',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 __all__ = [
     'Product',
@@ -17,4 +30,5 @@ __all__ = [
     'ProductImage',
     'ProductVariation',
     'CSVProductImporter',
+    'ProductFrame',
 ]
@@ -0,0 +1,168 @@
+import csv
+import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+import pandas as pd
+
+# Numbered column groups, e.g. attr_name_1, category_2, image_3
+_NUMBERED_COLUMN = re.compile(r'^(attr_name|attr_value|attr_var|category|include_hierarchy|image)_(\d+)$')
+
+PRICE_COLUMNS = ('regular_price', 'sale_price')
+STOCK_COLUMN = 'stock_quantity'
+TRUE_VALUES = ('true', 'yes', '1', 't', 'y')
+# Matched with a hash lookup instead of lowercasing every cell
+_TRUE_SPELLINGS = frozenset(v for value in TRUE_VALUES for v in (value, value.upper(), value.capitalize()))
+
+
+class ColumnLayout:
+    """Column layout of an import file, compiled once from its header
+
+    Replaces probing ``attr_name_{i}``, ``category_{i}`` and ``image_{i}`` on
+    every row: the numbered column groups present in the file are resolved
+    once, in order, and the row helpers only look at those columns.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        """Compile a layout
+
+        Args:
+            columns: Column names of the import file
+        """
+        self.columns = [c for c in columns if c is not None]
+
+        groups: Dict[str, Dict[int, str]] = {}
+        for column in self.columns:
+            match = _NUMBERED_COLUMN.match(column)
+            if match:
+                groups.setdefault(match.group(1), {})[int(match.group(2))] = column
+
+        names = groups.get('attr_name', {})
+        values = groups.get('attr_value', {})
+        variation_flags = groups.get('attr_var', {})
+        # (number, name column, value column, variation flag column)
+        self.attributes: List[Tuple[int, Optional[str], Optional[str], Optional[str]]] = [
+            (i, names.get(i), values.get(i), variation_flags.get(i))
+            for i in sorted(set(names) | set(values))
+        ]
+
+        hierarchy = groups.get('include_hierarchy', {})
+        # (number, category column, include hierarchy column)
+        self.categories: List[Tuple[int, str, Optional[str]]] = [
+            (i, column, hierarchy.get(i)) for i, column in sorted(groups.get('category', {}).items())
+        ]
+        # (number, image column)
+        self.images: List[Tuple[int, str]] = sorted(groups.get('image', {}).items())
+
+        self.bool_columns = [
+            c for c in self.columns
+            if c == 'manage_stock' or c in variation_flags.values() or c in hierarchy.values()
+        ]
+
+    def __repr__(self) -> str:
+        return (f"ColumnLayout(attributes={len(self.attributes)}, categories={len(self.categories)}, "
+                f"images={len(self.images)})")
+
+
+def read_csv_frame(file_path: str, delimiter: str = ',') -> pd.DataFrame:
+    """Read an import file as a DataFrame of strings
+
+    The delimiter is detected from the start of the file (comma, tab or
+    semicolon), falling back to ``delimiter``. Empty cells are read as NaN
+    and whitespace after delimiters is skipped by the C parser, so no
+    per-cell cleanup is needed afterwards.
+    """
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        try:
+            delimiter = csv.Sniffer().sniff(f.read(1024), delimiters=',\t;').delimiter
+        except csv.Error:
+            pass
+
+    return pd.read_csv(file_path, sep=delimiter, dtype=str, keep_default_na=False, na_values=[''],
+                       skipinitialspace=True, encoding='utf-8-sig')
+
+
+def frame_from_rows(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame of strings from row dictionaries (e.g. csv.DictReader rows)
+
+    Missing, NaN and blank values become NaN, like in read_csv_frame().
+    """
+    df = pd.DataFrame(rows, dtype=object)
+    # csv.DictReader stores surplus fields under the None key
+    df = df.loc[:, [c for c in df.columns if c is not None]]
+    missing = df.isna()
+    df = df.astype(str).apply(lambda column: column.str.strip())
+    return df.mask(missing | (df == ''))
+
+
+def normalize_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, ColumnLayout]:
+    """Normalize an import DataFrame column-wise, once per file
+
+    - empty cells (NaN) become None
+    - ``type`` is lowercased
+    - manage_stock, attr_var_* and include_hierarchy_* become bools
+    - prices stay strings (decimal commas are converted to points)
+    - stock_quantity becomes an int; values that are not whole numbers are
+      kept as they are so the row fails with a clear error
+
+    Columns without a header and columns without any value are dropped.
+
+    Args:
+        df: DataFrame of strings with NaN for empty cells, from
+            read_csv_frame() or frame_from_rows()
+
+    Returns:
+        Tuple of (normalized object DataFrame, compiled column layout)
+    """
+    # Columns without a header (trailing delimiters) carry no data
+    keep = [c for c in df.columns if isinstance(c, str) and c.strip() and not c.startswith('Unnamed:')]
+    layout = ColumnLayout(keep)
+
+    columns: Dict[str, pd.Series] = {}
+    for name in keep:
+        column = df[name]
+        missing = column.isna()
+        if missing.all():
+            continue
+
+        if name == 'type':
+            column = column.str.strip().str.lower()
+        elif name in layout.bool_columns:
+            column = column.str.strip().isin(_TRUE_SPELLINGS)
+        elif name in PRICE_COLUMNS:
+            # Only values that are not plain numbers need a closer look
+            odd = ~missing & pd.to_numeric(column, errors='coerce').isna()
+            if odd.any():
+                column = column.copy()
+                column[odd] = column[odd].str.strip().str.replace(r'^(\d+),(\d+)$', r'\1.\2', regex=True)
+        elif name == STOCK_COLUMN:
+            numbers = pd.to_numeric(column, errors='coerce')
+            whole = numbers.notna() & (numbers % 1 == 0)
+            column = column.astype(object)
+            column[whole] = numbers[whole].astype('int64').tolist()
+
+        columns[name] = column.astype(object).where(~missing, None)
+
+    return pd.DataFrame(columns, index=df.index), layout
+
+
+def to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Turn a normalized frame into one dictionary per row holding only its non-empty cells"""
+    names = list(frame.columns)
+    values = [frame[name].tolist() for name in names]
+    return [
+        {key: value for key, value in zip(names, row) if value is not None}
+        for row in zip(*values)
+    ]
+
+
+def prepare_frame(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], ColumnLayout]:
+    """Normalize an import DataFrame and turn it into compact row records
+
+    Args:
+        df: DataFrame of strings with NaN for empty cells
+
+    Returns:
+        Tuple of (records, layout), see normalize_frame() and to_records()
+    """
+    frame, layout = normalize_frame(df)
+    return to_records(frame), layout
@@ -1,8 +1,7 @@
-import csv
 import os
 import sys
 import pandas as pd
-from typing import List, Dict, Optional, Any, Union, TYPE_CHECKING
+from typing import List, Dict, Optional, Any, Tuple, Union, TYPE_CHECKING
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -12,10 +11,20 @@ if __name__ == "__main__":
     # When run directly as script
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from models.product import Product, ProductVariation, ProductAttribute, ProductImage
+    from models.csv_layout import ColumnLayout, frame_from_rows, normalize_frame, read_csv_frame, to_records
+    from models.csv_schema import compile_schema, validate_dataframe, validation_report
+    from models.import_plan import ImportPlanner
+    from models.import_report import DEFAULT_SLOWEST_ROWS, ImportProfiler
     from woo_client import WooClient
+    from woo_client.tracing import current_span, start_span
 else:
     # When imported as module
     from .product import Product, ProductVariation, ProductAttribute, ProductImage
+    from .csv_layout import ColumnLayout, frame_from_rows, normalize_frame, read_csv_frame, to_records
+    from .csv_schema import compile_schema, validate_dataframe, validation_report
+    from .import_plan import ImportPlanner
+    from .import_report import DEFAULT_SLOWEST_ROWS, ImportProfiler
+    from woo_client.tracing import current_span, start_span
     # Import WooClient for type checking
     if TYPE_CHECKING:
         from ..woo_client import WooClient
@@ -31,13 +40,14 @@ class CSVProductImporter:
     - Images from URLs or local paths
     """
     
-    def __init__(self, client: 'WooClient', logger=None):
+    def __init__(self, client: 'WooClient', logger=None, slowest_rows: int = DEFAULT_SLOWEST_ROWS):
         """
         Initialize the CSV product importer.
         
         Args:
             client: Initialized WooClient instance
             logger: Optional logger instance
+            slowest_rows: Number of slowest rows listed in the import report
         """
         self.client = client
         
@@ -64,39 +74,41 @@ class CSVProductImporter:
         self.created_products = []
         self.failed_products = []
         self.current_variable_product = None
+        self.layout: Optional[ColumnLayout] = None
+        self.slowest_rows = slowest_rows
+        self.profiler = ImportProfiler(slowest_rows)
+        # Lookups resolved once per import: global attributes by slug, and
+        # the categories added for a (category, include_hierarchy) cell
+        self._attribute_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._category_cache: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
     
-    def import_from_file(self, file_path: str, delimiter: str = ',') -> Dict[str, List]:
+    def import_from_file(self, file_path: str, delimiter: str = ',', dialect: Optional[str] = None,
+                         validate: bool = True) -> Dict[str, List]:
         """
         Import products from a CSV file.
         
         Args:
             file_path: Path to the CSV file
             delimiter: CSV delimiter character
+            dialect: Header dialect (see models.csv_schema.DIALECTS); detected when omitted
+            validate: Reject the whole file before any request if validation fails
             
         Returns:
-            Dictionary with created and failed products
+            Dictionary with created and failed products, and the timing report
+            under "report" (see models.import_report). When validation fails,
+            nothing is created and the validation report is under "validation".
         """
+        self.profiler = ImportProfiler(self.slowest_rows)
         try:
             self.logger.info(f"Attempting to parse CSV file: {file_path}")
             
-            # Use a robust CSV reader
-            products_data = []
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                # Sniff the delimiter to be more robust
-                try:
-                    dialect = csv.Sniffer().sniff(f.read(1024), delimiters=',\t;')
-                    f.seek(0)
-                    reader = csv.DictReader(f, dialect=dialect)
-                except csv.Error:
-                    self.logger.warning("Could not detect CSV dialect, falling back to default comma delimiter.")
-                    f.seek(0)
-                    reader = csv.DictReader(f)
-
-                for row in reader:
-                    products_data.append(row)
-                    
-            self.logger.info(f"Successfully loaded {len(products_data)} rows from CSV.")
-            return self.import_from_list(products_data)
+            with start_span('import_from_file', {'import.file': os.path.basename(file_path)}):
+                # The delimiter is sniffed from the start of the file
+                with self.profiler.phase('parse'):
+                    df = read_csv_frame(file_path, delimiter)
+                        
+                self.logger.info(f"Successfully loaded {len(df)} rows from CSV.")
+                return self._import_frame(df, dialect, validate)
         except Exception as e:
             self.logger.error(f"Failed to import products from {file_path}: {str(e)}")
             import traceback
@@ -106,23 +118,156 @@ class CSVProductImporter:
             return {
                 "created": self.created_products,
                 "failed": self.failed_products,
-                "error": str(e)
+                "error": str(e),
+                "report": self.profiler.report()
             }
     
-    def import_from_list(self, products_data: List[Dict]) -> Dict[str, List]:
+    def import_from_list(self, products_data: List[Dict], dialect: Optional[str] = None,
+                         validate: bool = True) -> Dict[str, List]:
         """
         Import products from a list of dictionaries.
         
         Args:
             products_data: List of product data dictionaries
+            dialect: Header dialect; detected when omitted
+            validate: Reject the whole list before any request if validation fails
             
         Returns:
             Dictionary with created and failed products
         """
+        return self.import_from_frame(frame_from_rows(products_data), dialect=dialect, validate=validate)
+    
+    def import_from_frame(self, df: pd.DataFrame, dialect: Optional[str] = None,
+                          validate: bool = True) -> Dict[str, List]:
+        """
+        Import products from a DataFrame with one column per CSV header.
+        
+        The header is mapped to the canonical columns (models.csv_schema) and
+        the whole frame is normalized column-wise before the rows are
+        processed (models.csv_layout).
+        
+        Args:
+            df: DataFrame of strings, one row per product or variation
+            dialect: Header dialect; detected when omitted
+            validate: Reject the whole frame before any request if validation fails
+            
+        Returns:
+            Dictionary with created and failed products, and the timing report
+        """
+        self.profiler = ImportProfiler(self.slowest_rows)
+        with start_span('import_from_frame'):
+            return self._import_frame(df, dialect, validate)
+    
+    def _import_frame(self, df: pd.DataFrame, dialect: Optional[str], validate: bool) -> Dict[str, Any]:
+        """Run an import with the current profiler collecting request counts"""
+        self.client.add_request_hook(self.profiler)
+        try:
+            results = self._process_frame(df, dialect, validate)
+        finally:
+            self.client.request_hooks.remove(self.profiler)
+        results["report"] = self.profiler.report()
+        current_span().set_attributes({"import.rows": results["report"]["rows"],
+                                       "import.created": len(results["created"]),
+                                       "import.failed": len(results["failed"])})
+        
+        summary = results["report"]
+        self.logger.info(f"Import took {summary['total_seconds']}s for {summary['rows']} rows, "
+                         f"{summary['requests']['total']} requests; phases: {summary['phases']}")
+        return results
+    
+    def _process_frame(self, df: pd.DataFrame, dialect: Optional[str], validate: bool) -> Dict[str, Any]:
+        """Validate and import a frame (see import_from_frame)"""
         self.created_products = []
         self.failed_products = []
         self.current_variable_product = None
+        self._attribute_cache = {}
+        self._category_cache = {}
+        
+        with self.profiler.phase('validate'):
+            schema = compile_schema(df.columns, dialect)
+        self.logger.debug(f"Compiled CSV schema: {schema}")
+        if schema.unknown_columns:
+            self.logger.warning(f"Ignoring unknown CSV columns: {', '.join(schema.unknown_columns)}")
+        if schema.file_errors:
+            return {
+                "created": [],
+                "failed": [],
+                "error": "; ".join(schema.file_errors),
+                "validation": validation_report(schema)
+            }
+        
+        with self.profiler.phase('parse'):
+            frame, self.layout = normalize_frame(schema.apply(df))
+        self.logger.debug(f"Compiled CSV layout: {self.layout}")
+        
+        if validate:
+            with self.profiler.phase('validate'):
+                report = validation_report(schema, frame, self.layout)
+            if not report['valid']:
+                self.logger.error(f"CSV validation failed with {report['error_count']} errors, nothing was imported")
+                return {
+                    "created": [],
+                    "failed": report['errors'],
+                    "error": f"CSV validation failed with {report['error_count']} errors",
+                    "validation": report
+                }
+        
+        with self.profiler.phase('parse'):
+            products_data = to_records(frame)
+        
+        with self.profiler.phase('categorize'):
+            simple_products, variable_products = self._group_rows(products_data)
+        
+        self.logger.debug(f"Found {len(simple_products)} simple products and {len(variable_products)} variable products")
+        
+        # Second pass: process products
+        
+        # Process all simple products
+        for index, product_data in simple_products:
+            try:
+                with self.profiler.row(index + 2, 'simple', product_data.get('sku')):
+                    self._process_simple_product(product_data)
+            except Exception as e:
+                self.logger.error(f"Row {index+2}: Error processing simple product: {str(e)}")
+                self.failed_products.append({
+                    "row": index + 2,
+                    "error": str(e),
+                    "data": product_data
+                })
+        
+        # Process each variable product with its variations
+        for key, group in variable_products.items():
+            parent_index, parent_data = group['parent']
+            variations_data = group['variations']
+            
+            self.logger.debug(f"Processing variable product {parent_data.get('name')} with {len(variations_data)} variations")
+            
+            try:
+                # Process the variable product with its variations
+                with self.profiler.row(parent_index + 2, 'variable', parent_data.get('sku')):
+                    self._process_variable_product_with_variations(parent_data, variations_data)
+            except Exception as e:
+                self.logger.error(f"Row {parent_index+2}: Error processing variable product: {str(e)}")
+                self.failed_products.append({
+                    "row": parent_index + 2,
+                    "error": str(e),
+                    "data": parent_data
+                })
         
+        return {
+            "created": self.created_products,
+            "failed": self.failed_products
+        }
+    
+    def _group_rows(self, products_data: List[Dict]) -> Tuple[List, Dict]:
+        """
+        Group rows into simple products and variable products with their variations.
+        
+        Rows that cannot be grouped are added to failed_products.
+        
+        Returns:
+            Tuple of (simple products, variable products), rows as (index, data) pairs
+        """
         # Group products by type to process variable products with their variations
         variable_products = {}  # Dictionary to store variable products and their variations
         simple_products = []    # List to store simple products
@@ -130,10 +275,8 @@ class CSVProductImporter:
         # First pass: categorize products
         for index, product_data in enumerate(products_data):
             try:
-                # Clean up the product data - convert empty strings to None
-                product_data = {k: v if pd.notna(v) and v != '' else None for k, v in product_data.items()}
-                
-                product_type = product_data.get('type', '').lower()
+                # Rows are already normalized: empty cells are left out, type is lowercase
+                product_type = product_data.get('type', '')
                 
                 if product_type == 'simple':
                     simple_products.append((index, product_data))
@@ -172,47 +315,92 @@ class CSVProductImporter:
                     "data": product_data
                 })
         
-        self.logger.debug(f"Found {len(simple_products)} simple products and {len(variable_products)} variable products")
+        return simple_products, variable_products
+    
+    def validate_file(self, file_path: str, delimiter: str = ',', dialect: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Validate a CSV file without sending any request.
         
-        # Second pass: process products
+        Args:
+            file_path: Path to the CSV file
+            delimiter: CSV delimiter character
+            dialect: Header dialect; detected when omitted
+            
+        Returns:
+            Validation report with per-row errors (see models.csv_schema.validate_dataframe)
+        """
+        return validate_dataframe(read_csv_frame(file_path, delimiter), dialect)
+    
+    def plan(self, file_path: str, delimiter: str = ',', dialect: Optional[str] = None, taxonomy=None,
+             latency: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Plan an import without writing anything to the store.
         
-        # Process all simple products
-        for index, product_data in simple_products:
-            try:
-                self._process_simple_product(product_data)
-            except Exception as e:
-                self.logger.error(f"Row {index+2}: Error processing simple product: {str(e)}")
-                self.failed_products.append({
-                    "row": index + 2,
-                    "error": str(e),
-                    "data": product_data
-                })
+        The file is parsed and validated like in import_from_file(), and
+        categories and global attributes are resolved against a taxonomy
+        index instead of the API. The plan counts the products, variations,
+        new categories, new attribute terms and image uploads, the HTTP
+        requests the import would make, and estimates its duration from the
+        latency measured while loading the index.
         
-        # Process each variable product with its variations
-        for key, group in variable_products.items():
-            parent_index, parent_data = group['parent']
-            variations_data = group['variations']
-            
-            self.logger.debug(f"Processing variable product {parent_data.get('name')} with {len(variations_data)} variations")
+        Args:
+            file_path: Path to the CSV file
+            delimiter: CSV delimiter character
+            dialect: Header dialect; detected when omitted
+            taxonomy: TaxonomyIndex to resolve against; a fresh one is loaded when omitted
+            latency: Optional overrides in seconds: 'read', 'write' and 'media'
             
-            try:
-                # Process the variable product with its variations
-                self._process_variable_product_with_variations(parent_data, variations_data)
-            except Exception as e:
-                self.logger.error(f"Row {parent_index+2}: Error processing variable product: {str(e)}")
-                self.failed_products.append({
-                    "row": parent_index + 2,
-                    "error": str(e),
-                    "data": parent_data
-                })
+        Returns:
+            Execution plan (see models.import_plan.ImportPlanner.result) with
+            the validation report under "validation"
+        """
+        return self.plan_frame(read_csv_frame(file_path, delimiter), dialect=dialect,
+                               taxonomy=taxonomy, latency=latency)
+    
+    def plan_frame(self, df: pd.DataFrame, dialect: Optional[str] = None, taxonomy=None,
+                   latency: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Plan the import of a DataFrame, see plan().
+        """
+        schema = compile_schema(df.columns, dialect)
+        if schema.file_errors:
+            report = validation_report(schema)
+            return {"valid": False, "rows": len(df), "validation": report}
+        
+        frame, self.layout = normalize_frame(schema.apply(df))
+        report = validation_report(schema, frame, self.layout)
+        
+        if taxonomy is None:
+            from woo_client.taxonomy_index import TaxonomyIndex
+            taxonomy = TaxonomyIndex()
+        # Only reads: categories, attributes and terms are fetched when missing or stale
+        taxonomy.ensure_fresh(self.client)
+        
+        self.failed_products = []
+        simple_products, variable_products = self._group_rows(to_records(frame))
+        
+        latency = latency or {}
+        planner = ImportPlanner(taxonomy, self.layout, read_seconds=latency.get('read'),
+                                write_seconds=latency.get('write'), media_seconds=latency.get('media'))
+        for _, product_data in simple_products:
+            planner.add_simple(product_data)
+        for group in variable_products.values():
+            planner.add_variable(group['parent'][1], group['variations'])
         
         return {
-            "created": self.created_products,
-            "failed": self.failed_products
+            "valid": report['valid'],
+            "rows": len(frame),
+            **planner.result(),
+            "skipped_rows": [{"row": f["row"], "error": f["error"]} for f in self.failed_products],
+            "validation": report
         }
     
     def _process_simple_product(self, product_data: Dict) -> None:
         """Process a simple product from CSV data"""
+        with self.profiler.phase('create'):
+            self._create_simple_product(product_data)
+    
+    def _create_simple_product(self, product_data: Dict) -> None:
         # Reset current variable product
         self.current_variable_product = None
         
@@ -227,7 +415,7 @@ class CSVProductImporter:
             description=product_data.get('description', ''),
             short_description=product_data.get('short_description', ''),
             sku=product_data.get('sku'),
-            stock_quantity=int(product_data.get('stock_quantity', 0)) if product_data.get('stock_quantity') else None,
+            stock_quantity=int(product_data['stock_quantity']) if product_data.get('stock_quantity') is not None else None,
             manage_stock=self._parse_bool(product_data.get('manage_stock', False))
         )
         
@@ -268,6 +456,10 @@ class CSVProductImporter:
     
     def _process_variable_product_with_variations(self, parent_data: Dict, variations_data: List) -> None:
         """Process a variable product with its variations"""
+        with self.profiler.phase('create'):
+            self._create_variable_product(parent_data, variations_data)
+    
+    def _create_variable_product(self, parent_data: Dict, variations_data: List) -> None:
         # Extract all attributes from the parent product first
         attributes_map = {}  # name -> set of options
         attr_names = []  # Store attribute names in order
@@ -276,12 +468,11 @@ class CSVProductImporter:
         self.logger.debug(f"Processing variable product: {parent_data.get('name')}")
         self.logger.debug(f"Found {len(variations_data)} variations")
         
+        layout = self._layout_for(parent_data)
+        
         # First gather all attribute names and values from the parent product
-        for i in range(1, 10):  # Support up to 10 attributes
-            attr_name_key = f'attr_name_{i}'
-            attr_value_key = f'attr_value_{i}'
-            
-            if attr_name_key in parent_data and parent_data[attr_name_key]:
+        for i, attr_name_key, attr_value_key, _ in layout.attributes:
+            if attr_name_key in parent_data:
                 attr_name = parent_data[attr_name_key]
                 attr_values_str = str(parent_data.get(attr_value_key, ''))
                 attr_values = [v.strip() for v in attr_values_str.split(',') if v.strip()]
@@ -297,14 +488,11 @@ class CSVProductImporter:
 
         # Now gather attributes from variations and track which ones are used
         for index, variation_data in variations_data:
-            for i in range(1, 10):  # Support up to 10 attributes
-                attr_value_key = f'attr_value_{i}'
-                
-                if attr_value_key in variation_data and variation_data[attr_value_key]:
+            for i, attr_name_key, attr_value_key, _ in layout.attributes:
+                if attr_value_key in variation_data:
                     attr_value = variation_data[attr_value_key]
                     
                     # Get attribute name from either variation or parent
-                    attr_name_key = f'attr_name_{i}'
                     attr_name = variation_data.get(attr_name_key)
                     
                     # If attr_name is None in the variation but we have a value, 
@@ -346,7 +534,7 @@ class CSVProductImporter:
                 try:
                     # Get the global attribute ID
                     attr_slug = attr_name[3:] if is_global else attr_name
-                    attr_obj = self.client.attributes.get_attribute_by_slug(attr_slug)
+                    attr_obj = self._get_global_attribute(attr_slug)
                     if attr_obj:
                         attr_id = attr_obj['id']
                 except Exception as e:
@@ -394,7 +582,7 @@ class CSVProductImporter:
         if parent_data.get('manage_stock') is not None:
             product.manage_stock = self._parse_bool(parent_data.get('manage_stock'))
             
-        if parent_data.get('stock_quantity'):
+        if parent_data.get('stock_quantity') is not None:
             product.stock_quantity = int(parent_data.get('stock_quantity'))
             
         if parent_data.get('stock_status'):
@@ -415,6 +603,7 @@ class CSVProductImporter:
             self.current_variable_product = {
                 "id": created_product['id'],
                 "data": created_product,
+                "row": parent_data,
                 "variations": []
             }
             
@@ -430,7 +619,8 @@ class CSVProductImporter:
             # Now create all the variations
             for index, variation_data in variations_data:
                 try:
-                    self._process_variation(variation_data)
+                    with self.profiler.row(index + 2, 'variation', variation_data.get('sku')):
+                        self._process_variation(variation_data)
                 except Exception as e:
                     self.logger.error(f"Row {index+2}: Error processing variation: {str(e)}")
                     self.failed_products.append({
@@ -445,6 +635,10 @@ class CSVProductImporter:
     
     def _process_variation(self, product_data: Dict) -> None:
         """Process a product variation from CSV data"""
+        with self.profiler.phase('variations'):
+            self._create_variation(product_data)
+    
+    def _create_variation(self, product_data: Dict) -> None:
         if not self.current_variable_product:
             raise ValueError("No parent variable product found for this variation")
         
@@ -455,12 +649,10 @@ class CSVProductImporter:
         # Infer attribute names from the parent if missing in the variation
         parent_attributes = {}
         
-        # Extract attribute names from parent
-        attr_names = []
-        for i in range(1, 10):  # Support up to 10 attributes
-            attr_name_key = f'attr_name_{i}'
-            if attr_name_key in parent_data and parent_data[attr_name_key]:
-                attr_names.append(parent_data[attr_name_key])
+        # Extract attribute names from the parent's CSV row (the API response has no attr_name_* keys)
+        parent_row = self.current_variable_product.get("row") or {}
+        layout = self._layout_for(product_data)
+        attr_names = [parent_row[name_key] for _, name_key, _, _ in layout.attributes if name_key in parent_row]
     
         # Ensure prices are strings
         # Use sale_price as regular_price if regular_price is None
@@ -477,13 +669,10 @@ class CSVProductImporter:
         # Extract attribute values from the variation row
         variation_attributes = []
         
-        # Loop through all possible attribute columns and match with parent attribute names
-        for i in range(1, 10):  # Support up to 10 attributes
-            attr_name_key = f'attr_name_{i}'
-            attr_value_key = f'attr_value_{i}'
-            
+        # Loop through the attribute columns and match with parent attribute names
+        for i, attr_name_key, attr_value_key, _ in layout.attributes:
             # Only process if we have a value for this attribute
-            if attr_value_key in product_data and product_data[attr_value_key]:
+            if attr_value_key in product_data:
                 # Get attribute name from either variation or parent
                 attr_name = product_data.get(attr_name_key)
                 
@@ -506,7 +695,7 @@ class CSVProductImporter:
                         # For global attributes, try to get the ID
                         try:
                             attr_slug = attr_name[3:]
-                            attr_obj = self.client.attributes.get_attribute_by_slug(attr_slug)
+                            attr_obj = self._get_global_attribute(attr_slug)
                             if attr_obj:
                                 variation_attributes.append({
                                     "id": attr_obj['id'],
@@ -537,7 +726,7 @@ class CSVProductImporter:
             regular_price=regular_price,
             sale_price=sale_price,
             sku=product_data.get('sku'),
-            stock_quantity=int(product_data.get('stock_quantity', 0)) if product_data.get('stock_quantity') else None,
+            stock_quantity=int(product_data['stock_quantity']) if product_data.get('stock_quantity') is not None else None,
             manage_stock=self._parse_bool(product_data.get('manage_stock', False))
         )
         
@@ -607,47 +796,52 @@ class CSVProductImporter:
     def _add_categories(self, product: Product, product_data: Dict) -> None:
         """Add categories to a product"""
         # Look for category_# columns
-        for i in range(1, 6):  # Support up to 5 categories
-            cat_key = f'category_{i}'
-            include_hierarchy_key = f'include_hierarchy_{i}'
-            
-            if cat_key in product_data and product_data[cat_key]:
+        for i, cat_key, include_hierarchy_key in self._layout_for(product_data).categories:
+            if cat_key in product_data:
                 category = product_data[cat_key]
                 include_hierarchy = self._parse_bool(product_data.get(include_hierarchy_key, False))
                 
                 self.logger.debug(f"Adding category '{category}' to product (include_hierarchy={include_hierarchy})")
                 
+                # The same cell resolves to the same categories for the whole import
+                key = (category, include_hierarchy)
+                cached = self._category_cache.get(key)
+                self.profiler.cache_lookup('categories', cached is not None)
+                if cached is not None:
+                    product.categories.extend(dict(cat) for cat in cached)
+                    continue
+                
+                added = len(product.categories)
                 try:
                     # Add the category to the product
-                    product.add_category(
-                        category=category,
-                        include_hierarchy=include_hierarchy,
-                        client=self.client
-                    )
+                    with self.profiler.phase('taxonomy'):
+                        product.add_category(
+                            category=category,
+                            include_hierarchy=include_hierarchy,
+                            client=self.client
+                        )
+                    self._category_cache[key] = [dict(cat) for cat in product.categories[added:]]
                 except Exception as e:
                     self.logger.warning(f"Could not add category '{category}': {str(e)}")
     
     def _add_attributes(self, product: Product, product_data: Dict, for_variation: bool = False) -> None:
         """Add attributes to a product"""
         # Extract attributes from the data
-        for i in range(1, 10):  # Support up to 10 attributes
-            attr_name_key = f'attr_name_{i}'
-            attr_value_key = f'attr_value_{i}'
-            attr_variation_key = f'attr_var_{i}'
-            
-            if attr_name_key in product_data and product_data[attr_name_key]:
+        for i, attr_name_key, attr_value_key, attr_variation_key in self._layout_for(product_data).attributes:
+            if attr_name_key in product_data:
                 attr_name = product_data[attr_name_key]
                 
                 # Split values by comma
                 attr_values = []
-                if attr_value_key in product_data and product_data[attr_value_key]:
+                if attr_value_key in product_data:
                     attr_values = str(product_data[attr_value_key]).split(',')
                     attr_values = [v.strip() for v in attr_values if v.strip()]
                 
                 # Check if it's for variation
                 is_variation = True  # Default to true for attributes in CSV
-                if attr_variation_key in product_data:
-                    is_variation = self._parse_bool(product_data[attr_variation_key])
+                if attr_variation_key is not None:
+                    # An empty attr_var cell means "not for variations"
+                    is_variation = self._parse_bool(product_data.get(attr_variation_key))
                 
                 # Skip if this is a variation attribute but we're not processing for variations
                 if is_variation and not for_variation:
@@ -666,7 +860,7 @@ class CSVProductImporter:
                         try:
                             # Extract slug and get attribute ID
                             attr_slug = attr_name[3:]  # Remove pa_ prefix
-                            attr_obj = self.client.attributes.get_attribute_by_slug(attr_slug)
+                            attr_obj = self._get_global_attribute(attr_slug)
                             if attr_obj:
                                 attr_id = attr_obj['id']
                         except Exception as e:
@@ -690,11 +884,13 @@ class CSVProductImporter:
     
     def _add_images(self, product: Product, product_data: Dict) -> None:
         """Add images to a product"""
+        with self.profiler.phase('media'):
+            self._upload_images(product, product_data)
+    
+    def _upload_images(self, product: Product, product_data: Dict) -> None:
         # Look for image_# columns
-        for i in range(1, 6):  # Support up to 5 images
-            image_key = f'image_{i}'
-            
-            if image_key in product_data and product_data[image_key]:
+        for i, image_key in self._layout_for(product_data).images:
+            if image_key in product_data:
                 image_path_or_url = product_data[image_key]
                 
                 try:
@@ -709,11 +905,13 @@ class CSVProductImporter:
     
     def _add_images_to_variation(self, variation: ProductVariation, product_data: Dict) -> None:
         """Add images to a variation"""
+        with self.profiler.phase('media'):
+            self._upload_variation_image(variation, product_data)
+    
+    def _upload_variation_image(self, variation: ProductVariation, product_data: Dict) -> None:
         # Look for image_# columns
-        for i in range(1, 6):  # Support up to 5 images
-            image_key = f'image_{i}'
-            
-            if image_key in product_data and product_data[image_key]:
+        for i, image_key in self._layout_for(product_data).images:
+            if image_key in product_data:
                 image_path_or_url = product_data[image_key]
                 
                 try:
@@ -729,6 +927,19 @@ class CSVProductImporter:
                 except Exception as e:
                     self.logger.warning(f"Could not add image {image_path_or_url}: {str(e)}")
     
+    def _get_global_attribute(self, attr_slug: str) -> Optional[Dict[str, Any]]:
+        """Get a global attribute by slug, requesting it once per import"""
+        hit = attr_slug in self._attribute_cache
+        self.profiler.cache_lookup('attributes', hit)
+        if not hit:
+            with self.profiler.phase('taxonomy'):
+                self._attribute_cache[attr_slug] = self.client.attributes.get_attribute_by_slug(attr_slug)
+        return self._attribute_cache[attr_slug]
+    
+    def _layout_for(self, product_data: Dict) -> ColumnLayout:
+        """Get the compiled layout of the current import, or compile one from the row's keys"""
+        return self.layout or ColumnLayout(product_data.keys())
+    
     def _parse_bool(self, value) -> bool:
         """Parse a boolean value from various formats"""
         if isinstance(value, bool):
@@ -0,0 +1,375 @@
+import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .csv_layout import ColumnLayout, normalize_frame, read_csv_frame
+
+PRODUCT_TYPES = ('simple', 'variable', 'variation')
+STOCK_STATUSES = ('instock', 'outofstock', 'onbackorder')
+PRODUCT_STATUSES = ('publish', 'draft', 'pending', 'private')
+
+# Columns every dialect accepts under their canonical name
+BASE_COLUMNS = (
+    'type', 'sku', 'name', 'description', 'short_description', 'regular_price', 'sale_price',
+    'sale_start_date', 'sale_end_date', 'manage_stock', 'stock_quantity', 'stock_status', 'status',
+    'weight', 'length', 'width', 'height',
+)
+
+# Default cap on the number of row errors in a validation report
+MAX_ERRORS = 1000
+
+
+class Slot:
+    """Column mapped to the next free number of a group, e.g. image_url -> image_2"""
+
+    def __init__(self, group: str):
+        self.group = group
+
+
+class Split:
+    """Column holding a separated list, spread over a numbered group, e.g. categories -> category_1..N"""
+
+    def __init__(self, group: str, separator: str = ','):
+        self.group = group
+        self.separator = separator
+
+
+ColumnSpec = Union[str, Slot, Split]
+
+
+class CSVDialect:
+    """Declarative description of an import file header
+
+    A dialect maps header names to the canonical columns read by the
+    importer (see docs/csv_import.md):
+
+    - ``columns`` maps exact header names to a canonical name, a Slot or a Split
+    - ``patterns`` maps header regexes to a canonical name template,
+      e.g. ``r'^attr_(\\d+)_name$'`` -> ``r'attr_name_\\1'``
+    - ``attribute_header`` is a regex whose first group is an attribute name
+      carried by the header itself, e.g. ``Attribute: Color``
+    """
+
+    def __init__(self, name: str, columns: Optional[Dict[str, ColumnSpec]] = None,
+                 patterns: Optional[Dict[str, str]] = None, attribute_header: Optional[str] = None):
+        self.name = name
+        self.columns = {column: column for column in BASE_COLUMNS}
+        self.columns.update(columns or {})
+        self.patterns = [(re.compile(pattern), template) for pattern, template in (patterns or {}).items()]
+        self.attribute_header = re.compile(attribute_header) if attribute_header else None
+
+    def match(self, header: str) -> Optional[Tuple[str, Any]]:
+        """Resolve one header to ('column', spec), ('pattern', name) or ('attribute', name)"""
+        if header in self.columns:
+            return 'column', self.columns[header]
+        for pattern, template in self.patterns:
+            if pattern.match(header):
+                return 'pattern', pattern.sub(template, header)
+        if self.attribute_header is not None:
+            match = self.attribute_header.match(header)
+            if match:
+                return 'attribute', match.group(1).strip()
+        return None
+
+    def __repr__(self) -> str:
+        return f"CSVDialect({self.name!r})"
+
+
+DIALECTS: Dict[str, CSVDialect] = {
+    # attr_name_N / attr_value_N / attr_var_N, category_N, image_N (docs/csv_import.md)
+    'canonical': CSVDialect(
+        'canonical',
+        patterns={r'^(attr_name|attr_value|attr_var|category|include_hierarchy|image)_(\d+)$': r'\1_\2'},
+    ),
+    # Attribute: {Name}, comma-separated categories and images (upload endpoint docs)
+    'labelled': CSVDialect(
+        'labelled',
+        columns={'price': 'regular_price', 'categories': Split('category'), 'images': Split('image')},
+        attribute_header=r'^Attribute:\s*(.+)$',
+    ),
+    # title, reg_price, attr_N_name, cat_slug, image_path/image_url (examples/products.csv)
+    'legacy': CSVDialect(
+        'legacy',
+        columns={
+            'title': 'name', 'desc': 'description', 'short_desc': 'short_description',
+            'reg_price': 'regular_price', 'cat_slug': Slot('category'), 'include_hierarchy': 'include_hierarchy_1',
+            'image_path': Slot('image'), 'image_url': Slot('image'),
+        },
+        patterns={r'^attr_(\d+)_(name|value|var)$': r'attr_\2_\1'},
+    ),
+}
+
+
+class CompiledSchema:
+    """Header of one file resolved against a dialect
+
+    Every source column is resolved once to a position-based operation, so
+    rewriting the file to canonical columns is a handful of column
+    operations, whatever the number of rows.
+    """
+
+    def __init__(self, dialect: CSVDialect, columns: Iterable[str]):
+        """Compile a header
+
+        Args:
+            dialect: Dialect the header is written in
+            columns: Header of the file, in order
+        """
+        self.dialect = dialect
+        self.columns = list(columns)
+        self.unknown_columns: List[str] = []
+        # (operation, source position, target)
+        self.operations: List[Tuple[str, int, Any]] = []
+
+        for position, header in enumerate(self.columns):
+            if not isinstance(header, str) or not header.strip() or header.startswith('Unnamed:'):
+                continue
+            resolved = dialect.match(header.strip())
+            if resolved is None:
+                self.unknown_columns.append(header)
+                continue
+            kind, target = resolved
+            if kind == 'attribute':
+                self.operations.append(('attribute', position, target))
+            elif isinstance(target, Split):
+                self.operations.append(('split', position, target))
+            elif isinstance(target, Slot):
+                self.operations.append(('slot', position, target.group))
+            else:
+                self.operations.append(('rename', position, target))
+
+        targets = {target for kind, _, target in self.operations if kind == 'rename'}
+        self.file_errors: List[str] = []
+        if 'type' not in targets:
+            self.file_errors.append("Missing required column: type")
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rewrite a DataFrame read with this header to canonical columns"""
+        out: Dict[str, pd.Series] = {}
+        used: Dict[str, int] = {}
+        renamed = {target for kind, _, target in self.operations if kind == 'rename'}
+
+        def next_slot(group: str) -> str:
+            # Numbers already taken by explicitly numbered columns are skipped
+            number = used.get(group, 0) + 1
+            while f'{group}_{number}' in out or f'{group}_{number}' in renamed:
+                number += 1
+            used[group] = number
+            return f'{group}_{number}'
+
+        product_type = None
+
+        for kind, position, target in self.operations:
+            column = df.iloc[:, position]
+            if kind == 'rename':
+                out[target] = column
+                if target == 'type':
+                    product_type = column.str.strip().str.lower()
+            elif kind == 'slot':
+                out[next_slot(target)] = column
+            elif kind == 'split':
+                parts = column.str.split(target.separator, expand=True)
+                for part in parts.columns:
+                    values = parts[part].str.strip()
+                    out[next_slot(target.group)] = values.where(values != '')
+
+        attributes = [(position, name) for kind, position, name in self.operations if kind == 'attribute']
+        if attributes:
+            # Attributes of simple products are plain attributes, the others are used for variations
+            simple = product_type.eq('simple') if product_type is not None else pd.Series(False, index=df.index)
+            for position, name in attributes:
+                number = next_slot('attr_name').rsplit('_', 1)[1]
+                values = df.iloc[:, position]
+                present = values.notna()
+                out[f'attr_name_{number}'] = pd.Series(name, index=df.index, dtype=object).where(present)
+                out[f'attr_value_{number}'] = values
+                out[f'attr_var_{number}'] = pd.Series(
+                    np.where(simple, 'false', 'true'), index=df.index, dtype=object
+                ).where(present)
+
+        return pd.DataFrame(out, index=df.index)
+
+    def __repr__(self) -> str:
+        return f"CompiledSchema(dialect={self.dialect.name!r}, operations={len(self.operations)})"
+
+
+def detect_dialect(columns: Iterable[str]) -> CSVDialect:
+    """Pick the dialect recognizing the most header columns (canonical wins ties)"""
+    headers = [c.strip() for c in columns if isinstance(c, str) and c.strip() and not c.startswith('Unnamed:')]
+    best, best_score = DIALECTS['canonical'], -1
+    for dialect in DIALECTS.values():
+        score = sum(1 for header in headers if dialect.match(header) is not None)
+        if score > best_score:
+            best, best_score = dialect, score
+    return best
+
+
+def compile_schema(columns: Iterable[str], dialect: Optional[str] = None) -> CompiledSchema:
+    """Compile a file header into a schema
+
+    Args:
+        columns: Header of the file
+        dialect: Name of a dialect in DIALECTS; detected from the header when omitted
+
+    Raises:
+        ValueError: If the dialect is unknown
+    """
+    columns = list(columns)
+    if dialect is None:
+        return CompiledSchema(detect_dialect(columns), columns)
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unknown CSV dialect: {dialect}")
+    return CompiledSchema(DIALECTS[dialect], columns)
+
+
+def validate_frame(frame: pd.DataFrame, layout: ColumnLayout,
+                   max_errors: int = MAX_ERRORS) -> Tuple[List[Dict[str, Any]], int]:
+    """Check a normalized frame (see normalize_frame) without any request
+
+    Every rule is evaluated on whole columns; only the failing rows are
+    turned into error entries. Row numbers match the CSV file (header is
+    row 1), like the importer's failure report.
+
+    Args:
+        frame: Normalized frame in canonical columns
+        layout: Layout of the frame
+        max_errors: Maximum number of error entries returned
+
+    Returns:
+        Tuple of (errors, total error count); each error has row, column and error
+    """
+    empty = pd.Series(None, index=frame.index, dtype=object)
+
+    def col(name: str) -> pd.Series:
+        return frame[name] if name in frame else empty
+
+    product_type = col('type')
+    parent = product_type.isin(('simple', 'variable'))
+    variable = product_type.eq('variable')
+    variation = product_type.eq('variation')
+
+    checks = [
+        (product_type.isna(), 'type', lambda v: "Missing product type"),
+        (product_type.notna() & ~product_type.isin(PRODUCT_TYPES), 'type',
+         lambda v: f"Unsupported product type: {v}"),
+        (parent & col('name').isna(), 'name', lambda v: "Name is required"),
+        (variation & ~variable.cummax(), 'type', lambda v: "Variation found without a parent variable product"),
+    ]
+
+    prices = {}
+    for name in ('regular_price', 'sale_price'):
+        values = col(name)
+        prices[name] = pd.to_numeric(values, errors='coerce')
+        checks.append((values.notna() & prices[name].isna(), name, lambda v: f"Invalid price: {v}"))
+        checks.append((prices[name] < 0, name, lambda v: f"Price cannot be negative: {v}"))
+    checks.append((prices['sale_price'] >= prices['regular_price'], 'sale_price',
+                   lambda v: f"Sale price {v} must be lower than the regular price"))
+
+    stock = col('stock_quantity')
+    numbers = pd.to_numeric(stock, errors='coerce')
+    checks.append((stock.notna() & ~(numbers % 1 == 0), 'stock_quantity', lambda v: f"Stock quantity must be a whole number: {v}"))
+    checks.append((col('stock_status').notna() & ~col('stock_status').isin(STOCK_STATUSES), 'stock_status',
+                   lambda v: f"Invalid stock status: {v}"))
+    checks.append((col('status').notna() & ~col('status').isin(PRODUCT_STATUSES), 'status',
+                   lambda v: f"Invalid status: {v}"))
+
+    sku = col('sku')
+    checks.append((sku.notna() & sku.duplicated(keep=False), 'sku', lambda v: f"Duplicate SKU in file: {v}"))
+
+    name_columns = [name for _, name, _, _ in layout.attributes if name in frame]
+    value_columns = [value for _, _, value, _ in layout.attributes if value in frame]
+    has_values = frame[value_columns].notna().any(axis=1) if value_columns else pd.Series(False, index=frame.index)
+    has_names = frame[name_columns].notna().any(axis=1) if name_columns else pd.Series(False, index=frame.index)
+    checks.append((variation & ~has_values, 'attr_value', lambda v: "Variation has no attribute values"))
+
+    # A variable product needs attribute names on its own row or on one of its variations
+    group = variable.cumsum()
+    named_groups = (has_names & (variable | variation)).groupby(group).transform('any')
+    checks.append((variable & ~named_groups, 'attr_name', lambda v: "No attributes found for variable product"))
+
+    errors = []
+    total = 0
+    for mask, column, message in checks:
+        failing = np.flatnonzero(mask.to_numpy(dtype=bool))
+        total += len(failing)
+        values = col(column) if column in frame else empty
+        for position in failing[:max(0, max_errors - len(errors))]:
+            errors.append({
+                'row': int(position) + 2,
+                'column': column,
+                'error': message(values.iat[position]),
+            })
+
+    errors.sort(key=lambda e: e['row'])
+    return errors, total
+
+
+def validation_report(schema: CompiledSchema, frame: Optional[pd.DataFrame] = None,
+                      layout: Optional[ColumnLayout] = None, max_errors: int = MAX_ERRORS) -> Dict[str, Any]:
+    """Build the validation report of a compiled file
+
+    Args:
+        schema: Compiled header of the file
+        frame: Normalized frame (see normalize_frame); omitted when the header itself is invalid
+        layout: Layout of the frame
+        max_errors: Maximum number of row errors in the report
+
+    Returns:
+        Validation report: valid, dialect, rows, file_errors, errors,
+        error_count and unknown_columns
+    """
+    report: Dict[str, Any] = {
+        'valid': False,
+        'dialect': schema.dialect.name,
+        'rows': len(frame) if frame is not None else 0,
+        'file_errors': list(schema.file_errors),
+        'errors': [],
+        'error_count': 0,
+        'unknown_columns': schema.unknown_columns,
+    }
+    if schema.file_errors or frame is None:
+        return report
+
+    report['errors'], report['error_count'] = validate_frame(frame, layout, max_errors)
+    report['valid'] = report['error_count'] == 0
+    return report
+
+
+def validate_dataframe(df: pd.DataFrame, dialect: Optional[str] = None,
+                       max_errors: int = MAX_ERRORS) -> Dict[str, Any]:
+    """Validate an import DataFrame (strings, NaN for empty cells)
+
+    Args:
+        df: DataFrame read with read_csv_frame() or frame_from_rows()
+        dialect: Header dialect; detected when omitted
+        max_errors: Maximum number of row errors in the report
+
+    Returns:
+        Validation report, see validation_report()
+    """
+    schema = compile_schema(df.columns, dialect)
+    if schema.file_errors:
+        report = validation_report(schema, max_errors=max_errors)
+        report['rows'] = len(df)
+        return report
+
+    frame, layout = normalize_frame(schema.apply(df))
+    return validation_report(schema, frame, layout, max_errors)
+
+
+def validate_file(file_path: str, delimiter: str = ',', dialect: Optional[str] = None,
+                  max_errors: int = MAX_ERRORS) -> Dict[str, Any]:
+    """Validate an import CSV file without sending any request
+
+    Args:
+        file_path: Path to the CSV file
+        delimiter: Delimiter used when it cannot be detected
+        dialect: Header dialect; detected when omitted
+        max_errors: Maximum number of row errors in the report
+
+    Returns:
+        Validation report, see validate_dataframe()
+    """
+    return validate_dataframe(read_csv_frame(file_path, delimiter), dialect, max_errors)
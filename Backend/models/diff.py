@@ -0,0 +1,56 @@
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Optional
+
+# Fields compared numerically, so "19.9" and "19.90" count as unchanged
+PRICE_FIELDS = ('regular_price', 'sale_price', 'price')
+
+
+def diff(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the top-level fields of ``new`` that differ from ``old``
+
+    Both sides are WooCommerce payloads (e.g. the output of ``to_dict()``).
+    Lists and nested objects are compared as a whole and returned in full when
+    anything inside them changed, because WooCommerce replaces them on update.
+    Keys missing from ``new`` are not reported, as ``to_dict()`` leaves out
+    fields that are not set.
+
+    Args:
+        old: Previous payload, or None when there is nothing to compare with
+        new: Updated payload
+
+    Returns:
+        Dictionary with the changed fields only (empty if nothing changed)
+    """
+    if old is None:
+        return dict(new)
+
+    changes = {}
+    for key, value in new.items():
+        if key not in old:
+            if not _is_empty(value):
+                changes[key] = value
+        elif not _equal(key, old[key], value):
+            changes[key] = value
+    return changes
+
+
+def _equal(key: str, old: Any, new: Any) -> bool:
+    """Compare two field values the way WooCommerce stores them"""
+    if _is_empty(old) and _is_empty(new):
+        return True
+    if key in PRICE_FIELDS:
+        return _to_decimal(old) == _to_decimal(new)
+    return old == new
+
+
+def _is_empty(value: Any) -> bool:
+    """WooCommerce returns "" for unset strings, so treat None and "" alike"""
+    return value is None or value == ''
+
+
+def _to_decimal(value: Any) -> Any:
+    """Convert a price to Decimal, leaving invalid values as they are"""
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return value
@@ -0,0 +1,254 @@
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+from woo_client.taxonomy_index import slugify
+
+from .csv_layout import ColumnLayout
+
+# Used when no read latency could be measured
+DEFAULT_READ_SECONDS = 0.3
+# Creating products, variations and categories is slower than reading on WooCommerce
+WRITE_LATENCY_FACTOR = 3.0
+# A media upload includes fetching the image and WordPress generating thumbnails
+MEDIA_UPLOAD_SECONDS = 2.0
+
+# Request kinds counted by the planner, by the latency class used for the estimate
+READ_KINDS = ('category_lookup', 'category_hierarchy', 'attribute_lookup')
+WRITE_KINDS = ('category_create', 'product_create', 'variation_create')
+MEDIA_KINDS = ('media_upload',)
+
+
+class ImportPlanner:
+    """Dry-run of CSVProductImporter: counts what an import would create and request
+
+    Follows the same code paths as the importer (category lookups and
+    hierarchies, global attribute lookups, image uploads, product and
+    variation creation) but resolves taxonomy against a TaxonomyIndex
+    instead of calling the API, so nothing is written.
+    """
+
+    def __init__(self, taxonomy, layout: ColumnLayout, read_seconds: Optional[float] = None,
+                 write_seconds: Optional[float] = None, media_seconds: Optional[float] = None):
+        """Initialize the planner
+
+        Args:
+            taxonomy: Loaded TaxonomyIndex of the target store
+            layout: Layout of the file being planned
+            read_seconds: Seconds per GET (defaults to the latency measured by the index)
+            write_seconds: Seconds per create request (defaults to read_seconds x WRITE_LATENCY_FACTOR)
+            media_seconds: Seconds per image upload (defaults to MEDIA_UPLOAD_SECONDS)
+        """
+        self.taxonomy = taxonomy
+        self.layout = layout
+        # Where each estimate comes from: 'measured' (by the index), 'given' (by the caller) or 'assumed'
+        self.sources: Dict[str, str] = {}
+        if read_seconds is not None:
+            self.read_seconds, self.sources['read'] = read_seconds, 'given'
+        elif taxonomy.read_latency is not None:
+            self.read_seconds, self.sources['read'] = taxonomy.read_latency, 'measured'
+        else:
+            self.read_seconds, self.sources['read'] = DEFAULT_READ_SECONDS, 'assumed'
+        if write_seconds is not None:
+            self.write_seconds, self.sources['write'] = write_seconds, 'given'
+        else:
+            # Derived from the read latency with an assumed factor, so never measured
+            self.write_seconds, self.sources['write'] = self.read_seconds * WRITE_LATENCY_FACTOR, 'assumed'
+        if media_seconds is not None:
+            self.media_seconds, self.sources['media'] = media_seconds, 'given'
+        else:
+            self.media_seconds, self.sources['media'] = MEDIA_UPLOAD_SECONDS, 'assumed'
+
+        self.calls: Counter = Counter()
+        self.counts: Counter = Counter()
+        self.existing_categories: Dict[str, str] = {}
+        self.new_categories: Dict[str, str] = {}
+        self.global_attributes: Dict[str, int] = {}
+        self.missing_attributes = set()
+        self.new_terms: Dict[str, set] = {}
+        self.image_downloads = 0
+        # The importer resolves each category cell and global attribute once per import
+        self.resolved_categories = set()
+        self.looked_up_attributes = set()
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def add_simple(self, row: Dict[str, Any]) -> None:
+        """Plan a simple product row"""
+        self.counts['simple'] += 1
+        self._categories(row)
+        for name, values, for_variation in self._row_attributes(row):
+            if not for_variation and values:
+                self._global_attribute(name, values)
+        self._images(row, first_only=False)
+        self.calls['product_create'] += 1
+
+    def add_variable(self, parent: Dict[str, Any], variations: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Plan a variable product row and its variation rows"""
+        self.counts['variable'] += 1
+
+        options: Dict[str, set] = {}
+        parent_names = []
+        for name, values, _ in self._row_attributes(parent):
+            options.setdefault(name, set()).update(values)
+            parent_names.append(name)
+        for _, variation in variations:
+            for name, value in self._variation_attributes(variation, parent_names):
+                options.setdefault(name, set()).add(value)
+
+        for name, values in options.items():
+            self._global_attribute(name, values)
+        self._categories(parent)
+        self._images(parent, first_only=False)
+        self.calls['product_create'] += 1
+
+        for _, variation in variations:
+            self.counts['variations'] += 1
+            for name, _ in self._variation_attributes(variation, parent_names):
+                if name.startswith('pa_'):
+                    self._count_attribute_lookup(name)
+            self._images(variation, first_only=True)
+            self.calls['variation_create'] += 1
+
+    # ------------------------------------------------------------------
+    # Row parts
+    # ------------------------------------------------------------------
+
+    def _row_attributes(self, row: Dict[str, Any]):
+        """Yield (name, values, for_variation) for the attributes named on a row"""
+        for _, name_key, value_key, var_key in self.layout.attributes:
+            if name_key not in row:
+                continue
+            values = [v.strip() for v in str(row.get(value_key, '')).split(',') if v.strip()]
+            for_variation = True if var_key is None else row.get(var_key) is True
+            yield row[name_key], values, for_variation
+
+    def _variation_attributes(self, row: Dict[str, Any], parent_names: List[str]):
+        """Yield (name, value) for a variation row, taking missing names from the parent by position"""
+        for i, name_key, value_key, _ in self.layout.attributes:
+            if value_key not in row:
+                continue
+            name = row.get(name_key)
+            if name is None and i - 1 < len(parent_names):
+                name = parent_names[i - 1]
+            if name:
+                yield name, str(row[value_key])
+
+    def _categories(self, row: Dict[str, Any]) -> None:
+        """Count the requests made by Product.add_category for each category of a row"""
+        for _, category_key, hierarchy_key in self.layout.categories:
+            if category_key not in row:
+                continue
+            value = str(row[category_key])
+            include_hierarchy = hierarchy_key is not None and row.get(hierarchy_key) is True
+            if (value, include_hierarchy) in self.resolved_categories:
+                continue
+            self.resolved_categories.add((value, include_hierarchy))
+            found = self._find_category(value)
+
+            # get_category_by_slug (or get_or_create_category's own lookup)
+            self.calls['category_lookup'] += 1
+            if found is None:
+                if not include_hierarchy:
+                    # get_or_create_category looks the slug up again before creating
+                    self.calls['category_lookup'] += 1
+                self.calls['category_create'] += 1
+                self.new_categories[slugify(value)] = value
+            if include_hierarchy:
+                # get_category_hierarchy fetches the category and each ancestor
+                depth = len(self.taxonomy.category_path(found['id'])) if found else 1
+                self.calls['category_hierarchy'] += max(depth, 1)
+
+    def _find_category(self, value: str) -> Optional[Dict[str, Any]]:
+        """Resolve a category against the index, or categories the import itself will create"""
+        found = self.taxonomy.find_category(value)
+        if found is not None:
+            self.existing_categories[found['slug']] = found['name']
+            return found
+        if slugify(value) in self.new_categories:
+            # Created earlier in the same import; a new category has no ancestors
+            return {'id': None, 'slug': slugify(value), 'name': value}
+        return None
+
+    def _global_attribute(self, name: str, values) -> None:
+        """Count the lookup of a global attribute and collect the terms WooCommerce will add"""
+        if not name.startswith('pa_'):
+            return
+        self._count_attribute_lookup(name)
+        attribute = self.taxonomy.find_attribute(name)
+        if attribute is None:
+            self.missing_attributes.add(name)
+            return
+        self.global_attributes[name] = attribute['id']
+        for value in values:
+            if self.taxonomy.find_term(attribute, value) is None:
+                self.new_terms.setdefault(name, set()).add(value)
+
+    def _count_attribute_lookup(self, name: str) -> None:
+        """Count get_attribute_by_slug the first time an attribute is seen"""
+        if name not in self.looked_up_attributes:
+            self.looked_up_attributes.add(name)
+            self.calls['attribute_lookup'] += 1
+
+    def _images(self, row: Dict[str, Any], first_only: bool) -> None:
+        """Count image uploads (variations only use their first image)"""
+        for _, image_key in self.layout.images:
+            if image_key not in row:
+                continue
+            self.calls['media_upload'] += 1
+            if str(row[image_key]).startswith(('http://', 'https://')):
+                self.image_downloads += 1
+            if first_only:
+                break
+
+    # ------------------------------------------------------------------
+    # Result
+    # ------------------------------------------------------------------
+
+    def result(self) -> Dict[str, Any]:
+        """Build the execution plan
+
+        Returns:
+            Plan with product counts, taxonomy to be created, request counts
+            by kind and the estimated duration of a sequential import
+        """
+        reads = sum(self.calls[kind] for kind in READ_KINDS)
+        writes = sum(self.calls[kind] for kind in WRITE_KINDS)
+        uploads = sum(self.calls[kind] for kind in MEDIA_KINDS)
+        estimated = reads * self.read_seconds + writes * self.write_seconds + uploads * self.media_seconds
+
+        return {
+            'products': {
+                'simple': self.counts['simple'],
+                'variable': self.counts['variable'],
+                'variations': self.counts['variations'],
+            },
+            'categories': {
+                'existing': sorted(self.existing_categories.values()),
+                'new': sorted(self.new_categories.values()),
+            },
+            'attributes': {
+                'global': sorted(self.global_attributes),
+                'missing': sorted(self.missing_attributes),
+                'new_terms': {name: sorted(values) for name, values in sorted(self.new_terms.items())},
+            },
+            'images': {
+                'uploads': uploads,
+                'downloads': self.image_downloads,
+            },
+            'calls': {
+                'total': reads + writes + uploads,
+                'reads': reads,
+                'writes': writes,
+                'media_uploads': uploads,
+                'by_kind': {kind: self.calls[kind] for kind in READ_KINDS + WRITE_KINDS + MEDIA_KINDS},
+            },
+            'latency': {
+                'read_seconds': round(self.read_seconds, 4),
+                'write_seconds': round(self.write_seconds, 4),
+                'media_seconds': round(self.media_seconds, 4),
+                'sources': dict(self.sources),
+            },
+            'estimated_seconds': round(estimated, 1),
+        }
@@ -0,0 +1,169 @@
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from woo_client.tracing import start_span
+
+# Phases of an import, in the order they run. Nested phases are timed
+# exclusively: media uploads made while creating a product count as media.
+PHASES = ('parse', 'validate', 'categorize', 'taxonomy', 'media', 'create', 'variations')
+
+# Number of slowest rows kept in the report
+DEFAULT_SLOWEST_ROWS = 10
+
+
+class ImportProfiler:
+    """Timing report of one CSVProductImporter run
+
+    Times the import phases, counts the upstream requests by endpoint (it is
+    a request hook, see BaseWooClient.add_request_hook), tracks the hit rates
+    of the importer's lookup caches and keeps the slowest rows with the
+    breakdown of their time. When tracing is on, rows and phases are also
+    recorded as spans.
+    """
+
+    def __init__(self, slowest_rows: int = DEFAULT_SLOWEST_ROWS):
+        """Start a report
+
+        Args:
+            slowest_rows: Number of slowest rows to keep
+        """
+        self.slowest_rows = slowest_rows
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.caches: Dict[str, Dict[str, int]] = {}
+        self.rows = 0
+        self._slowest: List = []
+        self._phase_stack: List[List] = []
+        self._row_stack: List[Dict[str, Any]] = []
+        self._thread = threading.get_ident()
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase, excluding the phases nested in it"""
+        frame = [name, 0.0]  # seconds spent in nested phases
+        self._phase_stack.append(frame)
+        started = time.perf_counter()
+        try:
+            with start_span(f'import.{name}'):
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._phase_stack.pop()
+            own = elapsed - frame[1]
+            self.phases[name] = self.phases.get(name, 0.0) + own
+            if self._row_stack:
+                row_phases = self._row_stack[-1]['phases']
+                row_phases[name] = row_phases.get(name, 0.0) + own
+            if self._phase_stack:
+                self._phase_stack[-1][1] += elapsed
+
+    @contextmanager
+    def row(self, row: int, kind: str, sku: Optional[str] = None):
+        """Time one CSV row (variation rows nested in their parent are timed separately)
+
+        Args:
+            row: Row number in the file (the header is row 1)
+            kind: Product type of the row
+            sku: SKU of the row, if any
+        """
+        record = {'row': row, 'type': kind, 'sku': sku, 'phases': {}, 'requests': 0, 'request_seconds': 0.0,
+                  '_nested': 0.0}
+        self._row_stack.append(record)
+        started = time.perf_counter()
+        try:
+            with start_span('import.row', {'import.row': row, 'import.type': kind, 'product.sku': sku}) as span:
+                try:
+                    yield
+                finally:
+                    span.set_attribute('import.requests', record['requests'])
+        finally:
+            elapsed = time.perf_counter() - started
+            self._row_stack.pop()
+            if self._row_stack:
+                self._row_stack[-1]['_nested'] += elapsed
+            record['seconds'] = elapsed - record.pop('_nested')
+            self.rows += 1
+            entry = (record['seconds'], self.rows, record)
+            if len(self._slowest) < self.slowest_rows:
+                heapq.heappush(self._slowest, entry)
+            elif self.slowest_rows:
+                heapq.heappushpop(self._slowest, entry)
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        """Count a hit or a miss of one of the importer's lookup caches"""
+        counts = self.caches.setdefault(cache, {'hits': 0, 'misses': 0})
+        counts['hits' if hit else 'misses'] += 1
+
+    def __call__(self, event) -> None:
+        """Request hook: count the requests made by the importing thread"""
+        if threading.get_ident() != self._thread:
+            return
+        prefix = '/wp/v2' if event.api == 'wp' else ''
+        key = f"{event.method} {prefix}{event.endpoint}"
+        stats = self.requests.get(key)
+        if stats is None:
+            stats = self.requests[key] = {'count': 0, 'seconds': 0.0, 'bytes_sent': 0, 'bytes_received': 0,
+                                          'retries': 0, 'errors': 0}
+        stats['count'] += 1
+        stats['seconds'] += event.duration
+        stats['bytes_sent'] += event.bytes_sent
+        stats['bytes_received'] += event.bytes_received
+        stats['retries'] += event.retries
+        if event.error:
+            stats['errors'] += 1
+        if self._row_stack:
+            self._row_stack[-1]['requests'] += 1
+            self._row_stack[-1]['request_seconds'] += event.duration
+
+    def finish(self) -> None:
+        """Stop the clock (report() stops it too)"""
+        if self._finished is None:
+            self._finished = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        """Build the report
+
+        Returns:
+            Total and per-phase seconds, request counts by endpoint, bytes
+            uploaded and downloaded, cache hit rates and the slowest rows
+        """
+        self.finish()
+        total = self._finished - self._started
+        requests = {key: {**stats, 'seconds': round(stats['seconds'], 4)}
+                    for key, stats in sorted(self.requests.items(), key=lambda item: -item[1]['seconds'])}
+        caches = {}
+        for name, counts in self.caches.items():
+            lookups = counts['hits'] + counts['misses']
+            caches[name] = {**counts, 'hit_rate': round(counts['hits'] / lookups, 4) if lookups else None}
+        slowest = []
+        for seconds, _, record in sorted(self._slowest, key=lambda entry: -entry[0]):
+            slowest.append({
+                'row': record['row'],
+                'type': record['type'],
+                'sku': record['sku'],
+                'seconds': round(seconds, 4),
+                'phases': {name: round(value, 4) for name, value in record['phases'].items() if round(value, 4)},
+                'requests': record['requests'],
+                'request_seconds': round(record['request_seconds'], 4),
+            })
+
+        return {
+            'total_seconds': round(total, 4),
+            'rows': self.rows,
+            'rows_per_second': round(self.rows / total, 2) if total and self.rows else None,
+            'phases': {name: round(value, 4) for name, value in self.phases.items()},
+            'requests': {
+                'total': sum(stats['count'] for stats in self.requests.values()),
+                'seconds': round(sum(stats['seconds'] for stats in self.requests.values()), 4),
+                'by_endpoint': requests,
+            },
+            'bytes_uploaded': sum(stats['bytes_sent'] for stats in self.requests.values()),
+            'bytes_downloaded': sum(stats['bytes_received'] for stats in self.requests.values()),
+            'caches': caches,
+            'slowest_rows': slowest,
+        }
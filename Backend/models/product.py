@@ -1,9 +1,28 @@
 from typing import List, Dict, Optional, Any, Union, Literal
 from datetime import datetime
 from decimal import Decimal
+import copy
+import gc
 import re
 from pydantic import BaseModel, Field, validator, model_validator
 
+from .diff import diff
+
+
+def _construct_trusted(model_cls, values: Dict[str, Any], private: Optional[Dict[str, Any]] = None):
+    """Create a model instance from already-valid values without validation
+
+    Equivalent to model_cls.model_construct(**values) when ``values`` holds
+    every field, but without the per-field default handling, which dominates
+    the cost of building thousands of small nested models.
+    """
+    instance = model_cls.__new__(model_cls)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__pydantic_fields_set__', set(values))
+    object.__setattr__(instance, '__pydantic_extra__', None)
+    object.__setattr__(instance, '__pydantic_private__', private)
+    return instance
+
 
 class ProductImage(BaseModel):
     """WooCommerce product image with validation"""
@@ -72,7 +91,8 @@ class ProductVariation(BaseModel):
 
     @validator('regular_price', 'sale_price')
     def validate_price(cls, v):
-        if v is not None:
+        # WooCommerce uses "" for prices that are not set
+        if v is not None and v != '':
             # Convert numeric values to strings
             if isinstance(v, (int, float)):
                 v = str(v)
@@ -241,10 +261,16 @@ class Product(BaseModel):
     # Add dimensions and weight fields to store these values
     _dimensions: Optional[Dict[str, str]] = None
     _weight: Optional[str] = None
+
+    # Snapshot of to_dict() taken when loaded from the API, used by changes()
+    _original: Optional[Dict[str, Any]] = None
+    # API data a trusted model was built from; the snapshot is derived from it on first use
+    _source: Optional[Dict[str, Any]] = None
     
     @validator('regular_price', 'sale_price')
     def validate_price(cls, v):
-        if v is not None:
+        # WooCommerce uses "" for prices that are not set
+        if v is not None and v != '':
             # Convert numeric values to strings
             if isinstance(v, (int, float)):
                 v = str(v)
@@ -362,6 +388,27 @@ class Product(BaseModel):
         self.manage_stock = manage
         self.stock_status = 'instock' if quantity > 0 else 'outofstock'
 
+    def changes(self) -> Dict[str, Any]:
+        """Get the fields changed since the model was loaded
+
+        Returns the full payload for models that were not loaded with
+        from_dict(), and an empty dictionary when nothing changed.
+        """
+        if self._original is None and self._source is not None:
+            self._original = type(self).from_api(self._source).to_dict()
+            self._source = None
+        return diff(self._original, self.to_dict())
+
+    def has_changes(self) -> bool:
+        """Whether an update would change anything"""
+        return bool(self.changes())
+
+    def mark_clean(self) -> None:
+        """Use the current state as the baseline for changes()"""
+        # to_dict() shares nested lists and dicts with the model, which in-place edits would change too
+        self._original = copy.deepcopy(self.to_dict())
+        self._source = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the product to a dictionary for WooCommerce API"""
         result = {
@@ -501,6 +548,21 @@ class Product(BaseModel):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Product':
         """Create a Product instance from a WooCommerce API response"""
+        # Extract attributes first: variable products are validated against them
+        attributes = [
+            ProductAttribute(
+                id=attr.get("id"),
+                name=attr.get("name", ""),
+                options=attr.get("options", []),
+                position=attr.get("position", 0),
+                visible=attr.get("visible", True),
+                variation=attr.get("variation", False),
+                is_global=bool(attr.get("id")),  # If it has an ID, it's a global attribute
+                global_slug=attr.get("slug")  # The global attribute slug
+            )
+            for attr in data.get("attributes") or []
+        ]
+        
         # Extract base fields
         product = cls(
             name=data.get("name", ""),
@@ -518,6 +580,7 @@ class Product(BaseModel):
             manage_stock=data.get("manage_stock", False),
             stock_quantity=data.get("stock_quantity"),
             stock_status=data.get("stock_status"),
+            attributes=attributes,
         )
         
         # Extract sale end date
@@ -546,24 +609,80 @@ class Product(BaseModel):
                 for image in data["images"]
             ]
             
-        # Extract attributes
-        if "attributes" in data and data["attributes"]:
-            product.attributes = [
-                ProductAttribute(
-                    id=attr.get("id"),
-                    name=attr.get("name", ""),
-                    options=attr.get("options", []),
-                    position=attr.get("position", 0),
-                    visible=attr.get("visible", True),
-                    variation=attr.get("variation", False),
-                    is_global=bool(attr.get("id")),  # If it has an ID, it's a global attribute
-                    global_slug=attr.get("slug")  # The global attribute slug
-                )
-                for attr in data["attributes"]
-            ]
-            
+        product.mark_clean()
         return product
 
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> 'Product':
+        """Create a Product from trusted WooCommerce API data without validation
+
+        Builds the same model as from_dict() without running the field
+        validators (SKU pattern, price parsing, variable product
+        checks). Only use it for data returned by the API. The baseline for
+        changes() is computed from ``data`` on first use, so ``data`` should
+        not be modified afterwards.
+        """
+        get = data.get
+        categories = [
+            _construct_trusted(ProductCategory, {"id": c.get("id", 0), "name": c.get("name"), "slug": c.get("slug")})
+            for c in get("categories") or ()
+        ]
+        images = [
+            _construct_trusted(ProductImage, {"id": i.get("id", 0), "name": i.get("name"), "alt": i.get("alt")})
+            for i in get("images") or ()
+        ]
+        attributes = [
+            _construct_trusted(ProductAttribute, {
+                "name": a.get("name", ""),
+                "options": list(a.get("options", [])),
+                "position": a.get("position", 0),
+                "visible": a.get("visible", True),
+                "variation": a.get("variation", False),
+                "id": a.get("id"),
+                "is_global": bool(a.get("id")),
+                "global_slug": a.get("slug"),
+            })
+            for a in get("attributes") or ()
+        ]
+
+        return _construct_trusted(cls, {
+            "name": get("name", ""),
+            "type": get("type", "simple"),
+            "description": get("description", ""),
+            "short_description": get("short_description", ""),
+            "regular_price": get("regular_price"),
+            "sale_price": get("sale_price"),
+            "sale_end_date": get("date_on_sale_to") or None,
+            "id": get("id"),
+            "parent_id": get("parent_id"),
+            "sku": get("sku"),
+            "manage_stock": get("manage_stock", False),
+            "stock_quantity": get("stock_quantity"),
+            "stock_status": get("stock_status"),
+            "status": get("status", "publish"),
+            "catalog_visibility": get("catalog_visibility", "visible"),
+            "featured": get("featured", False),
+            "categories": categories,
+            "images": images,
+            "attributes": attributes,
+            "variations": [],
+        }, private={"_dimensions": None, "_weight": None, "_original": None, "_source": data})
+
+    @classmethod
+    def from_api_list(cls, items: List[Dict[str, Any]]) -> List['Product']:
+        """Create Products from a list of trusted API items (see from_api)"""
+        from_api = cls.from_api
+        # Building tens of thousands of small objects triggers repeated full
+        # garbage collections; none of them form reference cycles, so pause
+        # the collector for the duration of the build
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return [from_api(item) for item in items]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
     def add_image_from_path_or_url(self, client, path_or_url: str, alt_text: str = None, title: str = None) -> int:
         """Add an image to the product from either a local path or a URL
         
@@ -644,9 +763,13 @@ class ProductVariation(BaseModel):
     _dimensions: Optional[Dict[str, str]] = None
     _weight: Optional[str] = None
 
+    # Snapshot of to_dict() taken when loaded from the API, used by changes()
+    _original: Optional[Dict[str, Any]] = None
+
     @validator('regular_price', 'sale_price')
     def validate_price(cls, v):
-        if v is not None:
+        # WooCommerce uses "" for prices that are not set
+        if v is not None and v != '':
             # Convert numeric values to strings
             if isinstance(v, (int, float)):
                 v = str(v)
@@ -663,6 +786,51 @@ class ProductVariation(BaseModel):
             image = ProductImage(id=image)
         self.images.append(image)
 
+    def changes(self) -> Dict[str, Any]:
+        """Get the fields changed since the model was loaded
+
+        Returns the full payload for models that were not loaded with
+        from_dict(), and an empty dictionary when nothing changed.
+        """
+        return diff(self._original, self.to_dict())
+
+    def has_changes(self) -> bool:
+        """Whether an update would change anything"""
+        return bool(self.changes())
+
+    def mark_clean(self) -> None:
+        """Use the current state as the baseline for changes()"""
+        # to_dict() shares nested lists and dicts with the model, which in-place edits would change too
+        self._original = copy.deepcopy(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProductVariation':
+        """Create a ProductVariation instance from a WooCommerce API response"""
+        attributes = []
+        for attr in data.get("attributes", []):
+            if attr.get("id"):
+                attributes.append({"id": attr["id"], "option": attr.get("option", "")})
+            else:
+                attributes.append({"name": attr.get("name", ""), "option": attr.get("option", "")})
+
+        variation = cls(
+            attributes=attributes,
+            regular_price=data.get("regular_price") or "",
+            sale_price=data.get("sale_price"),
+            sku=data.get("sku"),
+            stock_quantity=data.get("stock_quantity"),
+            manage_stock=bool(data.get("manage_stock", False)),
+        )
+
+        image = data.get("image")
+        if image and image.get("id"):
+            variation.images = [
+                ProductImage(id=image["id"], name=image.get("name"), alt=image.get("alt"))
+            ]
+
+        variation.mark_clean()
+        return variation
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the variation to a dictionary for WooCommerce API"""
         result = {
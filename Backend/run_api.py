@@ -5,29 +5,97 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Debug prints
-print("\nEnvironment variables:")
-print(f"API_KEY: {os.getenv('API_KEY')}")
-print(f"WC_KEY: {os.getenv('WC_KEY')}")
-print(f"WC_SECRET: {os.getenv('WC_SECRET')}")
-print(f"WC_URL: {os.getenv('WC_URL')}")
-print(f"WP_USERNAME: {os.getenv('WP_USERNAME')}")
-print(f"WP_SECRET: {'*' * len(os.getenv('WP_SECRET', '')) if os.getenv('WP_SECRET') else 'Not set'}")
-
 # Get port from environment or use default
 port = int(os.getenv("API_PORT", "8000"))
 host = os.getenv("API_HOST", "0.0.0.0")
-reload = os.getenv("API_RELOAD", "true").lower() == "true"
+
+# Production mode: several worker processes, no reload, indexes warmed up before serving
+production = os.getenv("API_MODE", "development").lower() == "production"
+workers = int(os.getenv("API_WORKERS", str(os.cpu_count() or 1) if production else "1"))
+reload = not production and os.getenv("API_RELOAD", "true").lower() == "true"
+warmup = os.getenv("API_WARMUP", "true").lower() == "true"
+
+
+def print_environment():
+    """Debug prints (secrets are masked in production mode)"""
+    def secret(name):
+        value = os.getenv(name)
+        if not value:
+            return 'Not set'
+        return '*' * len(value) if production else value
+
+    print("\nEnvironment variables:")
+    print(f"API_KEY: {secret('API_KEY')}")
+    print(f"WC_KEY: {secret('WC_KEY')}")
+    print(f"WC_SECRET: {secret('WC_SECRET')}")
+    print(f"WC_URL: {os.getenv('WC_URL')}")
+    print(f"WP_USERNAME: {os.getenv('WP_USERNAME')}")
+    print(f"WP_SECRET: {'*' * len(os.getenv('WP_SECRET', '')) if os.getenv('WP_SECRET') else 'Not set'}")
+
+
+def run_production():
+    """Serve with several worker processes sharing the host's index databases
+
+    The shared category/attribute and SKU indexes are warmed up before the
+    server binds its port. With gunicorn installed, the app is imported once
+    in the master and forked into uvicorn workers (preload); otherwise
+    uvicorn starts the workers itself, each importing the app.
+    """
+    if warmup:
+        from api.warmup import warm_shared_indexes
+        print("Warming up shared indexes...")
+        for name, result in warm_shared_indexes().items():
+            print(f"  {name}: {result}")
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:  # gunicorn is optional (and not available on Windows)
+        BaseApplication = None
+
+    if BaseApplication is None:
+        print("gunicorn is not installed: starting uvicorn workers without app preloading")
+        uvicorn.run("api.main:app", host=host, port=port, workers=workers, log_level="info")
+        return
+
+    try:
+        import uvicorn_worker  # noqa: F401 (uvicorn.workers is deprecated in favor of this package)
+        worker_class = "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        worker_class = "uvicorn.workers.UvicornWorker"
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", worker_class)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("timeout", int(os.getenv("API_WORKER_TIMEOUT", "120")))
+            self.cfg.set("graceful_timeout", int(os.getenv("API_GRACEFUL_TIMEOUT", "30")))
+            self.cfg.set("loglevel", "info")
+
+        def load(self):
+            from api.main import app
+            return app
+
+    Server().run()
+
 
 if __name__ == "__main__":
+    print_environment()
     print(f"\nStarting Woo-Flow API on {host}:{port}")
-    print(f"Debug mode: {'enabled' if reload else 'disabled'}")
+    if production:
+        print(f"Production mode: {workers} worker(s)")
+    else:
+        print(f"Debug mode: {'enabled' if reload else 'disabled'}")
     print("Press Ctrl+C to exit")
-    
-    uvicorn.run(
-        "api.main:app", 
-        host=host, 
-        port=port, 
-        reload=reload,
-        log_level="info"
-    )
+
+    if production:
+        run_production()
+    else:
+        uvicorn.run(
+            "api.main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            log_level="info"
+        )
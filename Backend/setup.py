@@ -8,7 +8,14 @@ setup(
         "requests>=2.31.0",
         "python-dotenv>=1.0.0",
         "pydantic>=2.5.0",
+        "pandas>=2.0.0",
+        "numpy>=1.24.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+        "brotli": ["brotli>=1.0.9"],
+        "tracing": ["opentelemetry-api>=1.20.0", "opentelemetry-sdk>=1.20.0"],
+    },
     python_requires=">=3.8",
     author="Ali Hassan",
     author_email="ccdd4lii@gmail.com",
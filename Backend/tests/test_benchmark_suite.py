@@ -0,0 +1,47 @@
+import json
+
+from benchmarks import suite
+
+
+def _report(results):
+    return {'environment': {}, 'results': results}
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(n) for n in range(1, 101)]
+
+    assert suite.percentile(samples, 50) == 50.0
+    assert suite.percentile(samples, 99) == 99.0
+    assert suite.percentile([], 99) == 0.0
+
+
+def test_compare_flags_regressions_in_the_right_direction(capsys):
+    baseline = _report({'api': {'list_rps': 100.0, 'list_p99_ms': 10.0, 'requests': 5}})
+    current = _report({'api': {'list_rps': 80.0, 'list_p99_ms': 9.5, 'requests': 50}})
+
+    assert suite.compare(baseline, current) == ['api.list_rps']
+    assert suite.compare(current, baseline) == []
+    assert 'REGRESSION' in capsys.readouterr().out
+
+
+def test_failing_benchmark_is_recorded_and_the_rest_still_run(monkeypatch):
+    def broken(quick):
+        raise RuntimeError('stub store went away')
+
+    monkeypatch.setitem(suite.BENCHMARKS, 'broken', broken)
+    monkeypatch.setitem(suite.BENCHMARKS, 'fine', lambda quick: {'value_per_second': 1})
+
+    report = suite.run(['broken', 'fine'], quick=True)
+
+    assert report['results'] == {'broken': {'error': 'stub store went away'}, 'fine': {'value_per_second': 1}}
+    assert report['environment']['quick'] is True
+    json.dumps(report)
+
+
+def test_import_benchmark_imports_every_row_into_the_stub_store():
+    result = suite.bench_import(quick=True)
+
+    # 20 simple products plus 20 variable ones with a parent row and 4 variations each
+    assert result['rows'] == 20 + 20 * 5
+    assert result['import_rows_per_second'] > 0
+    assert result['requests'] > 0
@@ -0,0 +1,106 @@
+import pytest
+
+from benchmarks.stub_store import StubStore
+from woo_client import BulkDeleter, WooClient
+
+
+class PartlyFailingDeleter(BulkDeleter):
+    """Deleter whose deletion of some products fails"""
+
+    def __init__(self, products_client, failing, **kwargs):
+        super().__init__(products_client, **kwargs)
+        self.failing = set(failing)
+
+    def _delete_products(self, ids, force, report, progress):
+        deleted = super()._delete_products([i for i in ids if i not in self.failing], force, report, progress)
+        report['failed'].extend({'id': i, 'error': 'Injected failure'} for i in ids if i in self.failing)
+        return deleted
+
+
+def _client(store):
+    return WooClient("ck_test", "cs_test", store.url, wp_username="admin", wp_password="secret")
+
+
+def _media_ids(store):
+    return set(store.data.media)
+
+
+def test_delete_by_ids():
+    with StubStore(products=10) as store:
+        client = _client(store)
+        ids = [p['id'] for p in client.products.get_products(per_page=3)]
+
+        report = client.products.bulk_delete(ids=ids + [999999])
+
+        assert report['deleted'] == 3
+        assert [failure['id'] for failure in report['failed']] == [999999]
+        assert len(client.products.get_products(per_page=100)) == 7
+
+
+def test_media_shared_with_a_failed_product_is_kept_when_deleting_everything():
+    with StubStore(products=5) as store:
+        client = _client(store)
+        first, second = client.products.get_products(per_page=2)
+        shared = first['images'][0]['id']
+        client.products.update_product(second['id'], {'images': [{'id': shared}]})
+        before = _media_ids(store)
+
+        deleter = PartlyFailingDeleter(client.products, failing=[second['id']])
+        report = deleter.run(delete_media=True, media_client=client.media)
+
+        assert report['deleted'] == 4
+        assert shared in _media_ids(store)
+        assert _media_ids(store) < before
+
+
+def test_media_used_by_a_trashed_product_is_kept():
+    with StubStore(products=5) as store:
+        client = _client(store)
+        first, second = client.products.get_products(per_page=2)
+        shared = first['images'][0]['id']
+        client.products.update_product(second['id'], {'images': [{'id': shared}]})
+        client.products.delete_product(second['id'], force=False)
+
+        report = client.products.bulk_delete(ids=[first['id']], delete_media=True, media_client=client.media)
+
+        assert report['deleted'] == 1
+        assert shared in _media_ids(store)
+
+
+def test_trashing_with_media_cleanup_is_rejected():
+    with StubStore(products=5) as store:
+        client = _client(store)
+
+        with pytest.raises(ValueError):
+            client.products.bulk_delete(force=False, delete_media=True, media_client=client.media)
+
+        assert len(client.products.get_products(per_page=100)) == 5
+
+
+def test_dry_run_collects_targets_without_deleting():
+    with StubStore(products=5) as store:
+        client = _client(store)
+        stages = set()
+
+        report = client.products.bulk_delete(delete_media=True, media_client=client.media, dry_run=True,
+                                             progress=lambda stage, done, total: stages.add(stage))
+
+        assert report['matched'] == 5 and report['deleted'] == 0
+        assert len(report['ids']) == 5 and report['media_ids']
+        assert stages == {'collect'}
+        assert len(client.products.get_products(per_page=100)) == 5
+
+
+def test_filters_select_products_and_trashing_uses_single_deletes():
+    with StubStore(products=10) as store:
+        client = _client(store)
+        drafts = [p['id'] for p in client.products.get_products(per_page=3)]
+        for product_id in drafts:
+            client.products.update_product(product_id, {'status': 'draft'})
+
+        report = client.products.bulk_delete(filters={'status': 'draft'}, force=False)
+
+        assert report['deleted'] == 3
+        assert store.stats().get('DELETE /products/{id}') == 3
+        assert 'POST /products/batch' not in store.stats()
+        assert sorted(p['id'] for p in client.products.get_products(per_page=100, status='trash')) == sorted(drafts)
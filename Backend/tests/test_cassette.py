@@ -0,0 +1,53 @@
+from urllib.parse import quote
+
+import pytest
+
+from benchmarks.stub_store import StubStore
+from woo_client import Cassette, WooClient
+from woo_client.cassette import SCRUBBED, scrub, scrub_url
+
+
+def _session(client, product_id):
+    """Read a product, rename it and read it again"""
+    before = client.products.get_product_by_id(product_id)
+    client.products.update_product(product_id, {'name': 'Renamed', 'post_password': 'hunter2'})
+    after = client.products.get_product_by_id(product_id)
+    return before, after
+
+
+def test_scrub_replaces_secret_fields_and_url_credentials():
+    assert scrub({'name': 'Mug', 'api_key': 'abc', 'nested': [{'password': 'pw', 'empty_secret': ''}]}) == {
+        'name': 'Mug', 'api_key': SCRUBBED, 'nested': [{'password': SCRUBBED, 'empty_secret': ''}]}
+    assert scrub_url('https://user:pw@shop.test/wp-json?consumer_key=ck&page=2') == \
+        f'https://shop.test/wp-json?consumer_key={quote(SCRUBBED)}&page=2'
+
+
+def test_recorded_session_replays_without_a_server(tmp_path):
+    path = str(tmp_path / 'session.json')
+    with StubStore(products=3) as store:
+        url = store.url
+        product_id = WooClient("ck_test", "cs_test", url).products.get_products(per_page=1)[0]['id']
+        store.reset_stats()
+        with Cassette(path, mode='record') as cassette:
+            recorded = _session(WooClient("ck_test", "cs_test", url, cassette=cassette), product_id)
+        requests_sent = sum(count for key, count in store.stats().items() if ' ' in key)
+
+    cassette = Cassette(path)
+    replayed = _session(WooClient("ck_test", "cs_test", url, cassette=cassette), product_id)
+
+    assert [product['name'] for product in replayed] == [product['name'] for product in recorded]
+    assert replayed[1]['post_password'] == SCRUBBED
+    assert replayed[0]['name'] != replayed[1]['name']
+    assert cassette.stats() == {'mode': 'replay', 'interactions': requests_sent, 'played': requests_sent, 'unused': 0}
+    with open(path, encoding='utf-8') as f:
+        saved = f.read()
+    assert 'hunter2' not in saved and 'cs_test' not in saved
+
+
+def test_unrecorded_requests_fail_in_replay(tmp_path):
+    path = str(tmp_path / 'empty.json')
+    Cassette(path, mode='record').save()
+    client = WooClient("ck_test", "cs_test", 'http://127.0.0.1:9', cassette=Cassette(path))
+
+    with pytest.raises(Exception, match='No recorded response for GET'):
+        client.products.get_products()
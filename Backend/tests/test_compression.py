@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from api.compression import negotiate_encoding
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+
+
+def _restock(client, count):
+    products = client.products.get_products(per_page=count)
+    return client.products.bulk_update_inventory(
+        [{'id': product['id'], 'stock_quantity': 500 + n, 'regular_price': '12.50'} for n, product in enumerate(products)])
+
+
+def test_negotiation_prefers_the_highest_q_value():
+    assert negotiate_encoding('gzip, deflate, br', ('br', 'gzip')) == 'br'
+    assert negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')) == 'gzip'
+    assert negotiate_encoding('*;q=0.1, br;q=0', ('br', 'gzip')) == 'gzip'
+    assert negotiate_encoding('identity', ('br', 'gzip')) is None
+
+
+def test_large_json_responses_are_compressed_and_small_ones_are_not():
+    with StubStore(products=100) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            http = TestClient(app)
+            gzipped = http.get('/api/products?per_page=100', headers={'Accept-Encoding': 'gzip'})
+            plain = http.get('/api/products?per_page=100', headers={'Accept-Encoding': 'identity'})
+            small = http.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        finally:
+            app.dependency_overrides.clear()
+
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert int(gzipped.headers['Content-Length']) < len(plain.content) / 3
+    assert gzipped.json() == plain.json()
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Content-Encoding' not in small.headers
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+
+
+def test_upstream_responses_are_requested_compressed():
+    with StubStore(products=50, seed=1) as plain_store, \
+            StubStore(products=50, seed=1, compress_responses=True) as gzip_store:
+        expected = WooClient("ck_test", "cs_test", plain_store.url).products.get_products(per_page=50)
+        products = WooClient("ck_test", "cs_test", gzip_store.url).products.get_products(per_page=50)
+
+        assert products == expected
+        assert gzip_store.traffic()['bytes_out'] < plain_store.traffic()['bytes_out'] / 3
+
+
+def test_batch_bodies_are_gzipped_when_the_store_accepts_them():
+    with StubStore(products=50, seed=1) as plain_store, \
+            StubStore(products=50, seed=1, accept_compressed_requests=True) as gzip_store:
+        _restock(WooClient("ck_test", "cs_test", plain_store.url), 50)
+        report = _restock(WooClient("ck_test", "cs_test", gzip_store.url, compress_requests=True,
+                                    compress_min_bytes=0), 50)
+
+        assert report['updated'] == 50
+        assert gzip_store.traffic()['bytes_in'] < plain_store.traffic()['bytes_in'] / 3
+
+
+def test_compression_is_turned_off_when_the_store_rejects_it():
+    with StubStore(products=10) as store:
+        client = WooClient("ck_test", "cs_test", store.url, compress_requests=True, compress_min_bytes=0)
+
+        report = _restock(client, 10)
+
+        assert report['updated'] == 10
+        assert not client.products.compress_requests
@@ -0,0 +1,52 @@
+from benchmarks.stub_store import StubStore
+from models.csv_layout import ColumnLayout, frame_from_rows, prepare_frame, read_csv_frame
+from models.csv_product_importer import CSVProductImporter
+from woo_client import WooClient
+
+
+def test_layout_resolves_numbered_groups_in_order():
+    layout = ColumnLayout(['type', 'attr_name_2', 'attr_value_2', 'attr_name_1', 'attr_value_1', 'attr_var_1',
+                           'category_2', 'include_hierarchy_2', 'category_1', 'image_1'])
+
+    assert [a[0] for a in layout.attributes] == [1, 2]
+    assert layout.attributes[0] == (1, 'attr_name_1', 'attr_value_1', 'attr_var_1')
+    assert layout.categories == [(1, 'category_1', None), (2, 'category_2', 'include_hierarchy_2')]
+    assert layout.images == [(1, 'image_1')]
+    assert sorted(layout.bool_columns) == ['attr_var_1', 'include_hierarchy_2']
+
+
+def test_prepare_normalizes_cells_column_wise(tmp_path):
+    path = tmp_path / 'products.csv'
+    path.write_text('type,sku,regular_price,stock_quantity,manage_stock,attr_name_1,attr_var_1,,\n'
+                    'Simple,A-1,"19,90",5,Yes,Color,TRUE,,\n'
+                    'variable,A-2,20,2.5,no,,,,\n')
+
+    records, layout = prepare_frame(read_csv_frame(str(path)))
+
+    assert records[0] == {'type': 'simple', 'sku': 'A-1', 'regular_price': '19.90', 'stock_quantity': 5,
+                          'manage_stock': True, 'attr_name_1': 'Color', 'attr_var_1': True}
+    assert records[1] == {'type': 'variable', 'sku': 'A-2', 'regular_price': '20', 'stock_quantity': '2.5',
+                          'manage_stock': False}
+    assert 'Unnamed: 7' not in layout.columns
+
+
+def test_rows_and_files_are_prepared_alike(tmp_path):
+    path = tmp_path / 'products.csv'
+    path.write_text('type,sku,stock_quantity\nsimple,A-1,3\nsimple,A-2,\n')
+
+    from_rows, _ = prepare_frame(frame_from_rows([{'type': 'simple', 'sku': 'A-1', 'stock_quantity': '3'},
+                                                  {'type': 'simple', 'sku': ' A-2 ', 'stock_quantity': ' '}]))
+
+    assert from_rows == prepare_frame(read_csv_frame(str(path)))[0]
+
+
+def test_import_creates_the_products_of_the_file():
+    with StubStore(products=0) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+
+        CSVProductImporter(client=client).import_from_file('examples/csv_sample_template.csv')
+
+        skus = {p['sku'] for p in client.products.get_products(per_page=100)}
+        assert {'TS-001', 'HDY-BASE'} <= skus
+        hoodie = next(p for p in client.products.get_products(per_page=100) if p['sku'] == 'HDY-BASE')
+        assert len(hoodie['variations']) == 4
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from models.csv_schema import compile_schema, detect_dialect, validate_dataframe, validate_file
+from woo_client import WooClient
+
+
+def test_dialects_are_detected_from_the_header():
+    assert detect_dialect(['type', 'sku', 'name', 'category_1', 'attr_name_1']).name == 'canonical'
+    assert detect_dialect(['type', 'name', 'price', 'categories', 'Attribute: Color']).name == 'labelled'
+    assert detect_dialect(['type', 'title', 'reg_price', 'cat_slug', 'attr_1_name']).name == 'legacy'
+
+
+def test_labelled_header_is_rewritten_to_canonical_columns():
+    df = pd.DataFrame({'type': ['variable', 'simple'], 'price': ['20', '5'],
+                       'categories': ['Clothing, Hoodies', 'Mugs'], 'Attribute: Color': ['Red,Blue', 'White'],
+                       'Colour notes': ['x', 'y']})
+
+    schema = compile_schema(df.columns)
+    out = schema.apply(df)
+
+    assert schema.unknown_columns == ['Colour notes']
+    assert out['regular_price'].tolist() == ['20', '5']
+    assert out['category_1'].tolist() == ['Clothing', 'Mugs']
+    assert out['category_2'].tolist()[0] == 'Hoodies'
+    assert out['attr_name_1'].tolist() == ['Color', 'Color']
+    assert out['attr_var_1'].tolist() == ['true', 'false']
+
+
+def test_row_errors_use_file_row_numbers(tmp_path):
+    path = tmp_path / 'products.csv'
+    path.write_text('type,sku,name,regular_price,sale_price,stock_quantity\n'
+                    'simple,A-1,Mug,10,12,3\n'
+                    'variation,A-2,,5,,1.5\n'
+                    'gadget,A-1,Thing,abc,,\n')
+
+    report = validate_file(str(path))
+
+    assert not report['valid']
+    assert {(e['row'], e['column']) for e in report['errors']} >= {
+        (2, 'sale_price'), (3, 'type'), (3, 'stock_quantity'), (4, 'type'), (4, 'regular_price'), (2, 'sku')}
+    assert validate_file(str(path), max_errors=2)['error_count'] == report['error_count']
+    assert len(validate_file(str(path), max_errors=2)['errors']) == 2
+
+
+def test_missing_type_column_is_a_file_error():
+    report = validate_dataframe(pd.DataFrame({'sku': ['A-1'], 'name': ['Mug']}))
+
+    assert report['file_errors'] == ["Missing required column: type"]
+    assert report['rows'] == 1 and not report['valid']
+
+
+def test_validate_endpoint_reports_without_writing():
+    with StubStore(products=0) as store:
+        app.dependency_overrides[get_woo_client] = lambda: WooClient("ck_test", "cs_test", store.url)
+        try:
+            with open(os.path.join('examples', 'csv_sample_template.csv'), 'rb') as f:
+                response = TestClient(app).post("/api/products/upload/csv/validate", files={"file": ("p.csv", f.read())})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()['valid'] and response.json()['dialect'] == 'canonical'
+        assert store.stats() == {}
@@ -0,0 +1,16 @@
+from models.diff import diff
+
+
+def test_only_changed_top_level_fields_are_reported():
+    old = {'name': 'Hoodie', 'regular_price': '19.9', 'description': '', 'categories': [{'id': 1}, {'id': 2}]}
+    new = {'name': 'Hoodie', 'regular_price': '19.90', 'description': None, 'categories': [{'id': 1}, {'id': 3}]}
+
+    assert diff(old, new) == {'categories': [{'id': 1}, {'id': 3}]}
+
+
+def test_new_fields_are_reported_unless_empty_and_missing_ones_are_ignored():
+    old = {'name': 'Hoodie', 'sku': 'HD-1'}
+
+    assert diff(old, {'name': 'Hoodie', 'sale_price': '', 'weight': '1.2'}) == {'weight': '1.2'}
+    assert diff(None, {'name': 'Hoodie'}) == {'name': 'Hoodie'}
+    assert diff(old, {'regular_price': 'not a price'}) == {'regular_price': 'not a price'}
@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.etags import etag_matches, make_etag
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+from woo_client.http_cache import ValidationCache
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = make_etag(b'{"id": 1}')
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_unchanged_responses_are_revalidated_against_the_store():
+    cache = ValidationCache()
+    with StubStore(products=5, etags=True) as store:
+        client = WooClient("ck_test", "cs_test", store.url, validation_cache=cache)
+        product_id = client.products.get_products(per_page=1)[0]['id']
+
+        first = client.products.get_product_by_id(product_id)
+        again = client.products.get_product_by_id(product_id)
+        client.products.update_product(product_id, {'name': 'Renamed'})
+        changed = client.products.get_product_by_id(product_id)
+        not_modified = store.stats().get('not_modified')
+
+    assert again == first
+    assert changed['name'] == 'Renamed'
+    assert not_modified == 1
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_api_answers_304_to_unchanged_pages():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            http = TestClient(app)
+            first = http.get('/api/products/1')
+            revalidated = http.get('/api/products/1', headers={'If-None-Match': first.headers['ETag']})
+            client.products.update_product(1, {'name': 'Renamed'})
+            changed = http.get('/api/products/1', headers={'If-None-Match': first.headers['ETag']})
+        finally:
+            app.dependency_overrides.clear()
+
+    assert first.headers['ETag'].startswith('W/"')
+    assert revalidated.status_code == 304 and revalidated.content == b''
+    assert changed.status_code == 200 and changed.json()['name'] == 'Renamed'
@@ -0,0 +1,60 @@
+import requests
+
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+from woo_client.http_cache import ResponseCache
+
+
+def _response(content):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.url = 'http://store/categories'
+    return response
+
+
+def test_rule_for_picks_the_longest_matching_prefix():
+    cache = ResponseCache(ttls={'/products': 60, '/products/categories': 600})
+
+    assert cache.rule_for('/products/categories/12?_fields=id') == ('/products/categories', 600)
+    assert cache.rule_for('/products/5') == ('/products', 60)
+    assert cache.rule_for('/orders') == (None, 0)
+
+
+def test_repeated_runs_within_the_ttl_skip_reference_reads(tmp_path):
+    path = str(tmp_path / 'responses.db')
+    with StubStore(products=5) as store:
+        for _ in range(2):  # two script runs, each with its own client and cache handle
+            cache = ResponseCache(path)
+            client = WooClient("ck_test", "cs_test", store.url, response_cache=cache)
+            categories = client.categories.get_categories()
+            client.products.get_products()
+            cache.close()
+        stats = store.stats()
+
+    assert categories
+    assert stats['GET /products/categories'] == 1
+    assert stats['GET /products'] == 2
+
+
+def test_writes_invalidate_the_cached_endpoint():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url, response_cache=ResponseCache())
+        before = client.categories.get_categories()
+        client.categories.create_category('Brand new')
+        after = client.categories.get_categories()
+
+        assert store.stats()['GET /products/categories'] == 2
+    assert len(after) == len(before) + 1
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_cap():
+    cache = ResponseCache(ttls={'/products/categories': 60}, max_bytes=250)
+    for key in ('a', 'b'):
+        cache.store(key, '/products/categories', _response(b'x' * 100))
+    cache.get('a')
+    cache.store('c', '/products/categories', _response(b'x' * 100))
+
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.get('b') is None
+    assert cache.stats()['entries'] == 2
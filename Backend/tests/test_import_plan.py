@@ -0,0 +1,65 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_taxonomy_index, get_woo_client
+from api.main import app
+from api.routers import products
+from benchmarks.stub_store import StubStore
+from models.csv_product_importer import CSVProductImporter
+from woo_client import TaxonomyIndex, WooClient
+
+TEMPLATE = 'examples/csv_sample_template.csv'
+
+
+def _plan(store, **kwargs):
+    client = WooClient("ck_test", "cs_test", store.url)
+    return CSVProductImporter(client=client).plan(TEMPLATE, taxonomy=TaxonomyIndex(), **kwargs)
+
+
+def test_plan_counts_what_the_import_would_create_without_writing():
+    with StubStore(products=5) as store:
+        plan = _plan(store)
+
+        assert plan['valid']
+        assert plan['products'] == {'simple': 2, 'variable': 1, 'variations': 4}
+        assert plan['calls']['writes'] == plan['calls']['by_kind']['category_create'] + 3 + 4
+        assert not any(key.startswith(('POST', 'PUT', 'DELETE')) for key in store.stats())
+
+
+def test_plan_tells_measured_latency_from_assumed_defaults():
+    with StubStore(products=5) as store:
+        latency = _plan(store)['latency']
+        assert latency['sources'] == {'read': 'measured', 'write': 'assumed', 'media': 'assumed'}
+
+        latency = _plan(store, latency={'media': 1.5})['latency']
+        assert latency['sources']['media'] == 'given'
+        assert latency['media_seconds'] == 1.5
+
+
+def test_plan_endpoint_runs_off_the_event_loop():
+    assert not asyncio.iscoroutinefunction(products.plan_csv_import)
+    with StubStore(products=5) as store:
+        app.dependency_overrides[get_woo_client] = lambda: WooClient("ck_test", "cs_test", store.url)
+        app.dependency_overrides[get_taxonomy_index] = TaxonomyIndex
+        try:
+            with open(TEMPLATE, 'rb') as f:
+                response = TestClient(app).post("/api/products/upload/csv/plan", files={"file": ("plan.csv", f.read())})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()['products']['variations'] == 4
+
+
+def test_plan_resolves_categories_against_the_store_taxonomy():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        existing = {c['name'] for c in client.categories.get_categories(per_page=100)}
+
+        plan = _plan(store)
+
+        assert set(plan['categories']['existing']) <= existing
+        assert not set(plan['categories']['new']) & existing
+        assert plan['calls']['by_kind']['category_create'] == len(plan['categories']['new'])
+        assert plan['images']['uploads'] == plan['calls']['media_uploads']
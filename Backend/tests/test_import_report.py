@@ -0,0 +1,67 @@
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from benchmarks.suite import write_import_csv
+from models.csv_product_importer import CSVProductImporter
+from models.import_report import ImportProfiler
+from woo_client import WooClient
+
+
+def _client(store):
+    return WooClient("ck_test", "cs_test", store.url, wp_username="admin", wp_password="secret")
+
+
+def test_nested_phases_are_timed_exclusively():
+    profiler = ImportProfiler(slowest_rows=1)
+    with profiler.row(2, 'simple', 'A'):
+        with profiler.phase('create'):
+            with profiler.phase('media'):
+                time.sleep(0.02)
+    with profiler.row(3, 'simple', 'B'):
+        pass
+
+    report = profiler.report()
+
+    assert report['phases']['media'] >= 0.02
+    assert report['phases']['create'] < 0.02
+    assert report['rows'] == 2
+    assert [row['sku'] for row in report['slowest_rows']] == ['A']
+
+
+def test_import_report_counts_requests_bytes_and_caches(tmp_path):
+    with StubStore(products=0) as store:
+        path = os.path.join(tmp_path, 'import.csv')
+        rows = write_import_csv(path, 4, store.url)
+        results = CSVProductImporter(client=_client(store), slowest_rows=3).import_from_file(path)
+        stats = store.stats()
+
+    report = results['report']
+    assert not results['failed']
+    assert report['rows'] == rows
+    assert report['requests']['by_endpoint']['POST /products']['count'] == stats['POST /products']
+    assert report['requests']['total'] == sum(count for key, count in stats.items() if ' ' in key and 'uploads' not in key)
+    assert report['bytes_uploaded'] > 0
+    assert report['phases']['media'] > 0 and report['phases']['variations'] > 0
+    assert all(cache['hit_rate'] is None or 0 <= cache['hit_rate'] <= 1 for cache in report['caches'].values())
+    assert len(report['slowest_rows']) == 3
+
+
+def test_upload_endpoint_returns_the_report(tmp_path):
+    with StubStore(products=0) as store:
+        path = os.path.join(tmp_path, 'import.csv')
+        write_import_csv(path, 2, store.url)
+        client = _client(store)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            with open(path, 'rb') as f:
+                response = TestClient(app).post("/api/products/upload/csv", files={"file": ("import.csv", f.read())})
+        finally:
+            app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert set(response.json()['report']['phases']) >= {'parse', 'categorize', 'taxonomy', 'media', 'create', 'variations'}
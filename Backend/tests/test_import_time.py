@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+from benchmarks.bench_import_time import BACKEND_DIR, check, parse_importtime
+
+
+def _loaded_after(statement):
+    completed = subprocess.run([sys.executable, '-c', f"import sys; {statement}; print('pandas' in sys.modules)"],
+                               cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return completed.stdout.strip() == 'True'
+
+
+def test_entry_points_do_not_import_heavy_dependencies():
+    results = check(repeat=1)
+
+    assert {name: result['problems'] for name, result in results.items()} == {
+        'woo_client': [], 'models': [], 'api': []}
+
+
+def test_lazy_names_load_pandas_on_first_use():
+    assert not _loaded_after('import models')
+    assert _loaded_after('from models import CSVProductImporter')
+
+
+def test_parse_importtime_reads_depth_and_times():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        300 | woo_client\n"
+              "import time:        80 |         80 |   woo_client.metrics\n")
+
+    assert parse_importtime(stderr) == [
+        {'module': 'woo_client', 'self_us': 120, 'cumulative_us': 300, 'depth': 0},
+        {'module': 'woo_client.metrics', 'self_us': 80, 'cumulative_us': 80, 'depth': 1},
+    ]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from api.routers import products
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+from woo_client.inventory import normalize_record
+
+
+def _variable_product(client):
+    return next(p for p in client.products.get_products(per_page=20) if p['variations'])
+
+
+def test_clear_ends_a_sale():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = client.products.get_products(per_page=1)[0]
+        client.products.update_product(product['id'], {'regular_price': '20', 'sale_price': '15'})
+
+        report = client.products.bulk_update_inventory([{'id': product['id'], 'sale_price': 'clear'}])
+
+        assert report['updated'] == 1
+        assert client.products.get_product_by_id(product['id'])['sale_price'] == ''
+
+
+def test_empty_sale_price_leaves_it_unchanged():
+    record = normalize_record({'sku': 'A-1', 'sale_price': '', 'stock_quantity': '3'})
+
+    assert 'sale_price' not in record
+    assert normalize_record({'sku': 'A-1', 'sale_price': 'Clear'})['sale_price'] == ''
+    with pytest.raises(ValueError):
+        normalize_record({'sku': 'A-1', 'sale_price': 'soon'})
+
+
+def test_bare_variation_id_is_resolved_through_the_sku_index():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        parent = _variable_product(client)
+        variation = client.products.get_variation(parent['id'], parent['variations'][0])
+        client.products.resolve_skus([variation['sku']])
+
+        report = client.products.bulk_update_inventory([{'id': variation['id'], 'stock_quantity': 7}])
+
+        assert report['failed'] == []
+        assert report['updated'] == 1
+
+
+def test_bare_variation_id_without_index_is_reported():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        parent = _variable_product(client)
+
+        report = client.products.bulk_update_inventory([{'id': parent['variations'][0], 'stock_quantity': 7}])
+
+        assert report['updated'] == 0
+        assert 'parent_id' in report['failed'][0]['error']
+
+
+def test_failed_fetch_is_reported_per_record():
+    with StubStore(products=5, error_rate=1.0) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+
+        report = client.products.bulk_update_inventory([{'id': 1, 'stock_quantity': 1},
+                                                        {'id': 2, 'parent_id': 9, 'stock_quantity': 1}])
+
+        assert [failure['record'] for failure in report['failed']] == [1, 2]
+        assert all('Could not fetch' in failure['error'] for failure in report['failed'])
+
+
+def test_inventory_endpoints_run_off_the_event_loop():
+    assert not asyncio.iscoroutinefunction(products.bulk_update_inventory)
+    assert not asyncio.iscoroutinefunction(products.bulk_update_inventory_csv)
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product_id = client.products.get_products(per_page=1)[0]['id']
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            response = TestClient(app).post("/api/products/bulk/inventory/csv", files={
+                "file": ("stock.csv", f"id,stock_quantity\n{product_id},4\n".encode())})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()['updated'] == 1
+        assert client.products.get_product_by_id(product_id)['stock_quantity'] == 4
+
+
+def test_csv_records_by_sku_are_batched_and_unchanged_ones_skipped(tmp_path):
+    with StubStore(products=10) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        first, second, third = client.products.get_products(per_page=3)
+        path = tmp_path / 'stock.csv'
+        path.write_text('sku,stock_quantity,regular_price\n'
+                        f"{first['sku']},12,\n"
+                        f"{second['sku']},{second['stock_quantity'] or ''},{second['regular_price']}\n"
+                        f"{third['sku']},,99.50\n"
+                        'NO-SUCH-SKU,1,\n')
+
+        report = client.products.bulk_update_inventory(str(path))
+
+        assert (report['received'], report['updated'], report['unchanged']) == (4, 2, 1)
+        assert report['unresolved'] == ['NO-SUCH-SKU']
+        assert store.stats().get('POST /products/batch') == 1
+        assert client.products.get_product_by_id(third['id'])['regular_price'] == '99.50'
+
+
+def test_dry_run_reports_changes_without_sending_them():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = client.products.get_products(per_page=1)[0]
+
+        report = client.products.bulk_update_inventory([{'id': product['id'], 'stock_quantity': 99}], dry_run=True)
+
+        assert report['changes']
+        assert 'POST /products/batch' not in store.stats()
+        assert client.products.get_product_by_id(product['id'])['stock_quantity'] != 99
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+from woo_client.json_codec import ORJSON, STDLIB, default_codec, get_codec
+
+
+@pytest.mark.parametrize('codec', [c for c in (STDLIB, ORJSON) if c is not None], ids=lambda c: c.name)
+def test_codecs_round_trip_payloads(codec):
+    payload = {'name': 'Café “crème”', 'price': '4.50', 'tags': [1, None, True], 'nested': {'a': []}}
+
+    encoded = codec.dumps(payload)
+
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode('utf-8')) == payload
+
+
+def test_codec_lookup():
+    assert get_codec('json') is STDLIB
+    assert get_codec() is default_codec()
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+def test_client_decodes_the_same_with_either_codec():
+    with StubStore(products=5) as store:
+        fast = WooClient("ck_test", "cs_test", store.url)
+        plain = WooClient("ck_test", "cs_test", store.url, json_codec=STDLIB)
+
+        assert fast.products.get_products(per_page=5) == plain.products.get_products(per_page=5)
+        created = plain.products.create_product({'name': 'Mug “Deluxe”', 'regular_price': '9.00'})
+        assert fast.products.get_product_by_id(created['id'])['name'] == 'Mug “Deluxe”'
+
+
+def test_raw_product_list_passes_the_upstream_body_through():
+    with StubStore(products=15) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        upstream = client.products.get_products_raw(per_page=10)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            response = TestClient(app).get("/api/products", params={"raw": "true", "per_page": 10})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.content == upstream.content
+        assert response.headers['X-WP-Total'] == '15'
+        assert response.headers['X-WP-TotalPages'] == '2'
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client, get_inbound_metrics
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+from woo_client.metrics import Histogram, RequestMetrics, endpoint_template
+
+
+def test_endpoint_template_replaces_ids():
+    assert endpoint_template('/products/123/variations/456?_fields=id') == '/products/{id}/variations/{id}'
+    assert endpoint_template('/products/batch') == '/products/batch'
+
+
+def test_histogram_quantile_stays_within_observed_values():
+    histogram = Histogram()
+    for value in (0.02, 0.03, 0.04, 0.2):
+        histogram.observe(value)
+
+    assert 0.025 <= histogram.quantile(0.5) <= 0.05
+    assert histogram.quantile(0.99) <= 0.2
+    assert histogram.cumulative()[-1] == ('+Inf', 4)
+
+
+def test_request_hook_records_endpoint_templates_and_statuses():
+    metrics = RequestMetrics()
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url, request_hooks=[metrics])
+        product_id = client.products.get_products(per_page=1)[0]['id']
+        client.products.get_product_by_id(product_id)
+        with pytest.raises(Exception, match="status 4"):
+            client.products.get_product_by_id(999999)
+
+    series = {(row['method'], row['endpoint'], row['status']): row for row in metrics.summary()}
+    assert set(series) == {('GET', '/products', '200'), ('GET', '/products/{id}', '200'),
+                           ('GET', '/products/{id}', '404')}
+    assert series[('GET', '/products', '200')]['bytes_received'] > 0
+    assert 'wooflow_upstream_duration_seconds_count{api="wc",method="GET",endpoint="/products/{id}",status="404"} 1' \
+        in metrics.to_prometheus('wooflow_upstream', 'Upstream latency')
+
+
+def test_retries_are_counted_on_the_final_event():
+    events = []
+    with StubStore(products=1, throttle_rate=1.0, retry_after=0) as store:
+        client = WooClient("ck_test", "cs_test", store.url, max_retries=2, retry_backoff=0,
+                           request_hooks=[events.append])
+        with pytest.raises(Exception, match="status 4"):
+            client.products.get_products()
+        throttled = store.stats()['throttled']
+
+    assert [(event.status, event.retries) for event in events] == [(429, 2)]
+    assert throttled == 3
+
+
+def test_metrics_endpoint_reports_inbound_requests_by_route():
+    get_inbound_metrics().reset()
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            http = TestClient(app)
+            http.get('/api/products/1')
+            body = http.get('/api/metrics').text
+        finally:
+            app.dependency_overrides.clear()
+
+    assert '# TYPE wooflow_http_request_duration_seconds histogram' in body
+    assert 'route="/api/products/{product_id}"' in body
+    assert 'wooflow_upstream_request_duration_seconds' in body
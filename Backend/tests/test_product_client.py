@@ -0,0 +1,36 @@
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+
+
+def test_update_with_empty_dict_sends_request():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = client.products.get_products(per_page=1)[0]
+
+        result = client.products.update_product(product['id'], {})
+
+        assert result['id'] == product['id']
+        assert store.stats().get('PUT /products/{id}') == 1
+
+
+def test_update_variation_with_empty_dict_sends_request():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        parent = next(p for p in client.products.get_products(per_page=20) if p['variations'])
+        variation_id = parent['variations'][0]
+
+        result = client.products.update_variation(parent['id'], variation_id, {})
+
+        assert result['id'] == variation_id
+        assert store.stats().get('PUT /products/{parent}/variations/{id}') == 1
+
+
+def test_update_without_changes_against_original_is_skipped():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = client.products.get_products(per_page=1)[0]
+
+        result = client.products.update_product(product['id'], {'name': product['name']}, original=product)
+
+        assert result['name'] == product['name']
+        assert 'PUT /products/{id}' not in store.stats()
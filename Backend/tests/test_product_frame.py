@@ -0,0 +1,92 @@
+import pytest
+
+from benchmarks.stub_store import StubStore
+from models.product_frame import ProductFrame
+from woo_client import WooClient
+
+FILES = {
+    'canonical': (
+        'type,sku,name,regular_price,sale_price,stock_quantity,category_1,category_2\n'
+        'variable,HD,Hoodie,49.99,,,Clothing,Hoodies\n'
+        'variation,HD-R,,45,,5,,\n'
+        'simple,TS,Shirt,19.99,15,10,Clothing,\n'
+    ),
+    'labelled': (
+        'type,sku,name,price,sale_price,stock_quantity,categories,Attribute: Color\n'
+        'variable,HD,Hoodie,49.99,,,"Clothing, Hoodies","Red,Blue"\n'
+        'variation,HD-R,,45,,5,,Red\n'
+        'simple,TS,Shirt,19.99,15,10,Clothing,\n'
+    ),
+    'legacy': (
+        'type,sku,title,desc,cat_slug,reg_price,sale_price,stock_quantity\n'
+        'variable,HD,Hoodie,Warm,Clothing,49.99,,\n'
+        'variation,HD-R,,,,45,,5\n'
+        'simple,TS,Shirt,Cotton,Clothing,19.99,15,10\n'
+    ),
+}
+
+
+@pytest.mark.parametrize('dialect', sorted(FILES))
+def test_from_csv_reads_every_dialect(tmp_path, dialect):
+    path = tmp_path / f'{dialect}.csv'
+    path.write_text(FILES[dialect])
+
+    frame = ProductFrame.from_csv(str(path))
+
+    assert frame.df['sku'].tolist() == ['HD', 'HD-R', 'TS']
+    assert frame.df['name'].tolist() == ['Hoodie', 'Hoodie', 'Shirt']
+    assert frame.df['regular_price'].tolist() == [49.99, 45.0, 19.99]
+    assert frame.df['stock_quantity'].tolist()[1:] == [5, 10]
+    assert 'Clothing' in set(frame.categories['category'])
+    assert len(frame.on_sale()) == 1
+
+
+def test_from_csv_with_an_explicit_dialect(tmp_path):
+    path = tmp_path / 'legacy.csv'
+    path.write_text(FILES['legacy'])
+
+    assert ProductFrame.from_csv(str(path), dialect='legacy').df['name'].tolist() == ['Hoodie', 'Hoodie', 'Shirt']
+    with pytest.raises(ValueError):
+        ProductFrame.from_csv(str(path), dialect='unknown')
+
+
+def test_from_client_loads_products_and_variations():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        products = client.products.get_products(per_page=20)
+        variation_count = sum(len(p['variations']) for p in products)
+
+        frame = ProductFrame.from_client(client, include_variations=True)
+
+        assert len(frame.products()) == 20
+        assert len(frame.variations()) == variation_count
+        assert (frame.variations().df['parent_id'] > 0).all()
+
+
+def test_repriced_rows_are_sent_as_minimal_batches():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        frame = ProductFrame.from_client(client)
+        cheap = frame.price_between(max_price=30)
+
+        repriced = cheap.reprice(1.1, ending=0.99)
+        payloads = repriced.to_batch_updates(original=frame, fields=('regular_price',))
+        report = repriced.apply(client, original=frame, fields=('regular_price',))
+
+        updates = [update for _, payload in payloads for update in payload['update']]
+        assert 0 < len(updates) <= len(cheap)
+        assert {endpoint for endpoint, _ in payloads} == {'/products/batch'}
+        assert all(set(update) == {'id', 'regular_price'} for update in updates)
+        assert all(update['regular_price'].endswith('.99') for update in updates)
+        assert report['updated'] == len(updates) and report['failed'] == []
+        changed = client.products.get_product_by_id(updates[0]['id'])
+        assert changed['regular_price'] == updates[0]['regular_price']
+
+
+def test_unchanged_frame_produces_no_updates():
+    with StubStore(products=10) as store:
+        frame = ProductFrame.from_client(WooClient("ck_test", "cs_test", store.url))
+
+        assert frame.copy().to_batch_updates(original=frame) == []
+        with pytest.raises(ValueError):
+            frame.to_batch_updates(fields=('name',))
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+
+
+def _get(client, **params):
+    app.dependency_overrides[get_woo_client] = lambda: client
+    try:
+        return TestClient(app).get("/api/products", params=params)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_list_is_returned_without_validation_by_default():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = client.products.get_products(per_page=1)[0]
+        client.products.update_product(product['id'], {'stock_quantity': '7'})
+
+        trusted = _get(client, per_page=1).json()[0]
+        validated = _get(client, per_page=1, validate='true').json()[0]
+
+        assert trusted['stock_quantity'] == '7'
+        assert validated['stock_quantity'] == 7
+        assert trusted['edit_link'] == validated['edit_link'] == (
+            f"{store.url}/wp-admin/post.php?post={product['id']}&action=edit")
+
+
+def test_raw_list_sends_the_edit_link_template():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+
+        response = _get(client, per_page=5, raw='true')
+
+        assert response.headers['X-Edit-Link-Template'] == f"{store.url}/wp-admin/post.php?post={{id}}&action=edit"
+        assert 'edit_link' not in response.json()[0]
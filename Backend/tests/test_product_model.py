@@ -0,0 +1,87 @@
+import gc
+
+from benchmarks.stub_store import StubStore
+from models.product import Product, ProductVariation
+from woo_client import WooClient
+
+
+def _variable_product(client):
+    return next(p for p in client.products.get_products(per_page=20) if p['variations'] and p['attributes'])
+
+
+def test_in_place_edit_of_nested_list_is_a_change():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = Product.from_dict(_variable_product(client))
+
+        product.attributes[0].options.append('L')
+
+        assert 'attributes' in product.changes()
+        client.products.update_product(product.id, product)
+        assert store.stats().get('PUT /products/{id}') == 1
+
+
+def test_in_place_edit_matches_from_api():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        data = _variable_product(client)
+        loaded, trusted = Product.from_dict(data), Product.from_api(data)
+
+        for product in (loaded, trusted):
+            product.attributes[0].options.append('L')
+
+        assert loaded.changes() == trusted.changes() != {}
+
+
+def test_variation_in_place_edit_is_a_change():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        parent = _variable_product(client)
+        variation = ProductVariation.from_dict(client.products.get_variation(parent['id'], parent['variations'][0]))
+
+        variation.attributes[0]['option'] = 'Changed'
+
+        assert 'attributes' in variation.changes()
+
+
+def test_models_are_validated_unless_the_caller_opts_out(monkeypatch):
+    validated = []
+    from_dict = Product.from_dict.__func__
+
+    def counting_from_dict(cls, data):
+        validated.append(data['id'])
+        return from_dict(cls, data)
+
+    monkeypatch.setattr(Product, 'from_dict', classmethod(counting_from_dict))
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+
+        products = client.products.get_products_as_models(per_page=5)
+        client.products.get_product_as_model(products[0].id)
+        assert len(validated) == 6
+
+        client.products.get_products_as_models(per_page=5, validate=False)
+        client.products.get_product_as_model(products[0].id, validate=False)
+        assert len(validated) == 6
+
+
+def test_trusted_construction_matches_validated_construction():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        items = client.products.get_products(per_page=20)
+
+        trusted = Product.from_api_list(items)
+
+        assert [p.to_dict() for p in trusted] == [Product.from_dict(item).to_dict() for item in items]
+        assert all(p.changes() == {} for p in trusted)
+        assert gc.isenabled()
+
+
+def test_trusted_model_reports_edits_against_the_api_data():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product = Product.from_api(client.products.get_products(per_page=1)[0])
+
+        product.set_stock(3)
+
+        assert product.changes() == {'stock_quantity': 3}
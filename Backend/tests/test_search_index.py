@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_search_index, get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import ProductSearchIndex, WooClient
+
+
+def _indexed(store):
+    client = WooClient("ck_test", "cs_test", store.url)
+    index = ProductSearchIndex()
+    index.build(client)
+    return client, index
+
+
+def test_build_indexes_every_product_and_drops_deleted_ones():
+    with StubStore(products=30) as store:
+        client, index = _indexed(store)
+        assert index.count() == 30 and index.is_ready()
+
+        client.products.delete_product(client.products.get_products(per_page=1)[0]['id'], force=True)
+        index.build(client)
+
+        assert index.count() == 29
+
+
+def test_search_ranks_name_and_sku_matches_and_applies_filters():
+    with StubStore(products=30) as store:
+        client, index = _indexed(store)
+        product = client.products.get_products(per_page=1)[0]
+        word = product['name'].split()[-1]
+
+        by_name = index.search(word, limit=50)
+        by_sku = index.search(product['sku'])
+        filtered = index.search(word, limit=50, stock_status='outofstock')
+
+        assert product['id'] in [hit['id'] for hit in by_name['hits']]
+        assert by_name['total'] == len(by_name['hits'])
+        assert by_sku['hits'][0]['id'] == product['id']
+        assert all(hit['stock_status'] == 'outofstock' for hit in filtered['hits'])
+        assert index.search('') == {'total': 0, 'hits': []}
+
+
+def test_autocomplete_and_facets():
+    with StubStore(products=30) as store:
+        client, index = _indexed(store)
+        product = client.products.get_products(per_page=1)[0]
+
+        suggestions = index.autocomplete(product['name'][:4])
+        facets = index.facets()
+
+        assert product['id'] in [s['id'] for s in suggestions]
+        assert facets['total'] == 30
+        assert sum(facets['stock_status'].values()) == 30
+
+
+def test_refresh_picks_up_modified_products():
+    with StubStore(products=10) as store:
+        client, index = _indexed(store)
+        product = client.products.get_products(per_page=1)[0]
+        client.products.update_product(product['id'], {'name': 'Zebra striped scarf'})
+
+        index.refresh(client)
+
+        assert [hit['id'] for hit in index.search('zebra')['hits']] == [product['id']]
+
+
+def test_product_list_search_is_served_from_the_index_with_totals():
+    with StubStore(products=30) as store:
+        client, index = _indexed(store)
+        word = client.products.get_products(per_page=1)[0]['name'].split()[-1]
+        total = index.search(word)['total']
+        app.dependency_overrides[get_woo_client] = lambda: client
+        app.dependency_overrides[get_search_index] = lambda: index
+        try:
+            response = TestClient(app).get("/api/products", params={"search": word, "per_page": 2})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.headers['X-WP-Total'] == str(total)
+        assert response.headers['X-WP-TotalPages'] == str(-(-total // 2))
+        assert len(response.json()) == min(2, total)
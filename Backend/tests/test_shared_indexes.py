@@ -0,0 +1,74 @@
+import threading
+import time
+
+from benchmarks.stub_store import StubStore
+from woo_client import SkuIndex, WooClient
+from woo_client.sqlite_utils import Lease, build_once, connect
+from woo_client.taxonomy_index import TaxonomyIndex
+
+
+def test_lease_is_exclusive_until_released_or_expired(tmp_path):
+    path = str(tmp_path / 'leases.db')
+    first = Lease(connect(path), 'job', seconds=0.2)
+    second = Lease(connect(path), 'job', seconds=0.2)
+
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    time.sleep(0.25)
+    assert first.acquire()
+
+
+def test_build_once_waits_for_the_process_that_builds(tmp_path):
+    path = str(tmp_path / 'build.db')
+    done = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(threading.get_ident())
+        time.sleep(0.1)
+        done.set()
+
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(
+        build_once(connect(path), 'job', done.is_set, build, poll_seconds=0.01))) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(builds) == 1
+    assert sorted(results) == [False, False, False, True]
+
+
+def test_sku_index_is_built_once_per_database(tmp_path):
+    path = str(tmp_path / 'skus.db')
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        indexes = [SkuIndex(path) for _ in range(3)]
+        workers = [threading.Thread(target=index.ensure_built, args=(client,)) for index in indexes]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        product = client.products.get_products(per_page=1)[0]
+        listed = store.stats()['GET /products']
+
+    assert listed == 2  # one build, plus the lookup above
+    assert all(index.get(product['sku'])['id'] == product['id'] for index in indexes)
+
+
+def test_taxonomy_snapshot_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'taxonomy.db')
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        first = TaxonomyIndex(path=path)
+        first.ensure_fresh(client, sections=['categories'])
+        fetched = store.stats()['GET /products/categories']
+
+        second = TaxonomyIndex(path=path)
+        second.ensure_fresh(client, sections=['categories'])
+
+        assert store.stats()['GET /products/categories'] == fetched
+        assert second.list_categories() == first.list_categories()
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import SkuIndex, WooClient
+
+
+def _variable_product(client):
+    return next(p for p in client.products.get_products(per_page=20) if p['variations'])
+
+
+def test_build_covers_products_and_variations():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        parent = _variable_product(client)
+        variation = client.products.get_variation(parent['id'], parent['variations'][0])
+        index = SkuIndex()
+
+        index.build(client)
+
+        assert index.get(parent['sku'])['id'] == parent['id']
+        assert index.get(variation['sku']) == {'sku': variation['sku'], 'id': variation['id'],
+                                               'parent_id': parent['id'], 'type': 'variation'}
+        assert index.parents([variation['id'], parent['id']]) == {variation['id']: parent['id']}
+
+
+def test_resolve_looks_up_only_index_misses_in_batches():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        skus = [p['sku'] for p in client.products.get_products(per_page=20)]
+        index = SkuIndex()
+        index.upsert([{'id': 1, 'sku': skus[0], 'parent_id': 0, 'type': 'simple'}])
+        before = store.stats().get('GET /products', 0)
+
+        resolved = index.resolve(skus + ['NO-SUCH-SKU'], client=client)
+
+        assert resolved['NO-SUCH-SKU'] is None
+        assert all(resolved[sku] for sku in skus)
+        assert store.stats()['GET /products'] - before == 1
+        assert index.count() == 20
+
+
+def test_index_is_shared_through_its_file(tmp_path):
+    path = str(tmp_path / 'skus.db')
+    with StubStore(products=10) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        SkuIndex(path).build(client, include_variations=False)
+
+        reopened = SkuIndex(path)
+
+        assert reopened.is_ready()
+        assert reopened.count() == 10
+
+
+def test_refresh_follows_sku_changes_and_delete_removes_variations():
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        index = SkuIndex()
+        index.build(client)
+        parent = _variable_product(client)
+        client.products.update_product(parent['id'], {'sku': 'RENAMED-1'})
+
+        index.refresh(client, include_variations=False)
+        assert index.get('RENAMED-1')['id'] == parent['id']
+        assert index.get(parent['sku']) is None
+
+        index.delete_ids([parent['id']])
+        assert index.parents(parent['variations']) == {}
+
+
+def test_resolve_endpoint_splits_resolved_and_missing():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        client.products.sku_index = SkuIndex()
+        sku = client.products.get_products(per_page=1)[0]['sku']
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            response = TestClient(app).post("/api/products/resolve-skus", json={"skus": [sku, "MISSING"]})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert list(response.json()['resolved']) == [sku]
+        assert response.json()['missing'] == ["MISSING"]
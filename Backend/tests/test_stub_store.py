@@ -0,0 +1,46 @@
+import requests
+
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient
+
+AUTH = ('ck_test', 'cs_test')
+
+
+def test_seeded_contents_are_deterministic_and_paginated():
+    with StubStore(products=25, seed=7) as first, StubStore(products=25, seed=7) as second:
+        response = requests.get(f"{first.url}/wp-json/wc/v3/products", params={'per_page': 10, 'page': 3}, auth=AUTH)
+        same = requests.get(f"{second.url}/wp-json/wc/v3/products", params={'per_page': 10, 'page': 3}, auth=AUTH)
+
+        assert response.json() == same.json()
+        assert len(response.json()) == 5
+        assert (response.headers['X-WP-Total'], response.headers['X-WP-TotalPages']) == ('25', '3')
+        assert requests.get(f"{first.url}/wp-json/wc/v3/products", params={'per_page': 500}, auth=AUTH).status_code == 400
+
+
+def test_batch_endpoint_reports_errors_per_item():
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        product_id = client.products.get_products(per_page=1)[0]['id']
+
+        result = requests.post(f"{store.url}/wp-json/wc/v3/products/batch", auth=AUTH, json={
+            'create': [{'name': 'New mug'}],
+            'update': [{'id': product_id, 'name': 'Renamed'}, {'id': 999999, 'name': 'Ghost'}],
+        }).json()
+
+        assert result['create'][0]['name'] == 'New mug'
+        assert result['update'][0]['name'] == 'Renamed'
+        assert result['update'][1]['error']['code'] == 'woocommerce_rest_product_invalid_id'
+        assert store.stats()['POST /products/batch'] == 1
+
+        oversized = requests.post(f"{store.url}/wp-json/wc/v3/products/batch", auth=AUTH,
+                                  json={'create': [{'name': f'Mug {i}'} for i in range(101)]})
+        assert oversized.status_code == 413
+
+
+def test_injected_faults_are_counted():
+    with StubStore(products=5, throttle_rate=1.0, retry_after=3) as store:
+        response = requests.get(f"{store.url}/wp-json/wc/v3/products", auth=AUTH)
+
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '3'
+        assert store.stats()['throttled'] == 1
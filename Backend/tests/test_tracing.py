@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_woo_client
+from api.main import app
+from benchmarks.stub_store import StubStore
+from woo_client import WooClient, configure_tracing, disable_tracing, finished_spans
+from woo_client.tracing import NOOP_SPAN, bind_context, start_span
+
+pytest.importorskip('opentelemetry.sdk')
+
+
+@pytest.fixture
+def spans():
+    configure_tracing('memory')
+    try:
+        yield finished_spans
+    finally:
+        disable_tracing()
+
+
+def test_spans_are_noops_while_tracing_is_off():
+    def fn():
+        return 42
+
+    assert start_span('anything') is NOOP_SPAN
+    assert bind_context(fn) is fn
+    assert finished_spans() == []
+
+
+def test_client_spans_carry_endpoint_status_and_retries(spans):
+    with StubStore(products=1, throttle_rate=1.0, retry_after=0) as store:
+        client = WooClient("ck_test", "cs_test", store.url, max_retries=1, retry_backoff=0)
+        with pytest.raises(Exception):
+            client.products.get_products()
+
+    [span] = spans()
+    assert span['name'] == 'GET /products'
+    assert span['attributes']['url.template'] == '/products'
+    assert span['attributes']['woo.retries'] == 1
+    assert span['attributes']['http.response.status_code'] == 429
+
+
+def test_worker_pool_requests_join_the_callers_trace(spans):
+    with StubStore(products=20) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        ids = [product['id'] for product in client.products.get_products(per_page=20)]
+        with start_span('job'):
+            client.products.bulk_delete(ids, batch_size=5, max_workers=4)
+
+    recorded = spans()
+    job = next(span for span in recorded if span['name'] == 'job')
+    batches = [span for span in recorded if span['name'] == 'POST /products/batch']
+    assert len(batches) == 4
+    assert {span['trace_id'] for span in batches} == {job['trace_id']}
+
+
+def test_api_request_continues_an_incoming_trace(spans):
+    trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+    with StubStore(products=1) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        app.dependency_overrides[get_woo_client] = lambda: client
+        try:
+            TestClient(app).get('/api/products/1', headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'})
+        finally:
+            app.dependency_overrides.clear()
+
+    recorded = spans()
+    server = next(span for span in recorded if span['name'] == 'GET /api/products/{product_id}')
+    assert server['trace_id'] == trace_id
+    assert any(span['name'] == 'GET /products/{id}' and span['parent_id'] == server['span_id'] for span in recorded)
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+import api.main
+from api.main import app
+from api.models import Settings
+from api.warmup import IndexWarmup, warm_shared_indexes
+from benchmarks.stub_store import StubStore
+from woo_client import SkuIndex, TaxonomyIndex, WooClient
+
+
+def _warmup(client_factory):
+    return IndexWarmup(client_factory, TaxonomyIndex(), SkuIndex())
+
+
+def test_warm_up_loads_every_index_once():
+    with StubStore(products=10) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        warmup = _warmup(lambda: client)
+
+        assert warmup.warm_up()
+        fetched = store.stats()
+        warmup.refresh()
+
+        assert store.stats() == fetched
+    assert fetched['GET /products/categories'] >= 1 and fetched['GET /products/attributes'] >= 1
+    status = warmup.status()
+    assert status['ready']
+    assert {name: task['state'] for name, task in status['indexes'].items()} == {
+        'categories': 'ready', 'attributes': 'ready', 'sku': 'ready'}
+    assert warmup.sku_index.is_ready()
+
+
+def test_failed_index_is_reported_and_retried_by_refresh():
+    with StubStore(products=10) as store:
+        stopped_url = store.url
+    clients = [WooClient("ck_test", "cs_test", stopped_url)]
+    warmup = _warmup(lambda: clients[-1])
+
+    assert not warmup.warm_up()
+    assert warmup.status()['indexes']['sku']['state'] == 'failed'
+    assert warmup.status()['indexes']['sku']['error']
+
+    with StubStore(products=10) as store:
+        clients.append(WooClient("ck_test", "cs_test", store.url))
+        warmup.refresh()
+
+    assert warmup.status()['ready']
+
+
+def test_readiness_endpoint_waits_for_the_warmup(monkeypatch):
+    with StubStore(products=5) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        warmup = _warmup(lambda: client)
+        monkeypatch.setattr(api.main, 'get_index_warmup', lambda: warmup)
+        http = TestClient(app)
+
+        assert http.get('/api/health/ready').status_code == 503
+        warmup.warm_up()
+        response = http.get('/api/health/ready')
+
+    assert response.status_code == 200
+    assert response.json()['ready']
+
+
+def test_shared_warmup_is_skipped_without_credentials():
+    assert warm_shared_indexes(Settings()) == {'skipped': 'WooCommerce API credentials not configured'}
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_settings, get_webhook_dispatcher
+from api.main import app
+from api.models import Settings, WebhookEvent
+from api.webhooks import WebhookDispatcher, compute_signature, order_product_ids, parse_topic
+from benchmarks.stub_store import StubStore
+from woo_client import ProductSearchIndex, WooClient
+
+
+def _event(resource, resource_id=1, **payload):
+    return WebhookEvent(topic=f"{resource}.updated", resource=resource, event="updated",
+                        resource_id=resource_id, payload={"id": resource_id, **payload},
+                        received_at=datetime.utcnow())
+
+
+def test_events_without_subscribers_are_ignored():
+    dispatcher = WebhookDispatcher(debounce_seconds=60)
+    applied = []
+    dispatcher.subscribe("product", applied.extend)
+
+    assert dispatcher.submit(_event("coupon")) is False
+    assert dispatcher.submit(_event("product")) is True
+    dispatcher.flush()
+
+    assert [event.resource for event in applied] == ["product"]
+    stats = dispatcher.stats()
+    assert stats["ignored"] == 1
+    assert stats["received"] == 1
+
+
+def test_order_events_reindex_the_ordered_products():
+    with StubStore(products=10) as store:
+        client = WooClient("ck_test", "cs_test", store.url)
+        index = ProductSearchIndex()
+        index.build(client)
+        product = client.products.get_products(per_page=1)[0]
+        client.products.update_product(product['id'], {'stock_status': 'outofstock'})
+        events = [_event("order", 500, line_items=[{"product_id": product['id'], "variation_id": 0},
+                                                   {"product_id": product['id'], "variation_id": 0}]),
+                  _event("order", 501)]
+
+        assert order_product_ids(events) == [product['id']]
+        assert index.reindex(client, order_product_ids(events)) == 1
+        assert index.facets()['stock_status'] == {'instock': 9, 'outofstock': 1}
+
+
+def test_burst_of_updates_is_coalesced_into_the_latest_event():
+    dispatcher = WebhookDispatcher(debounce_seconds=60)
+    applied = []
+    dispatcher.subscribe("product", applied.extend)
+
+    for name in ("first", "second", "third"):
+        dispatcher.submit(_event("product", 7, name=name))
+    dispatcher.submit(_event("product", 8, name="other"))
+    dispatcher.flush()
+
+    assert sorted(event.payload["name"] for event in applied) == ["other", "third"]
+    assert dispatcher.stats()["coalesced"] == 2
+
+
+def test_taxonomy_actions_are_mapped_to_resources():
+    assert parse_topic("product.deleted", {"id": 4}) == ("product", "deleted", 4)
+    assert parse_topic("action.edited_product_cat", {"action": "edited_product_cat", "arg": 12}) == (
+        "category", "updated", 12)
+    assert parse_topic("action.woocommerce_attribute_deleted", {"arg": "3"}) == ("attribute", "deleted", 3)
+    assert parse_topic("action.created_pa_color", {"arg": {"term_id": 9}}) == ("term", "created", 9)
+
+
+def test_receiver_checks_the_signature_before_queueing():
+    dispatcher = WebhookDispatcher(debounce_seconds=60)
+    applied = []
+    dispatcher.subscribe("product", applied.extend)
+    app.dependency_overrides[get_settings] = lambda: Settings(webhook_secret="secret")
+    app.dependency_overrides[get_webhook_dispatcher] = lambda: dispatcher
+    body = json.dumps({"id": 5, "name": "Hoodie"}).encode()
+    try:
+        client = TestClient(app)
+        forged = client.post("/api/webhooks/woocommerce", content=body, headers={
+            "X-WC-Webhook-Topic": "product.updated", "X-WC-Webhook-Signature": compute_signature(body, "wrong")})
+        signed = client.post("/api/webhooks/woocommerce", content=body, headers={
+            "X-WC-Webhook-Topic": "product.updated", "X-WC-Webhook-Signature": compute_signature(body, "secret")})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert forged.status_code == 401
+    assert signed.status_code == 202
+    assert signed.json() == {"status": "queued", "topic": "product.updated", "resource": "product", "id": 5}
+    dispatcher.flush()
+    assert [event.payload["name"] for event in applied] == ["Hoodie"]
@@ -1,9 +1,19 @@
-from typing import Dict, Optional
-from .base_client import BaseWooClient
+from typing import Dict, List, Optional
+from .base_client import BaseWooClient, DEFAULT_COMPRESS_MIN_BYTES
 from .product_client import ProductClient
 from .attribute_client import AttributeClient
 from .media_client import MediaClient
 from .category_client import CategoryClient
+from .search_index import ProductSearchIndex
+from .sku_index import SkuIndex
+from .taxonomy_index import TaxonomyIndex
+from .inventory import InventoryUpdater
+from .bulk_delete import BulkDeleter
+from .cassette import Cassette
+from .http_cache import ResponseCache, ValidationCache
+from .json_codec import JsonCodec, get_codec
+from .metrics import RequestEvent, RequestHook, RequestMetrics, endpoint_template
+from .tracing import configure_tracing, disable_tracing, finished_spans
 
 
 class WooClient(BaseWooClient):
@@ -11,7 +21,11 @@ class WooClient(BaseWooClient):
     
     def __init__(self, api_key: str, api_secret: str, store_url: str, 
                  wp_username: Optional[str] = None, wp_password: Optional[str] = None,
-                 verify_ssl: bool = True):
+                 verify_ssl: bool = True, json_codec: Optional[JsonCodec] = None, max_retries: int = 0,
+                 retry_backoff: float = 0.5, request_hooks: Optional[List[RequestHook]] = None,
+                 compress_requests: bool = False, compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES,
+                 validation_cache: Optional[ValidationCache] = None,
+                 response_cache: Optional[ResponseCache] = None, cassette: Optional[Cassette] = None):
         """Initialize the WooClient with API credentials and create sub-clients
 
         Args:
@@ -21,6 +35,17 @@ class WooClient(BaseWooClient):
             wp_username: WordPress username (used for media uploads)
             wp_password: WordPress application password (used for media uploads)
             verify_ssl: Whether to verify SSL certificates
+            json_codec: Optional JSON codec shared by all sub-clients (orjson when installed)
+            max_retries: Retries for transient failures (see BaseWooClient)
+            retry_backoff: Seconds before the first retry, doubled on each retry
+            request_hooks: Request hooks shared by all sub-clients (see add_request_hook)
+            compress_requests: Gzip large JSON bodies (see BaseWooClient)
+            compress_min_bytes: Smallest body compressed, in bytes
+            validation_cache: ETag/Last-Modified cache shared by all sub-clients
+                (see ValidationCache)
+            response_cache: Persistent TTL cache of reference data shared by all
+                sub-clients (see ResponseCache)
+            cassette: Record/replay transport shared by all sub-clients (see Cassette)
         """
         super().__init__(
             api_key=api_key, 
@@ -28,20 +53,41 @@ class WooClient(BaseWooClient):
             store_url=store_url,
             wp_username=wp_username,
             wp_password=wp_password,
-            verify_ssl=verify_ssl
+            verify_ssl=verify_ssl,
+            json_codec=json_codec,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            request_hooks=request_hooks,
+            compress_requests=compress_requests,
+            compress_min_bytes=compress_min_bytes,
+            validation_cache=validation_cache,
+            response_cache=response_cache,
+            cassette=cassette
         )
         
-        # Initialize sub-clients
-        self.products = ProductClient(api_key, api_secret, store_url, verify_ssl=verify_ssl)
-        self.attributes = AttributeClient(api_key, api_secret, store_url, verify_ssl=verify_ssl)
-        self.categories = CategoryClient(api_key, api_secret, store_url, verify_ssl=verify_ssl)
+        # Initialize sub-clients; they share the codec, retry policy, hook list and caches
+        shared = {
+            'verify_ssl': verify_ssl,
+            'json_codec': self.json_codec,
+            'max_retries': self.max_retries,
+            'retry_backoff': self.retry_backoff,
+            'request_hooks': self.request_hooks,
+            'compress_requests': compress_requests,
+            'compress_min_bytes': compress_min_bytes,
+            'validation_cache': validation_cache,
+            'response_cache': response_cache,
+            'cassette': cassette,
+        }
+        self.products = ProductClient(api_key, api_secret, store_url, **shared)
+        self.attributes = AttributeClient(api_key, api_secret, store_url, **shared)
+        self.categories = CategoryClient(api_key, api_secret, store_url, **shared)
         self.media = MediaClient(
             api_key=api_key, 
             api_secret=api_secret, 
             store_url=store_url,
             wp_username=wp_username,
             wp_password=wp_password,
-            verify_ssl=verify_ssl
+            **shared
         )
     
     def get_store_info(self) -> Dict:
@@ -55,4 +101,7 @@ class WooClient(BaseWooClient):
 
 
 # Make it easier to import the classes directly
-__all__ = ['WooClient', 'BaseWooClient', 'ProductClient', 'AttributeClient', 'MediaClient', 'CategoryClient']
+__all__ = ['WooClient', 'BaseWooClient', 'ProductClient', 'AttributeClient', 'MediaClient', 'CategoryClient',
+           'ProductSearchIndex', 'SkuIndex', 'TaxonomyIndex', 'InventoryUpdater',
+           'BulkDeleter', 'JsonCodec', 'get_codec', 'ValidationCache', 'ResponseCache', 'Cassette', 'RequestEvent', 'RequestMetrics', 'endpoint_template',
+           'configure_tracing', 'disable_tracing', 'finished_spans']
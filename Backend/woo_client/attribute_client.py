@@ -29,6 +29,23 @@ class AttributeClient(BaseWooClient):
                 return attr
         return None
 
+    def get_attribute_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get an attribute by its slug
+        
+        Args:
+            slug: The attribute slug, with or without the 'pa_' prefix
+            
+        Returns:
+            The attribute if found, None otherwise
+        """
+        if not slug.startswith('pa_'):
+            slug = f'pa_{slug}'
+        attributes = self.get_attributes(per_page=100)
+        for attr in attributes:
+            if attr['slug'] == slug:
+                return attr
+        return None
+
     def get_or_create_attribute(self, name: str) -> Dict[str, Any]:
         """Get an existing attribute or create it if it doesn't exist
         
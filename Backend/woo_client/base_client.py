@@ -1,9 +1,28 @@
 import requests
-import json
 import base64
+import gzip
+import logging
+import time
 import warnings
+from requests.utils import DEFAULT_ACCEPT_ENCODING
 from urllib3.exceptions import InsecureRequestWarning
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
+
+from .cassette import Cassette
+from .http_cache import ResponseCache, ValidationCache, cache_key
+from .json_codec import JsonCodec, default_codec
+from .metrics import RequestEvent, RequestHook, endpoint_template
+from .tracing import NOOP_SPAN, start_span, tracing_enabled
+
+# Statuses worth retrying: throttling, and gateway errors for idempotent methods
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+# Cap on a server-provided Retry-After, in seconds
+MAX_RETRY_AFTER = 30.0
+# Smallest JSON body gzipped when request compression is on (batch requests are usually far larger)
+DEFAULT_COMPRESS_MIN_BYTES = 16 * 1024
+
+logger = logging.getLogger(__name__)
 
 
 class BaseWooClient:
@@ -11,7 +30,11 @@ class BaseWooClient:
 
     def __init__(self, api_key: str, api_secret: str, store_url: str, 
                  wp_username: Optional[str] = None, wp_password: Optional[str] = None, 
-                 verify_ssl: bool = True):
+                 verify_ssl: bool = True, json_codec: Optional[JsonCodec] = None, max_retries: int = 0,
+                 retry_backoff: float = 0.5, request_hooks: Optional[List[RequestHook]] = None,
+                 compress_requests: bool = False, compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES,
+                 validation_cache: Optional[ValidationCache] = None,
+                 response_cache: Optional[ResponseCache] = None, cassette: Optional[Cassette] = None):
         """Initialize the base client with API credentials and store URL
 
         Args:
@@ -21,6 +44,27 @@ class BaseWooClient:
             wp_username (str, optional): WordPress username for REST API
             wp_password (str, optional): WordPress application password for REST API
             verify_ssl (bool): Whether to verify SSL certificates
+            json_codec (JsonCodec, optional): JSON codec for request and response
+                bodies (orjson when installed, the json module otherwise)
+            max_retries (int): Retries for connection errors, 429 responses and
+                (for idempotent methods) 502/503/504 responses
+            retry_backoff (float): Seconds before the first retry, doubled on each
+                retry (a Retry-After header takes precedence)
+            request_hooks (list, optional): Callables receiving a RequestEvent
+                after every request (the list is shared, not copied)
+            compress_requests (bool): Gzip JSON bodies of at least
+                ``compress_min_bytes`` (e.g. batch requests). Only for servers
+                that decode ``Content-Encoding: gzip`` request bodies; it is
+                turned off after the first compressed request they reject
+            compress_min_bytes (int): Smallest body compressed, in bytes
+            validation_cache (ValidationCache, optional): Cache of GET responses
+                carrying an ETag or Last-Modified; cached URLs are requested
+                conditionally and a 304 response is served from the cache
+            response_cache (ResponseCache, optional): Persistent cache serving
+                GET responses of endpoints with a TTL (reference data) without
+                a request until they expire
+            cassette (Cassette, optional): Record the requests and responses to
+                a file, or replay them from it instead of contacting the store
         """
         self.api_key = api_key
         self.api_secret = api_secret
@@ -40,6 +84,30 @@ class BaseWooClient:
         # SSL verification setting
         self.verify_ssl = verify_ssl
         
+        # JSON encoder/decoder for request and response bodies
+        self.json_codec = json_codec or default_codec()
+        
+        # Retry policy for transient failures
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        
+        # Callables notified of every request (see add_request_hook)
+        self.request_hooks: List[RequestHook] = request_hooks if request_hooks is not None else []
+        
+        # Request body compression (responses are always requested compressed)
+        self.compress_requests = compress_requests
+        self.compress_min_bytes = compress_min_bytes
+        
+        # Conditional GET requests (see ValidationCache) and TTL-based reuse (see ResponseCache)
+        self.validation_cache = validation_cache
+        self.response_cache = response_cache
+        
+        # Record/replay transport (requests are sent with requests.request otherwise)
+        self.cassette = cassette
+        
+        # Last HTTP response received (used to read pagination headers)
+        self.last_response = None
+        
         # Suppress SSL warnings if verify_ssl is False
         if not verify_ssl:
             warnings.simplefilter('ignore', InsecureRequestWarning)
@@ -58,6 +126,15 @@ class BaseWooClient:
         auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
         return {'Authorization': f'Basic {auth_b64}'}
 
+    def add_request_hook(self, hook: RequestHook) -> None:
+        """Call ``hook`` with a RequestEvent after every request of this client
+
+        Events carry the method, the endpoint with IDs replaced by ``{id}``,
+        the status, the duration, the request and response sizes and the
+        number of retries. WooClient shares its hooks with its sub-clients.
+        """
+        self.request_hooks.append(hook)
+
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None, 
                       wordpress_api: bool = False, is_multipart: bool = False, files: Optional[Dict] = None) -> Any:
         """Make a request to the WooCommerce API or WordPress API
@@ -77,6 +154,50 @@ class BaseWooClient:
         Raises:
             Exception: If the API returns a non-200 status code
         """
+        response = self._send_request(method, endpoint, params=params, data=data, wordpress_api=wordpress_api,
+                                      is_multipart=is_multipart, files=files)
+        self.last_response = response
+        return self.json_codec.loads(response.content) if response.content else {}
+
+    def _make_raw_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                          data: Optional[Dict] = None, wordpress_api: bool = False) -> requests.Response:
+        """Make a request and return the response without decoding the body
+
+        Used to pass large upstream payloads through as-is. The body is in
+        ``response.content`` and the pagination headers in ``response.headers``.
+
+        Returns:
+            The raw requests.Response
+        """
+        response = self._send_request(method, endpoint, params=params, data=data, wordpress_api=wordpress_api)
+        self.last_response = response
+        return response
+
+    def _send_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None,
+                      wordpress_api: bool = False, is_multipart: bool = False,
+                      files: Optional[Dict] = None) -> requests.Response:
+        """Send a request and return the raw response (see _make_request for arguments)
+
+        Raises:
+            Exception: If the API returns a non-200 status code
+        """
+        if not tracing_enabled():
+            return self._send_with_retries(method, endpoint, params, data, wordpress_api, is_multipart, files)
+        
+        template = endpoint_template(endpoint)
+        attributes = {
+            'http.request.method': method.upper(),
+            'url.template': template,
+            'woo.api': 'wp' if wordpress_api else 'wc',
+            'woo.retries': 0,
+        }
+        with start_span(f"{method.upper()} {template}", attributes, kind='client') as span:
+            return self._send_with_retries(method, endpoint, params, data, wordpress_api, is_multipart, files, span)
+
+    def _send_with_retries(self, method: str, endpoint: str, params: Optional[Dict], data: Optional[Dict],
+                           wordpress_api: bool, is_multipart: bool, files: Optional[Dict],
+                           span=NOOP_SPAN) -> requests.Response:
+        """Send a request, retrying transient failures (see _send_request)"""
         # Choose the appropriate base URL and auth header
         if wordpress_api:
             base_url = self.wp_api_base_url
@@ -93,22 +214,194 @@ class BaseWooClient:
             headers = {**auth_header}  # Don't set Content-Type for multipart requests
         else:
             headers = {**auth_header, 'Content-Type': 'application/json'}
+        # JSON responses shrink 5-10x with gzip (or brotli/zstd when urllib3 can decode them)
+        headers['Accept-Encoding'] = DEFAULT_ACCEPT_ENCODING
         
         # Handle the request data based on type
+        uncompressed = None
         if data and not is_multipart:
-            data = json.dumps(data)
-        
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=headers,
-            params=params,
-            data=data,
-            files=files,
-            verify=self.verify_ssl
-        )
+            data = self.json_codec.dumps(data)
+            if self.compress_requests and len(data) >= self.compress_min_bytes:
+                uncompressed = data
+                data = gzip.compress(data, compresslevel=6)
+                headers['Content-Encoding'] = 'gzip'
         
-        if response.status_code < 200 or response.status_code >= 300:
+        # Serve fresh reference data from the response cache, and revalidate
+        # a cached copy instead of downloading the body again
+        key = cached = None
+        if method.upper() == 'GET' and not files and (
+                self.validation_cache is not None or self.response_cache is not None):
+            key = cache_key(url, params)
+            if self.response_cache is not None:
+                fresh = self.response_cache.get(key)
+                if fresh is not None:
+                    span.set_attribute('woo.cache', 'hit')
+                    return fresh.to_response()
+            if self.validation_cache is not None:
+                cached = self.validation_cache.get(key)
+                if cached is not None:
+                    headers.update(cached.conditional_headers())
+        
+        # File objects cannot be re-sent, so multipart uploads are not retried
+        max_retries = 0 if is_multipart else self.max_retries
+        send = self.cassette.request if self.cassette is not None else requests.request
+        started = time.perf_counter()
+        retries = 0
+        while True:
+            try:
+                response = send(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    files=files,
+                    verify=self.verify_ssl
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if retries < max_retries:
+                    self._wait_before_retry(retries, None)
+                    retries += 1
+                    span.set_attribute('woo.retries', retries)
+                    continue
+                self._emit(method, endpoint, wordpress_api, None, started, data, None, retries, str(e))
+                raise
+            
+            if uncompressed is not None and self._rejects_compression(response):
+                # Send this and later requests uncompressed; not counted as a retry
+                logger.warning(f"{url} rejected a gzip request body (HTTP {response.status_code}); "
+                               f"request compression turned off")
+                self.compress_requests = False
+                data, uncompressed = uncompressed, None
+                del headers['Content-Encoding']
+                continue
+            
+            if response.status_code in RETRY_STATUSES and retries < max_retries and (
+                    response.status_code == 429 or method.upper() in IDEMPOTENT_METHODS):
+                self._wait_before_retry(retries, response.headers.get('Retry-After'))
+                retries += 1
+                span.set_attribute('woo.retries', retries)
+                continue
+            break
+        
+        span.set_attribute('http.response.status_code', response.status_code)
+        
+        if cached is not None:
+            revalidated = response.status_code == 304
+            self.validation_cache.record(revalidated)
+            if revalidated:
+                self._emit(method, endpoint, wordpress_api, response, started, data, response.content, retries, None)
+                response = cached.to_response(response)
+                if self.response_cache is not None:
+                    self.response_cache.store(key, endpoint, response)
+                return response
+        
+        failed = response.status_code < 200 or response.status_code >= 300
+        self._emit(method, endpoint, wordpress_api, response, started, data, response.content, retries,
+                   f"HTTP {response.status_code}" if failed else None)
+        
+        if failed:
             raise Exception(f"API request failed with status {response.status_code}: {response.text}")
         
-        return response.json() if response.text else {}
+        if key is not None:
+            if self.validation_cache is not None:
+                self.validation_cache.store(key, response)
+            if self.response_cache is not None:
+                self.response_cache.store(key, endpoint, response)
+        elif self.response_cache is not None and method.upper() != 'GET':
+            self.response_cache.invalidate(endpoint)
+        
+        return response
+
+    @staticmethod
+    def _rejects_compression(response: requests.Response) -> bool:
+        """Whether a response says the server could not read a gzip request body
+
+        Servers that do not decode request bodies pass the gzip bytes to
+        WordPress, which answers 400 rest_invalid_json; others answer 415.
+        """
+        if response.status_code == 415:
+            return True
+        return response.status_code == 400 and b'rest_invalid_json' in response.content
+
+    def _wait_before_retry(self, retries: int, retry_after: Optional[str]) -> None:
+        """Sleep before a retry: Retry-After when the server sent one, exponential backoff otherwise"""
+        delay = self.retry_backoff * (2 ** retries)
+        if retry_after:
+            try:
+                delay = min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+    def _emit(self, method: str, endpoint: str, wordpress_api: bool, response: Optional[requests.Response],
+              started: float, body: Any, content: Optional[bytes], retries: int, error: Optional[str]) -> None:
+        """Send a RequestEvent to the request hooks (hook errors are logged, never raised)"""
+        if not self.request_hooks:
+            return
+        if isinstance(body, (bytes, str)):
+            bytes_sent = len(body)
+        elif response is not None:
+            bytes_sent = int(response.request.headers.get('Content-Length') or 0)
+        else:
+            bytes_sent = 0
+        event = RequestEvent(
+            method=method.upper(),
+            endpoint=endpoint_template(endpoint),
+            api='wp' if wordpress_api else 'wc',
+            status=response.status_code if response is not None else None,
+            duration=time.perf_counter() - started,
+            bytes_sent=bytes_sent,
+            bytes_received=self._wire_size(response, content),
+            retries=retries,
+            error=error
+        )
+        for hook in list(self.request_hooks):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook failed")
+
+    @staticmethod
+    def _wire_size(response: Optional[requests.Response], content: Optional[bytes]) -> int:
+        """Size of a response body as received, before decompression"""
+        if not content:
+            return 0
+        raw = getattr(response, 'raw', None)
+        if response.headers.get('Content-Encoding') and hasattr(raw, 'tell'):
+            return raw.tell() or len(content)
+        return len(content)
+
+    def iter_pages(self, endpoint: str, params: Optional[Dict] = None, per_page: int = 100,
+                   wordpress_api: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """Iterate over every page of a list endpoint
+
+        Uses the X-WP-TotalPages header to know when to stop, and falls back to
+        stopping at the first short page when the header is missing.
+
+        Args:
+            endpoint: API endpoint (e.g., /products)
+            params: Additional query parameters (e.g., {'_fields': 'id,sku'})
+            per_page: Number of items per page (max 100)
+            wordpress_api: Whether to use the WordPress API instead of WooCommerce API
+
+        Yields:
+            One list of items per page
+        """
+        page = 1
+        while True:
+            page_params = {**(params or {}), 'per_page': per_page, 'page': page}
+            response = self._send_request('GET', endpoint, params=page_params, wordpress_api=wordpress_api)
+            items = self.json_codec.loads(response.content) if response.content else []
+            if not items:
+                return
+            
+            yield items
+            
+            total_pages = response.headers.get('X-WP-TotalPages')
+            if total_pages is not None:
+                if page >= int(total_pages):
+                    return
+            elif len(items) < per_page:
+                return
+            page += 1
@@ -0,0 +1,256 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Optional, Set
+
+from .tracing import bind_context
+
+# WooCommerce accepts at most 100 objects per batch request
+MAX_BATCH_SIZE = 100
+
+# Progress callback: progress(stage, done, total)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class BulkDeleter:
+    """Store-wide product deletion engine
+
+    Deletes products in three steps:
+
+    1. Target IDs (and their image IDs when media cleanup is requested) are
+       collected with paginated ``_fields`` fetches before anything is
+       deleted, so pagination is not shifted by the deletions.
+    2. Products are deleted 100 at a time through /products/batch, several
+       batches in parallel. WooCommerce always deletes batch items
+       permanently, so trashing falls back to parallel single DELETE requests.
+    3. Optionally, media that was attached to the deleted products and is not
+       used by any remaining product (trashed ones included) is deleted as
+       well. Media is deleted permanently, so it is only cleaned up when the
+       products are deleted permanently too.
+    """
+
+    def __init__(self, products_client, batch_size: int = MAX_BATCH_SIZE, max_workers: int = 4,
+                 logger: Optional[logging.Logger] = None):
+        """Initialize the deleter
+
+        Args:
+            products_client: ProductClient used for all product requests
+            batch_size: Number of IDs per batch request (max 100)
+            max_workers: Number of requests sent in parallel
+            logger: Optional logger instance
+        """
+        self.client = products_client
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self._requests = 0
+
+    def run(self, ids: Optional[Iterable[int]] = None, filters: Optional[Dict[str, Any]] = None,
+            force: bool = True, delete_media: bool = False, media_client=None, dry_run: bool = False,
+            progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Delete products
+
+        Args:
+            ids: Product IDs to delete; when omitted, every product matching
+                ``filters`` is deleted (every product when both are omitted)
+            filters: Query parameters selecting the products (e.g. {'status': 'draft'})
+            force: Delete permanently instead of moving to the trash
+            delete_media: Also delete media left unused by the deleted products
+                (requires ``force``: trashed products could not be restored
+                with their images)
+            media_client: MediaClient used for media cleanup
+            dry_run: Only report what would be deleted
+            progress: Optional callback called as progress(stage, done, total)
+                with the stages 'collect', 'delete' and 'media'
+
+        Returns:
+            Report with matched/deleted counts, failures, media counts and timing
+            ('requests' counts collection pages, batches and media deletions,
+            not variation image lookups)
+        """
+        if delete_media and media_client is None:
+            raise ValueError("media_client is required to delete media")
+        if delete_media and not force:
+            raise ValueError("delete_media requires force=True; trashed products would lose their images")
+
+        started = time.perf_counter()
+        self._requests = 0
+        progress = progress or (lambda stage, done, total: None)
+
+        targets = self._collect(ids, filters, delete_media, progress)
+        report: Dict[str, Any] = {
+            'matched': len(targets),
+            'deleted': 0,
+            'failed': [],
+        }
+
+        media_ids: Set[int] = set()
+        for image_ids in targets.values():
+            media_ids.update(image_ids)
+
+        if dry_run:
+            report['ids'] = list(targets)
+            if delete_media:
+                report['media_ids'] = sorted(media_ids)
+        else:
+            deleted = self._delete_products(list(targets), force, report, progress)
+            if self.client.sku_index is not None and deleted:
+                self.client.sku_index.delete_ids(deleted)
+
+            if delete_media:
+                # Only media of products that are really gone is eligible
+                failed_ids = {f['id'] for f in report['failed']}
+                candidates = set()
+                for product_id, image_ids in targets.items():
+                    if product_id not in failed_ids:
+                        candidates.update(image_ids)
+                # Shared images may still be used by other products, or by products whose deletion failed
+                candidates -= self._media_in_use()
+                self._delete_media(media_client, sorted(candidates), report, progress)
+
+        elapsed = time.perf_counter() - started
+        report['requests'] = self._requests
+        report['elapsed_seconds'] = round(elapsed, 3)
+        return report
+
+    def _collect(self, ids: Optional[Iterable[int]], filters: Optional[Dict[str, Any]],
+                 with_media: bool, progress: ProgressCallback) -> Dict[int, List[int]]:
+        """Collect the target product IDs mapped to their image IDs"""
+        fields = 'id,type,images' if with_media else 'id'
+        targets: Dict[int, List[int]] = {}
+        variable_ids = []
+
+        if ids is not None:
+            wanted = list(dict.fromkeys(int(i) for i in ids))
+            if not with_media:
+                progress('collect', len(wanted), len(wanted))
+                return {i: [] for i in wanted}
+            pages = (
+                self.client._make_request('GET', '/products', params={
+                    'include': ','.join(str(i) for i in wanted[start:start + MAX_BATCH_SIZE]),
+                    'per_page': MAX_BATCH_SIZE,
+                    '_fields': fields,
+                })
+                for start in range(0, len(wanted), MAX_BATCH_SIZE)
+            )
+        else:
+            pages = self.client.iter_pages('/products', params={**(filters or {}), '_fields': fields})
+
+        for page in pages:
+            self._requests += 1
+            for product in page:
+                targets[product['id']] = [image['id'] for image in product.get('images') or [] if image.get('id')]
+                if product.get('type') == 'variable':
+                    variable_ids.append(product['id'])
+            progress('collect', len(targets), len(targets))
+
+        if ids is not None:
+            # IDs the store did not return are still attempted, so they show up as failures
+            for product_id in wanted:
+                targets.setdefault(product_id, [])
+
+        if with_media and variable_ids:
+            # Variation images are not part of the parent's images list
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for parent_id, image_ids in zip(variable_ids, executor.map(bind_context(self._variation_images), variable_ids)):
+                    targets[parent_id].extend(image_ids)
+
+        return targets
+
+    def _delete_products(self, ids: List[int], force: bool, report: Dict[str, Any],
+                         progress: ProgressCallback) -> List[int]:
+        """Delete products in parallel batches and return the deleted IDs"""
+        if force:
+            jobs = [ids[start:start + self.batch_size] for start in range(0, len(ids), self.batch_size)]
+
+            def send(chunk):
+                try:
+                    response = self.client._make_request('POST', '/products/batch', data={'delete': chunk})
+                    return chunk, response.get('delete', []), None
+                except Exception as e:
+                    return chunk, [], e
+        else:
+            jobs = [[product_id] for product_id in ids]
+
+            def send(chunk):
+                try:
+                    return chunk, [self.client.delete_product(chunk[0], force=False)], None
+                except Exception as e:
+                    return chunk, [], e
+
+        deleted = []
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk, results, error in executor.map(bind_context(send), jobs):
+                self._requests += 1
+                done += len(chunk)
+                if error is not None:
+                    self.logger.error(f"Deleting products {chunk[0]}..{chunk[-1]} failed: {str(error)}")
+                    report['failed'].extend({'id': product_id, 'error': str(error)} for product_id in chunk)
+                else:
+                    errors_by_id = {
+                        r.get('id'): r['error'] for r in results if isinstance(r, dict) and r.get('error')
+                    }
+                    for product_id in chunk:
+                        if product_id in errors_by_id:
+                            message = errors_by_id[product_id].get('message', 'Delete failed')
+                            report['failed'].append({'id': product_id, 'error': message})
+                        else:
+                            deleted.append(product_id)
+                progress('delete', done, len(ids))
+
+        report['deleted'] = len(deleted)
+        return deleted
+
+    def _media_in_use(self) -> Set[int]:
+        """Get the image IDs still used by remaining products and their variations
+
+        Trashed products are included (status 'any' leaves them out), since
+        they can still be restored.
+        """
+        in_use: Set[int] = set()
+        variable_ids = []
+        for status in ('any', 'trash'):
+            for page in self.client.iter_pages('/products', params={'status': status, '_fields': 'id,type,images'}):
+                self._requests += 1
+                for product in page:
+                    in_use.update(image['id'] for image in product.get('images') or [] if image.get('id'))
+                    if product.get('type') == 'variable':
+                        variable_ids.append(product['id'])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for image_ids in executor.map(bind_context(self._variation_images), variable_ids):
+                in_use.update(image_ids)
+        return in_use
+
+    def _variation_images(self, parent_id: int) -> List[int]:
+        """Get the image IDs of a variable product's variations"""
+        image_ids = []
+        for variations in self.client.iter_pages(f'/products/{parent_id}/variations', params={'_fields': 'image'}):
+            image_ids.extend(v['image']['id'] for v in variations if (v.get('image') or {}).get('id'))
+        return image_ids
+
+    def _delete_media(self, media_client, media_ids: List[int], report: Dict[str, Any],
+                      progress: ProgressCallback) -> None:
+        """Delete media items in parallel (the WordPress API has no batch endpoint for media)"""
+        report['media_deleted'] = 0
+        report['media_failed'] = []
+
+        def send(media_id):
+            try:
+                # Attachments do not support trashing, so force is required
+                media_client.delete_media(media_id, force=True)
+                return media_id, None
+            except Exception as e:
+                return media_id, e
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for media_id, error in executor.map(bind_context(send), media_ids):
+                self._requests += 1
+                done += 1
+                if error is not None:
+                    report['media_failed'].append({'id': media_id, 'error': str(error)})
+                else:
+                    report['media_deleted'] += 1
+                progress('media', done, len(media_ids))
@@ -0,0 +1,237 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .http_cache import UNCACHED_HEADERS, CachedResponse, cache_key
+from .json_codec import default_codec
+
+# Request/response fields whose values are replaced before a cassette is written
+# (matched case-insensitively as substrings of JSON keys and query parameters)
+SECRET_FIELDS = ('password', 'secret', 'token', 'consumer_key', 'api_key', 'authorization', 'signature')
+SCRUBBED = '[scrubbed]'
+
+# Response headers never recorded (cookies may carry sessions)
+UNRECORDED_HEADERS = UNCACHED_HEADERS + ('set-cookie', 'authorization', 'www-authenticate')
+
+MODES = ('record', 'replay')
+LATENCIES = ('zero', 'recorded')
+
+
+def _is_secret(name: str) -> bool:
+    name = name.lower()
+    return any(field in name for field in SECRET_FIELDS)
+
+
+def scrub(value: Any) -> Any:
+    """Copy of a decoded JSON value with secret fields replaced"""
+    if isinstance(value, dict):
+        return {key: SCRUBBED if _is_secret(key) and val not in (None, '') else scrub(val)
+                for key, val in value.items()}
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+def scrub_url(url: str) -> str:
+    """URL with secret query parameters and user info replaced"""
+    parts = urlsplit(url)
+    query = urlencode([(name, SCRUBBED if _is_secret(name) else value)
+                       for name, value in parse_qsl(parts.query, keep_blank_values=True)])
+    netloc = parts.netloc.rpartition('@')[2]
+    return urlunsplit((parts.scheme, netloc, parts.path, query, parts.fragment))
+
+
+class Cassette:
+    """Record/replay transport for BaseWooClient
+
+    In 'record' mode requests go to the store as usual, and each
+    request/response pair is kept, with credentials and secret fields
+    scrubbed; save() writes them to a JSON file. In 'replay' mode no request
+    leaves the process: responses are served from the file, either
+    immediately (``latency='zero'``, to profile the CPU cost of the client,
+    the importer and the models alone) or after the recorded response time
+    (``latency='recorded'``).
+
+    Replayed requests are matched on method, URL and body; failing that on
+    method and URL, then on method and path (for bodies or query strings
+    holding timestamps). Identical requests get their recorded responses in
+    order, the last one being repeated once they run out.
+    """
+
+    def __init__(self, path: str, mode: str = 'replay', latency: str = 'zero'):
+        """Open a cassette
+
+        Args:
+            path: Cassette file (read in 'replay' mode, written by save() in 'record' mode)
+            mode: 'record' or 'replay'
+            latency: In replay mode, 'zero' or 'recorded' (wait as long as the
+                store took to answer)
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        if latency not in LATENCIES:
+            raise ValueError(f"latency must be one of {LATENCIES}, not {latency!r}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions: List[Dict[str, Any]] = []
+        self._codec = default_codec()
+        self._lock = threading.Lock()
+        # Replay state: recorded responses, and their indexes by match key
+        self._responses: List[CachedResponse] = []
+        self._index: Dict[Tuple, List[int]] = defaultdict(list)
+        self._used: List[bool] = []
+        self._last: Dict[Tuple, int] = {}
+        self.played = 0
+        if mode == 'replay':
+            self.load()
+
+    def __enter__(self) -> 'Cassette':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.mode == 'record':
+            self.save()
+        return False
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                params: Optional[Dict[str, Any]] = None, data: Any = None, files: Any = None,
+                verify: bool = True) -> requests.Response:
+        """Send (record) or look up (replay) a request; same arguments as requests.request"""
+        request_url = scrub_url(cache_key(url, params))
+        body = self._request_body(headers or {}, data, files)
+        if self.mode == 'replay':
+            return self._play(method.upper(), request_url, body)
+
+        started = time.perf_counter()
+        response = requests.request(method=method, url=url, headers=headers, params=params, data=data,
+                                    files=files, verify=verify)
+        elapsed = time.perf_counter() - started
+        self._record(method.upper(), request_url, body, response, elapsed)
+        return response
+
+    def _request_body(self, headers: Dict[str, str], data: Any, files: Any) -> Optional[str]:
+        """Scrubbed JSON request body, as recorded and matched (None for multipart and empty bodies)"""
+        if files or not isinstance(data, (bytes, str)) or not data:
+            return None
+        if headers.get('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        try:
+            decoded = self._codec.loads(data)
+        except ValueError:
+            return None
+        return json.dumps(scrub(decoded), sort_keys=True, separators=(',', ':'))
+
+    def _record(self, method: str, url: str, body: Optional[str], response: requests.Response,
+                elapsed: float) -> None:
+        content = response.content
+        recorded: Dict[str, Any] = {}
+        try:
+            recorded['body'] = self._codec.dumps(scrub(self._codec.loads(content))).decode('utf-8') if content else ''
+        except ValueError:
+            try:
+                recorded['body'] = content.decode('utf-8')
+            except UnicodeDecodeError:
+                recorded['body_base64'] = base64.b64encode(content).decode('ascii')
+        interaction = {
+            'request': {'method': method, 'url': url, 'body': body},
+            'response': {
+                'status': response.status_code,
+                'headers': {name: value for name, value in response.headers.items()
+                            if name.lower() not in UNRECORDED_HEADERS},
+                **recorded,
+            },
+            'elapsed': round(elapsed, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _match_keys(method: str, url: str, body: Optional[str]) -> Tuple[Tuple, ...]:
+        digest = hashlib.sha1(body.encode('utf-8')).hexdigest() if body else None
+        return (method, url, digest), (method, url), (method, urlsplit(url).path)
+
+    def load(self) -> None:
+        """Read the cassette file and index its responses for replay"""
+        with open(self.path, 'rb') as f:
+            self.interactions = self._codec.loads(f.read())['interactions']
+        self._responses, self._used, self._last = [], [], {}
+        self._index.clear()
+        for position, interaction in enumerate(self.interactions):
+            request, recorded = interaction['request'], interaction['response']
+            content = (base64.b64decode(recorded['body_base64']) if 'body_base64' in recorded
+                       else recorded['body'].encode('utf-8'))
+            self._responses.append(CachedResponse(request['url'], recorded['status'], content, recorded['headers']))
+            self._used.append(False)
+            for key in self._match_keys(request['method'], request['url'], request.get('body')):
+                self._index[key].append(position)
+
+    def _play(self, method: str, url: str, body: Optional[str]) -> requests.Response:
+        with self._lock:
+            position = None
+            keys = self._match_keys(method, url, body)
+            for key in keys:
+                position = next((i for i in self._index.get(key, ()) if not self._used[i]), None)
+                if position is not None:
+                    break
+            if position is None:
+                position = next((self._last[key] for key in keys if key in self._last), None)
+            if position is None:
+                raise Exception(f"No recorded response for {method} {url} in {self.path}")
+            self._used[position] = True
+            for key in keys:
+                self._last[key] = position
+            self.played += 1
+        if self.latency == 'recorded':
+            time.sleep(self.interactions[position]['elapsed'])
+        response = self._responses[position].to_response()
+        # Request hooks read the request headers; building a full PreparedRequest would cost more than the replay
+        response.request = requests.PreparedRequest()
+        response.request.method, response.request.url = method, url
+        response.request.headers = CaseInsensitiveDict({'Content-Length': str(len(body or ''))})
+        return response
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file"""
+        with self._lock:
+            document = {
+                'version': 1,
+                'recorded_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S'),
+                'interactions': list(self.interactions),
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode, number of interactions, and (in replay mode) how many were played and never used"""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'interactions': len(self.interactions),
+                'played': self.played,
+                'unused': self._used.count(False) if self.mode == 'replay' else None,
+            }
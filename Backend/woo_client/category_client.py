@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional
+import requests
 from .base_client import BaseWooClient
 
 
@@ -17,6 +18,19 @@ class CategoryClient(BaseWooClient):
         params = {'per_page': per_page}
         return self._make_request('GET', '/products/categories', params=params)
     
+    def get_categories_raw(self, per_page: int = 100, **kwargs) -> requests.Response:
+        """Get a page of categories without decoding the response
+        
+        Args:
+            per_page: Number of categories to retrieve per page
+            **kwargs: Additional query parameters
+            
+        Returns:
+            The raw response (JSON body in ``.content``, pagination headers in ``.headers``)
+        """
+        params = {'per_page': per_page, **kwargs}
+        return self._make_raw_request('GET', '/products/categories', params=params)
+    
     def get_category(self, category_id: int) -> Dict[str, Any]:
         """Get a specific category by ID
         
@@ -0,0 +1,308 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .sqlite_utils import connect, transaction
+
+# Headers not stored with a cached body: it is kept decoded, and these
+# describe the transfer rather than the resource
+UNCACHED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive')
+
+# Seconds ResponseCache keeps reference data: it changes rarely and is read
+# by every import. Endpoints without a rule (products, orders) are not cached.
+DEFAULT_TTLS = {
+    '/products/categories': 3600,
+    '/products/attributes': 3600,
+    '/media': 3600,
+}
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """URL with its encoded query string (None values are left out, as requests does)"""
+    if not params:
+        return url
+    query = urlencode([(name, value) for name, value in params.items() if value is not None], doseq=True)
+    return f"{url}{'&' if '?' in url else '?'}{query}" if query else url
+
+
+class CachedResponse:
+    """Body, headers and validators of a response kept for revalidation"""
+
+    __slots__ = ('url', 'status', 'content', 'headers', 'etag', 'last_modified')
+
+    def __init__(self, url: str, status: int, content: bytes, headers: Dict[str, str]):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.headers = headers
+        self.etag = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> 'CachedResponse':
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in UNCACHED_HEADERS}
+        return cls(response.url, response.status_code, response.content, headers)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers revalidating this response"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, not_modified: Optional[requests.Response] = None) -> requests.Response:
+        """Rebuild a requests.Response carrying the cached body
+
+        Args:
+            not_modified: 304 response whose headers update the cached ones
+        """
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.content
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = 'utf-8'
+        if not_modified is not None:
+            for name, value in not_modified.headers.items():
+                if name.lower() not in UNCACHED_HEADERS:
+                    response.headers[name] = value
+            response.request = not_modified.request
+            response.elapsed = not_modified.elapsed
+        return response
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class ValidationCache:
+    """In-memory LRU cache of GET responses that carry an ETag or Last-Modified
+
+    BaseWooClient sends conditional requests for cached URLs; when the server
+    answers 304 Not Modified, the cached body is served instead of being
+    downloaded again. The server still decides on every request whether the
+    copy is current, so entries never serve stale data. Thread-safe; share
+    one instance between clients to share the entries.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        """Create an empty cache
+
+        Args:
+            max_entries: Number of URLs kept
+            max_bytes: Total body size kept; the least recently used entries are evicted first
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Keep a successful response if it has a validator (drop the URL's entry otherwise)"""
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self.discard(key)
+            return
+        entry = CachedResponse.from_response(response)
+        if entry.size > self.max_bytes:
+            self.discard(key)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def record(self, revalidated: bool) -> None:
+        """Count a conditional request answered with 304 (hit) or a full body (miss)"""
+        with self._lock:
+            if revalidated:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, cached bytes, and 304 hits/misses of conditional requests"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+class ResponseCache:
+    """Persistent cache of GET responses, with time-to-live per endpoint
+
+    Unlike ValidationCache, a fresh entry is served without any request, so
+    repeated script runs skip the reads of reference data (categories,
+    attributes and terms, the media library) until the entry expires. Only
+    endpoints with a TTL rule are cached; a successful write to an endpoint
+    drops the cached responses of its rule, so a script sees its own
+    changes. Changes made by others show up once the TTL has passed.
+
+    Entries are stored in SQLite (WAL mode), so several processes on the
+    host can share the cache file safely. The total body size is capped;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str = ':memory:', ttls: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """Open (or create) the cache
+
+        Args:
+            path: SQLite database path, or ':memory:' for a process-local cache
+            ttls: Seconds to keep responses, by endpoint prefix (e.g.
+                ``{'/products/categories': 600}``); the longest matching
+                prefix wins. Defaults to DEFAULT_TTLS
+            max_bytes: Total body size kept
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._conn = connect(path)
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    rule TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_rule ON responses (rule);
+                CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+            ''')
+
+    def rule_for(self, endpoint: str) -> Tuple[Optional[str], float]:
+        """TTL rule covering an endpoint
+
+        Returns:
+            The matching endpoint prefix and its TTL in seconds, or (None, 0)
+        """
+        path = endpoint.split('?', 1)[0].rstrip('/')
+        best = None
+        for prefix in self.ttls:
+            if (path == prefix or path.startswith(prefix + '/')) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return (best, self.ttls[best]) if best is not None else (None, 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Fresh cached response for a key (None when missing or expired)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, content FROM responses WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+        return CachedResponse(key, row['status'], row['content'], json.loads(row['headers']))
+
+    def store(self, key: str, endpoint: str, response: requests.Response) -> None:
+        """Keep a successful response if a TTL rule covers its endpoint"""
+        rule, ttl = self.rule_for(endpoint)
+        if rule is None or ttl <= 0 or response.status_code != 200:
+            return
+        entry = CachedResponse.from_response(response)
+        if entry.size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, rule, status, headers, content, size, expires_at, '
+                'accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, rule, entry.status, json.dumps(entry.headers), entry.content, entry.size, now + ttl, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones over the size cap"""
+        self._conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        excess = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for row in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            evicted.append((row['key'],))
+            excess -= row['size']
+            if excess <= 0:
+                break
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def invalidate(self, endpoint: str) -> int:
+        """Drop the cached responses of the TTL rule covering an endpoint (e.g. after a write)
+
+        Returns:
+            Number of responses dropped
+        """
+        rule, _ = self.rule_for(endpoint)
+        if rule is None:
+            return 0
+        with self._lock:
+            return self._conn.execute('DELETE FROM responses WHERE rule = ?', (rule,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries and cached bytes (shared by every process), hits and misses of this process"""
+        with self._lock:
+            row = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'entries': row[0],
+                'bytes': row[1],
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
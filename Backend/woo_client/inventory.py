@@ -0,0 +1,347 @@
+import csv
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+
+from .tracing import bind_context
+
+# Fields an inventory record may update
+INVENTORY_FIELDS = ('regular_price', 'sale_price', 'stock_quantity', 'stock_status')
+
+# Fields fetched to compare records against the current store state
+CURRENT_FIELDS = 'id,regular_price,sale_price,stock_quantity,stock_status,manage_stock'
+
+# WooCommerce accepts at most 100 objects per batch request
+MAX_BATCH_SIZE = 100
+
+STOCK_STATUSES = ('instock', 'outofstock', 'onbackorder')
+
+# sale_price value that ends a sale (empty values leave the field unchanged)
+CLEAR_SALE = 'clear'
+
+
+def load_inventory_csv(file_path: str) -> List[Dict[str, Any]]:
+    """Read inventory records from a CSV file
+
+    The file needs a header row with an ``sku`` or ``id`` column and any of
+    ``regular_price``, ``sale_price``, ``stock_quantity`` and ``stock_status``
+    (``parent_id`` is optional). Empty cells leave the field unchanged; a
+    ``sale_price`` of ``clear`` ends the sale.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        List of record dictionaries
+    """
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean up an inventory record
+
+    Drops empty values, strips strings and converts stock quantities to int.
+    A ``sale_price`` of ``clear`` (any case) becomes an empty string, which
+    WooCommerce takes as the end of the sale.
+
+    Raises:
+        ValueError: If the record has no identifier, nothing to update or invalid values
+    """
+    cleaned: Dict[str, Any] = {}
+    for key in ('id', 'sku', 'parent_id') + INVENTORY_FIELDS:
+        value = record.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            continue
+        cleaned[key] = value
+
+    if 'id' not in cleaned and 'sku' not in cleaned:
+        raise ValueError("Record needs an 'id' or 'sku'")
+    if not any(field in cleaned for field in INVENTORY_FIELDS):
+        raise ValueError("Record has no fields to update")
+
+    for key in ('id', 'parent_id'):
+        if key in cleaned:
+            cleaned[key] = int(cleaned[key])
+    if 'stock_quantity' in cleaned:
+        cleaned['stock_quantity'] = int(float(cleaned['stock_quantity']))
+    if str(cleaned.get('sale_price', '')).lower() == CLEAR_SALE:
+        cleaned['sale_price'] = ''
+    for key in ('regular_price', 'sale_price'):
+        if key in cleaned and cleaned[key] != '':
+            cleaned[key] = str(cleaned[key])
+            _to_decimal(cleaned[key], strict=True)
+    if 'stock_status' in cleaned:
+        cleaned['stock_status'] = str(cleaned['stock_status']).lower()
+        if cleaned['stock_status'] not in STOCK_STATUSES:
+            raise ValueError(f"Invalid stock_status: {cleaned['stock_status']}")
+
+    return cleaned
+
+
+def inventory_changes(record: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the fields of a record that differ from the current store values
+
+    Prices are compared numerically, so "19.9" and "19.90" are equal. Setting
+    a stock quantity on an item without stock management enables it.
+
+    Args:
+        record: Normalized inventory record
+        current: Current values from WooCommerce
+
+    Returns:
+        Dictionary of changed fields (empty if nothing changed)
+    """
+    changes = {}
+    for field in ('regular_price', 'sale_price'):
+        if field in record and _to_decimal(record[field]) != _to_decimal(current.get(field)):
+            changes[field] = record[field]
+    if 'stock_quantity' in record:
+        if record['stock_quantity'] != current.get('stock_quantity') or not current.get('manage_stock'):
+            changes['stock_quantity'] = record['stock_quantity']
+            if not current.get('manage_stock'):
+                changes['manage_stock'] = True
+    if 'stock_status' in record and record['stock_status'] != current.get('stock_status'):
+        changes['stock_status'] = record['stock_status']
+    return changes
+
+
+def _to_decimal(value: Any, strict: bool = False) -> Optional[Decimal]:
+    """Convert a price to Decimal (None for empty values)"""
+    if value is None or value == '':
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        if strict:
+            raise ValueError(f"Invalid price: {value}")
+        return None
+
+
+class InventoryUpdater:
+    """Bulk price and stock update engine
+
+    Applies (sku|id, regular_price, sale_price, stock_quantity, stock_status)
+    records with as few requests as possible:
+
+    1. SKUs are resolved in bulk through the SKU index.
+    2. Current values are fetched 100 IDs at a time (per parent for variations).
+    3. Records that would not change anything are dropped.
+    4. The remaining changes are sent through /products/batch and
+       /products/{parent}/variations/batch, several batches in parallel.
+    """
+
+    def __init__(self, products_client, batch_size: int = MAX_BATCH_SIZE, max_workers: int = 4,
+                 logger: Optional[logging.Logger] = None):
+        """Initialize the updater
+
+        Args:
+            products_client: ProductClient used for all requests
+            batch_size: Number of objects per batch request (max 100)
+            max_workers: Number of batch requests sent in parallel
+            logger: Optional logger instance
+        """
+        self.client = products_client
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self._requests = 0
+
+    def run(self, records: Union[str, Iterable[Dict[str, Any]]], dry_run: bool = False) -> Dict[str, Any]:
+        """Apply inventory records
+
+        Args:
+            records: Path to a CSV file or an iterable of record dictionaries
+            dry_run: Compute the changes without sending updates
+
+        Returns:
+            Report with counts, per-record failures, the changes (dry run only)
+            and throughput figures ('requests' excludes SKU index lookups)
+        """
+        started = time.perf_counter()
+        self._requests = 0
+        if isinstance(records, str):
+            records = load_inventory_csv(records)
+
+        report: Dict[str, Any] = {
+            'received': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'unresolved': [],
+            'failed': [],
+        }
+
+        # Normalize and validate
+        valid = []
+        for position, record in enumerate(records, start=1):
+            report['received'] += 1
+            try:
+                valid.append((position, normalize_record(record)))
+            except (TypeError, ValueError) as e:
+                report['failed'].append({'record': position, 'error': str(e), 'data': record})
+
+        # Resolve SKUs to IDs in bulk
+        targets = self._resolve_targets(valid, report)
+
+        # Compare against the current values and keep only real changes
+        current, fetch_errors = self._fetch_current(targets)
+        targets = self._find_variation_parents(targets, current, fetch_errors)
+        products: List[Tuple[int, Dict[str, Any]]] = []
+        variations: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        for position, record, item_id, parent_id in targets:
+            state = current.get(item_id)
+            if state is None:
+                error = fetch_errors.get(item_id, f"Item {item_id} not found")
+                if item_id not in fetch_errors and not parent_id:
+                    error += " (give the parent_id or the sku of a variation)"
+                report['failed'].append({'record': position, 'error': error, 'data': record})
+                continue
+            changes = inventory_changes(record, state)
+            if not changes:
+                report['unchanged'] += 1
+                continue
+            update = (position, {'id': item_id, **changes})
+            if parent_id:
+                variations.setdefault(parent_id, []).append(update)
+            else:
+                products.append(update)
+
+        if dry_run:
+            report['changes'] = {
+                'products': [u for _, u in products],
+                'variations': {parent: [u for _, u in updates] for parent, updates in variations.items()},
+            }
+        else:
+            self._send_batches(products, variations, report)
+
+        elapsed = time.perf_counter() - started
+        report['requests'] = self._requests
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['records_per_second'] = round(report['received'] / elapsed, 1) if elapsed > 0 else None
+        return report
+
+    def _resolve_targets(self, valid: List[Tuple[int, Dict[str, Any]]],
+                         report: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any], int, int]]:
+        """Attach (id, parent_id) to each record, resolving SKUs in bulk"""
+        skus = [record['sku'] for _, record in valid if 'id' not in record]
+        resolved = {}
+        if skus:
+            resolved = self.client.resolve_skus(skus)
+
+        targets = []
+        for position, record in valid:
+            if 'id' in record:
+                targets.append((position, record, record['id'], record.get('parent_id', 0)))
+                continue
+            entry = resolved.get(record['sku'])
+            if not entry:
+                report['unresolved'].append(record['sku'])
+                continue
+            targets.append((position, record, entry['id'], entry.get('parent_id') or 0))
+        return targets
+
+    def _find_variation_parents(self, targets: List[Tuple[int, Dict[str, Any], int, int]],
+                                current: Dict[int, Dict[str, Any]],
+                                fetch_errors: Dict[int, str]) -> List[Tuple[int, Dict[str, Any], int, int]]:
+        """Attach the parent of variation IDs given without parent_id, and fetch their values
+
+        /products?include= never returns variations, so IDs it did not find
+        are looked up in the SKU index attached to the client (if any).
+        """
+        sku_index = getattr(self.client, 'sku_index', None)
+        bare = [item_id for _, _, item_id, parent_id in targets
+                if not parent_id and item_id not in current and item_id not in fetch_errors]
+        if not bare or sku_index is None:
+            return targets
+        parents = sku_index.parents(bare)
+        if not parents:
+            return targets
+
+        targets = [(position, record, item_id, parent_id or (parents.get(item_id, 0) if item_id in bare else 0))
+                   for position, record, item_id, parent_id in targets]
+        found, errors = self._fetch_current([target for target in targets if target[2] in parents])
+        current.update(found)
+        fetch_errors.update(errors)
+        return targets
+
+    def _fetch_current(self, targets: List[Tuple[int, Dict[str, Any], int, int]]
+                       ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, str]]:
+        """Fetch the current inventory values of every target, 100 IDs per request
+
+        Returns:
+            Current values by ID, and the error of the IDs whose request failed
+        """
+        groups: Dict[int, List[int]] = {}
+        for _, _, item_id, parent_id in targets:
+            groups.setdefault(parent_id, []).append(item_id)
+
+        jobs = []
+        for parent_id, ids in groups.items():
+            endpoint = f'/products/{parent_id}/variations' if parent_id else '/products'
+            unique = list(dict.fromkeys(ids))
+            for start in range(0, len(unique), MAX_BATCH_SIZE):
+                jobs.append((endpoint, unique[start:start + MAX_BATCH_SIZE]))
+
+        def fetch(job):
+            endpoint, ids = job
+            try:
+                return job, self.client._make_request('GET', endpoint, params={
+                    'include': ','.join(str(i) for i in ids),
+                    'per_page': len(ids),
+                    '_fields': CURRENT_FIELDS,
+                }), None
+            except Exception as e:
+                return job, [], e
+
+        current, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for (endpoint, ids), items, error in executor.map(bind_context(fetch), jobs):
+                if error is not None:
+                    self.logger.error(f"Fetching current values from {endpoint} failed: {str(error)}")
+                    errors.update((item_id, f"Could not fetch current values: {str(error)}") for item_id in ids)
+                    continue
+                for item in items:
+                    current[item['id']] = item
+        self._requests += len(jobs)
+        return current, errors
+
+    def _send_batches(self, products: List[Tuple[int, Dict[str, Any]]],
+                      variations: Dict[int, List[Tuple[int, Dict[str, Any]]]], report: Dict[str, Any]) -> None:
+        """Send the changes through the batch endpoints in parallel"""
+        jobs = []
+        for start in range(0, len(products), self.batch_size):
+            jobs.append(('/products/batch', products[start:start + self.batch_size]))
+        for parent_id, updates in variations.items():
+            for start in range(0, len(updates), self.batch_size):
+                jobs.append((f'/products/{parent_id}/variations/batch', updates[start:start + self.batch_size]))
+
+        def send(job):
+            endpoint, updates = job
+            try:
+                response = self.client._make_request('POST', endpoint, data={'update': [u for _, u in updates]})
+                return job, response.get('update', []), None
+            except Exception as e:
+                return job, [], e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for (endpoint, updates), results, error in executor.map(bind_context(send), jobs):
+                self._requests += 1
+                if error is not None:
+                    self.logger.error(f"Batch update to {endpoint} failed: {str(error)}")
+                    for position, update in updates:
+                        report['failed'].append({'record': position, 'error': str(error), 'data': update})
+                    continue
+
+                errors_by_id = {
+                    r.get('id'): r['error'] for r in results if isinstance(r, dict) and r.get('error')
+                }
+                for position, update in updates:
+                    if update['id'] in errors_by_id:
+                        message = errors_by_id[update['id']].get('message', 'Update failed')
+                        report['failed'].append({'record': position, 'error': message, 'data': update})
+                    else:
+                        report['updated'] += 1
@@ -0,0 +1,69 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+class JsonCodec:
+    """JSON encoder/decoder pair used by the clients
+
+    ``dumps`` returns bytes so request bodies can be sent without an extra
+    str → bytes copy; ``loads`` accepts bytes or str.
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[bytes, str]], Any]):
+        """Create a codec
+
+        Args:
+            name: Codec name, reported by the benchmarks
+            dumps: Function encoding an object to JSON bytes
+            loads: Function decoding JSON bytes or str
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+STDLIB = JsonCodec('json', _stdlib_dumps, json.loads)
+
+if orjson is not None:
+    # Non-str keys are allowed so payloads behave the same as with the json module
+    ORJSON: Optional[JsonCodec] = JsonCodec(
+        'orjson',
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads
+    )
+else:
+    ORJSON = None
+
+
+def default_codec() -> JsonCodec:
+    """Get the fastest available codec (orjson when installed, json otherwise)"""
+    return ORJSON or STDLIB
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Get a codec by name ('orjson' or 'json'), or the default one
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed
+    """
+    if not name:
+        return default_codec()
+    if name == 'json':
+        return STDLIB
+    if name == 'orjson':
+        if ORJSON is None:
+            raise ValueError("orjson is not installed")
+        return ORJSON
+    raise ValueError(f"Unknown JSON codec: {name}")
@@ -4,6 +4,7 @@ import mimetypes
 import base64
 import requests
 from .base_client import BaseWooClient
+from .json_codec import JsonCodec
 
 
 class MediaClient(BaseWooClient):
@@ -11,7 +12,7 @@ class MediaClient(BaseWooClient):
 
     def __init__(self, api_key: str, api_secret: str, store_url: str, 
                  wp_username: Optional[str] = None, wp_password: Optional[str] = None,
-                 verify_ssl: bool = True):
+                 verify_ssl: bool = True, json_codec: Optional[JsonCodec] = None, **kwargs):
         """Initialize the MediaClient with API credentials
         
         Args:
@@ -21,6 +22,8 @@ class MediaClient(BaseWooClient):
             wp_username: WordPress username (recommended for media uploads)
             wp_password: WordPress application password (recommended for media uploads)
             verify_ssl: Whether to verify SSL certificates
+            json_codec: Optional JSON codec for request and response bodies
+            **kwargs: Retry and request hook options for BaseWooClient
         """
         super().__init__(
             api_key=api_key, 
@@ -28,7 +31,9 @@ class MediaClient(BaseWooClient):
             store_url=store_url, 
             wp_username=wp_username,
             wp_password=wp_password,
-            verify_ssl=verify_ssl
+            verify_ssl=verify_ssl,
+            json_codec=json_codec,
+            **kwargs
         )
 
     def get_media(self, per_page: int = 10) -> List[Dict[str, Any]]:
@@ -51,8 +56,11 @@ class MediaClient(BaseWooClient):
         Returns:
             The created media item data
         """
-        # First, download the image
-        response = requests.get(image_url, verify=self.verify_ssl)
+        # First, download the image (recorded and replayed with the API requests)
+        if self.cassette is not None:
+            response = self.cassette.request('GET', image_url, verify=self.verify_ssl)
+        else:
+            response = requests.get(image_url, verify=self.verify_ssl)
         if response.status_code != 200:
             raise Exception(f"Failed to download image from URL: {image_url}")
             
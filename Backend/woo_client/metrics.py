@@ -0,0 +1,239 @@
+import re
+import threading
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets, as in Prometheus clients
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Numeric path segments, e.g. the IDs in /products/123/variations/456
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replace the IDs of an endpoint path with ``{id}``
+
+    Keeps the number of distinct endpoints (and metric series) bounded:
+    ``/products/123/variations/456`` becomes ``/products/{id}/variations/{id}``.
+    """
+    return _ID_SEGMENT.sub('/{id}', endpoint.split('?', 1)[0]) or '/'
+
+
+class RequestEvent:
+    """One upstream request, as passed to request hooks
+
+    Attributes:
+        method: HTTP method
+        endpoint: Endpoint template with IDs replaced by ``{id}``
+        api: 'wc' for the WooCommerce API, 'wp' for the WordPress API
+        status: HTTP status of the last attempt (None if no response was received)
+        duration: Seconds spent in the request, retries included
+        bytes_sent: Size of the request body (compressed, if it was)
+        bytes_received: Size of the response body as received (compressed, if it was)
+        retries: Number of attempts after the first one
+        error: Error message when the request failed
+    """
+
+    __slots__ = ('method', 'endpoint', 'api', 'status', 'duration', 'bytes_sent', 'bytes_received',
+                 'retries', 'error')
+
+    def __init__(self, method: str, endpoint: str, api: str = 'wc', status: Optional[int] = None,
+                 duration: float = 0.0, bytes_sent: int = 0, bytes_received: int = 0, retries: int = 0,
+                 error: Optional[str] = None):
+        self.method = method
+        self.endpoint = endpoint
+        self.api = api
+        self.status = status
+        self.duration = duration
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.retries = retries
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"RequestEvent({self.method} {self.endpoint} -> {self.status}, "
+                f"{self.duration * 1000:.1f} ms, retries={self.retries})")
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile (0-1) by linear interpolation inside its bucket
+
+        The estimate is clamped to the smallest and largest observed values.
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        estimate = self.max
+        for i, bound in enumerate(self.buckets):
+            if seen + self.counts[i] >= target:
+                share = (target - seen) / self.counts[i] if self.counts[i] else 0.0
+                estimate = lower + (bound - lower) * share
+                break
+            seen += self.counts[i]
+            lower = bound
+        return min(max(estimate, self.min), self.max)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, as in the Prometheus exposition format"""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            pairs.append((_format_number(bound), running))
+        pairs.append(('+Inf', self.count))
+        return pairs
+
+
+class LatencyMetrics:
+    """Latency histograms and counters keyed by a fixed set of labels
+
+    Thread-safe; used for upstream WooCommerce requests (see RequestMetrics)
+    and for inbound API requests.
+    """
+
+    def __init__(self, labels: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Create an empty registry
+
+        Args:
+            labels: Label names, in the order keys are given to observe()
+            buckets: Histogram bucket upper bounds, in seconds
+        """
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+        self._counters: Dict[str, Dict[Tuple[str, ...], float]] = {}
+
+    def observe(self, key: Tuple[str, ...], seconds: float, **counters: float) -> None:
+        """Record one request
+
+        Args:
+            key: Label values, in the order of ``labels``
+            seconds: Request duration
+            **counters: Amounts added to named counters for the same labels (e.g. bytes_sent=512)
+        """
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            for name, amount in counters.items():
+                series = self._counters.setdefault(name, {})
+                series[key] = series.get(key, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-series count, total and average time and p50/p95/p99 estimates, slowest total first"""
+        with self._lock:
+            rows = []
+            for key, histogram in self._histograms.items():
+                row: Dict[str, Any] = dict(zip(self.labels, key))
+                row.update({
+                    'count': histogram.count,
+                    'total_seconds': round(histogram.sum, 4),
+                    'avg_ms': round(histogram.sum / histogram.count * 1000, 2),
+                    'p50_ms': _ms(histogram.quantile(0.5)),
+                    'p95_ms': _ms(histogram.quantile(0.95)),
+                    'p99_ms': _ms(histogram.quantile(0.99)),
+                })
+                for name, series in self._counters.items():
+                    row[name] = series.get(key, 0)
+                rows.append(row)
+        rows.sort(key=lambda r: r['total_seconds'], reverse=True)
+        return rows
+
+    def to_prometheus(self, name: str, help_text: str) -> str:
+        """Render the histograms and counters in the Prometheus text format
+
+        Args:
+            name: Metric name prefix; the histogram is ``{name}_duration_seconds``
+                and counters are ``{name}_{counter}_total``
+            help_text: Description used in the HELP line of the histogram
+        """
+        metric = f'{name}_duration_seconds'
+        lines = [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+        with self._lock:
+            for key, histogram in sorted(self._histograms.items()):
+                labels = _format_labels(self.labels, key)
+                for le, count in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'{metric}_sum{{{labels}}} {_format_number(histogram.sum)}')
+                lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+            for counter, series in sorted(self._counters.items()):
+                counter_metric = f'{name}_{counter}_total'
+                lines.append(f'# TYPE {counter_metric} counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f'{counter_metric}{{{_format_labels(self.labels, key)}}} {_format_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics(LatencyMetrics):
+    """Request hook feeding upstream WooCommerce requests into latency histograms
+
+    Series are keyed by API, method, endpoint template and status. Attach it
+    to a client with ``client.add_request_hook(metrics)``.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(('api', 'method', 'endpoint', 'status'), buckets)
+
+    def __call__(self, event: RequestEvent) -> None:
+        status = str(event.status) if event.status is not None else 'error'
+        self.observe((event.api, event.method, event.endpoint, status), event.duration,
+                     bytes_sent=event.bytes_sent, bytes_received=event.bytes_received,
+                     retries=event.retries)
+
+
+def render_prometheus(sections: Iterable[Tuple[LatencyMetrics, str, str]]) -> str:
+    """Concatenate several registries as (metrics, name, help text) into one exposition"""
+    return ''.join(metrics.to_prometheus(name, help_text) for metrics, name, help_text in sections)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
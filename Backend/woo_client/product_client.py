@@ -1,16 +1,32 @@
-from typing import List, Dict, Union, Any, Optional
+from typing import List, Dict, Union, Any, Iterable, Optional
+import requests
 from .base_client import BaseWooClient
+from .sku_index import SkuIndex
+from .inventory import InventoryUpdater
+from .bulk_delete import BulkDeleter, ProgressCallback
 
 # Fix the relative import
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import Product, ProductVariation
+from models.diff import diff
 
 
 class ProductClient(BaseWooClient):
     """Client for managing WooCommerce products"""
 
+    def __init__(self, *args, sku_index: Optional[SkuIndex] = None, **kwargs):
+        """Initialize the ProductClient
+
+        Args:
+            *args: Positional arguments for BaseWooClient
+            sku_index: Optional shared SKU index used by resolve_skus()
+            **kwargs: Keyword arguments for BaseWooClient
+        """
+        super().__init__(*args, **kwargs)
+        self.sku_index = sku_index
+
     def get_products(self, per_page: int = 10, **kwargs) -> List[Dict[str, Any]]:
         """Get a list of products from the store
         
@@ -24,19 +40,78 @@ class ProductClient(BaseWooClient):
         params = {'per_page': per_page, **kwargs}
         return self._make_request('GET', '/products', params=params)
     
-    def get_products_as_models(self, per_page: int = 10, **kwargs) -> List[Product]:
-        """Get a list of products as Product models"""
+    def get_products_raw(self, per_page: int = 10, **kwargs) -> requests.Response:
+        """Get a page of products without decoding the response
+        
+        Takes the same arguments as get_products(). Useful for passing the
+        upstream JSON through unchanged.
+        
+        Returns:
+            The raw response (JSON body in ``.content``, pagination headers in ``.headers``)
+        """
+        params = {'per_page': per_page, **kwargs}
+        return self._make_raw_request('GET', '/products', params=params)
+    
+    def get_products_as_models(self, per_page: int = 10, validate: bool = True, **kwargs) -> List[Product]:
+        """Get a list of products as Product models
+        
+        Args:
+            per_page: Number of products per page
+            validate: Run the model validators on every product; pass False on
+                hot paths to trust the API data and skip validation
+            **kwargs: Additional query parameters
+        """
         products_data = self.get_products(per_page=per_page, **kwargs)
-        return [Product.from_dict(p) for p in products_data]
+        if validate:
+            return [Product.from_dict(p) for p in products_data]
+        return Product.from_api_list(products_data)
 
     def get_product_by_id(self, product_id: int) -> Dict[str, Any]:
         """Get a specific product by ID"""
         return self._make_request('GET', f'/products/{product_id}')
     
-    def get_product_as_model(self, product_id: int) -> Product:
-        """Get a product by ID and return as a Product model"""
+    def get_product_as_model(self, product_id: int, validate: bool = True) -> Product:
+        """Get a product by ID and return as a Product model (see get_products_as_models)"""
         data = self.get_product_by_id(product_id)
-        return Product.from_dict(data)
+        return Product.from_dict(data) if validate else Product.from_api(data)
+    
+    def resolve_skus(self, skus: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve SKUs to product and variation IDs in bulk
+        
+        Uses the attached SKU index (an in-memory one is created on first use)
+        and looks up index misses with batched requests.
+        
+        Args:
+            skus: SKUs to resolve
+            
+        Returns:
+            Dictionary mapping each SKU to {sku, id, parent_id, type}, or None if not found
+        """
+        if self.sku_index is None:
+            self.sku_index = SkuIndex()
+        return self.sku_index.resolve(skus, client=self)
+    
+    def bulk_update_inventory(self, records: Union[str, Iterable[Dict[str, Any]]], batch_size: int = 100,
+                              max_workers: int = 4, dry_run: bool = False) -> Dict[str, Any]:
+        """Update prices and stock for many products and variations at once
+        
+        Records are dictionaries (or rows of a CSV file) with an ``sku`` or
+        ``id`` and any of ``regular_price``, ``sale_price``, ``stock_quantity``
+        and ``stock_status``. SKUs are resolved in bulk, unchanged records are
+        dropped and the rest is sent through the batch endpoints, with
+        variations grouped by parent.
+        
+        Args:
+            records: Path to a CSV file or an iterable of record dictionaries
+            batch_size: Number of items per batch request (max 100)
+            max_workers: Number of batch requests sent in parallel
+            dry_run: Compute the changes without sending them
+            
+        Returns:
+            Report with updated/unchanged/unresolved/failed counts and throughput
+        """
+        updater = InventoryUpdater(self, batch_size=batch_size, max_workers=max_workers)
+        return updater.run(records, dry_run=dry_run)
     
     def create_product(self, product_data: Union[Product, Dict[str, Any]]) -> Dict[str, Any]:
         """Create a new product with given data
@@ -52,18 +127,73 @@ class ProductClient(BaseWooClient):
             
         return self._make_request('POST', '/products', data=product_data)
     
-    def update_product(self, product_id: int, product_data: Union[Product, Dict[str, Any]]) -> Dict[str, Any]:
-        """Update an existing product"""
-        if isinstance(product_data, Product):
-            product_data = product_data.to_dict()
+    def update_product(self, product_id: int, product_data: Union[Product, Dict[str, Any]],
+                       original: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Update an existing product, sending only the fields that changed
+        
+        Products loaded with Product.from_dict() (e.g. get_product_as_model())
+        are compared with their loaded state. Dictionaries are compared with
+        ``original`` when given and sent as they are otherwise (even when
+        empty). No request is made when nothing changed.
+        
+        Args:
+            product_id: The ID of the product to update
+            product_data: Product instance or dict with product data
+            original: Previous product data to compare a dict against
             
-        return self._make_request('PUT', f'/products/{product_id}', data=product_data)
+        Returns:
+            dict: Updated product data from API, or the unchanged data when
+            the request was skipped
+        """
+        if isinstance(product_data, Product):
+            data = product_data.changes()
+            if not data:
+                return {'id': product_id, **product_data.to_dict()}
+            result = self._make_request('PUT', f'/products/{product_id}', data=data)
+            product_data.mark_clean()
+            return result
+        
+        data = diff(original, product_data) if original is not None else product_data
+        if original is not None and not data:
+            return {'id': product_id, **original}
+        return self._make_request('PUT', f'/products/{product_id}', data=data)
     
     def delete_product(self, product_id: int, force: bool = False) -> Dict[str, Any]:
         """Delete a product"""
         params = {'force': force}
         return self._make_request('DELETE', f'/products/{product_id}', params=params)
     
+    def bulk_delete(self, ids: Optional[Iterable[int]] = None, filters: Optional[Dict[str, Any]] = None,
+                    force: bool = True, batch_size: int = 100, max_workers: int = 4,
+                    delete_media: bool = False, media_client=None, dry_run: bool = False,
+                    progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Delete many products at once
+        
+        Collects every matching product ID across all pages first, then deletes
+        them through /products/batch, 100 IDs per request with several batches
+        in parallel. With ``delete_media``, media attached to the deleted
+        products that no remaining product uses is deleted too.
+        
+        Args:
+            ids: Product IDs to delete (all products matching ``filters`` if omitted)
+            filters: Query parameters selecting the products, e.g. {'status': 'draft'}
+            force: Delete permanently instead of moving to the trash (trashing
+                cannot use the batch endpoint and is slower)
+            batch_size: Number of IDs per batch request (max 100)
+            max_workers: Number of requests sent in parallel
+            delete_media: Also delete media left unused by the deleted products
+                (only with ``force``)
+            media_client: MediaClient used for media cleanup
+            dry_run: Only report what would be deleted
+            progress: Optional callback called as progress(stage, done, total)
+            
+        Returns:
+            Report with matched/deleted counts, failures and timing
+        """
+        deleter = BulkDeleter(self, batch_size=batch_size, max_workers=max_workers)
+        return deleter.run(ids=ids, filters=filters, force=force, delete_media=delete_media,
+                           media_client=media_client, dry_run=dry_run, progress=progress)
+    
     def create_variation(self, parent_id: int, variation_data: Union[Product, Dict[str, Any], ProductVariation]) -> Dict[str, Any]:
         """Create a new variation for a variable product
         
@@ -98,6 +228,16 @@ class ProductClient(BaseWooClient):
         params = {'per_page': per_page, **kwargs}
         return self._make_request('GET', f'/products/{parent_id}/variations', params=params)
     
+    def get_variations_raw(self, parent_id: int, per_page: int = 10, **kwargs) -> requests.Response:
+        """Get a page of variations without decoding the response (see get_products_raw)"""
+        params = {'per_page': per_page, **kwargs}
+        return self._make_raw_request('GET', f'/products/{parent_id}/variations', params=params)
+    
+    def get_variation_as_model(self, parent_id: int, variation_id: int) -> ProductVariation:
+        """Get a variation by ID and return as a ProductVariation model"""
+        data = self.get_variation(parent_id, variation_id)
+        return ProductVariation.from_dict(data)
+    
     def get_variation(self, parent_id: int, variation_id: int) -> Dict[str, Any]:
         """Get a specific variation by ID
         
@@ -111,23 +251,36 @@ class ProductClient(BaseWooClient):
         return self._make_request('GET', f'/products/{parent_id}/variations/{variation_id}')
     
     def update_variation(self, parent_id: int, variation_id: int, 
-                        variation_data: Union[Dict[str, Any], ProductVariation]) -> Dict[str, Any]:
-        """Update a product variation
+                        variation_data: Union[Dict[str, Any], ProductVariation],
+                        original: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Update a product variation, sending only the fields that changed
+        
+        Works like update_product(): variations loaded with
+        ProductVariation.from_dict() are compared with their loaded state and
+        no request is made when nothing changed.
         
         Args:
             parent_id: The ID of the parent product
             variation_id: The ID of the variation to update
             variation_data: Updated variation data
+            original: Previous variation data to compare a dict against
             
         Returns:
-            Updated variation data
+            Updated variation data, or the unchanged data when the request was skipped
         """
+        endpoint = f'/products/{parent_id}/variations/{variation_id}'
         if isinstance(variation_data, ProductVariation):
-            data = variation_data.to_dict()
-        else:
-            data = variation_data.copy()
+            data = variation_data.changes()
+            if not data:
+                return {'id': variation_id, 'parent_id': parent_id, **variation_data.to_dict()}
+            result = self._make_request('PUT', endpoint, data=data)
+            variation_data.mark_clean()
+            return result
         
-        return self._make_request('PUT', f'/products/{parent_id}/variations/{variation_id}', data=data)
+        data = diff(original, variation_data) if original is not None else variation_data.copy()
+        if original is not None and not data:
+            return {'id': variation_id, 'parent_id': parent_id, **original}
+        return self._make_request('PUT', endpoint, data=data)
     
     def delete_variation(self, parent_id: int, variation_id: int, force: bool = False) -> Dict[str, Any]:
         """Delete a product variation
@@ -0,0 +1,472 @@
+import re
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+
+from .sqlite_utils import connect, modified_since, transaction, utc_now
+
+# Fields requested from /products when building the index
+INDEX_FIELDS = (
+    'id,parent_id,name,sku,type,status,description,short_description,'
+    'price,stock_status,categories,attributes,date_modified_gmt'
+)
+
+# Upper bounds of the price bands used for faceting (the last band is open-ended)
+DEFAULT_PRICE_BANDS = (10, 25, 50, 100, 250, 500, 1000)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class ProductSearchIndex:
+    """Local full-text and faceted search index over WooCommerce products
+
+    Backed by SQLite FTS5. The index covers name, SKU, descriptions, category
+    names and attribute values, and keeps a small per-product row used for
+    filtering and facet counts (category, stock status and price bands).
+
+    The index is populated from paginated client fetches with ``build()`` and
+    kept current with ``refresh()`` (``modified_after`` polling) or by feeding
+    webhook payloads to ``upsert_products()`` / ``delete_products()``.
+    """
+
+    def __init__(self, path: str = ':memory:', price_bands: Sequence[float] = DEFAULT_PRICE_BANDS):
+        """Open (or create) the index
+
+        Args:
+            path: SQLite database path, or ':memory:' for a process-local index
+            price_bands: Ascending upper bounds of the price facet bands
+        """
+        self.path = path
+        self.price_bands = tuple(price_bands)
+        self._lock = threading.RLock()
+        self._conn = connect(path)
+        self._create_schema()
+        # Rows written outside of build() are tagged with the newest generation
+        # so that a build running concurrently does not treat them as stale
+        self._generation = int(self.get_meta('generation') or 0)
+
+    def _create_schema(self) -> None:
+        """Create the tables if they do not exist yet"""
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY,
+                    parent_id INTEGER,
+                    name TEXT,
+                    sku TEXT,
+                    type TEXT,
+                    status TEXT,
+                    stock_status TEXT,
+                    price REAL,
+                    generation INTEGER DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS product_categories (
+                    product_id INTEGER,
+                    category_id INTEGER,
+                    category_name TEXT,
+                    PRIMARY KEY (product_id, category_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_product_categories_category
+                    ON product_categories (category_id);
+                CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5(
+                    name, sku, description, categories, attributes,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3 4'
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            ''')
+
+    # ------------------------------------------------------------------
+    # Population
+    # ------------------------------------------------------------------
+
+    def build(self, client, per_page: int = 100, **params) -> int:
+        """Rebuild the index from a full paginated product fetch
+
+        The existing contents stay searchable while the build runs; products
+        that no longer exist are removed once every page has been fetched.
+
+        Args:
+            client: ProductClient (or WooClient) used to fetch products
+            per_page: Page size for the fetch
+            **params: Extra query parameters for /products
+
+        Returns:
+            Number of products indexed
+        """
+        products_client = getattr(client, 'products', client)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        started_at = utc_now()
+        count = 0
+
+        query = {'_fields': INDEX_FIELDS, **params}
+        for page in products_client.iter_pages('/products', params=query, per_page=per_page):
+            count += self.upsert_products(page, generation=generation)
+
+        with self._lock, transaction(self._conn):
+            stale = [row['id'] for row in self._conn.execute(
+                'SELECT id FROM products WHERE generation != ?', (generation,))]
+            self._delete_rows(stale)
+            self._set_meta('last_synced', started_at)
+            self._set_meta('generation', str(generation))
+
+        return count
+
+    def refresh(self, client, per_page: int = 100) -> int:
+        """Re-index products modified since the last build or refresh
+
+        Falls back to a full build when the index has never been synced.
+
+        Returns:
+            Number of products re-indexed
+        """
+        last_synced = self.get_meta('last_synced')
+        if not last_synced:
+            return self.build(client, per_page=per_page)
+
+        products_client = getattr(client, 'products', client)
+        started_at = utc_now()
+        count = 0
+
+        query = {'_fields': INDEX_FIELDS, 'modified_after': modified_since(last_synced), 'dates_are_gmt': True}
+        for page in products_client.iter_pages('/products', params=query, per_page=per_page):
+            count += self.upsert_products(page)
+
+        self._set_meta('last_synced', started_at)
+        return count
+
+    def reindex(self, client, product_ids: Iterable[int]) -> int:
+        """Fetch and re-index specific products (e.g. the products of a new order)
+
+        Args:
+            client: ProductClient (or WooClient) used to fetch products
+            product_ids: IDs of the products to refresh
+
+        Returns:
+            Number of products re-indexed
+        """
+        products_client = getattr(client, 'products', client)
+        ids = list(dict.fromkeys(int(pid) for pid in product_ids if pid))
+        count = 0
+        for start in range(0, len(ids), 100):
+            chunk = ids[start:start + 100]
+            count += self.upsert_products(products_client.get_products(
+                per_page=len(chunk), include=','.join(str(pid) for pid in chunk), _fields=INDEX_FIELDS))
+        return count
+
+    def upsert_products(self, products: Iterable[Dict[str, Any]], generation: Optional[int] = None) -> int:
+        """Add or replace products in the index
+
+        Variations and trashed products are ignored.
+
+        Args:
+            products: Product dictionaries as returned by the WooCommerce API
+            generation: Build generation to tag the rows with
+
+        Returns:
+            Number of products indexed
+        """
+        if generation is None:
+            generation = self._generation
+
+        rows = []
+        trashed = []
+        for product in products:
+            if not product.get('id') or product.get('type') == 'variation':
+                continue
+            if product.get('status') == 'trash':
+                trashed.append(product['id'])
+                continue
+            rows.append(product)
+
+        with self._lock, transaction(self._conn):
+            self._delete_rows(trashed)
+            for product in rows:
+                self._insert_product(product, generation)
+
+        return len(rows)
+
+    def delete_products(self, product_ids: Iterable[int]) -> None:
+        """Remove products from the index"""
+        ids = [int(pid) for pid in product_ids if pid is not None]
+        if not ids:
+            return
+        with self._lock, transaction(self._conn):
+            self._delete_rows(ids)
+
+    def _insert_product(self, product: Dict[str, Any], generation: int) -> None:
+        """Write a single product to the index tables (caller holds the lock)"""
+        product_id = int(product['id'])
+        categories = product.get('categories') or []
+        attributes = product.get('attributes') or []
+
+        self._delete_rows([product_id])
+        self._conn.execute(
+            'INSERT INTO products (id, parent_id, name, sku, type, status, stock_status, price, generation) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                product_id,
+                product.get('parent_id') or 0,
+                product.get('name') or '',
+                product.get('sku') or '',
+                product.get('type'),
+                product.get('status'),
+                product.get('stock_status'),
+                _parse_price(product.get('price')),
+                generation,
+            )
+        )
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO product_categories (product_id, category_id, category_name) VALUES (?, ?, ?)',
+            [(product_id, cat.get('id'), cat.get('name')) for cat in categories if cat.get('id')]
+        )
+
+        description = ' '.join(filter(None, (product.get('short_description'), product.get('description'))))
+        attribute_text = ' '.join(
+            ' '.join([attr.get('name') or ''] + [str(o) for o in attr.get('options') or []])
+            for attr in attributes
+        )
+        self._conn.execute(
+            'INSERT INTO product_fts (rowid, name, sku, description, categories, attributes) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                product_id,
+                product.get('name') or '',
+                product.get('sku') or '',
+                _TAG_RE.sub(' ', description),
+                ' '.join(cat.get('name') or '' for cat in categories),
+                attribute_text,
+            )
+        )
+
+    def _delete_rows(self, product_ids: List[int]) -> None:
+        """Delete products from every table (caller holds the lock)"""
+        for product_id in product_ids:
+            self._conn.execute('DELETE FROM products WHERE id = ?', (product_id,))
+            self._conn.execute('DELETE FROM product_categories WHERE product_id = ?', (product_id,))
+            self._conn.execute('DELETE FROM product_fts WHERE rowid = ?', (product_id,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10, offset: int = 0, **filters) -> Dict[str, Any]:
+        """Full-text search with optional filters
+
+        Every word of the query must match (as a prefix) in one of the indexed
+        fields. Results are ranked by BM25 with name and SKU matches weighted
+        higher than descriptions.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of hits to return
+            offset: Number of hits to skip
+            **filters: category, stock_status, status, type, min_price, max_price
+
+        Returns:
+            Dictionary with the total hit count and the hits for the page
+        """
+        match = _build_match_query(query)
+        if not match:
+            return {'total': 0, 'hits': []}
+
+        where, args = self._filter_clause(filters)
+        base = (
+            'FROM product_fts JOIN products p ON p.id = product_fts.rowid '
+            f'WHERE product_fts MATCH ? {where}'
+        )
+
+        with self._lock:
+            total = self._conn.execute(f'SELECT COUNT(*) {base}', [match, *args]).fetchone()[0]
+            rows = self._conn.execute(
+                f'SELECT p.id, p.name, p.sku, p.type, p.status, p.stock_status, p.price {base} '
+                'ORDER BY bm25(product_fts, 10.0, 8.0, 1.0, 2.0, 2.0) LIMIT ? OFFSET ?',
+                [match, *args, limit, offset]
+            ).fetchall()
+
+        return {'total': total, 'hits': [dict(row) for row in rows]}
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Suggest products whose name or SKU starts with the typed words
+
+        Args:
+            prefix: Partial query as typed by the user
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of {id, name, sku} suggestions
+        """
+        tokens = _TOKEN_RE.findall(prefix.lower())
+        if not tokens:
+            return []
+        match = '{name sku} : ' + ' AND '.join(f'"{token}"*' for token in tokens)
+
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT p.id, p.name, p.sku FROM product_fts JOIN products p ON p.id = product_fts.rowid '
+                'WHERE product_fts MATCH ? ORDER BY bm25(product_fts, 10.0, 8.0) LIMIT ?',
+                (match, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def facets(self, query: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Count matching products by category, stock status and price band
+
+        Args:
+            query: Optional free text query restricting the counted products
+            **filters: Same filters as search()
+
+        Returns:
+            Dictionary with 'total', 'category', 'stock_status' and 'price' counts
+        """
+        where, args = self._filter_clause(filters)
+        if query:
+            match = _build_match_query(query)
+            if not match:
+                return {'total': 0, 'category': [], 'stock_status': {}, 'price': {}}
+            matched = (
+                'SELECT p.id, p.stock_status, p.price FROM product_fts '
+                f'JOIN products p ON p.id = product_fts.rowid WHERE product_fts MATCH ? {where}'
+            )
+            args = [match, *args]
+        else:
+            matched = f'SELECT p.id, p.stock_status, p.price FROM products p WHERE 1 = 1 {where}'
+
+        band_case, band_labels = self._price_band_case()
+
+        with self._lock:
+            # One pass over the matches yields the total, stock and price counts
+            grouped = self._conn.execute(
+                f'SELECT stock_status, CASE WHEN price IS NULL THEN NULL ELSE {band_case} END AS band, '
+                f'COUNT(*) FROM ({matched}) GROUP BY stock_status, band',
+                args
+            ).fetchall()
+            if query or where:
+                categories = self._conn.execute(
+                    'SELECT category_id AS id, MAX(category_name) AS name, COUNT(*) AS count '
+                    f'FROM product_categories WHERE product_id IN (SELECT id FROM ({matched})) '
+                    'GROUP BY category_id ORDER BY count DESC',
+                    args
+                ).fetchall()
+            else:
+                categories = self._conn.execute(
+                    'SELECT category_id AS id, MAX(category_name) AS name, COUNT(*) AS count '
+                    'FROM product_categories GROUP BY category_id ORDER BY count DESC'
+                ).fetchall()
+
+        total = 0
+        stock: Dict[str, int] = {}
+        band_counts: Dict[int, int] = {}
+        for stock_status, band, count in grouped:
+            total += count
+            stock[stock_status or 'unknown'] = stock.get(stock_status or 'unknown', 0) + count
+            if band is not None:
+                band_counts[band] = band_counts.get(band, 0) + count
+
+        return {
+            'total': total,
+            'category': [dict(row) for row in categories],
+            'stock_status': stock,
+            'price': {label: band_counts.get(i, 0) for i, label in enumerate(band_labels)},
+        }
+
+    def count(self) -> int:
+        """Get the number of indexed products"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    def is_ready(self) -> bool:
+        """Whether the index has completed at least one build"""
+        return self.get_meta('last_synced') is not None
+
+    def status(self) -> Dict[str, Any]:
+        """Get a summary of the index state"""
+        return {
+            'ready': self.is_ready(),
+            'products': self.count(),
+            'last_synced': self.get_meta('last_synced'),
+            'path': self.path,
+        }
+
+    def _filter_clause(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Translate search filters into an SQL fragment on the products table"""
+        clauses = []
+        args: List[Any] = []
+
+        for column in ('stock_status', 'status', 'type'):
+            if filters.get(column):
+                clauses.append(f'p.{column} = ?')
+                args.append(filters[column])
+        if filters.get('category'):
+            clauses.append('p.id IN (SELECT product_id FROM product_categories WHERE category_id = ?)')
+            args.append(int(filters['category']))
+        if filters.get('min_price') is not None:
+            clauses.append('p.price >= ?')
+            args.append(float(filters['min_price']))
+        if filters.get('max_price') is not None:
+            clauses.append('p.price <= ?')
+            args.append(float(filters['max_price']))
+
+        where = ''.join(f' AND {clause}' for clause in clauses)
+        return where, args
+
+    def _price_band_case(self) -> Tuple[str, List[str]]:
+        """Build the SQL CASE expression and labels for the price bands"""
+        labels = []
+        whens = []
+        lower = 0
+        for i, upper in enumerate(self.price_bands):
+            whens.append(f'WHEN price < {float(upper)} THEN {i}')
+            labels.append(f'{_format_price(lower)}-{_format_price(upper)}')
+            lower = upper
+        labels.append(f'{_format_price(lower)}+')
+        return f'CASE {" ".join(whens)} ELSE {len(self.price_bands)} END', labels
+
+    # ------------------------------------------------------------------
+    # Metadata helpers
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a metadata value"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        """Write a metadata value"""
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def _build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query where every word is a prefix term"""
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+
+def _parse_price(value: Any) -> Optional[float]:
+    """Convert a WooCommerce price string to a float"""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_price(value: float) -> str:
+    """Format a price band boundary without a trailing .0"""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
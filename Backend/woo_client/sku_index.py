@@ -0,0 +1,329 @@
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Optional
+
+from .sqlite_utils import build_once, connect, modified_since, transaction, utc_now
+
+# Fields requested when building the index
+SKU_FIELDS = 'id,sku,parent_id,type'
+
+# Number of SKUs per /products?sku= lookup for index misses
+LOOKUP_BATCH_SIZE = 50
+
+
+class SkuIndex:
+    """Persistent SKU → ID index covering products and variations
+
+    Entries map a SKU to the product or variation ID, its parent ID (0 for
+    top-level products) and the product type. The index is built from
+    paginated ``_fields=id,sku,parent_id,type`` fetches, refreshed with
+    ``modified_after`` polling or webhook payloads, and stored in SQLite so
+    that it survives restarts and can be shared between processes.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """Open (or create) the index
+
+        Args:
+            path: SQLite database path, or ':memory:' for a process-local index
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = connect(path)
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS skus (
+                    sku TEXT PRIMARY KEY,
+                    id INTEGER NOT NULL,
+                    parent_id INTEGER NOT NULL DEFAULT 0,
+                    type TEXT,
+                    generation INTEGER DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_skus_id ON skus (id);
+                CREATE INDEX IF NOT EXISTS idx_skus_parent ON skus (parent_id);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            ''')
+        self._generation = int(self.get_meta('generation') or 0)
+
+    # ------------------------------------------------------------------
+    # Population
+    # ------------------------------------------------------------------
+
+    def build(self, client, per_page: int = 100, include_variations: bool = True) -> int:
+        """Rebuild the index from a full paginated fetch
+
+        Args:
+            client: ProductClient (or WooClient) used to fetch products
+            per_page: Page size for the fetch
+            include_variations: Whether to index the variations of variable products
+
+        Returns:
+            Number of SKUs indexed
+        """
+        products_client = getattr(client, 'products', client)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        started_at = utc_now()
+
+        count = self._sync(products_client, {'_fields': SKU_FIELDS}, per_page, include_variations, generation)
+
+        with self._lock, transaction(self._conn):
+            self._conn.execute('DELETE FROM skus WHERE generation != ?', (generation,))
+            self._set_meta('last_synced', started_at)
+            self._set_meta('generation', str(generation))
+
+        return count
+
+    def ensure_built(self, client, per_page: int = 100, build_timeout_seconds: float = 1800.0) -> bool:
+        """Build the index unless it has been built already
+
+        When several processes share the database, only one of them builds
+        it; the others wait for the build to finish.
+
+        Args:
+            client: ProductClient (or WooClient) used to fetch products
+            per_page: Page size for the fetch
+            build_timeout_seconds: Time after which waiting processes give up
+                on the building one and build the index themselves
+
+        Returns:
+            True if this process built the index
+        """
+        return build_once(self._conn, 'sku_index:sync', self.is_ready,
+                          lambda: self.build(client, per_page=per_page), lease_seconds=build_timeout_seconds,
+                          lock=self._lock)
+
+    def ensure_fresh(self, client, max_age_seconds: float, per_page: int = 100,
+                     build_timeout_seconds: float = 1800.0) -> bool:
+        """Build the index, or refresh it if the last sync is older than ``max_age_seconds``
+
+        As with ensure_built(), only one of the processes sharing the
+        database syncs at a time.
+
+        Returns:
+            True if this process synced the index
+        """
+        def is_fresh():
+            age = self.sync_age()
+            return age is not None and age <= max_age_seconds
+
+        return build_once(self._conn, 'sku_index:sync', is_fresh,
+                          lambda: self.refresh(client, per_page=per_page), lease_seconds=build_timeout_seconds,
+                          lock=self._lock)
+
+    def refresh(self, client, per_page: int = 100, include_variations: bool = True) -> int:
+        """Update the index with products modified since the last sync
+
+        Variations of every modified variable product are re-fetched as well.
+        Falls back to a full build when the index has never been synced.
+
+        Returns:
+            Number of SKUs re-indexed
+        """
+        last_synced = self.get_meta('last_synced')
+        if not last_synced:
+            return self.build(client, per_page=per_page, include_variations=include_variations)
+
+        products_client = getattr(client, 'products', client)
+        started_at = utc_now()
+        params = {'_fields': SKU_FIELDS, 'modified_after': modified_since(last_synced), 'dates_are_gmt': True}
+        count = self._sync(products_client, params, per_page, include_variations, self._generation)
+
+        self._set_meta('last_synced', started_at)
+        return count
+
+    def _sync(self, products_client, params: Dict[str, Any], per_page: int,
+              include_variations: bool, generation: int) -> int:
+        """Fetch products (and their variations) and write them to the index"""
+        count = 0
+        for page in products_client.iter_pages('/products', params=params, per_page=per_page):
+            count += self.upsert(page, generation=generation)
+
+            if not include_variations:
+                continue
+            for product in page:
+                if product.get('type') != 'variable':
+                    continue
+                variation_pages = products_client.iter_pages(
+                    f"/products/{product['id']}/variations",
+                    params={'_fields': 'id,sku'},
+                    per_page=per_page
+                )
+                for variations in variation_pages:
+                    count += self.upsert(
+                        [{**v, 'parent_id': product['id'], 'type': 'variation'} for v in variations],
+                        generation=generation
+                    )
+        return count
+
+    def upsert(self, items: Iterable[Dict[str, Any]], generation: Optional[int] = None) -> int:
+        """Add or replace entries
+
+        Items without a SKU remove any SKU previously recorded for their ID,
+        which covers SKUs that were cleared in WooCommerce.
+
+        Args:
+            items: Dictionaries with id, sku, parent_id and type
+            generation: Build generation to tag the rows with
+
+        Returns:
+            Number of SKUs written
+        """
+        if generation is None:
+            generation = self._generation
+
+        rows = []
+        cleared = []
+        for item in items:
+            if not item.get('id'):
+                continue
+            if item.get('sku') and item.get('status') != 'trash':
+                rows.append((
+                    item['sku'],
+                    int(item['id']),
+                    int(item.get('parent_id') or 0),
+                    item.get('type'),
+                    generation,
+                ))
+            else:
+                cleared.append(int(item['id']))
+
+        with self._lock, transaction(self._conn):
+            self._conn.executemany('DELETE FROM skus WHERE id = ?', [(i,) for i in cleared])
+            # A product whose SKU changed keeps its ID, so drop the old entry first
+            self._conn.executemany('DELETE FROM skus WHERE id = ? AND sku != ?', [(r[1], r[0]) for r in rows])
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO skus (sku, id, parent_id, type, generation) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+        return len(rows)
+
+    def delete_ids(self, ids: Iterable[int]) -> None:
+        """Remove products or variations (and the variations of deleted parents)"""
+        params = [(int(i), int(i)) for i in ids if i is not None]
+        if not params:
+            return
+        with self._lock, transaction(self._conn):
+            self._conn.executemany('DELETE FROM skus WHERE id = ? OR parent_id = ?', params)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, sku: str) -> Optional[Dict[str, Any]]:
+        """Look up a single SKU in the index (no network access)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT sku, id, parent_id, type FROM skus WHERE sku = ?', (sku,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def parents(self, ids: Iterable[int]) -> Dict[int, int]:
+        """Map the variation IDs among ``ids`` to their parent IDs (no network access)"""
+        wanted = list(dict.fromkeys(int(i) for i in ids))
+        result = {}
+        with self._lock:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in self._conn.execute(
+                    f'SELECT id, parent_id FROM skus WHERE id IN ({placeholders}) AND parent_id != 0', chunk
+                ):
+                    result[row['id']] = row['parent_id']
+        return result
+
+    def resolve(self, skus: Iterable[str], client=None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve SKUs to IDs in bulk
+
+        SKUs missing from the index are looked up with batched
+        ``/products?sku=a,b,c`` requests when a client is given (WooCommerce
+        matches variations as well for SKU lookups), and the results are
+        added to the index.
+
+        Args:
+            skus: SKUs to resolve
+            client: Optional ProductClient used to look up index misses
+
+        Returns:
+            Dictionary mapping every requested SKU to {sku, id, parent_id, type},
+            or None when it does not exist
+        """
+        wanted = list(dict.fromkeys(s for s in skus if s))
+        result: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        with self._lock:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in self._conn.execute(
+                    f'SELECT sku, id, parent_id, type FROM skus WHERE sku IN ({placeholders})', chunk
+                ):
+                    result[row['sku']] = dict(row)
+
+        missing = [s for s in wanted if s not in result]
+        if missing and client is not None:
+            products_client = getattr(client, 'products', client)
+            for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+                chunk = missing[start:start + LOOKUP_BATCH_SIZE]
+                found = products_client._make_request('GET', '/products', params={
+                    'sku': ','.join(chunk),
+                    '_fields': SKU_FIELDS,
+                    'per_page': 100,
+                })
+                self.upsert(found)
+                for item in found:
+                    if item.get('sku') in chunk:
+                        result[item['sku']] = {
+                            'sku': item['sku'],
+                            'id': item['id'],
+                            'parent_id': item.get('parent_id') or 0,
+                            'type': item.get('type'),
+                        }
+
+        return {s: result.get(s) for s in wanted}
+
+    def count(self) -> int:
+        """Get the number of indexed SKUs"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM skus').fetchone()[0]
+
+    def is_ready(self) -> bool:
+        """Whether the index has completed at least one build"""
+        return self.get_meta('last_synced') is not None
+
+    def sync_age(self) -> Optional[float]:
+        """Seconds since the last build or refresh started (None if never synced)"""
+        last_synced = self.get_meta('last_synced')
+        if not last_synced:
+            return None
+        synced_at = datetime.strptime(last_synced, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - synced_at).total_seconds()
+
+    def status(self) -> Dict[str, Any]:
+        """Get a summary of the index state"""
+        return {
+            'ready': self.is_ready(),
+            'skus': self.count(),
+            'last_synced': self.get_meta('last_synced'),
+            'path': self.path,
+        }
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a metadata value"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        """Write a metadata value"""
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
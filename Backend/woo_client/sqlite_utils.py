@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open an SQLite connection shared between threads
+
+    File databases use WAL mode so that several processes can read while one
+    writes. The connection runs in autocommit mode; use transaction() to group
+    statements.
+
+    Args:
+        path: Database file path, or ':memory:' for a process-local database
+    """
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if path != ':memory:':
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class transaction:
+    """Minimal BEGIN/COMMIT/ROLLBACK context manager for autocommit connections"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def utc_now() -> str:
+    """Current UTC time in the ISO 8601 format accepted by modified_after"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def modified_since(last_synced: str) -> str:
+    """modified_after value for a sync that started at ``last_synced``
+
+    Timestamps have one-second resolution and modified_after is exclusive,
+    so changes made during the second the previous sync started would be
+    missed; the window starts one second earlier (re-indexing is idempotent).
+    """
+    started = datetime.strptime(last_synced, '%Y-%m-%dT%H:%M:%S') - timedelta(seconds=1)
+    return started.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class Lease:
+    """Host-wide lock on a named job, stored in an SQLite database
+
+    Lets one process (e.g. one API worker) build an index while the other
+    processes sharing the database wait for the result instead of building
+    it too. A lease expires after ``seconds`` so a crashed holder does not
+    block the others forever.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, name: str, seconds: float = 300.0, lock=None):
+        """Create a lease handle (nothing is locked until acquire())
+
+        Args:
+            conn: Connection to the shared database
+            name: Job name, e.g. 'taxonomy:categories'
+            seconds: Time after which an unreleased lease can be taken over
+            lock: Lock serializing the use of ``conn`` between threads, if any
+        """
+        self.conn = conn
+        self.name = name
+        self.seconds = seconds
+        self.token = f"{os.getpid()}:{id(self)}"
+        self._lock = lock or nullcontext()
+        with self._lock:
+            conn.execute('CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, '
+                         'expires_at REAL NOT NULL)')
+
+    def acquire(self) -> bool:
+        """Take the lease if nobody else holds it
+
+        Returns:
+            True if this handle now holds the lease
+        """
+        now = time.time()
+        with self._lock, transaction(self.conn):
+            row = self.conn.execute('SELECT owner, expires_at FROM leases WHERE name = ?', (self.name,)).fetchone()
+            if row is not None and row['owner'] != self.token and row['expires_at'] > now:
+                return False
+            self.conn.execute('INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)',
+                              (self.name, self.token, now + self.seconds))
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.conn.execute('DELETE FROM leases WHERE name = ? AND owner = ?', (self.name, self.token))
+
+
+def build_once(conn: sqlite3.Connection, name: str, is_done: Callable[[], bool], build: Callable[[], Any],
+               lease_seconds: float = 300.0, poll_seconds: float = 0.25, lock=None) -> bool:
+    """Run ``build`` unless ``is_done()``, in one process at a time
+
+    Processes that find the lease taken wait until ``is_done()`` turns true,
+    or until the lease expires (then they build themselves).
+
+    Args:
+        conn: Connection to the shared database
+        name: Lease name
+        is_done: Whether the result of ``build`` is already available
+        build: Function producing the result
+        lease_seconds: Expected upper bound of the build time
+        poll_seconds: Interval between checks while waiting
+        lock: Lock serializing the use of ``conn`` between threads, if any
+
+    Returns:
+        True if this process ran ``build``
+    """
+    if is_done():
+        return False
+    lease = Lease(conn, name, lease_seconds, lock)
+    while not is_done():
+        if lease.acquire():
+            try:
+                if is_done():  # finished by another process between the checks
+                    return False
+                build()
+                return True
+            finally:
+                lease.release()
+        time.sleep(poll_seconds)
+    return False
@@ -0,0 +1,408 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional
+
+from .json_codec import default_codec
+from .sqlite_utils import build_once, connect, transaction
+from .tracing import bind_context
+
+# Sections of the index, loaded and invalidated independently
+SECTIONS = ('categories', 'attributes')
+
+# Fields kept for categories and attribute terms (everything the API returns but the links)
+CATEGORY_FIELDS = 'id,name,slug,parent,description,display,image,menu_order,count'
+TERM_FIELDS = 'id,name,slug,description,menu_order,count'
+
+
+def slugify(value: str) -> str:
+    """Slug WooCommerce derives from a category or term name (as in get_or_create_category)"""
+    return value.strip().lower().replace(' ', '-')
+
+
+class TaxonomyIndex:
+    """In-memory index of product categories, global attributes and their terms
+
+    Lets the import planner (and anything else that needs names resolved to
+    IDs) look up taxonomy without one request per lookup. The index is loaded
+    with a handful of paginated ``_fields`` fetches, expires after
+    ``max_age_seconds`` and is invalidated by category, attribute and term
+    webhook events.
+
+    With a ``path``, loaded sections are also saved to an SQLite snapshot
+    shared by every process on the host (e.g. the API workers): a process
+    whose copy is stale loads the snapshot instead of refetching it, only one
+    process at a time refetches an expired section, and invalidations reach
+    every process.
+    """
+
+    def __init__(self, max_age_seconds: float = 3600.0, path: Optional[str] = None,
+                 build_timeout_seconds: float = 300.0):
+        """Create an empty index
+
+        Args:
+            max_age_seconds: Age after which ensure_fresh() reloads the index
+            path: SQLite database shared between processes (None for a process-local index)
+            build_timeout_seconds: Time after which other processes stop waiting
+                for a process that is loading a section and load it themselves
+        """
+        self.max_age_seconds = max_age_seconds
+        self.path = path
+        self.build_timeout_seconds = build_timeout_seconds
+        self._lock = threading.RLock()
+        self._categories: Dict[int, Dict[str, Any]] = {}
+        self._categories_by_key: Dict[str, Dict[str, Any]] = {}
+        self._attributes: Dict[str, Dict[str, Any]] = {}
+        self._terms: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._term_lists: Dict[int, List[Dict[str, Any]]] = {}
+        self._loaded_at: Dict[str, Optional[float]] = {'categories': None, 'attributes': None}
+        self._read_latency: Optional[float] = None
+        self._versions: Dict[str, Optional[int]] = dict.fromkeys(SECTIONS)
+        self._codec = default_codec()
+        self._conn = None
+        if path is not None:
+            self._conn = connect(path)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    section TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    loaded_at REAL,
+                    read_latency REAL,
+                    data BLOB NOT NULL
+                )
+            ''')
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh(self, client, max_workers: int = 4) -> Dict[str, Any]:
+        """Reload categories, global attributes and attribute terms
+
+        Args:
+            client: WooClient used for the fetches
+            max_workers: Number of attribute term lists fetched in parallel
+
+        Returns:
+            Index status (see status())
+        """
+        self.refresh_categories(client)
+        self.refresh_attributes(client, max_workers=max_workers)
+        return self.status()
+
+    def refresh_categories(self, client) -> int:
+        """Reload every product category
+
+        Returns:
+            Number of categories loaded
+        """
+        timings = []
+        categories = []
+        pages = client.categories.iter_pages('/products/categories', params={'_fields': CATEGORY_FIELDS})
+        started = time.perf_counter()
+        for page in pages:
+            timings.append(time.perf_counter() - started)
+            categories.extend(page)
+            started = time.perf_counter()
+
+        loaded_at = time.time()
+        with self._lock:
+            self._set_categories(categories, loaded_at)
+            self._record_latency(timings)
+            count = len(self._categories)
+        self._save_snapshot('categories', categories, loaded_at)
+        return count
+
+    def refresh_attributes(self, client, max_workers: int = 4) -> int:
+        """Reload every global attribute and its terms
+
+        Returns:
+            Number of attributes loaded
+        """
+        started = time.perf_counter()
+        # The attributes endpoint is not paginated
+        attributes = client.attributes._make_request('GET', '/products/attributes')
+        timings = [time.perf_counter() - started]
+
+        def load_terms(attribute):
+            terms = []
+            endpoint = f"/products/attributes/{attribute['id']}/terms"
+            page_started = time.perf_counter()
+            page_timings = []
+            for page in client.attributes.iter_pages(endpoint, params={'_fields': TERM_FIELDS}):
+                page_timings.append(time.perf_counter() - page_started)
+                terms.extend(page)
+                page_started = time.perf_counter()
+            return terms, page_timings
+
+        term_lists = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for terms, page_timings in executor.map(bind_context(load_terms), attributes):
+                timings.extend(page_timings)
+                term_lists.append(terms)
+
+        loaded = {'attributes': attributes, 'terms': term_lists}
+        loaded_at = time.time()
+        with self._lock:
+            self._set_attributes(loaded, loaded_at)
+            self._record_latency(timings)
+        self._save_snapshot('attributes', loaded, loaded_at)
+        return len(attributes)
+
+    def _set_categories(self, categories: List[Dict[str, Any]], loaded_at: float) -> None:
+        """Replace the category lookups (caller holds the lock)"""
+        by_key = {}
+        for category in categories:
+            by_key.setdefault(category['name'].strip().lower(), category)
+        for category in categories:
+            # Slugs are unique, so they win over names
+            by_key[category['slug']] = category
+
+        self._categories = {c['id']: c for c in categories}
+        self._categories_by_key = by_key
+        self._loaded_at['categories'] = loaded_at
+
+    def _set_attributes(self, loaded: Dict[str, Any], loaded_at: float) -> None:
+        """Replace the attribute and term lookups (caller holds the lock)"""
+        terms_by_attribute = {}
+        term_lists = {}
+        for attribute, terms in zip(loaded['attributes'], loaded['terms']):
+            index = {}
+            for term in terms:
+                index.setdefault(term['name'].strip().lower(), term)
+                index[term['slug']] = term
+            terms_by_attribute[attribute['id']] = index
+            term_lists[attribute['id']] = terms
+
+        self._attributes = {a['slug']: a for a in loaded['attributes']}
+        self._terms = terms_by_attribute
+        self._term_lists = term_lists
+        self._loaded_at['attributes'] = loaded_at
+
+    def ensure_fresh(self, client, sections: Iterable[str] = SECTIONS,
+                     max_age_seconds: Optional[float] = None) -> bool:
+        """Load the parts of the index that are missing, invalidated or expired
+
+        With a shared snapshot, a section another process has already
+        reloaded is read from the snapshot instead of being refetched.
+
+        Args:
+            client: WooClient used for the fetches
+            sections: Sections to check ('categories', 'attributes')
+            max_age_seconds: Age after which a section is reloaded, when
+                refreshing ahead of ``self.max_age_seconds``
+
+        Returns:
+            True if anything was reloaded
+        """
+        reloaded = False
+        for section in sections:
+            if self._conn is not None:
+                reloaded = self._sync_shared(section, client, max_age_seconds) or reloaded
+            elif self._is_stale(self._loaded_at[section], max_age_seconds):
+                self._refresh_section(section, client)
+                reloaded = True
+        return reloaded
+
+    def is_loaded(self, section: str) -> bool:
+        """Whether a section is loaded and has not expired or been invalidated"""
+        with self._lock:
+            return not self._is_stale(self._loaded_at[section])
+
+    def invalidate(self, section: Optional[str] = None) -> None:
+        """Mark a section ('categories' or 'attributes') or the whole index as stale
+
+        A shared snapshot is invalidated too, so that every process reloads it.
+        """
+        with self._lock:
+            for name in self._loaded_at:
+                if section is None or section == name:
+                    self._loaded_at[name] = None
+            if self._conn is None:
+                return
+            if section is None:
+                self._conn.execute('UPDATE snapshots SET loaded_at = NULL')
+            else:
+                self._conn.execute('UPDATE snapshots SET loaded_at = NULL WHERE section = ?', (section,))
+
+    def _is_stale(self, loaded_at: Optional[float], max_age_seconds: Optional[float] = None) -> bool:
+        if max_age_seconds is None:
+            max_age_seconds = self.max_age_seconds
+        return loaded_at is None or time.time() - loaded_at > max_age_seconds
+
+    def _refresh_section(self, section: str, client) -> None:
+        if section == 'categories':
+            self.refresh_categories(client)
+        else:
+            self.refresh_attributes(client)
+
+    # ------------------------------------------------------------------
+    # Shared snapshot
+    # ------------------------------------------------------------------
+
+    def _snapshot_state(self, section: str) -> Optional[tuple]:
+        """(version, loaded_at) of a section's snapshot, or None if it was never saved"""
+        with self._lock:
+            row = self._conn.execute('SELECT version, loaded_at FROM snapshots WHERE section = ?',
+                                     (section,)).fetchone()
+        return (row['version'], row['loaded_at']) if row else None
+
+    def _snapshot_fresh(self, section: str, max_age_seconds: Optional[float] = None) -> bool:
+        state = self._snapshot_state(section)
+        return state is not None and not self._is_stale(state[1], max_age_seconds)
+
+    def _sync_shared(self, section: str, client, max_age_seconds: Optional[float] = None) -> bool:
+        """Bring a section up to date with the shared snapshot, refetching it if the snapshot is stale
+
+        Returns:
+            True if the local copy changed
+        """
+        state = self._snapshot_state(section)
+        if state is not None and not self._is_stale(state[1], max_age_seconds):
+            if state[0] == self._versions[section]:
+                return False
+            return self._load_snapshot(section)
+
+        refetched = build_once(self._conn, f'taxonomy:{section}',
+                               lambda: self._snapshot_fresh(section, max_age_seconds),
+                               lambda: self._refresh_section(section, client),
+                               lease_seconds=self.build_timeout_seconds, lock=self._lock)
+        return refetched or self._load_snapshot(section)
+
+    def _load_snapshot(self, section: str) -> bool:
+        """Replace a section with the shared snapshot
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT version, loaded_at, read_latency, data FROM snapshots WHERE section = ?',
+                                     (section,)).fetchone()
+        if row is None or row['loaded_at'] is None:
+            return False
+        data = self._codec.loads(row['data'])
+        with self._lock:
+            if section == 'categories':
+                self._set_categories(data, row['loaded_at'])
+            else:
+                self._set_attributes(data, row['loaded_at'])
+            self._versions[section] = row['version']
+            if row['read_latency'] is not None:
+                self._read_latency = row['read_latency']
+        return True
+
+    def _save_snapshot(self, section: str, data: Any, loaded_at: float) -> None:
+        """Publish a freshly loaded section to the other processes"""
+        if self._conn is None:
+            return
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                'INSERT INTO snapshots (section, version, loaded_at, read_latency, data) VALUES (?, 1, ?, ?, ?) '
+                'ON CONFLICT (section) DO UPDATE SET version = version + 1, loaded_at = excluded.loaded_at, '
+                'read_latency = excluded.read_latency, data = excluded.data',
+                (section, loaded_at, self._read_latency, self._codec.dumps(data))
+            )
+            self._versions[section] = self._conn.execute(
+                'SELECT version FROM snapshots WHERE section = ?', (section,)).fetchone()[0]
+
+    def apply_events(self, events: Iterable[Any]) -> None:
+        """Webhook handler: invalidate the sections touched by taxonomy events
+
+        Action webhooks only carry the term ID, so the affected section is
+        reloaded on next use instead of being patched.
+        """
+        for event in events:
+            if event.resource == 'category':
+                self.invalidate('categories')
+            elif event.resource in ('attribute', 'term'):
+                self.invalidate('attributes')
+
+    def _record_latency(self, timings: List[float]) -> None:
+        """Keep a moving average of the GET latency seen while loading (caller holds the lock)"""
+        if not timings:
+            return
+        average = sum(timings) / len(timings)
+        if self._read_latency is None:
+            self._read_latency = average
+        else:
+            self._read_latency = (self._read_latency + average) / 2
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def read_latency(self) -> Optional[float]:
+        """Average seconds per GET request measured while loading, if known"""
+        with self._lock:
+            return self._read_latency
+
+    def find_category(self, value: str) -> Optional[Dict[str, Any]]:
+        """Find a category by slug or name (case-insensitive)"""
+        with self._lock:
+            key = value.strip().lower()
+            return self._categories_by_key.get(key) or self._categories_by_key.get(slugify(value))
+
+    def category_path(self, category_id: int) -> List[Dict[str, Any]]:
+        """Get a category and its ancestors, ordered from the root to the category"""
+        path = []
+        seen = set()
+        with self._lock:
+            category = self._categories.get(category_id)
+            while category is not None and category['id'] not in seen:
+                seen.add(category['id'])
+                path.append(category)
+                category = self._categories.get(category.get('parent') or 0)
+        path.reverse()
+        return path
+
+    def find_attribute(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find a global attribute by slug, with or without the 'pa_' prefix"""
+        slug = name if name.startswith('pa_') else f'pa_{name}'
+        with self._lock:
+            return self._attributes.get(slug) or self._attributes.get(name)
+
+    def find_term(self, attribute: Dict[str, Any], value: str) -> Optional[Dict[str, Any]]:
+        """Find a term of a global attribute by name or slug (case-insensitive)"""
+        with self._lock:
+            terms = self._terms.get(attribute['id'], {})
+            return terms.get(value.strip().lower()) or terms.get(slugify(value))
+
+    def list_categories(self, parent: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get every category (or the children of ``parent``), in the order WooCommerce returned them"""
+        with self._lock:
+            categories = list(self._categories.values())
+        if parent is not None:
+            categories = [c for c in categories if (c.get('parent') or 0) == parent]
+        return categories
+
+    def list_attributes(self) -> List[Dict[str, Any]]:
+        """Get every global attribute"""
+        with self._lock:
+            return list(self._attributes.values())
+
+    def list_terms(self, attribute_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Get the terms of a global attribute (None if the attribute is not in the index)"""
+        with self._lock:
+            terms = self._term_lists.get(attribute_id)
+            return list(terms) if terms is not None else None
+
+    def status(self) -> Dict[str, Any]:
+        """Get the size and age of the index"""
+        with self._lock:
+            return {
+                'categories': len(self._categories),
+                'attributes': len(self._attributes),
+                'terms': sum(len({t['id'] for t in terms.values()}) for terms in self._terms.values()),
+                'categories_loaded_at': self._loaded_at['categories'],
+                'attributes_loaded_at': self._loaded_at['attributes'],
+                'read_latency_seconds': round(self._read_latency, 4) if self._read_latency is not None else None,
+                'path': self.path,
+            }
+
+    def close(self) -> None:
+        """Close the snapshot database, if any"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,181 @@
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+# OpenTelemetry modules, imported by configure_tracing(): opentelemetry-api is
+# optional, and importing it costs tens of milliseconds at startup
+otel_context = propagate = trace = None
+
+# Instrumentation scope of the spans created by Woo-Flow
+TRACER_NAME = 'woo_flow'
+
+# Exporters configure_tracing() can set up without extra configuration
+EXPORTERS = ('memory', 'console')
+
+
+class _NoopSpan:
+    """Stand-in for a span while tracing is off (also a no-op context manager)"""
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Tracer used by start_span(); None while tracing is off
+_tracer = None
+_memory_exporter = None
+
+
+def configure_tracing(exporter: Optional[str] = None, provider=None) -> None:
+    """Turn tracing on
+
+    Spans are created for API requests, importer rows and phases, and
+    upstream HTTP requests (with endpoint template, status and retry count).
+
+    Args:
+        exporter: 'memory' to keep finished spans in-process (see
+            finished_spans()), 'console' to print them as JSON, or None to use
+            the TracerProvider already configured for the process (e.g. an
+            OTLP exporter set up by the application)
+        provider: TracerProvider to use instead of creating one
+
+    Raises:
+        ImportError: If opentelemetry-api (or -sdk, for an exporter) is not installed
+        ValueError: If the exporter is unknown
+    """
+    global _tracer, _memory_exporter, otel_context, propagate, trace
+    if exporter is not None and exporter not in EXPORTERS:
+        raise ValueError(f"Unknown trace exporter: {exporter} (expected one of {', '.join(EXPORTERS)})")
+    try:
+        from opentelemetry import context as otel_context
+        from opentelemetry import propagate, trace
+    except ImportError:
+        raise ImportError("Tracing requires opentelemetry-api (pip install woo-flow[tracing])")
+
+    if exporter is not None:
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        if provider is None:
+            provider = TracerProvider()
+        if exporter == 'memory':
+            _memory_exporter = InMemorySpanExporter()
+            provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+        else:
+            provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+
+    _tracer = provider.get_tracer(TRACER_NAME) if provider is not None else trace.get_tracer(TRACER_NAME)
+
+
+def disable_tracing() -> None:
+    """Turn tracing off (spans become no-ops again)"""
+    global _tracer, _memory_exporter
+    _tracer = None
+    _memory_exporter = None
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: Optional[str] = None,
+               context=None):
+    """Start a span as the current span, for use in a ``with`` statement
+
+    Returns a no-op span when tracing is off, so callers never need to check.
+
+    Args:
+        name: Span name
+        attributes: Initial attributes (None values are left out)
+        kind: 'server' or 'client' (internal when omitted)
+        context: Parent context, e.g. from extract_context()
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    span_kind = {'server': trace.SpanKind.SERVER, 'client': trace.SpanKind.CLIENT}.get(kind, trace.SpanKind.INTERNAL)
+    if attributes:
+        attributes = {key: value for key, value in attributes.items() if value is not None}
+    return tracer.start_as_current_span(name, context=context, kind=span_kind, attributes=attributes)
+
+
+def current_span():
+    """The span in progress (a no-op span when tracing is off)"""
+    if _tracer is None:
+        return NOOP_SPAN
+    return trace.get_current_span()
+
+
+def extract_context(headers) -> Any:
+    """Parent context from incoming W3C ``traceparent`` headers (None when tracing is off)"""
+    if _tracer is None:
+        return None
+    return propagate.extract(headers)
+
+
+def bind_context(fn: Callable) -> Callable:
+    """Wrap ``fn`` to run in the caller's trace context
+
+    Worker threads do not inherit the current span; pass the wrapped
+    function to ``executor.map``/``submit`` so spans created by the workers
+    belong to the same trace.
+    """
+    if _tracer is None:
+        return fn
+    ctx = otel_context.get_current()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = otel_context.attach(ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+
+    return run
+
+
+def finished_spans() -> List[Dict[str, Any]]:
+    """Spans collected by the 'memory' exporter, oldest first
+
+    Returns:
+        One dict per span with name, trace/span/parent IDs (hex), start and
+        end times (ns), duration in milliseconds, status and attributes
+    """
+    if _memory_exporter is None:
+        return []
+    spans = []
+    for span in _memory_exporter.get_finished_spans():
+        spans.append({
+            'name': span.name,
+            'trace_id': format(span.context.trace_id, '032x'),
+            'span_id': format(span.context.span_id, '016x'),
+            'parent_id': format(span.parent.span_id, '016x') if span.parent else None,
+            'start_time': span.start_time,
+            'end_time': span.end_time,
+            'duration_ms': round((span.end_time - span.start_time) / 1e6, 3),
+            'status': span.status.status_code.name,
+            'attributes': dict(span.attributes or {}),
+        })
+    return spans
+
+
+def clear_finished_spans() -> None:
+    if _memory_exporter is not None:
+        _memory_exporter.clear()